@@ -1,6 +1,8 @@
 import os
 import google.generativeai as genai
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import (Flask, Response, request, jsonify, render_template, send_from_directory, send_file, abort,
+                   stream_with_context)
+import mimetypes
 from dotenv import load_dotenv
 import numpy as np
 import pandas as pd
@@ -13,7 +15,25 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import markdown2
 import json
+import math
 import re
+import glob
+from src.navigation import (CampusGraph, LocationSnapper, ROUTING_PROFILES, corridor_source_hash, detect_profile,
+                            BuildingConfigStore, ConfigSnapshot, ConfigVersionConflict, RoomNameIndex,
+                            normalize_profile)
+from src.navigation.config_store import ROUTING_CONFIG_KEYS, SNAP_CONFIG_KEYS
+from src.navigation.geometry import MAX_MAP_ZOOM, MIN_MAP_ZOOM
+from src.navigation.map_layers import band_file, load_or_build_map_layers
+from src.navigation.compiler import build_navigation_bundle
+from src.navigation.batch import route_batch
+from src.navigation.alternatives import DEFAULT_MAX_OVERLAP, AlternativeRoutes
+from src.navigation.multistop import plan_multi_stop
+from src.navigation.isochrones import DEFAULT_THRESHOLDS_S, IsochroneService
+from src.navigation.dynamic import GraphEditor
+from src.navigation.amenities import AmenityIndex, detect_amenity, is_nearest_request
+from src.navigation.floorplan_index import build_floor_plan_index, floor_plan_signature
+from src.navigation.transform import PlanTransform
+from src.assets import AssetStore
 
 # Import functions from the multimodal RAG system
 try:
@@ -29,6 +49,8 @@ try:
     from src.models.embedding_models import EmbeddingModelManager
     from src.models.gemini_models import GeminiModelManager
     from src.config.settings import RAGConfig
+    from src.retrieval import BM25Index, hybrid_search, select_regions
+    from src.retrieval.embedding_store import EmbeddingStore
     RAG_SYSTEM_AVAILABLE = True
     print("✅ Multimodal RAG system available")
 except ImportError as e:
@@ -40,15 +62,292 @@ load_dotenv()
 # The 'templates' folder is the default for Flask, so we just need to tell it where the static files are.
 app = Flask(__name__, static_folder='static')
 
-# Load Building M room configuration
-try:
-    config_path = Path('config/building_m_rooms.json')
-    with open(config_path, 'r') as f:
-        building_m_config = json.load(f)['Building M']
-    print("✅ Building M room configuration loaded")
-except Exception as e:
-    print(f"⚠️ Failed to load room configuration: {e}")
-    building_m_config = {}
+# Load building room configurations (config/building_*_rooms.json)
+BUILDING_CONFIG_PATHS = os.getenv("BUILDING_CONFIG_PATHS", "config/building_*_rooms.json").split(",")
+
+def load_config_store() -> BuildingConfigStore:
+    """Loads every building config into a versioned store (empty if the files cannot be read)"""
+    try:
+        store = BuildingConfigStore(BUILDING_CONFIG_PATHS)
+        print(f"✅ Room configuration loaded for buildings: {', '.join(sorted(store.snapshot().configs)) or 'none'}")
+        return store
+    except Exception as e:
+        print(f"⚠️ Failed to load room configuration: {e}")
+        return BuildingConfigStore(BUILDING_CONFIG_PATHS, configs={})
+
+config_store = load_config_store()
+
+def get_navigation_config() -> Dict[str, Any]:
+    """Merged room lookup view of the current config snapshot (empty if no building is loaded)"""
+    snapshot = config_store.snapshot()
+    return snapshot.merged if snapshot.configs else {}
+
+# Fuzzy room name index over aliases, room IDs and descriptions (rebuilt per config version)
+ROOM_MATCH_THRESHOLD = float(os.getenv("ROOM_MATCH_THRESHOLD", "0.8"))
+room_index_cache = (None, None)  # (config version, index), swapped as one reference
+
+def get_room_index() -> RoomNameIndex:
+    """Returns the room name index of the current config snapshot"""
+    global room_index_cache
+    snapshot = config_store.snapshot()
+    version, index = room_index_cache
+    if version != snapshot.version:
+        index = RoomNameIndex.from_config(snapshot.merged)
+        room_index_cache = (snapshot.version, index)
+    return index
+
+# Load the campus corridor graph and precomputed route tables for server-side routing
+CORRIDOR_SEGMENTS_PATHS = os.getenv("CORRIDOR_SEGMENTS_PATH", "map/corridor_segments_building_m.geojson").split(",")
+ROUTE_TABLES_DIR = os.getenv("ROUTE_TABLES_DIR", "config/route_tables")
+DEFAULT_ROUTING_PROFILE = normalize_profile(os.getenv("DEFAULT_ROUTING_PROFILE", "default"))
+ROUTE_BATCH_MAX = int(os.getenv("ROUTE_BATCH_MAX", "10000"))
+ALTERNATIVE_ROUTES_MAX_K = int(os.getenv("ALTERNATIVE_ROUTES_MAX_K", "5"))
+MULTI_STOP_MAX = int(os.getenv("MULTI_STOP_MAX", "25"))
+WALKING_SPEED_M_PER_S = float(os.getenv("WALKING_SPEED_M_PER_S", "1.2"))
+ISOCHRONE_MAX_SECONDS = float(os.getenv("ISOCHRONE_MAX_SECONDS", "900"))
+CLOSURE_MAX_HOURS = float(os.getenv("CLOSURE_MAX_HOURS", "720"))
+
+NODE_SPREADSHEET_PATHS = os.getenv("NODE_SPREADSHEETS_PATH", "LeafletJS/Node Excel Files/*.xlsx").split(",")
+NAVIGATION_BUNDLE_DIR = os.getenv("NAVIGATION_BUNDLE_DIR", "config/navigation_bundle")
+CAMPUS_GEOJSON_PATH = os.getenv("CAMPUS_GEOJSON_PATH", "LeafletJS/campus.geojson")
+navigation_bundle_manifest: Optional[Dict[str, Any]] = None
+
+def node_spreadsheet_files() -> List[str]:
+    return sorted(path for pattern in NODE_SPREADSHEET_PATHS for path in glob.glob(pattern))
+
+def load_campus_graph() -> Optional[CampusGraph]:
+    """
+    Compiles the navigation bundle (corridors, configs, node spreadsheets, floor plans), builds the
+    campus graph from it and loads (or rebuilds) its per-floor route tables
+    """
+    global navigation_bundle_manifest
+    configs = config_store.snapshot().configs
+    try:
+        bundle, navigation_bundle_manifest = build_navigation_bundle(
+            CORRIDOR_SEGMENTS_PATHS, configs, NAVIGATION_BUNDLE_DIR, node_spreadsheet_files(), CAMPUS_GEOJSON_PATH
+        )
+        report = bundle["report"]
+        for message in report["errors"]:
+            print(f"❌ Navigation bundle: {message}")
+        if report["warnings"]:
+            print(f"⚠️ Navigation bundle: {len(report['warnings'])} warnings (see scripts/build_navigation_bundle.py)")
+        campus_graph = CampusGraph.from_bundle(bundle, ROUTE_TABLES_DIR)
+    except Exception as e:
+        print(f"⚠️ Failed to compile navigation bundle, using the corridor segments only: {e}")
+        navigation_bundle_manifest = None
+        try:
+            campus_graph = CampusGraph.from_sources(
+                CORRIDOR_SEGMENTS_PATHS,
+                configs,
+                ROUTE_TABLES_DIR,
+                corridor_source_hash(CORRIDOR_SEGMENTS_PATHS)
+            )
+        except Exception as e:
+            print(f"⚠️ Failed to load navigation graph: {e}")
+            return None
+    print(f"✅ Navigation graph loaded: {len(campus_graph)} nodes on {len(campus_graph.floors)} floors, "
+          f"{campus_graph.edge_count} edges")
+    return campus_graph
+
+def _corridor_signature():
+    try:
+        return tuple((path, os.stat(path).st_mtime, os.stat(path).st_size)
+                     for path in CORRIDOR_SEGMENTS_PATHS + node_spreadsheet_files())
+    except OSError:
+        return None
+
+campus_graph = load_campus_graph()
+campus_graph_signature = _corridor_signature()
+
+def get_campus_graph() -> Optional[CampusGraph]:
+    """Returns the campus graph, rebuilding bundle, graph and tables when the corridor sources change"""
+    global campus_graph, campus_graph_signature
+    signature = _corridor_signature()
+    if signature != campus_graph_signature:
+        print("🔄 Corridor segments or node spreadsheets changed, reloading navigation graph...")
+        campus_graph = load_campus_graph()
+        campus_graph_signature = signature
+    if campus_graph is not None:
+        graph_editor_for(campus_graph).expire_closures()
+    return campus_graph
+
+# Runtime edge edits and closures; active closures carry over when the graph is rebuilt
+graph_editor_cache = (None, None)  # (graph, editor), swapped as one reference
+
+def graph_editor_for(graph: CampusGraph) -> GraphEditor:
+    """Returns the editor of a campus graph, re-applying the previous graph's active closures"""
+    global graph_editor_cache
+    cached_graph, editor = graph_editor_cache
+    if cached_graph is not graph:
+        editor = GraphEditor(graph, editor.active_closures() if editor else ())
+        graph_editor_cache = (graph, editor)
+    return editor
+
+def get_graph_editor() -> Optional[GraphEditor]:
+    """Returns the editor of the current campus graph"""
+    graph = get_campus_graph()
+    return graph_editor_for(graph) if graph is not None else None
+
+# Nearest-amenity fields per category and profile (rebuilt with the graph or the config)
+amenity_index_cache = (None, None, None, None)  # (graph, graph version, config version, index)
+
+def get_amenity_index() -> Optional[AmenityIndex]:
+    """Returns the nearest-amenity index of the current campus graph and config snapshot"""
+    global amenity_index_cache
+    graph = get_campus_graph()
+    if graph is None:
+        return None
+    snapshot = config_store.snapshot()
+    cached_graph, graph_version, version, index = amenity_index_cache
+    if cached_graph is not graph or graph_version != graph.version or version != snapshot.version:
+        index = AmenityIndex.from_config(graph, snapshot.merged)
+        amenity_index_cache = (graph, graph.version, snapshot.version, index)
+    return index
+
+# k-shortest alternative routes, cached per query until the graph version changes
+alternative_routes_cache = (None, None)  # (graph, service), swapped as one reference
+
+def get_alternative_routes() -> Optional[AlternativeRoutes]:
+    """Returns the alternative route service of the current campus graph"""
+    global alternative_routes_cache
+    graph = get_campus_graph()
+    if graph is None:
+        return None
+    cached_graph, service = alternative_routes_cache
+    if cached_graph is not graph:
+        service = AlternativeRoutes(graph)
+        alternative_routes_cache = (graph, service)
+    return service
+
+# Walk-time isochrones, shortest-path trees cached per (origin, profile) until the graph version changes
+isochrone_service_cache = (None, None)  # (graph, service), swapped as one reference
+
+def get_isochrone_service() -> Optional[IsochroneService]:
+    """Returns the isochrone service of the current campus graph"""
+    global isochrone_service_cache
+    graph = get_campus_graph()
+    if graph is None:
+        return None
+    cached_graph, service = isochrone_service_cache
+    if cached_graph is not graph:
+        service = IsochroneService(graph, WALKING_SPEED_M_PER_S)
+        isochrone_service_cache = (graph, service)
+    return service
+
+def find_nearest_amenity(start_room: str, category: str, profile: str) -> Optional[Dict[str, Any]]:
+    """Nearest instance of an amenity category from a room or node (None if unknown or unreachable)"""
+    graph = get_campus_graph()
+    index = get_amenity_index()
+    start_node = graph.resolve(start_room) if graph else None
+    if index is None or start_node is None:
+        return None
+    return index.nearest(start_node, category, profile)
+
+# Spatial index of nodes and rooms per floor, for snapping map positions
+
+def load_location_snapper(graph: Optional[CampusGraph]) -> Optional[LocationSnapper]:
+    """Builds the per-floor snap indexes from the campus graph and the floor plan SVGs"""
+    try:
+        snapper = LocationSnapper.from_sources(graph, config_store.snapshot().configs, CAMPUS_GEOJSON_PATH)
+        print("✅ Snap index built: " + ", ".join(f"{floor} ({len(index)} items)"
+                                                 for floor, index in sorted(snapper.indexes.items())))
+        return snapper
+    except Exception as e:
+        print(f"⚠️ Failed to build snap index: {e}")
+        return None
+
+# Room geometry index of the floor plan SVGs (rebuilt when the config or an SVG changes)
+floor_plan_index_cache = (None, None)  # ((config version, SVG signature), index)
+
+def get_floor_plan_index() -> Optional[Dict[str, Any]]:
+    """Returns the floor plan index of the current config snapshot"""
+    global floor_plan_index_cache
+    snapshot = config_store.snapshot()
+    key = (snapshot.version, floor_plan_signature(snapshot.configs))
+    cached_key, index = floor_plan_index_cache
+    if cached_key != key:
+        try:
+            index = build_floor_plan_index(snapshot.configs, CAMPUS_GEOJSON_PATH)
+            print(f"✅ Floor plan index {index['version']}: " + ", ".join(
+                f"{floor} ({len(plan['rooms'])} rooms, {len(plan['nodes'])} nodes)"
+                for floor, plan in sorted(index["floors"].items())))
+        except Exception as e:
+            print(f"⚠️ Failed to build floor plan index: {e}")
+            index = None
+        floor_plan_index_cache = (key, index)
+    return index
+
+# Zoom-banded, quantized campus geometry served from a versioned endpoint
+MAP_LAYERS_DIR = os.getenv("MAP_LAYERS_DIR", "config/map_layers")
+
+def load_map_layers() -> Optional[Dict[str, Any]]:
+    """Loads (or rebuilds when campus.geojson changes) the map layer manifest"""
+    try:
+        return load_or_build_map_layers(CAMPUS_GEOJSON_PATH, MAP_LAYERS_DIR)
+    except Exception as e:
+        print(f"⚠️ Failed to build map layers: {e}")
+        return None
+
+def _campus_geojson_signature():
+    try:
+        stat = os.stat(CAMPUS_GEOJSON_PATH)
+        return (stat.st_mtime, stat.st_size)
+    except OSError:
+        return None
+
+map_layers_cache = (_campus_geojson_signature(), load_map_layers())  # (signature, manifest), swapped as one reference
+
+def get_map_layers() -> Optional[Dict[str, Any]]:
+    """Returns the map layer manifest, rebuilding the layers when campus.geojson changes"""
+    global map_layers_cache
+    signature = _campus_geojson_signature()
+    cached_signature, manifest = map_layers_cache
+    if signature != cached_signature:
+        manifest = load_map_layers()
+        map_layers_cache = (signature, manifest)
+    return manifest
+
+# Content-hashed static assets: versioned URLs, strong ETags and precompressed variants
+ASSET_CACHE_DIR = os.getenv("ASSET_CACHE_DIR", "config/asset_cache")
+ASSET_ROOTS = {"static": "static", "LeafletJS": "LeafletJS", "map": "map", "tools": "tools"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+mimetypes.add_type("application/geo+json", ".geojson")
+
+def load_asset_store() -> AssetStore:
+    """Hashes the served files and precomputes the compressed variants of the changed ones"""
+    store = AssetStore(ASSET_ROOTS, ASSET_CACHE_DIR)
+    try:
+        stats = store.build()
+        print(f"✅ Asset manifest: {stats['files']} files ({stats['changed']} changed, {stats['compressed']} precompressed)")
+    except Exception as e:
+        print(f"⚠️ Failed to build asset manifest, assets will be hashed on demand: {e}")
+    return store
+
+asset_store = load_asset_store()
+
+location_snapper = load_location_snapper(campus_graph)
+location_snapper_graph = campus_graph
+
+def get_location_snapper() -> Optional[LocationSnapper]:
+    """Returns the snap indexes, rebuilding them whenever the campus graph is rebuilt"""
+    global location_snapper, location_snapper_graph
+    graph = get_campus_graph()
+    if graph is not location_snapper_graph:
+        location_snapper = load_location_snapper(graph)
+        location_snapper_graph = graph
+    return location_snapper
+
+def on_building_config_change(previous: ConfigSnapshot, snapshot: ConfigSnapshot):
+    """Rebuilds what depends on the changed config keys: the campus graph and the snap indexes"""
+    global campus_graph, location_snapper_graph
+    changed = previous.changed_keys(snapshot)
+    print(f"🔄 Building config v{snapshot.version}: {', '.join(sorted(changed)) or 'no changes'}")
+    if changed & ROUTING_CONFIG_KEYS:
+        campus_graph = load_campus_graph()
+    if changed & SNAP_CONFIG_KEYS:
+        location_snapper_graph = None  # rebuilt on next use
+
+config_store.subscribe(on_building_config_change)
 
 # Configure the generative AI model
 try:
@@ -324,11 +623,22 @@ class AutoImageUpdater:
 class AdvancedImageManager:
     """Advanced image manager with embeddings for navigation"""
 
-    def __init__(self, images_folder: str = "images/"):
+    # Embedding columns of the metadata DataFrame, dropped once the embedding store holds the vectors
+    EMBEDDING_COLUMNS = ("mm_embedding_from_img_only", "text_embedding_from_image_description")
+
+    def __init__(self, images_folder: str = "images/", tile_images: bool = False, store_mode: str = "int8",
+                 rescore_dir: Optional[str] = None):
         self.images_folder = images_folder
+        self.tile_images = tile_images
+        self.store_mode = store_mode
+        self.rescore_dir = rescore_dir
+        self.tiles_folder = "image_tiles/"
         self.image_metadata_df = None
         self.is_initialized = False
         self.cache_file = "image_metadata_cache.pkl"
+        self.lexical_index = None
+        self.description_store = None
+        self.records_by_path = {}
         self.initialize()
 
     def initialize(self):
@@ -346,6 +656,7 @@ class AdvancedImageManager:
             # Try to load cache first
             if self.load_cache():
                 print("✅ Image cache loaded successfully")
+                self.build_search_indexes()
                 self.is_initialized = True
                 return
 
@@ -355,6 +666,7 @@ class AdvancedImageManager:
 
             if self.image_metadata_df is not None and not self.image_metadata_df.empty:
                 self.save_cache()
+                self.build_search_indexes()
                 self.is_initialized = True
                 print(f"✅ {len(self.image_metadata_df)} images processed with embeddings")
             else:
@@ -370,7 +682,9 @@ class AdvancedImageManager:
                 pasta_imagens=self.images_folder,
                 embedding_size=512,
                 gerar_descricoes=True,
-                formatos_suportados=['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']
+                formatos_suportados=['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'],
+                dividir_em_tiles=self.tile_images,
+                pasta_tiles=self.tiles_folder
             )
         except Exception as e:
             print(f"❌ Error processing images: {e}")
@@ -397,25 +711,117 @@ class AdvancedImageManager:
         except Exception as e:
             print(f"⚠️ Error saving cache: {e}")
     
-    def find_relevant_images(self, user_message: str, top_n: int = 3) -> List[Dict]:
-        """Finds relevant images based on user message"""
-        if not self.is_initialized or self.image_metadata_df is None or self.image_metadata_df.empty:
-            return []
+    def build_search_indexes(self):
+        """Builds the BM25 index and the embedding store over image descriptions"""
+        self.lexical_index = None
+        self.description_store = None
+        self.records_by_path = {}
 
-        try:
-            # Generate embedding from user message
-            user_embedding = get_text_embedding_from_text_embedding_model(user_message)
-            user_embedding = np.array(user_embedding)
+        if self.image_metadata_df is None or self.image_metadata_df.empty:
+            return
 
-            # Search for similar images using text embeddings from descriptions
-            similar_images = buscar_imagens_similares_com_embedding(
-                user_embedding,
+        try:
+            self.description_store = EmbeddingStore.from_dataframe(
                 self.image_metadata_df,
-                top_n=top_n,
-                column_name="text_embedding_from_image_description"
+                column_name="text_embedding_from_image_description",
+                mode=self.store_mode,
+                rescore_dir=self.rescore_dir
             )
+            memory = self.description_store.memory_bytes()
+            print(f"✅ Embedding store built ({self.store_mode}): {len(self.description_store)} vectors, "
+                  f"{memory['index'] / 1024:.1f} KB index")
+            # The store holds the vectors now: drop the per-row float lists (the pickle cache keeps them)
+            if len(self.description_store):
+                self.image_metadata_df = self.image_metadata_df.drop(
+                    columns=[c for c in self.EMBEDDING_COLUMNS if c in self.image_metadata_df.columns]
+                )
+        except Exception as e:
+            print(f"⚠️ Error building embedding store: {e}")
+            self.description_store = None
+
+        try:
+            documents = []
+            for _, row in self.image_metadata_df.iterrows():
+                img_path = row.get('img_path')
+                self.records_by_path[img_path] = row
+                # The file name carries floor/building tokens such as "M1"
+                documents.append((img_path, f"{row.get('original_filename', '')} {row.get('img_desc', '') or ''}"))
+
+            self.lexical_index = BM25Index().build(documents)
+            print(f"✅ Lexical index built: {len(self.lexical_index)} descriptions, {len(self.lexical_index.postings)} terms")
+        except Exception as e:
+            print(f"⚠️ Error building lexical index: {e}")
+            self.lexical_index = None
+
+    def _image_result(self, img_path: str, **scores) -> Dict[str, Any]:
+        """Creates a result record in the same format as the vector search"""
+        row = self.records_by_path[img_path]
+        result = {
+            'file_name': row.get('file_name', 'N/A'),
+            'img_path': row.get('img_path', 'N/A'),
+            'page_num': row.get('page_num', 'N/A'),
+            'img_desc': row.get('img_desc', 'N/A'),
+            'original_filename': row.get('original_filename', 'N/A'),
+            'source_type': row.get('source_type', 'N/A'),
+            'record_type': row.get('record_type', 'image'),
+            'parent_img_path': row.get('parent_img_path'),
+            'tile_box': row.get('tile_box')
+        }
+        result.update(scores)
+        return result
+
+    def find_relevant_images(self, user_message: str, top_n: int = 3) -> List[Dict]:
+        """
+        Finds relevant images based on user message
+
+        Runs BM25 over the image descriptions alongside the vector search and
+        fuses both rankings with Reciprocal Rank Fusion. Queries whose room
+        numbers all appear in the lexical index are answered without an
+        embedding call.
+        """
+        if not self.is_initialized or self.image_metadata_df is None or self.image_metadata_df.empty:
+            return []
 
-            return similar_images
+        try:
+            similar_by_path = {}
+
+            def vector_search(candidate_pool: int) -> List:
+                # Generate embedding from user message
+                user_embedding = get_text_embedding_from_text_embedding_model(user_message)
+                user_embedding = np.array(user_embedding)
+
+                # Search for similar images using text embeddings from descriptions
+                if self.description_store is not None and len(self.description_store):
+                    # Quantized candidate search, rescored in full precision
+                    similar_images = [
+                        self._image_result(img_path, cosine_score=round(score, 2))
+                        for img_path, score in self.description_store.search(user_embedding, top_n=candidate_pool)
+                    ]
+                else:
+                    similar_images = buscar_imagens_similares_com_embedding(
+                        user_embedding,
+                        self.image_metadata_df,
+                        top_n=candidate_pool,
+                        column_name="text_embedding_from_image_description"
+                    )
+                similar_by_path.update((img['img_path'], img) for img in similar_images)
+                return [(img['img_path'], img.get('cosine_score')) for img in similar_images]
+
+            # BM25 fused with the vector ranking (lexical only for exact room numbers)
+            retrieval, hits = hybrid_search(user_message, self.lexical_index, vector_search, top_n)
+
+            results = []
+            for img_path, scores in hits:
+                if img_path in similar_by_path:
+                    result = dict(similar_by_path[img_path])
+                else:
+                    result = self._image_result(img_path)
+                result.update(scores)
+                if retrieval != 'vector':
+                    result['retrieval'] = retrieval
+                results.append(result)
+
+            return results
         except Exception as e:
             print(f"❌ Error finding relevant images: {e}")
             return []
@@ -425,7 +831,9 @@ class AdvancedImageManager:
         if not self.is_initialized:
             return ""
 
-        relevant_images = self.find_relevant_images(user_message, top_n=2)
+        # Search a wider pool, then keep the most relevant region per floor plan
+        candidates = self.find_relevant_images(user_message, top_n=6 if self.tile_images else 2)
+        relevant_images = select_regions(candidates, top_n=2)
 
         if not relevant_images:
             return ""
@@ -434,9 +842,12 @@ class AdvancedImageManager:
         context += "Based on your query, I found the following relevant visual information:\n\n"
 
         for i, img_info in enumerate(relevant_images, 1):
-            context += f"**Image {i} ({img_info.get('original_filename', 'N/A')}):**\n"
+            if img_info.get('record_type') == 'tile':
+                context += f"**Image {i} ({img_info.get('original_filename', 'N/A')}, region {img_info.get('tile_box')}):**\n"
+            else:
+                context += f"**Image {i} ({img_info.get('original_filename', 'N/A')}):**\n"
             context += f"Description: {img_info.get('img_desc', 'N/A')}\n"
-            context += f"Relevance: {img_info.get('cosine_score', 0):.3f}\n\n"
+            context += f"Relevance: {img_info.get('relevance_score', img_info.get('cosine_score', 0)):.3f}\n\n"
 
         context += "Use this visual information to provide more precise and detailed directions."
         return context
@@ -480,6 +891,7 @@ class AdvancedImageManager:
 
             if self.image_metadata_df is not None and not self.image_metadata_df.empty:
                 self.save_cache()
+                self.build_search_indexes()
                 self.is_initialized = True
                 print(f"✅ {len(self.image_metadata_df)} images processed with updated embeddings")
                 return True
@@ -498,6 +910,9 @@ class AdvancedImageManager:
                 os.remove(self.cache_file)
                 print(f"✅ Cache removed: {self.cache_file}")
             self.image_metadata_df = None
+            self.lexical_index = None
+            self.description_store = None
+            self.records_by_path = {}
             self.is_initialized = False
             return True
         except Exception as e:
@@ -519,6 +934,11 @@ class AdvancedImageManager:
             "images_folder": self.images_folder,
             "cache_file": self.cache_file,
             "cache_exists": os.path.exists(self.cache_file),
+            "embedding_store": {
+                "mode": self.store_mode,
+                "vectors": len(self.description_store) if self.description_store is not None else 0,
+                "memory_bytes": self.description_store.memory_bytes() if self.description_store is not None else {}
+            },
             "rag_available": RAG_SYSTEM_AVAILABLE,
             "rag_models_initialized": rag_models_initialized if 'rag_models_initialized' in globals() else False
         }
@@ -530,29 +950,31 @@ def resolve_room_name(room_name: str) -> Optional[str]:
     Resolve a user-provided room name to the official room ID
     Handles aliases like "1003", "bathroom men", etc.
     """
-    if not building_m_config:
+    navigation_config = get_navigation_config()
+    if not navigation_config:
         return None
 
     # Normalize input
     normalized = room_name.lower().strip()
 
     # Check aliases
-    aliases = building_m_config.get('aliases', {})
+    aliases = navigation_config.get('aliases', {})
     if normalized in aliases:
         return aliases[normalized]
 
     # Try to match room ID directly
-    room_to_node = building_m_config.get('roomToNode', {})
+    room_to_node = navigation_config.get('roomToNode', {})
     if room_name in room_to_node:
         return room_name
 
-    return None
+    # Fuzzy match (typos, "M1003", "mens washroom"), only when confident
+    return get_room_index().resolve(room_name, ROOM_MATCH_THRESHOLD)
 
 def parse_navigation_request(user_message: str) -> Dict[str, Any]:
     """
     Parse navigation request from user message
     Uses Gemini to extract start and end locations
-    Returns dict with: {is_navigation, start, end, startNode, endNode, building, floor}
+    Returns dict with: {is_navigation, start, end, startNode, endNode, building, floor, profile}
     """
     if not model:
         return {'is_navigation': False}
@@ -561,7 +983,7 @@ def parse_navigation_request(user_message: str) -> Dict[str, Any]:
     nav_keywords = ['how', 'get', 'go', 'navigate', 'path', 'way', 'direction',
                     'from', 'to', 'reach', 'find', 'como', 'ir', 'chegar']
     message_lower = user_message.lower()
-    is_likely_nav = any(keyword in message_lower for keyword in nav_keywords)
+    is_likely_nav = any(keyword in message_lower for keyword in nav_keywords) or is_nearest_request(user_message)
 
     if not is_likely_nav:
         return {'is_navigation': False}
@@ -590,25 +1012,37 @@ def parse_navigation_request(user_message: str) -> Dict[str, Any]:
                 start_name = parsed.get('start')
                 end_name = parsed.get('end')
 
-                # Resolve room names
+                # Resolve room names; "nearest washroom" goes to the closest one from the start
                 start_room = resolve_room_name(start_name) if start_name else None
                 end_room = resolve_room_name(end_name) if end_name else None
+                category = detect_amenity(end_name or user_message) if is_nearest_request(user_message) else None
+                if start_room and category:
+                    profile = detect_profile(user_message) or DEFAULT_ROUTING_PROFILE
+                    nearest = find_nearest_amenity(start_room, category, profile)
+                    if nearest:
+                        end_room = nearest['room']
 
                 if start_room and end_room:
                     # Get node IDs
-                    room_to_node = building_m_config.get('roomToNode', {})
+                    room_to_node = get_navigation_config().get('roomToNode', {})
                     start_node = room_to_node.get(start_room)
                     end_node = room_to_node.get(end_room)
 
                     if start_node and end_node:
+                        campus_graph = get_campus_graph()
+                        start_location = (campus_graph.node_location(start_node) if campus_graph else None) or {}
+                        end_location = (campus_graph.node_location(end_node) if campus_graph else None) or {}
                         return {
                             'is_navigation': True,
                             'start': start_room,
                             'end': end_room,
                             'startNode': start_node,
                             'endNode': end_node,
-                            'building': 'M',
-                            'floor': 1,
+                            'building': start_location.get('building'),
+                            'floor': start_location.get('floor'),
+                            'endBuilding': end_location.get('building'),
+                            'endFloor': end_location.get('floor'),
+                            'profile': detect_profile(user_message) or DEFAULT_ROUTING_PROFILE,
                             'start_original': start_name,
                             'end_original': end_name
                         }
@@ -621,10 +1055,11 @@ def parse_navigation_request(user_message: str) -> Dict[str, Any]:
 
 def get_room_friendly_name(room_id: str) -> str:
     """Get human-friendly name for a room ID"""
-    if not building_m_config:
+    navigation_config = get_navigation_config()
+    if not navigation_config:
         return room_id
 
-    descriptions = building_m_config.get('roomDescriptions', {})
+    descriptions = navigation_config.get('roomDescriptions', {})
     return descriptions.get(room_id, room_id)
 
 def classify_user_intent(user_message: str) -> Dict[str, Any]:
@@ -971,7 +1406,12 @@ Event text:
         return {'error': str(e)}
 
 # Initialize image manager
-image_manager = AdvancedImageManager("images/")
+image_manager = AdvancedImageManager(
+    "images/",
+    tile_images=os.getenv("IMAGE_TILING", "false").lower() == "true",
+    store_mode=os.getenv("EMBEDDING_STORE_MODE", "int8"),
+    rescore_dir=os.getenv("EMBEDDING_RESCORE_DIR") or None
+)
 
 # Initialize automatic image updater
 auto_updater = AutoImageUpdater(image_manager, "images/")
@@ -984,17 +1424,124 @@ def index():
     # Use render_template to serve the HTML file from the 'templates' directory
     return render_template('index.html')
 
+@app.context_processor
+def inject_asset_urls():
+    """Versioned asset URLs for the templates: asset_url('static/script.js') and asset_urls([...])"""
+    return {
+        "asset_url": asset_store.url,
+        "asset_urls": lambda paths: {path: asset_store.url(path) for path in paths},
+    }
+
+def send_asset(prefix: str, path: str, version: Optional[str] = None):
+    """
+    Serve a file from one of the asset roots with a strong ETag per
+    representation, 304 on If-None-Match and the precompressed variant the
+    client accepts. Versioned URLs whose hash matches are cached forever;
+    everything else must be revalidated.
+    """
+    entry = asset_store.entry(prefix, path)
+    if entry is None:
+        abort(404)
+
+    file_path, encoding = asset_store.variant(entry, request.headers.get("Accept-Encoding", ""))
+    etag = asset_store.etag(entry, encoding)
+    cache_control = IMMUTABLE_CACHE_CONTROL if version == entry["hash"] else "no-cache"
+
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        response = send_file(file_path, mimetype=mimetype, download_name=os.path.basename(path),
+                             conditional=False, etag=False, max_age=None)
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+@app.route('/assets/<version>/<prefix>/<path:path>')
+def send_versioned_asset(version, prefix, path):
+    return send_asset(prefix, path, version)
+
 @app.route('/LeafletJS/<path:path>')
 def send_leaflet(path):
-    return send_from_directory('LeafletJS', path)
+    return send_asset('LeafletJS', path)
 
 @app.route('/tools/<path:path>')
 def send_tools(path):
-    return send_from_directory('tools', path)
+    return send_asset('tools', path)
 
 @app.route('/map/<path:path>')
 def send_map(path):
-    return send_from_directory('map', path)
+    return send_asset('map', path)
+
+@app.route("/api/map/campus", methods=['GET'])
+def api_map_campus():
+    """
+    Manifest of the campus map layers (one per zoom band)
+    Returns: {version, source, sourceBytes, bands: [{name, minZoom, maxZoom, url, bytes, gzipBytes, tolerance_m}],
+              featureBounds: {name: [west, south, east, north]}}
+    """
+    map_layers_manifest = get_map_layers()
+    if map_layers_manifest is None:
+        return jsonify({"error": "Map layers not available"}), 500
+
+    bands = [{**band, "url": f"/api/map/campus/{map_layers_manifest['version']}/{band['name']}"}
+             for band in map_layers_manifest["bands"]]
+    response = jsonify({**map_layers_manifest, "bands": bands})
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+@app.route("/api/map/campus/<version>/<band>", methods=['GET'])
+def api_map_campus_layer(version, band):
+    """Serve one campus layer; versioned URLs are immutable and sent pre-compressed when accepted"""
+    map_layers_manifest = get_map_layers()
+    if map_layers_manifest is None or version != map_layers_manifest["version"]:
+        return jsonify({"error": "Unknown map layer version"}), 404
+    filename = band_file(map_layers_manifest, band)
+    if filename is None:
+        return jsonify({"error": f"Unknown zoom band: {band}"}), 404
+
+    use_gzip = bool(request.accept_encodings["gzip"])
+    response = send_from_directory(MAP_LAYERS_DIR, f"{filename}.gz" if use_gzip else filename,
+                                   mimetype="application/json", max_age=31536000)
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+@app.route("/api/navigation/bundle", methods=['GET'])
+def api_navigation_bundle():
+    """
+    Manifest of the compiled navigation bundle
+    Returns: {version, url, bytes, gzipBytes, stats, errors, warnings}
+    """
+    get_campus_graph()
+    if navigation_bundle_manifest is None:
+        return jsonify({"error": "Navigation bundle not available"}), 500
+
+    response = jsonify({**navigation_bundle_manifest,
+                        "url": f"/api/navigation/bundle/{navigation_bundle_manifest['version']}"})
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+@app.route("/api/navigation/bundle/<version>", methods=['GET'])
+def api_navigation_bundle_version(version):
+    """Serve the navigation bundle; versioned URLs are immutable and sent pre-compressed when accepted"""
+    if navigation_bundle_manifest is None or version != navigation_bundle_manifest["version"]:
+        return jsonify({"error": "Unknown navigation bundle version"}), 404
+
+    filename = navigation_bundle_manifest["file"]
+    use_gzip = bool(request.accept_encodings["gzip"])
+    response = send_from_directory(NAVIGATION_BUNDLE_DIR, f"{filename}.gz" if use_gzip else filename,
+                                   mimetype="application/json", max_age=31536000)
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
 
 @app.route("/chat", methods=['POST'])
 def chat():
@@ -1016,6 +1563,10 @@ def chat():
         if intent_type == "NAVIGATION":
             # Handle navigation queries
             nav_result = parse_navigation_request(user_message)
+            try:
+                profile = normalize_profile(request.json.get("profile") or nav_result.get('profile'))
+            except ValueError as e:
+                return jsonify({"reply": str(e)}), 400
 
             # Get image context if available
             image_context = image_manager.get_image_context_for_prompt(user_message)
@@ -1041,12 +1592,15 @@ def chat():
                     "reply": html_response,
                     "mapAction": {
                         "type": "SHOW_ROUTE",
-                        "building": "M",
-                        "floor": 1,
+                        "building": nav_result['building'],
+                        "floor": nav_result['floor'],
+                        "endBuilding": nav_result['endBuilding'],
+                        "endFloor": nav_result['endFloor'],
                         "startRoom": nav_result['start'],
                         "endRoom": nav_result['end'],
                         "startNode": nav_result['startNode'],
-                        "endNode": nav_result['endNode']
+                        "endNode": nav_result['endNode'],
+                        "profile": profile
                     }
                 })
             else:
@@ -1090,6 +1644,14 @@ def system_status():
         "rag_system": "available" if RAG_SYSTEM_AVAILABLE else "not_available",
         "image_manager": image_manager.get_status(),
         "auto_monitoring": auto_updater.get_status(),
+        "route_geometry_cache": campus_graph.geometry.cache_info() if campus_graph else None,
+        "alternative_routes_cache": (alternative_routes_cache[1].cache_info()
+                                     if alternative_routes_cache[1] else None),
+        "isochrone_cache": isochrone_service_cache[1].cache_info() if isochrone_service_cache[1] else None,
+        "graph_version": campus_graph.version if campus_graph else None,
+        "active_closures": len(graph_editor_cache[1].active_closures()) if graph_editor_cache[1] else 0,
+        "building_config_version": config_store.version,
+        "navigation_bundle_version": navigation_bundle_manifest["version"] if navigation_bundle_manifest else None,
         "environment": {
             "gemini_api_key": "set" if os.getenv("GEMINI_API_KEY") else "not_set",
             "google_cloud_project": "set" if os.getenv("GOOGLE_CLOUD_PROJECT_ID") else "not_set"
@@ -1402,36 +1964,65 @@ def api_parse_navigation():
     result = parse_navigation_request(data['message'])
     return jsonify(result)
 
+def snap_position_to_room(position: Optional[Dict[str, Any]], floor_key: Optional[str] = None) -> Optional[str]:
+    """Returns the room at (or nearest to) a {lat, lng} map position"""
+    snapper = get_location_snapper()
+    if not position or snapper is None:
+        return None
+    try:
+        result = snapper.snap(float(position['lng']), float(position['lat']), floor_key)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return result['room']['id'] if result and result['room'] else None
+
 @app.route("/api/navigation/from-clicks", methods=['POST'])
 def api_navigation_from_clicks():
     """
     Handle navigation request from map clicks
-    Receives: {startRoom, endRoom, building, floor}
-    Returns: {reply, path}
+    Receives: {startRoom, endRoom, building, floor, profile}
+              (startPosition/endPosition {lat, lng} may replace a room; it is snapped to the nearest room;
+              endAmenity, e.g. "washroom", may replace endRoom: the nearest one from the start is used)
+    Returns: {reply, startRoom, endRoom, startNode, endNode, profile}
     """
     if model is None:
         return jsonify({"error": "AI model not configured"}), 500
 
     try:
-        data = request.json
-        if not data or not data.get('startRoom') or not data.get('endRoom'):
-            return jsonify({"error": "startRoom and endRoom required"}), 400
-
-        start_room = data.get('startRoom')
-        end_room = data.get('endRoom')
+        data = request.json or {}
+        floor_key = f"{data['building']}{data['floor']}".upper() if data.get('building') and data.get('floor') else None
+        start_room = data.get('startRoom') or snap_position_to_room(data.get('startPosition'), floor_key)
+        end_room = data.get('endRoom') or snap_position_to_room(data.get('endPosition'), floor_key)
+        try:
+            profile = normalize_profile(data.get('profile'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if start_room and not end_room and data.get('endAmenity'):
+            nearest = find_nearest_amenity(start_room, detect_amenity(data['endAmenity']) or data['endAmenity'], profile)
+            end_room = nearest['room'] if nearest else None
+        if not start_room or not end_room:
+            return jsonify({"error": "startRoom and endRoom (or startPosition and endPosition) required"}), 400
 
         # Get friendly names
         start_friendly = get_room_friendly_name(start_room)
         end_friendly = get_room_friendly_name(end_room)
 
-        # Create navigation message for Gemini
-        nav_message = f"Give me walking directions from {start_friendly} to {end_friendly} in Building M Floor 1."
-
         # Parse to get path nodes (optional, for reference)
-        room_to_node = building_m_config.get('roomToNode', {})
+        room_to_node = get_navigation_config().get('roomToNode', {})
         start_node = room_to_node.get(start_room)
         end_node = room_to_node.get(end_room)
 
+        # Create navigation message for Gemini
+        campus_graph = get_campus_graph()
+        location = (campus_graph.node_location(start_node) if campus_graph and start_node else None) or {
+            'building': data.get('building', 'M'), 'floor': data.get('floor', 1)
+        }
+        nav_message = (f"Give me walking directions from {start_friendly} to {end_friendly} "
+                       f"in Building {location['building']} Floor {location['floor']}.")
+        if profile == 'step-free':
+            nav_message += " The route must be step-free (no stairs); use elevators and ramps."
+        elif profile == 'elevator-preferred':
+            nav_message += " Prefer elevators over stairs."
+
         # Get image context if available
         image_context = image_manager.get_image_context_for_prompt(nav_message)
 
@@ -1451,60 +2042,601 @@ def api_navigation_from_clicks():
             "startRoom": start_room,
             "endRoom": end_room,
             "startNode": start_node,
-            "endNode": end_node
+            "endNode": end_node,
+            "profile": profile
         })
 
     except Exception as e:
         print(f"Error in navigation from clicks: {e}")
         return jsonify({"error": str(e)}), 500
 
+def parse_zoom(value: Any) -> Optional[float]:
+    """Map zoom of a request (None for full detail); raises ValueError outside the tile zoom range"""
+    if value is None:
+        return None
+    zoom = float(value)
+    if not MIN_MAP_ZOOM <= zoom <= MAX_MAP_ZOOM:
+        raise ValueError(f"zoom must be between {MIN_MAP_ZOOM} and {MAX_MAP_ZOOM}")
+    return zoom
+
+@app.route("/api/navigation/route", methods=['GET', 'POST'])
+def api_navigation_route():
+    """
+    Compute the shortest route between two rooms or corridor nodes
+    Receives: {start, end, profile, zoom} (JSON body or query string; room names, aliases or node IDs;
+              profile is one of /api/navigation/profiles, default "default";
+              zoom is the map zoom (0-24) the geometry is simplified for, default full detail)
+    Returns: {start, end, startNode, endNode, profile, building, floor, path, distance_m, cost, legs, transfers,
+              geometry} (distance_m in meters, cost the profile-weighted length the route minimizes)
+    """
+    campus_graph = get_campus_graph()
+    if campus_graph is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+
+    data = request.get_json(silent=True) or request.args
+    start_name = data.get('start')
+    end_name = data.get('end')
+    if not start_name or not end_name:
+        return jsonify({"error": "start and end required"}), 400
+    try:
+        profile = normalize_profile(data.get('profile'))
+        zoom = parse_zoom(data.get('zoom'))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    start = resolve_room_name(start_name) or start_name
+    end = resolve_room_name(end_name) or end_name
+
+    unknown = [name for name in (start, end) if campus_graph.resolve(name) is None]
+    if unknown:
+        return jsonify({"error": f"Unknown location: {', '.join(unknown)}"}), 404
+
+    route = campus_graph.route(start, end, profile, zoom)
+    if route is None:
+        untraced = [campus_graph.room_to_node.get(name, name) for name in (start, end)
+                    if campus_graph.room_to_node.get(name, name) not in campus_graph]
+        message = "No route found between these locations"
+        if untraced:
+            message += f" (corridor segments not traced yet for: {', '.join(untraced)})"
+        elif profile != DEFAULT_ROUTING_PROFILE:
+            message += f" for the '{profile}' profile"
+        return jsonify({"error": message}), 404
+
+    return jsonify(route)
+
+@app.route("/api/navigation/routes:batch", methods=['POST'])
+def api_navigation_routes_batch():
+    """
+    Compute many routes at once, one shortest-path search per (profile, start)
+    Receives: {routes: [{start, end, profile?} or [start, end, profile?]], profile?, stream?}
+              (profile is the default for the routes that do not name one; with stream=true or
+              Accept: application/x-ndjson the results are streamed as NDJSON while they are computed)
+    Returns: {results: [{index, start, end, profile, path, distance_m, cost} or {index, start, end, error}],
+              sources, routes} ordered by index; the NDJSON stream ends with a {summary} line
+    """
+    campus_graph = get_campus_graph()
+    if campus_graph is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+
+    data = request.get_json(silent=True) or {}
+    items = data.get('routes')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "routes must be a non-empty list"}), 400
+    if len(items) > ROUTE_BATCH_MAX:
+        return jsonify({"error": f"At most {ROUTE_BATCH_MAX} routes per batch"}), 413
+    try:
+        default_profile = normalize_profile(data.get('profile') or DEFAULT_ROUTING_PROFILE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = route_batch(campus_graph, items, default_profile, resolve_room_name)
+
+    def summary(computed: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+        routed = [r for r in computed if "path" in r]
+        return {"routes": len(computed), "found": len(routed),
+                "sources": len({(r["profile"], r["path"][0]) for r in routed}),
+                "elapsed_ms": round((time.time() - started) * 1000, 1)}
+
+    stream = data.get('stream') or "application/x-ndjson" in request.headers.get("Accept", "")
+    if stream:
+        def generate():
+            started, computed = time.time(), []
+            for result in results:
+                computed.append(result)
+                yield json.dumps(result) + "\n"
+            yield json.dumps({"summary": summary(computed, started)}) + "\n"
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    started = time.time()
+    computed = sorted(results, key=lambda result: result["index"])
+    return jsonify({"results": computed, **summary(computed, started)})
+
+@app.route("/api/navigation/alternatives", methods=['GET', 'POST'])
+def api_navigation_alternatives():
+    """
+    Compute up to k alternative routes between two locations (k shortest loopless paths)
+    Receives: {start, end, k, profile, maxOverlap, zoom} (JSON body or query string; k defaults to 3;
+              maxOverlap is the largest share of a route's length it may have in common with a shorter
+              route, default 0.7, 1 allows any overlap)
+    Returns: {start, end, startNode, endNode, profile, routes: [{rank, path, distance_m, cost, extra_m, overlap,
+              geometry}]}, lowest cost first (extra_m: meters longer than the first route)
+    """
+    service = get_alternative_routes()
+    if service is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+
+    data = request.get_json(silent=True) or request.args
+    start_name, end_name = data.get('start'), data.get('end')
+    if not start_name or not end_name:
+        return jsonify({"error": "start and end required"}), 400
+    try:
+        profile = normalize_profile(data.get('profile'))
+        k = int(data.get('k', 3))
+        max_overlap = float(data.get('maxOverlap', DEFAULT_MAX_OVERLAP))
+        zoom = parse_zoom(data.get('zoom'))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    if not 1 <= k <= ALTERNATIVE_ROUTES_MAX_K:
+        return jsonify({"error": f"k must be between 1 and {ALTERNATIVE_ROUTES_MAX_K}"}), 400
+    if not 0 <= max_overlap <= 1:
+        return jsonify({"error": "maxOverlap must be between 0 and 1"}), 400
+
+    campus_graph = service.campus
+    start = resolve_room_name(start_name) or start_name
+    end = resolve_room_name(end_name) or end_name
+    start_node, end_node = campus_graph.resolve(start), campus_graph.resolve(end)
+    unknown = [name for name, node in ((start, start_node), (end, end_node)) if node is None]
+    if unknown:
+        return jsonify({"error": f"Unknown location: {', '.join(unknown)}"}), 404
+
+    routes = service.find(start_node, end_node, k, profile, max_overlap)
+    if not routes:
+        return jsonify({"error": "No route found between these locations"}), 404
+
+    shortest = routes[0]["distance_m"]
+    return jsonify({
+        "start": start,
+        "end": end,
+        "startNode": start_node,
+        "endNode": end_node,
+        "profile": profile,
+        "routes": [{
+            "rank": rank,
+            **route,
+            "extra_m": round(route["distance_m"] - shortest, 2),
+            "geometry": {"type": "LineString",
+                         "coordinates": campus_graph.geometry.geometry(route["path"], zoom)["coordinates"]},
+        } for rank, route in enumerate(routes, 1)]
+    })
+
+@app.route("/api/navigation/multi-stop", methods=['POST'])
+def api_navigation_multi_stop():
+    """
+    Plan one route from a start through several stops in the shortest visiting order
+    Receives: {start, stops: [...], end?, profile, zoom} (room names, aliases or node IDs; the stops are
+              visited in any order, end, if given, last)
+    Returns: {start, stops, end, profile, order: [stop names in visiting order], method, distance_m, cost,
+              legs: [{from, to, fromNode, toNode, path, distance_m, cost}], path, geometry}
+    """
+    campus_graph = get_campus_graph()
+    if campus_graph is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+
+    data = request.get_json(silent=True) or {}
+    start_name, stop_names, end_name = data.get('start'), data.get('stops'), data.get('end')
+    if not start_name or not isinstance(stop_names, list) or not stop_names:
+        return jsonify({"error": "start and a non-empty stops list required"}), 400
+    if len(stop_names) > MULTI_STOP_MAX:
+        return jsonify({"error": f"At most {MULTI_STOP_MAX} stops per route"}), 413
+    try:
+        profile = normalize_profile(data.get('profile'))
+        zoom = parse_zoom(data.get('zoom'))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    names = [start_name, *stop_names] + ([end_name] if end_name else [])
+    resolved = [resolve_room_name(str(name)) or str(name) for name in names]
+    nodes = [campus_graph.resolve(name) for name in resolved]
+    unknown = [name for name, node in zip(resolved, nodes) if node is None]
+    if unknown:
+        return jsonify({"error": f"Unknown location: {', '.join(unknown)}"}), 404
+
+    try:
+        plan = plan_multi_stop(campus_graph, nodes[0], nodes[1:len(stop_names) + 1],
+                               nodes[-1] if end_name else None, profile)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+
+    # Name each leg by the locations it joins, following the visiting order
+    visited = [0] + [i + 1 for i in plan["order"]] + ([len(names) - 1] if end_name else [])
+    legs = [{"from": resolved[a], "to": resolved[b], "fromNode": leg["from"], "toNode": leg["to"],
+             "path": leg["path"], "distance_m": leg["distance_m"], "cost": leg["cost"]}
+            for (a, b), leg in zip(zip(visited, visited[1:]), plan["legs"])]
+
+    return jsonify({
+        "start": resolved[0],
+        "stops": resolved[1:len(stop_names) + 1],
+        "end": resolved[-1] if end_name else None,
+        "profile": profile,
+        "order": [resolved[i + 1] for i in plan["order"]],
+        "method": plan["method"],
+        "distance_m": plan["distance_m"],
+        "cost": plan["cost"],
+        "legs": legs,
+        "path": plan["path"],
+        "geometry": {"type": "LineString",
+                     "coordinates": campus_graph.geometry.geometry(plan["path"], zoom)["coordinates"]},
+    })
+
+@app.route("/api/navigation/isochrone", methods=['GET', 'POST'])
+def api_navigation_isochrone():
+    """
+    Everything within a few minutes' walk of a location, as GeoJSON bands
+    Receives: {from, thresholds, profile} (JSON body or query string; from is a room name or node ID,
+              thresholds the band limits in seconds as a list or comma-separated, default 60,120,300)
+    Returns: {from, fromNode, profile, speed_m_s, thresholds, isochrone: FeatureCollection of
+              MultiLineString bands {band, minSeconds, maxSeconds, building, floor} with
+              rooms: [{room, node, seconds}]}
+    """
+    service = get_isochrone_service()
+    if service is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+
+    data = request.get_json(silent=True) or request.args
+    origin_name = data.get('from')
+    if not origin_name:
+        return jsonify({"error": "from required"}), 400
+    try:
+        profile = normalize_profile(data.get('profile'))
+        thresholds = data.get('thresholds') or list(DEFAULT_THRESHOLDS_S)
+        if isinstance(thresholds, str):
+            thresholds = thresholds.split(",")
+        thresholds = sorted({float(threshold) for threshold in thresholds})
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    if not all(math.isfinite(threshold) and 0 < threshold <= ISOCHRONE_MAX_SECONDS for threshold in thresholds):
+        return jsonify({"error": f"thresholds must be between 0 and {ISOCHRONE_MAX_SECONDS:g} seconds"}), 400
+
+    origin = resolve_room_name(origin_name) or origin_name
+    origin_node = service.campus.resolve(origin)
+    if origin_node is None:
+        return jsonify({"error": f"Unknown location: {origin}"}), 404
+
+    return jsonify({
+        "from": origin,
+        "fromNode": origin_node,
+        "profile": profile,
+        "speed_m_s": service.speed_m_per_s,
+        "thresholds": thresholds,
+        "isochrone": service.isochrone(origin_node, thresholds, profile),
+    })
+
+@app.route("/api/navigation/graph/edits", methods=['POST'])
+def api_navigation_graph_edits():
+    """
+    Add, remove or reweight corridor edges at runtime (route tables are repaired incrementally)
+    Receives: {edits: [{op: "add"|"remove"|"reweight", start, end, weight?, coordinates?, segmentType?}]}
+              (applied in order; add needs a weight or [[lng, lat], ...] coordinates unless both nodes
+              have positions, and at most one new node, which joins the other node's floor)
+    Returns: {version, elapsed_ms, results: [{op, start, end, version, columnsRecomputed, elapsed_ms}]}
+    """
+    editor = get_graph_editor()
+    if editor is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+
+    data = request.get_json(silent=True) or {}
+    edits = data.get('edits')
+    if not isinstance(edits, list) or not edits or not all(isinstance(edit, dict) for edit in edits):
+        return jsonify({"error": "A non-empty edits list required"}), 400
+
+    started = time.perf_counter()
+    results = []
+    for position, edit in enumerate(edits):
+        op, start, end = edit.get('op'), edit.get('start'), edit.get('end')
+        try:
+            if not start or not end:
+                raise ValueError("start and end required")
+            if op == "add":
+                properties = {"segmentType": edit['segmentType']} if edit.get('segmentType') else {}
+                weight = float(edit['weight']) if edit.get('weight') is not None else None
+                result = editor.add_edge(start, end, weight, edit.get('coordinates'), **properties)
+            elif op == "remove":
+                result = editor.remove_edge(start, end)
+            elif op == "reweight":
+                result = editor.set_weight(start, end, float(edit.get('weight')))
+            else:
+                raise ValueError(f"Unknown op '{op}', use add, remove or reweight")
+        except (TypeError, ValueError) as e:
+            # Earlier edits stay applied: report how far the batch got
+            return jsonify({"error": f"Edit {position}: {e}", "applied": results}), 400
+        results.append({"op": op, "start": start, "end": end, **result})
+
+    print(f"✏️  Applied {len(results)} graph edit(s), graph version {editor.campus.version}")
+    return jsonify({"version": editor.campus.version,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+                    "results": results})
+
+@app.route("/api/navigation/closures", methods=['GET', 'POST'])
+def api_navigation_closures():
+    """
+    List or add temporary edge closures (construction, events); they reopen by themselves
+    Receives (POST): {start, end, minutes or until (epoch seconds), reason}
+    Returns: GET {version, closures: [{id, start, end, until, reason, type}]};
+             POST the closure with {version, columnsRecomputed, elapsed_ms}
+    """
+    editor = get_graph_editor()
+    if editor is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+    if request.method == 'GET':
+        return jsonify({"version": editor.campus.version, "closures": editor.active_closures()})
+
+    data = request.get_json(silent=True) or {}
+    start, end = data.get('start'), data.get('end')
+    if not start or not end:
+        return jsonify({"error": "start and end required"}), 400
+    try:
+        if data.get('until') is not None:
+            until = float(data['until'])
+        elif data.get('minutes') is not None:
+            until = time.time() + float(data['minutes']) * 60
+        else:
+            raise ValueError("minutes or until required")
+        if until - time.time() > CLOSURE_MAX_HOURS * 3600:
+            raise ValueError(f"Closures last at most {CLOSURE_MAX_HOURS:g} hours")
+        closure = editor.close(start, end, until, str(data.get('reason') or ""))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    print(f"🚧 Closed {start} ↔ {end} until {time.strftime('%Y-%m-%d %H:%M', time.localtime(until))}")
+    return jsonify(closure), 201
+
+@app.route("/api/navigation/closures/<closure_id>", methods=['DELETE'])
+def api_navigation_closure_reopen(closure_id):
+    """
+    Reopen a closed edge before its closure ends
+    Returns: the closure with {version, columnsRecomputed, elapsed_ms}
+    """
+    editor = get_graph_editor()
+    if editor is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+    try:
+        closure = editor.reopen(closure_id)
+    except KeyError:
+        return jsonify({"error": f"Unknown closure: {closure_id}"}), 404
+    print(f"✅ Reopened {closure['start']} ↔ {closure['end']}")
+    return jsonify(closure)
+
+@app.route("/api/navigation/nearest", methods=['GET', 'POST'])
+def api_navigation_nearest():
+    """
+    Find the nearest amenity (washroom, exit, elevator, stairs, entrance) from a location
+    Receives: {from, category, profile} (JSON body or query string; from is a room name or node ID,
+              category a category name or free text such as "accessible washroom")
+    Returns: {from, fromNode, category, room, node, distance_m, cost, path, profile}
+    """
+    index = get_amenity_index()
+    if index is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+
+    data = request.get_json(silent=True) or request.args
+    start_name = data.get('from')
+    category_name = data.get('category')
+    if not start_name or not category_name:
+        return jsonify({"error": "from and category required"}), 400
+    if not isinstance(start_name, str) or not isinstance(category_name, str):
+        return jsonify({"error": "from and category must be strings"}), 400
+    try:
+        profile = normalize_profile(data.get('profile'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    category = category_name if category_name in index.instances else detect_amenity(category_name)
+    if category not in index.instances:
+        return jsonify({"error": f"Unknown amenity '{category_name}'. Use one of {sorted(index.instances)}"}), 400
+
+    start = resolve_room_name(start_name) or start_name
+    start_node = index.campus.resolve(start)
+    if start_node is None or start_node not in index.campus:
+        return jsonify({"error": f"Unknown location: {start_name}"}), 404
+
+    nearest = index.nearest(start_node, category, profile)
+    if nearest is None:
+        return jsonify({"error": f"No reachable {category} from {start_name}"}), 404
+    return jsonify({"from": start, "fromNode": start_node, "profile": profile, **nearest})
+
+@app.route("/api/navigation/amenities", methods=['GET'])
+def api_navigation_amenities():
+    """List the amenity categories and the rooms tagged with them"""
+    index = get_amenity_index()
+    if index is None:
+        return jsonify({"error": "Navigation graph not loaded"}), 500
+    return jsonify({"categories": index.categories()})
+
+@app.route("/api/navigation/profiles", methods=['GET'])
+def api_navigation_profiles():
+    """List the routing profiles accepted by the navigation endpoints"""
+    return jsonify({
+        "default": DEFAULT_ROUTING_PROFILE,
+        "profiles": {name: settings["description"] for name, settings in ROUTING_PROFILES.items()}
+    })
+
+@app.route("/api/navigation/snap", methods=['GET', 'POST'])
+def api_navigation_snap():
+    """
+    Snap a map position to the nearest corridor node and room
+    Receives: {lat, lng, floor?, building?, maxDistance?} (JSON body or query string;
+              floor is a floor key such as "M1", or a floor number together with building)
+    Returns: {lat, lng, floor, node, room} where node/room carry id, distance_m and inside
+    """
+    snapper = get_location_snapper()
+    if snapper is None:
+        return jsonify({"error": "Snap index not loaded"}), 500
+
+    data = request.get_json(silent=True) or request.args
+    try:
+        lat = float(data.get('lat'))
+        lng = float(data.get('lng'))
+        max_distance = float(data['maxDistance']) if data.get('maxDistance') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "lat and lng must be numbers"}), 400
+    if not all(math.isfinite(value) for value in (lat, lng, max_distance) if value is not None):
+        return jsonify({"error": "lat and lng must be numbers"}), 400
+
+    floor_key = data.get('floor')
+    if floor_key is not None and data.get('building'):
+        floor_key = f"{str(data.get('building')).upper()}{floor_key}"
+    if floor_key is not None:
+        floor_key = str(floor_key).upper()
+
+    result = snapper.snap(lng, lat, floor_key, max_distance)
+    if result is None:
+        return jsonify({"error": "No node or room found near this position"}), 404
+
+    return jsonify({"lat": lat, "lng": lng, **result})
+
 @app.route("/api/navigation/rooms", methods=['GET'])
 def api_get_rooms():
-    """Get list of all rooms in Building M with descriptions"""
-    if not building_m_config:
-        return jsonify({"error": "Building M configuration not loaded"}), 500
+    """Get list of all rooms with their node, building and description"""
+    navigation_config = get_navigation_config()
+    if not navigation_config:
+        return jsonify({"error": "Room configuration not loaded"}), 500
 
     rooms_data = {}
-    room_to_node = building_m_config.get('roomToNode', {})
-    descriptions = building_m_config.get('roomDescriptions', {})
+    room_to_node = navigation_config.get('roomToNode', {})
+    descriptions = navigation_config.get('roomDescriptions', {})
+    room_buildings = navigation_config.get('roomBuilding', {})
 
     for room_id, node_id in room_to_node.items():
         rooms_data[room_id] = {
             "node": node_id,
+            "building": room_buildings.get(room_id),
             "description": descriptions.get(room_id, room_id)
         }
 
     return jsonify(rooms_data)
 
+@app.route("/api/navigation/rooms/search", methods=['GET'])
+def api_search_rooms():
+    """
+    Fuzzy room name search
+    Query: ?q=mens washroom&limit=5
+    Returns: {query, resolved, candidates: [{room, score, name, source, description}]}
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', 5)), 20))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    index = get_room_index()
+    candidates = index.search(query, limit)
+    for candidate in candidates:
+        candidate["description"] = get_room_friendly_name(candidate["room"])
+
+    return jsonify({
+        "query": query,
+        "resolved": index.resolve(query, ROOM_MATCH_THRESHOLD),
+        "candidates": candidates
+    })
+
+@app.route("/api/navigation/floorplans", methods=['GET'])
+def api_navigation_floorplans():
+    """
+    Precomputed room geometry of the floor plan SVGs
+    Returns: {version, floors: {floor_key: {svg, bearing, viewBox, corners, transform: {kind, matrix, inverse},
+              rooms: {id: {center, manual, latlng, bbox, centroid, polygon}}, nodes: {id: {svg, latlng}}}}}
+              (ETag is the version; revalidate with If-None-Match)
+    """
+    index = get_floor_plan_index()
+    if index is None:
+        return jsonify({"error": "Floor plan index not available"}), 500
+
+    etag = f'"{index["version"]}"'
+    if etag in request.headers.get("If-None-Match", ""):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(index)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+@app.route("/api/navigation/transform", methods=['POST'])
+def api_navigation_transform():
+    """
+    Converts points between a floor plan's SVG coordinates and the map
+    Receives: {floor, points: [[x, y] or [lat, lng], ...], to: "latlng" | "svg"}
+    Returns: {floor, to, kind, points: [[lat, lng] or [x, y], ...]}
+    """
+    data = request.get_json(silent=True) or {}
+    floor, points, target = data.get("floor"), data.get("points"), data.get("to", "latlng")
+    if target not in ("latlng", "svg"):
+        return jsonify({"error": "to must be 'latlng' or 'svg'"}), 400
+    if not isinstance(points, list) or not all(isinstance(p, (list, tuple)) and len(p) == 2 for p in points):
+        return jsonify({"error": "points must be a list of [a, b] pairs"}), 400
+    if not isinstance(floor, str):
+        return jsonify({"error": "floor must be a floor key such as 'M1'"}), 400
+
+    index = get_floor_plan_index()
+    plan = (index or {}).get("floors", {}).get(floor)
+    if plan is None:
+        return jsonify({"error": f"Unknown floor plan: {floor}"}), 404
+
+    transform = PlanTransform.from_dict(plan["transform"])
+    try:
+        if not points:
+            converted = []
+        elif target == "latlng":
+            converted = [[lat, lng] for lng, lat in transform.to_lnglat(points).tolist()]
+        else:
+            converted = transform.to_svg([(lng, lat) for lat, lng in points]).tolist()
+    except (TypeError, ValueError):
+        return jsonify({"error": "points must be numbers"}), 400
+    return jsonify({"floor": floor, "to": target, "kind": transform.kind, "points": converted})
+
 @app.route("/api/navigation/room-centers", methods=['GET'])
 def api_get_room_centers():
-    """Get manual room center coordinates for Building M"""
-    if not building_m_config:
-        return jsonify({"error": "Building M configuration not loaded"}), 500
+    """
+    Get manual room center coordinates (the config version is sent in X-Config-Version)
+    Returns: {room_id: {x, y, floor?, lat?, lng?}} (map coordinates from the floor plan index)
+    """
+    snapshot = config_store.snapshot()
+    if not snapshot.configs:
+        return jsonify({"error": "Room configuration not loaded"}), 500
 
-    room_centers = building_m_config.get('roomCentersSVG', {})
+    room_centers = snapshot.merged.get('roomCentersSVG', {})
 
     # Filter out comment fields
-    filtered_centers = {k: v for k, v in room_centers.items() if not k.startswith('_')}
+    filtered_centers = {k: dict(v) for k, v in room_centers.items() if not k.startswith('_') and isinstance(v, dict)}
 
-    return jsonify(filtered_centers)
+    # Add the map coordinates, converted once per floor when the index was built
+    index = get_floor_plan_index()
+    for floor, plan in sorted((index or {}).get("floors", {}).items()):
+        for room_id, center in filtered_centers.items():
+            room = plan["rooms"].get(room_id)
+            if room is not None and room.get("manual") and "floor" not in center:
+                center.update(floor=floor, lat=room["latlng"][0], lng=room["latlng"][1])
+
+    response = jsonify(filtered_centers)
+    response.headers["X-Config-Version"] = str(snapshot.version)
+    return response
 
 @app.route("/api/navigation/room-centers/reload", methods=['POST'])
 def reload_room_centers():
     """Reload room centers from config file without restarting server"""
-    global building_m_config
     try:
-        config_path = Path('config/building_m_rooms.json')
-        with open(config_path, 'r') as f:
-            building_m_config = json.load(f)['Building M']
+        # Subscribers rebuild the campus graph if room mappings or transfers changed
+        snapshot = config_store.reload()
 
-        room_count = len(building_m_config.get('roomCentersSVG', {}))
-        print(f"✅ Room centers reloaded: {room_count} coordinates loaded")
+        room_count = len(snapshot.merged.get('roomCentersSVG', {}))
+        print(f"✅ Room centers reloaded: {room_count} coordinates loaded (config v{snapshot.version})")
 
         return jsonify({
             "status": "success",
             "message": "Room centers reloaded successfully",
-            "room_count": room_count
+            "room_count": room_count,
+            "version": snapshot.version
         })
     except Exception as e:
         print(f"❌ Error reloading room centers: {e}")
@@ -1515,8 +2647,11 @@ def reload_room_centers():
 
 @app.route("/api/navigation/room-centers/update", methods=['POST'])
 def update_room_centers():
-    """Update room center coordinates in the configuration file"""
-    global building_m_config
+    """
+    Update room center coordinates in the configuration file
+    Send the X-Config-Version from GET /api/navigation/room-centers to reject
+    the update (409) if someone else changed the config in the meantime
+    """
     try:
         data = request.get_json()
         if not data:
@@ -1551,33 +2686,25 @@ def update_room_centers():
                 "invalid_rooms": invalid_rooms
             }), 400
 
-        # Update in-memory config
-        if 'roomCentersSVG' not in building_m_config:
-            building_m_config['roomCentersSVG'] = {}
+        expected_version = request.headers.get("X-Config-Version")
+        if expected_version is not None and not expected_version.isdigit():
+            return jsonify({"status": "error", "message": "X-Config-Version must be an integer"}), 400
 
-        for room_id, coords in data.items():
-            building_m_config['roomCentersSVG'][room_id] = {
-                'x': coords['x'],
-                'y': coords['y']
-            }
-
-        # Write to file
-        config_path = Path('config/building_m_rooms.json')
-        with open(config_path, 'r') as f:
-            full_config = json.load(f)
-
-        full_config['Building M']['roomCentersSVG'].update(data)
-
-        with open(config_path, 'w') as f:
-            json.dump(full_config, f, indent=2)
+        # Each room is written atomically to its building's config file (new rooms go to the first building)
+        try:
+            snapshot = config_store.update_room_centers(
+                data, int(expected_version) if expected_version is not None else None)
+        except ConfigVersionConflict as e:
+            return jsonify({"status": "error", "message": str(e), "version": config_store.version}), 409
 
         updated_count = len(data)
-        print(f"✅ Updated {updated_count} room coordinates successfully")
+        print(f"✅ Updated {updated_count} room coordinates successfully (config v{snapshot.version})")
 
         return jsonify({
             "status": "success",
             "message": f"Updated {updated_count} room coordinates",
-            "updated_count": updated_count
+            "updated_count": updated_count,
+            "version": snapshot.version
         })
 
     except Exception as e:
@@ -32,7 +32,6 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import PIL
-import fitz
 import requests
 from IPython.display import display
 
@@ -56,6 +55,11 @@ from rich import print as rich_print
 from rich.markdown import Markdown as rich_Markdown
 from IPython.display import Markdown, display
 
+# Floor plan tiling (region-level retrieval) and image preprocessing
+from src.ingestion.tiling import generate_tiles, describe_tile_position
+from src.ingestion.image_preprocessing import ImageDerivativeCache
+from src.ingestion.pdf_extraction import PDFImageExtractor
+
 # =============================================================================
 # CONFIGURATION AND INITIALIZATION
 # =============================================================================
@@ -72,6 +76,14 @@ class Config:
         self.OVERLAP = 100
         self.IMAGE_SAVE_DIR = "images/"
         self.PDF_FOLDER_PATH = "map/"
+        self.TILE_IMAGES = False
+        self.TILE_SAVE_DIR = "image_tiles/"
+        self.TILE_SIZE = 768
+        self.TILE_OVERLAP = 0.25
+        self.IMAGE_CACHE_DIR = "image_cache/"
+        self.PDF_RENDER_PAGES = False
+        self.PDF_RENDER_DPI = 150
+        self.PDF_WORKERS = None
         
     def update_from_args(self, args):
         """Updates configurations from command line arguments"""
@@ -85,10 +97,25 @@ class Config:
             self.IMAGE_SAVE_DIR = args.image_dir
         if args.pdf_dir:
             self.PDF_FOLDER_PATH = args.pdf_dir
+        if getattr(args, "tile_images", False):
+            self.TILE_IMAGES = True
+        if getattr(args, "render_pages", False):
+            self.PDF_RENDER_PAGES = True
+        if getattr(args, "pdf_dpi", None):
+            self.PDF_RENDER_DPI = args.pdf_dpi
+        if getattr(args, "pdf_workers", None):
+            self.PDF_WORKERS = args.pdf_workers
 
 # Global configuration instance
 config = Config()
 
+# Model-ready image derivatives (downsized once, reused by every API call)
+image_derivatives = ImageDerivativeCache(config.IMAGE_CACHE_DIR)
+
+def load_image_for_api(image_uri: str, profile: str = "description") -> Image:
+    """Loads the cached derivative of an image as a Gemini Image"""
+    return Image.load_from_file(image_derivatives.derivative_path(image_uri, profile))
+
 # =============================================================================
 # UTILITY FUNCTIONS (from multimodal_qa_with_rag_utils.py)
 # =============================================================================
@@ -149,10 +176,14 @@ def get_image_embedding_from_multimodal_embedding_model(
     Returns:
         list: A list containing the image embedding values. If `return_array` is True, returns a NumPy array instead.
     """
-    image = vision_model_Image.load_from_file(image_uri)
+    image = vision_model_Image.load_from_file(
+        image_derivatives.derivative_path(image_uri, "embedding")
+    )
+    start = time.perf_counter()
     embeddings = multimodal_embedding_model.get_embeddings(
         image=image, contextual_text=text, dimension=embedding_size
     )  # 128, 256, 512, 1408
+    image_derivatives.record_upload(image_uri, "embedding", time.perf_counter() - start)
     image_embedding = embeddings.image_embedding
 
     if return_array:
@@ -308,7 +339,10 @@ def buscar_imagens_similares_com_embedding(
             'page_num': row.get('page_num', 'N/A'),
             'img_desc': row.get('img_desc', 'N/A'),
             'original_filename': row.get('original_filename', 'N/A'),
-            'source_type': row.get('source_type', 'N/A')
+            'source_type': row.get('source_type', 'N/A'),
+            'record_type': row.get('record_type', 'image'),
+            'parent_img_path': row.get('parent_img_path'),
+            'tile_box': row.get('tile_box')
         }
 
         similar_results.append(result)
@@ -320,74 +354,106 @@ def buscar_imagens_similares_com_embedding(
 # IMAGE PROCESSING FUNCTIONS
 # =============================================================================
 
-def extrair_imagens_do_pdf(pdf_path: str, output_dir: str = "images/", prefixo: str = "map") -> List[str]:
+def extrair_imagens_do_pdf(
+    pdf_path: str,
+    output_dir: str = "images/",
+    prefixo: str = "map",
+    renderizar_paginas: bool = False,
+    dpi: int = 150,
+    workers: Optional[int] = None,
+    forcar: bool = False
+) -> List[str]:
     """
     Extracts images from a PDF and saves them to the images folder
 
+    Pages are processed in parallel, each xref and identical image is written
+    once, and PDFs unchanged since the last run (per the manifest in
+    output_dir) are skipped.
+
     Args:
         pdf_path: Path to the PDF file
         output_dir: Output directory
         prefixo: Prefix for the file names
+        renderizar_paginas: Also render every page as a whole image
+        dpi: Resolution of the page renders
+        workers: Number of worker processes (default: up to 4)
+        forcar: Extract again even if the PDF is unchanged
 
     Returns:
         List of paths to extracted images
     """
-    print(f"🔍 Processing PDF: {pdf_path}")
-
-    if not os.path.exists(pdf_path):
-        print(f"❌ PDF not found: {pdf_path}")
-        return []
-
-    # Create directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Open PDF
-    doc = fitz.open(pdf_path)
-    imagens_extraidas = []
-
-    print(f"📊 PDF has {len(doc)} pages")
-
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        images = page.get_images()
-
-        print(f"📄 Page {page_num + 1}: {len(images)} images found")
-
-        for img_index, img in enumerate(images):
-            try:
-                # Extract image
-                xref = img[0]
-                pix = fitz.Pixmap(doc, xref)
+    extractor = PDFImageExtractor(output_dir, workers=workers, render_pages=renderizar_paginas, dpi=dpi)
+    return extractor.extract(pdf_path, prefixo, force=forcar)
+
+def _gerar_embeddings_e_descricao(
+    caminho_imagem: str,
+    nome_arquivo: str,
+    embedding_size: int,
+    gerar_descricoes: bool,
+    prompt_descricao: str
+) -> Tuple[np.ndarray, str, Optional[list]]:
+    """
+    Generates the image embedding, Gemini description and description embedding of one image
 
-                # Convert to RGB if necessary
-                if pix.colorspace and pix.colorspace.n > 3:
-                    pix = fitz.Pixmap(fitz.csRGB, pix)
+    Args:
+        caminho_imagem: Path to the image (or tile)
+        nome_arquivo: Name used in logs and fallback descriptions
+        embedding_size: Embedding size (128, 256, 512, 1408)
+        gerar_descricoes: Whether to generate the description with Gemini
+        prompt_descricao: Prompt used for the description
 
-                # File name
-                img_filename = f"{prefixo}_page_{page_num + 1}_img_{img_index + 1}.png"
-                img_path = os.path.join(output_dir, img_filename)
+    Returns:
+        Tuple of (image embedding array, description, text embedding or None)
+    """
+    # 1. Generate image embedding
+    print("  🔄 Generating embedding...")
+    image_embedding = get_image_embedding_from_multimodal_embedding_model(
+        image_uri=caminho_imagem,
+        embedding_size=embedding_size,
+        return_array=True
+    )
+    print(f"  ✅ Embedding generated: shape {image_embedding.shape}")
 
-                # Save image
-                pix.save(img_path)
-                imagens_extraidas.append(img_path)
+    # 2. Generate image description (if requested)
+    descricao = ""
+    if gerar_descricoes:
+        print("  🤖 Generating description with Gemini...")
+        try:
+            imagem_gemini = load_image_for_api(caminho_imagem, "description")
 
-                print(f"  ✅ Extracted: {img_filename}")
+            start = time.perf_counter()
+            descricao = get_gemini_response(
+                multimodal_model_2_0_flash,
+                model_input=[prompt_descricao, imagem_gemini],
+                stream=False,
+            )
+            image_derivatives.record_upload(caminho_imagem, "description", time.perf_counter() - start)
+            print(f"  ✅ Description generated: {len(descricao)} characters")
 
-                pix = None  # Free memory
+        except Exception as desc_error:
+            print(f"  ⚠️  Error generating description: {desc_error}")
+            descricao = f"Image: {nome_arquivo}"
 
-            except Exception as e:
-                print(f"  ❌ Error extracting image {img_index}: {e}")
-                continue
+    # 3. Generate description embedding (for RAG compatibility)
+    text_embedding = None
+    if descricao:
+        try:
+            text_embedding = get_text_embedding_from_text_embedding_model(descricao)
+            print("  ✅ Text embedding of description generated")
+        except Exception as text_emb_error:
+            print(f"  ⚠️  Error generating text embedding: {text_emb_error}")
 
-    doc.close()
-    print(f"\n🎉 Total of {len(imagens_extraidas)} images extracted!")
-    return imagens_extraidas
+    return image_embedding, descricao, text_embedding
 
 def processar_imagens_da_pasta(
     pasta_imagens: str = "images/",
     embedding_size: int = 512,
     gerar_descricoes: bool = True,
-    formatos_suportados: List[str] = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']
+    formatos_suportados: List[str] = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'],
+    dividir_em_tiles: bool = False,
+    pasta_tiles: str = "image_tiles/",
+    tamanho_tile: int = 768,
+    sobreposicao_tile: float = 0.25
 ) -> pd.DataFrame:
     """
     Processes all images from a folder, generating embeddings and descriptions for RAG
@@ -397,6 +463,11 @@ def processar_imagens_da_pasta(
         embedding_size: Embedding size (128, 256, 512, 1408)
         gerar_descricoes: Whether to generate image descriptions with Gemini
         formatos_suportados: List of supported image formats
+        dividir_em_tiles: Whether to also split large plans into overlapping tiles,
+                          each with its own embedding and description
+        pasta_tiles: Directory where tiles are saved (outside the watched images folder)
+        tamanho_tile: Tile side in pixels
+        sobreposicao_tile: Fraction of overlap between neighbouring tiles
 
     Returns:
         pd.DataFrame: DataFrame compatible with existing RAG system
@@ -462,41 +533,9 @@ def processar_imagens_da_pasta(
         print(f"\n📸 PROCESSING {i}/{len(imagens_encontradas)}: {nome_arquivo}")
 
         try:
-            # 1. Generate image embedding
-            print("  🔄 Generating embedding...")
-            image_embedding = get_image_embedding_from_multimodal_embedding_model(
-                image_uri=caminho_imagem,
-                embedding_size=embedding_size,
-                return_array=True
+            image_embedding, descricao, text_embedding = _gerar_embeddings_e_descricao(
+                caminho_imagem, nome_arquivo, embedding_size, gerar_descricoes, prompt_descricao
             )
-            print(f"  ✅ Embedding generated: shape {image_embedding.shape}")
-
-            # 2. Generate image description (if requested)
-            descricao = ""
-            if gerar_descricoes:
-                print("  🤖 Generating description with Gemini...")
-                try:
-                    imagem_gemini = Image.load_from_file(caminho_imagem)
-
-                    descricao = get_gemini_response(
-                        multimodal_model_2_0_flash,
-                        model_input=[prompt_descricao, imagem_gemini],
-                        stream=False,
-                    )
-                    print(f"  ✅ Description generated: {len(descricao)} characters")
-
-                except Exception as desc_error:
-                    print(f"  ⚠️  Error generating description: {desc_error}")
-                    descricao = f"Image: {nome_arquivo}"
-
-            # 3. Generate description embedding (for RAG compatibility)
-            text_embedding = None
-            if descricao:
-                try:
-                    text_embedding = get_text_embedding_from_text_embedding_model(descricao)
-                    print("  ✅ Text embedding of description generated")
-                except Exception as text_emb_error:
-                    print(f"  ⚠️  Error generating text embedding: {text_emb_error}")
 
             # 4. Create record compatible with existing system
             registro = {
@@ -508,7 +547,10 @@ def processar_imagens_da_pasta(
                 'mm_embedding_from_img_only': image_embedding.tolist(),  # Compatibility
                 'text_embedding_from_image_description': text_embedding if text_embedding else None,
                 'source_type': 'pasta_imagens',  # Identify source
-                'original_filename': nome_arquivo
+                'original_filename': nome_arquivo,
+                'record_type': 'image',
+                'parent_img_path': None,
+                'tile_box': None
             }
             
             dados_imagens.append(registro)
@@ -518,6 +560,50 @@ def processar_imagens_da_pasta(
             print(f"  ❌ Error processing {nome_arquivo}: {e}")
             continue
 
+        # 5. Split large plans into tiles (parent-child index)
+        if dividir_em_tiles:
+            try:
+                tiles = generate_tiles(caminho_imagem, pasta_tiles, tamanho_tile, sobreposicao_tile)
+            except Exception as tile_error:
+                print(f"  ⚠️  Error generating tiles: {tile_error}")
+                tiles = []
+
+            if tiles:
+                print(f"  🧩 Processing {len(tiles)} tiles of {nome_arquivo}...")
+
+            for tile in tiles:
+                posicao = describe_tile_position(tile['tile_box'], tile['parent_size'])
+                prompt_tile = (
+                    f"This image is the {posicao} region of the floor plan '{nome_arquivo}'. "
+                    f"Describe ONLY what is visible in this region.\n\n{prompt_descricao}"
+                )
+
+                try:
+                    tile_embedding, tile_descricao, tile_text_embedding = _gerar_embeddings_e_descricao(
+                        tile['tile_path'], tile['tile_id'], embedding_size, gerar_descricoes, prompt_tile
+                    )
+                except Exception as e:
+                    print(f"  ❌ Error processing tile {tile['tile_id']}: {e}")
+                    continue
+
+                dados_imagens.append({
+                    'file_name': f"pasta_images_{tile['tile_id']}",
+                    'page_num': 1,
+                    'img_num': i,
+                    'img_path': tile['tile_path'],
+                    'img_desc': tile_descricao,
+                    'mm_embedding_from_img_only': tile_embedding.tolist(),
+                    'text_embedding_from_image_description': tile_text_embedding if tile_text_embedding else None,
+                    'source_type': 'pasta_imagens_tile',
+                    'original_filename': nome_arquivo,  # Tiles belong to the parent file
+                    'record_type': 'tile',
+                    'parent_img_path': caminho_imagem,
+                    'tile_box': tuple(tile['tile_box'])
+                })
+                print(f"  ✅ Tile {tile['tile_id']} ({posicao}) processed")
+
+    image_derivatives.display_report()
+
     # Create DataFrame
     if dados_imagens:
         df_imagens = pd.DataFrame(dados_imagens)
@@ -679,7 +765,7 @@ def analise_contextual_com_gemini(
     
     try:
         # Load the image
-        imagem_gemini = Image.load_from_file(imagem_caminho)
+        imagem_gemini = load_image_for_api(imagem_caminho)
         print(f"✅ Image loaded: {imagem_caminho}")
 
         # Prepare context from similar images
@@ -769,7 +855,7 @@ def analise_direta_com_gemini(imagem_caminho: str, modelo_gemini=None) -> None:
 
     try:
         # Load the image
-        imagem_gemini = Image.load_from_file(imagem_caminho)
+        imagem_gemini = load_image_for_api(imagem_caminho)
         print(f"✅ Image loaded: {imagem_caminho}")
 
         # Ask each question
@@ -883,50 +969,28 @@ def executar_fluxo_completo(args):
         print("="*50)
 
         # Check how many images we currently have
-        current_images = len([f for f in os.listdir(config.IMAGE_SAVE_DIR) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp'))])
+        current_images = 0
+        if os.path.isdir(config.IMAGE_SAVE_DIR):
+            current_images = len([f for f in os.listdir(config.IMAGE_SAVE_DIR) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp'))])
         print(f"📊 Current images in folder: {current_images}")
 
         if current_images <= 1:
-            print("🔄 Extracting images from PDF to have more data...")
-
-            # Extract from map.pdf if it exists
-            if os.path.exists(os.path.join(config.PDF_FOLDER_PATH, "map.pdf")):
-                imagens_extraidas = extrair_imagens_do_pdf(
-                    os.path.join(config.PDF_FOLDER_PATH, "map.pdf"),
-                    config.IMAGE_SAVE_DIR,
-                    "map"
-                )
+            print("🔄 Extracting images from PDFs to have more data...")
+
+            # Every PDF in the PDF folder; unchanged PDFs are skipped via the manifest
+            extractor = PDFImageExtractor(
+                config.IMAGE_SAVE_DIR,
+                workers=config.PDF_WORKERS,
+                render_pages=config.PDF_RENDER_PAGES,
+                dpi=config.PDF_RENDER_DPI
+            )
+            resultados_pdf = extractor.extract_folder(config.PDF_FOLDER_PATH)
 
-                if imagens_extraidas:
-                    print(f"\n✅ {len(imagens_extraidas)} new images added!")
-                else:
-                    print("❌ No images were extracted from PDF")
+            if resultados_pdf:
+                total_imagens = sum(len(imagens) for imagens in resultados_pdf.values())
+                print(f"\n✅ {total_imagens} images available from {len(resultados_pdf)} PDFs in {config.PDF_FOLDER_PATH}")
             else:
-                print("❌ File map/map.pdf not found")
-
-                # Check for other available PDFs
-                print("\n🔍 Looking for other PDFs...")
-                pdf_paths = []
-                for root, dirs, files in os.walk("."):
-                    for file in files:
-                        if file.lower().endswith('.pdf'):
-                            pdf_paths.append(os.path.join(root, file))
-
-                if pdf_paths:
-                    print("📋 PDFs found:")
-                    for i, pdf_path in enumerate(pdf_paths[:3], 1):
-                        print(f"  {i}. {pdf_path}")
-
-                    # Process the first PDF found
-                    if pdf_paths:
-                        primeiro_pdf = pdf_paths[0]
-                        print(f"\n🔄 Processing: {primeiro_pdf}")
-                        imagens_extraidas = extrair_imagens_do_pdf(primeiro_pdf, config.IMAGE_SAVE_DIR, "doc")
-
-                        if imagens_extraidas:
-                            print(f"\n✅ {len(imagens_extraidas)} images extracted from {primeiro_pdf}!")
-                else:
-                    print("❌ No PDF found to extract images")
+                print(f"❌ No PDF found in {config.PDF_FOLDER_PATH}")
         else:
             print("✅ There are already multiple images in folder")
     
@@ -938,7 +1002,11 @@ def executar_fluxo_completo(args):
         pasta_imagens=config.IMAGE_SAVE_DIR,
         embedding_size=config.EMBEDDING_SIZE,
         gerar_descricoes=True,
-        formatos_suportados=['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']
+        formatos_suportados=['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'],
+        dividir_em_tiles=config.TILE_IMAGES,
+        pasta_tiles=config.TILE_SAVE_DIR,
+        tamanho_tile=config.TILE_SIZE,
+        sobreposicao_tile=config.TILE_OVERLAP
     )
 
     if image_metadata_df.empty:
@@ -1037,6 +1105,10 @@ Exemplos de uso:
 
     # Execution options
     parser.add_argument("--extract-pdf", action="store_true", help="Extract images from PDFs before processing")
+    parser.add_argument("--render-pages", action="store_true", help="Also render whole PDF pages as images when extracting")
+    parser.add_argument("--pdf-dpi", type=int, default=150, help="Resolution of the rendered PDF pages")
+    parser.add_argument("--pdf-workers", type=int, help="Worker processes for PDF extraction (default: up to 4)")
+    parser.add_argument("--tile-images", action="store_true", help="Split large floor plans into overlapping tiles with their own embeddings")
     parser.add_argument("--direct-analysis", action="store_true", help="Run direct analysis with Gemini")
     parser.add_argument("--target-image", type=str, default="M3.jpeg", help="Target image name for analysis")
 
@@ -1061,6 +1133,8 @@ def main():
         print(f"  Image Directory: {args.image_dir}")
         print(f"  PDF Directory: {args.pdf_dir}")
         print(f"  Extract PDF: {args.extract_pdf}")
+        print(f"  Render PDF Pages: {args.render_pages} ({args.pdf_dpi} DPI)")
+        print(f"  Tile Images: {args.tile_images}")
         print(f"  Direct Analysis: {args.direct_analysis}")
         print(f"  Target Image: {args.target_image}")
         return
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Alternative Routes Benchmark
+============================
+
+Measures the latency of the k-shortest alternative routes (Yen's
+algorithm) over every pair of nodes of the full campus graph, for every
+routing profile, uncached and cached.
+
+Usage:
+    python scripts/benchmark_alternatives.py [--k 3] [--max-overlap 0.7]
+"""
+
+import argparse
+import glob
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from navigation import ROUTING_PROFILES, AlternativeRoutes, CampusGraph, load_building_configs
+from navigation.compiler import compile_navigation_bundle
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    """Runs every node pair through the alternative route service and prints latency percentiles"""
+    parser = argparse.ArgumentParser(description="Alternative routes latency benchmark")
+    parser.add_argument("--corridors", type=str, nargs="+",
+                        default=[str(PROJECT_ROOT / "map" / "corridor_segments_building_m.geojson")],
+                        help="Corridor segments GeoJSON files")
+    parser.add_argument("--configs", type=str, default=str(PROJECT_ROOT / "config" / "building_*_rooms.json"),
+                        help="Building config files (glob)")
+    parser.add_argument("--spreadsheets", type=str,
+                        default=str(PROJECT_ROOT / "LeafletJS" / "Node Excel Files" / "*.xlsx"),
+                        help="Node spreadsheets (glob)")
+    parser.add_argument("--campus", type=str, default=str(PROJECT_ROOT / "LeafletJS" / "campus.geojson"),
+                        help="Campus GeoJSON with the building outlines")
+    parser.add_argument("--k", type=int, default=3, help="Routes per query")
+    parser.add_argument("--max-overlap", type=float, default=0.7, help="Diversity constraint")
+    args = parser.parse_args()
+
+    bundle = compile_navigation_bundle(args.corridors, load_building_configs([args.configs]),
+                                       sorted(glob.glob(args.spreadsheets)), args.campus, str(PROJECT_ROOT))
+    campus = CampusGraph.from_bundle(bundle)
+    nodes = sorted(campus.floor_of)
+    pairs = [(a, b) for a in nodes for b in nodes if a != b]
+
+    print(f"📊 ALTERNATIVE ROUTES BENCHMARK ({len(nodes)} nodes, {campus.edge_count} edges, "
+          f"{len(pairs)} pairs, k={args.k}, max overlap {args.max_overlap})")
+    print("=" * 84)
+    print(f"{'profile':>20} {'cache':>6} {'routes/query':>13} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    print("-" * 84)
+
+    for profile in ROUTING_PROFILES:
+        service = AlternativeRoutes(campus, cache_size=len(pairs))
+        for cache in ("cold", "warm"):
+            latencies, found = [], 0
+            for a, b in pairs:
+                started = time.perf_counter()
+                found += len(service.find(a, b, args.k, profile, args.max_overlap))
+                latencies.append((time.perf_counter() - started) * 1000)
+            print(f"{profile:>20} {cache:>6} {found / len(pairs):>13.2f} {statistics.median(latencies):>9.3f} "
+                  f"{percentile(latencies, 0.95):>9.3f} {percentile(latencies, 0.99):>9.3f} {max(latencies):>9.3f}")
+    print("=" * 84)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
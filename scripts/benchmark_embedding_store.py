@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Embedding Store Benchmark
+=========================
+
+Compares memory, latency and recall@k of the float32, float16 and int8
+embedding store modes for 512-d multimodal and 768-d text vectors.
+
+Usage:
+    python scripts/benchmark_embedding_store.py [--vectors 5000] [--queries 200] [--k 10]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from retrieval.embedding_store import benchmark_embedding_store
+
+
+def main():
+    """Runs the benchmark and prints a table"""
+    parser = argparse.ArgumentParser(description="Embedding store benchmark")
+    parser.add_argument("--vectors", type=int, default=5000, help="Number of stored vectors")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="k for recall@k")
+    args = parser.parse_args()
+
+    print("📊 EMBEDDING STORE BENCHMARK")
+    print("=" * 92)
+    print(f"{'dim':>5} {'mode':>8} {'rescore':>8} {'index KB':>10} {'disk KB':>10} {'lists KB':>10} {'ms/query':>10} {'recall@' + str(args.k):>10}")
+    print("-" * 92)
+
+    for row in benchmark_embedding_store(num_vectors=args.vectors, num_queries=args.queries, top_k=args.k):
+        print(f"{row['dimension']:>5} {row['mode']:>8} {str(row['rescore']):>8} "
+              f"{row['index_bytes'] / 1024:>10.0f} "
+              f"{row['on_disk_bytes'] / 1024:>10.0f} {row['python_list_bytes'] / 1024:>10.0f} "
+              f"{row['avg_latency_ms']:>10.3f} "
+              f"{row[f'recall@{args.k}']:>10.3f}")
+
+    print("=" * 92)
+
+
+if __name__ == "__main__":
+    main()
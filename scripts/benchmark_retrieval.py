@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Retrieval Benchmark
+===================
+
+Runs the offline retrieval benchmark (recall@k, MRR, p50/p95/p99 latency
+and memory per index configuration) on the fixture embeddings and checks
+the results against the stored baseline.
+
+Usage:
+    python scripts/benchmark_retrieval.py                    # compare with baseline
+    python scripts/benchmark_retrieval.py --update-baseline  # accept current numbers
+    python scripts/benchmark_retrieval.py --generate-fixture # rebuild the fixture
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from retrieval.benchmark import (
+    RetrievalFixture, generate_fixture, run_benchmark,
+    load_baseline, write_baseline, compare_to_baseline
+)
+
+DEFAULT_FIXTURE = PROJECT_ROOT / "tests" / "fixtures" / "retrieval"
+DEFAULT_BASELINE = PROJECT_ROOT / "tests" / "performance" / "retrieval_baseline.json"
+
+
+def main():
+    """Runs the benchmark, prints a table and checks regressions"""
+    parser = argparse.ArgumentParser(description="Retrieval quality and latency benchmark")
+    parser.add_argument("--fixture", type=str, default=str(DEFAULT_FIXTURE), help="Fixture directory")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--k", type=int, default=5, help="k for recall@k")
+    parser.add_argument("--generate-fixture", action="store_true", help="Regenerate the fixture before running")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--skip-latency", action="store_true", help="Don't check latency against the baseline")
+    args = parser.parse_args()
+
+    if args.generate_fixture:
+        fixture = generate_fixture(args.fixture)
+        print(f"✅ Fixture written to {args.fixture}")
+    else:
+        fixture = RetrievalFixture.load(args.fixture)
+
+    print(f"📊 RETRIEVAL BENCHMARK ({len(fixture.corpus)} images, {len(fixture.queries)} queries)")
+    print("=" * 88)
+    print(f"{'configuration':>18} {'recall@' + str(args.k):>10} {'MRR':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'memory KB':>11}")
+    print("-" * 88)
+
+    results = run_benchmark(fixture, k=args.k)
+    for name, row in results.items():
+        print(f"{name:>18} {row[f'recall@{args.k}']:>10.4f} {row['mrr']:>8.4f} {row['latency_p50_ms']:>9.3f} "
+              f"{row['latency_p95_ms']:>9.3f} {row['latency_p99_ms']:>9.3f} {row['memory_bytes'] / 1024:>11.0f}")
+    print("=" * 88)
+
+    if args.update_baseline:
+        write_baseline(args.baseline, results, args.k)
+        print(f"✅ Baseline updated: {args.baseline}")
+        return 0
+
+    if not Path(args.baseline).exists():
+        print(f"⚠️  No baseline found at {args.baseline} (run with --update-baseline)")
+        return 0
+
+    regressions = compare_to_baseline(results, load_baseline(args.baseline), check_latency=not args.skip_latency)
+    if regressions:
+        print("❌ Regressions against baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
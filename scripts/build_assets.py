@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Static Assets Build
+===================
+
+Hashes the files served under /static, /LeafletJS, /map and /tools and
+precomputes their gzip (and, with the brotli package, brotli) variants,
+so the server starts with a warm asset manifest. The server also updates
+the manifest incrementally at startup and when a file changes.
+
+Usage:
+    python scripts/build_assets.py [--output config/asset_cache]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from assets import BROTLI_AVAILABLE, AssetStore
+
+ASSET_ROOTS = ["static", "LeafletJS", "map", "tools"]
+
+
+def main():
+    """Builds and saves the asset manifest"""
+    parser = argparse.ArgumentParser(description="Fingerprint and precompress the static assets")
+    parser.add_argument("--output", type=str, default=str(PROJECT_ROOT / "config" / "asset_cache"),
+                        help="Manifest and compressed variants directory")
+    args = parser.parse_args()
+
+    store = AssetStore({root: str(PROJECT_ROOT / root) for root in ASSET_ROOTS}, args.output)
+    stats = store.build()
+
+    print(f"✅ Asset manifest saved to {args.output}")
+    print(f"   {stats['files']} files, {stats['changed']} changed, {stats['compressed']} precompressed")
+    if not BROTLI_AVAILABLE:
+        print("⚠️ brotli not installed, only gzip variants were built (pip install brotli)")
+
+
+if __name__ == "__main__":
+    main()
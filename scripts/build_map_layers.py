@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Map Layers Build
+================
+
+Builds the zoom-banded, simplified and quantized campus map layers (plus
+pre-compressed .gz copies) served by /api/map/campus. The server also
+rebuilds them automatically when campus.geojson changes.
+
+Usage:
+    python scripts/build_map_layers.py [--source LeafletJS/campus.geojson] [--output config/map_layers]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from navigation.map_layers import build_map_layers
+
+
+def main():
+    """Builds and saves the map layers"""
+    parser = argparse.ArgumentParser(description="Build zoom-banded campus map layers")
+    parser.add_argument("--source", type=str, default=str(PROJECT_ROOT / "LeafletJS" / "campus.geojson"),
+                        help="Campus GeoJSON")
+    parser.add_argument("--output", type=str, default=str(PROJECT_ROOT / "config" / "map_layers"),
+                        help="Output directory")
+    args = parser.parse_args()
+
+    manifest = build_map_layers(args.source, args.output)
+
+    print(f"✅ Map layers {manifest['version']} saved to {args.output}")
+    print(f"   source: {manifest['sourceBytes']} bytes")
+    for band in manifest["bands"]:
+        print(f"   {band['name']:<10} z{band['minZoom']}-{band['maxZoom']}  tolerance {band['tolerance_m']} m  "
+              f"{band['bytes']} bytes, {band['gzipBytes']} gzipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Navigation Bundle Build
+=======================
+
+Validates the navigation sources (corridor segments, building configs,
+node spreadsheets, floor plan SVGs) and compiles them into the versioned
+navigation bundle served by /api/navigation/bundle. The server also
+recompiles it automatically when a source changes.
+
+Exits with status 1 when the sources have errors.
+
+Usage:
+    python scripts/build_navigation_bundle.py [--corridors map/corridor_segments_building_m.geojson]
+        [--spreadsheets "LeafletJS/Node Excel Files/*.xlsx"] [--output config/navigation_bundle]
+"""
+
+import argparse
+import glob
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from navigation.campus import load_building_configs
+from navigation.compiler import build_navigation_bundle
+
+
+def main():
+    """Compiles, validates and saves the navigation bundle"""
+    parser = argparse.ArgumentParser(description="Compile the navigation bundle")
+    parser.add_argument("--corridors", type=str, nargs="+",
+                        default=[str(PROJECT_ROOT / "map" / "corridor_segments_building_m.geojson")],
+                        help="Corridor segments GeoJSON files")
+    parser.add_argument("--configs", type=str, default=str(PROJECT_ROOT / "config" / "building_*_rooms.json"),
+                        help="Building config files (glob)")
+    parser.add_argument("--spreadsheets", type=str,
+                        default=str(PROJECT_ROOT / "LeafletJS" / "Node Excel Files" / "*.xlsx"),
+                        help="Node spreadsheets (glob)")
+    parser.add_argument("--campus", type=str, default=str(PROJECT_ROOT / "LeafletJS" / "campus.geojson"),
+                        help="Campus GeoJSON with the building outlines")
+    parser.add_argument("--output", type=str, default=str(PROJECT_ROOT / "config" / "navigation_bundle"),
+                        help="Output directory")
+    args = parser.parse_args()
+
+    # Copies of the corridor file lying around in map/ are not compiled
+    included = {Path(path).resolve() for path in args.corridors}
+    for path in sorted((PROJECT_ROOT / "map").glob("*corridor*.geojson")):
+        if path.resolve() not in included:
+            print(f"⚠️ Not included: {path.relative_to(PROJECT_ROOT)}")
+
+    bundle, manifest = build_navigation_bundle(
+        args.corridors,
+        load_building_configs([args.configs]),
+        args.output,
+        sorted(glob.glob(args.spreadsheets)),
+        args.campus,
+        str(PROJECT_ROOT)
+    )
+    report = bundle["report"]
+
+    for message in report["warnings"]:
+        print(f"⚠️ {message}")
+    for message in report["errors"]:
+        print(f"❌ {message}")
+
+    stats = report["stats"]
+    print(f"✅ Navigation bundle {manifest['version']} saved to {args.output}")
+    print(f"   {stats['nodes']} nodes, {stats['edges']} edges ({stats['tracedEdges']} traced), "
+          f"{stats['transfers']} transfers, {stats['rooms']} rooms on {stats['floors']} floors")
+    print(f"   {manifest['bytes']} bytes, {manifest['gzipBytes']} gzipped")
+    print(f"   {len(report['errors'])} errors, {len(report['warnings'])} warnings")
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
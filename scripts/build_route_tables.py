@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Route Tables Build
+==================
+
+Precomputes the all-pairs distance and next-hop tables of every floor, for
+every routing profile, and saves them next to the building configuration
+(<output>/<profile>/<floor>/). The server also rebuilds them automatically
+when the corridor GeoJSON changes.
+
+Usage:
+    python scripts/build_route_tables.py [--corridors map/corridor_segments_building_m.geojson]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from navigation import CampusGraph, corridor_source_hash, load_building_configs
+
+
+def main():
+    """Builds and saves the route tables"""
+    parser = argparse.ArgumentParser(description="Build precomputed route tables")
+    parser.add_argument("--corridors", type=str, nargs="+",
+                        default=[str(PROJECT_ROOT / "map" / "corridor_segments_building_m.geojson")],
+                        help="Corridor segments GeoJSON files")
+    parser.add_argument("--configs", type=str, default=str(PROJECT_ROOT / "config" / "building_*_rooms.json"),
+                        help="Building room configurations (glob)")
+    parser.add_argument("--output", type=str, default=str(PROJECT_ROOT / "config" / "route_tables"),
+                        help="Output directory")
+    args = parser.parse_args()
+
+    campus = CampusGraph.from_sources(args.corridors, load_building_configs([args.configs]), args.output,
+                                      corridor_source_hash(args.corridors))
+
+    for profile, engines in campus.engines.items():
+        for floor_key, engine in sorted(engines.items()):
+            tables = engine.tables
+            reachable = int((tables.distances != float("inf")).sum())
+            print(f"   {profile:<20} {floor_key:<4} {len(tables)} nodes, {reachable} of {len(tables) ** 2} pairs "
+                  f"reachable, {tables.distances.nbytes + tables.next_hop.nbytes} bytes")
+    print(f"✅ Route tables saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
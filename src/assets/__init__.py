@@ -0,0 +1,12 @@
+"""
+Assets Module
+=============
+
+This module fingerprints and precompresses the static files served by the
+web app, so they can be served with versioned URLs, strong ETags and
+long-lived cache headers.
+"""
+
+from .store import BROTLI_AVAILABLE, AssetStore, choose_encoding, file_hash, parse_accept_encoding
+
+__all__ = ['BROTLI_AVAILABLE', 'AssetStore', 'choose_encoding', 'file_hash', 'parse_accept_encoding']
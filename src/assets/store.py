@@ -0,0 +1,234 @@
+"""
+Static Asset Store
+==================
+
+This module fingerprints the files served by the web app (static/,
+LeafletJS/, map/ and tools/) so they can be cached by browsers:
+
+- every file is hashed by content (SHA-256) into a manifest, refreshed
+  incrementally by size and modification time
+- text assets (JS, CSS, JSON/GeoJSON, SVG, ...) get gzip and, when the
+  brotli package is installed, brotli variants precomputed into a
+  content-addressed cache directory
+- the hash gives a versioned URL (/assets/<hash>/<prefix>/<path>) that can
+  be cached forever, and a strong ETag per representation for the
+  unversioned URLs
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+MANIFEST_FILE = "manifest.json"
+HASH_LENGTH = 16
+COMPRESSIBLE_EXTENSIONS = {".js", ".mjs", ".css", ".json", ".geojson", ".svg", ".html", ".htm", ".txt",
+                           ".xml", ".csv", ".map", ".md"}
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Content-Encoding → variant file suffix, in server preference order
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+def file_hash(path: str) -> str:
+    """Truncated SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Content codings of an Accept-Encoding header with their q-values"""
+    codings = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[name] = quality
+    return codings
+
+
+def choose_encoding(available: List[str], accept_encoding: str) -> Optional[str]:
+    """Preferred available encoding acceptable to the client (None: identity)"""
+    codings = parse_accept_encoding(accept_encoding)
+    wildcard = codings.get("*", 0.0)
+    for encoding in ENCODINGS:
+        if encoding in available and codings.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def _write(path: str, data: bytes) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+class AssetStore:
+    """Content-hash manifest and precompressed variants of the served files"""
+
+    def __init__(self, roots: Dict[str, str], cache_dir: str, compress: bool = True):
+        """
+        Args:
+            roots: URL prefix → directory (e.g. {"LeafletJS": "LeafletJS"})
+            cache_dir: Where the manifest and the compressed variants are kept
+            compress: Precompute gzip/brotli variants of text assets
+        """
+        self.roots = {prefix: os.path.abspath(directory) for prefix, directory in roots.items()}
+        self.cache_dir = cache_dir
+        self.compress = compress
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+    def resolve(self, prefix: str, path: str) -> Optional[str]:
+        """Absolute file path of an asset (None if outside its root or missing)"""
+        root = self.roots.get(prefix)
+        if root is None:
+            return None
+        full_path = os.path.abspath(os.path.join(root, path))
+        if os.path.commonpath([root, full_path]) != root or not os.path.isfile(full_path):
+            return None
+        return full_path
+
+    def _variant_path(self, digest: str, encoding: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}{ENCODINGS[encoding]}")
+
+    def _compressible(self, path: str, size: int) -> bool:
+        return (self.compress and size >= MIN_COMPRESS_BYTES
+                and os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS)
+
+    def _build_variants(self, full_path: str, digest: str) -> Dict[str, int]:
+        """Writes the missing compressed variants of a file; returns encoding → size of the useful ones"""
+        with open(full_path, "rb") as f:
+            data = f.read()
+        compressors = {"gzip": lambda raw: gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)}
+        if BROTLI_AVAILABLE:
+            compressors["br"] = lambda raw: brotli.compress(raw, quality=BROTLI_QUALITY)
+
+        variants = {}
+        for encoding, compress in compressors.items():
+            variant_path = self._variant_path(digest, encoding)
+            if not os.path.exists(variant_path):
+                compressed = compress(data)
+                if len(compressed) >= len(data):
+                    continue
+                os.makedirs(os.path.dirname(variant_path), exist_ok=True)
+                _write(variant_path, compressed)
+            variants[encoding] = os.path.getsize(variant_path)
+        return variants
+
+    def _refresh(self, full_path: str, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Entry of a file, reusing the previous one while size and mtime are unchanged"""
+        stat = os.stat(full_path)
+        if (previous is not None and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime_ns
+                and all(os.path.exists(self._variant_path(previous["hash"], e)) for e in previous["encodings"])):
+            return previous
+        digest = file_hash(full_path)
+        encodings = self._build_variants(full_path, digest) if self._compressible(full_path, stat.st_size) else {}
+        return {"hash": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns, "encodings": encodings}
+
+    def load_manifest(self) -> None:
+        """Loads the manifest of a previous build (missing or unreadable: empty)"""
+        try:
+            with open(os.path.join(self.cache_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.entries = manifest.get("assets", {}) if manifest.get("brotli") == BROTLI_AVAILABLE else {}
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def save_manifest(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = {"brotli": BROTLI_AVAILABLE, "assets": self.entries}
+        _write(os.path.join(self.cache_dir, MANIFEST_FILE), json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+
+    def build(self) -> Dict[str, int]:
+        """
+        Hashes every file under the roots and precomputes the compressed
+        variants of the changed ones (starting from the saved manifest on
+        the first build), then saves the manifest.
+
+        Returns:
+            {files, changed, compressed}
+        """
+        if not self.entries:
+            self.load_manifest()
+        entries, changed = {}, 0
+        for prefix, root in self.roots.items():
+            for directory, _, filenames in os.walk(root):
+                for filename in filenames:
+                    full_path = os.path.join(directory, filename)
+                    key = f"{prefix}/{os.path.relpath(full_path, root).replace(os.sep, '/')}"
+                    previous = self.entries.get(key)
+                    entries[key] = self._refresh(full_path, previous)
+                    changed += entries[key] is not previous
+        with self._lock:
+            self.entries = entries
+        self.save_manifest()
+        return {"files": len(entries), "changed": changed,
+                "compressed": sum(1 for entry in entries.values() if entry["encodings"])}
+
+    def entry(self, prefix: str, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Manifest entry of an asset, rehashed if the file changed since the
+        build (None if it does not exist). Includes the absolute 'path'.
+        """
+        full_path = self.resolve(prefix, path)
+        if full_path is None:
+            return None
+        key = f"{prefix}/{path}"
+        with self._lock:
+            previous = self.entries.get(key)
+        current = self._refresh(full_path, previous)
+        if current is not previous:
+            with self._lock:
+                self.entries[key] = current
+        return {**current, "path": full_path}
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+    def url(self, asset_path: str) -> str:
+        """Versioned URL of an asset given as '<prefix>/<path>' (plain URL if unknown)"""
+        prefix, _, path = asset_path.lstrip("/").partition("/")
+        entry = self.entry(prefix, path)
+        if entry is None:
+            return "/" + quote(asset_path.lstrip("/"))
+        return f"/assets/{entry['hash']}/{quote(prefix)}/{quote(path)}"
+
+    def variant(self, entry: Dict[str, Any], accept_encoding: str) -> Tuple[str, Optional[str]]:
+        """File to send for an entry and its Content-Encoding (None: identity)"""
+        encoding = choose_encoding(list(entry["encodings"]), accept_encoding)
+        if encoding is None:
+            return entry["path"], None
+        return self._variant_path(entry["hash"], encoding), encoding
+
+    @staticmethod
+    def etag(entry: Dict[str, Any], encoding: Optional[str]) -> str:
+        """Strong ETag of one representation of an asset (unquoted)"""
+        return entry["hash"] if encoding is None else f"{entry['hash']}-{encoding}"
@@ -0,0 +1,14 @@
+"""
+Ingestion Module
+================
+
+This module contains the preprocessing steps applied to images and PDFs
+before they are embedded by the multimodal RAG system.
+"""
+
+from .tiling import compute_tile_boxes, generate_tiles, describe_tile_position
+from .image_preprocessing import ImageDerivativeCache, MODEL_IMAGE_PROFILES
+from .pdf_extraction import PDFImageExtractor
+
+__all__ = ['compute_tile_boxes', 'generate_tiles', 'describe_tile_position',
+           'ImageDerivativeCache', 'MODEL_IMAGE_PROFILES', 'PDFImageExtractor']
@@ -0,0 +1,213 @@
+"""
+Image Preprocessing and Derivative Cache
+========================================
+
+This module normalizes images once before they are sent to the multimodal
+APIs: decode, apply the EXIF orientation, downsize to the dimensions each
+model actually uses and re-encode. Derivatives are cached on disk by source
+content hash and preprocessing parameters, so every later API call uploads
+the small cached file instead of the full-resolution scan.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+# Try to import Pillow, but don't fail if not available
+try:
+    from PIL import Image as PILImage, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    print("⚠️  Pillow not available. Install with: pip install pillow")
+
+# Target sizes per API call. The multimodal embedding model works on small
+# inputs; Gemini descriptions need enough resolution to read room numbers.
+MODEL_IMAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "embedding": {"max_dimension": 1024, "format": "JPEG", "quality": 90},
+    "description": {"max_dimension": 2048, "format": "JPEG", "quality": 92},
+}
+
+FORMAT_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Computes the SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_image(
+    source_path: str,
+    output_path: str,
+    max_dimension: int,
+    image_format: str = "JPEG",
+    quality: int = 90,
+) -> Tuple[int, int]:
+    """
+    Decodes, orients, downsizes and re-encodes one image.
+
+    Args:
+        source_path: Original image
+        output_path: Where the derivative is written
+        max_dimension: Largest allowed side in pixels (aspect ratio is kept)
+        image_format: Output format (JPEG, PNG or WEBP)
+        quality: Encoder quality for lossy formats
+
+    Returns:
+        (width, height) of the derivative
+    """
+    with PILImage.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+
+        if image_format == "JPEG" and image.mode != "RGB":
+            # Flatten transparency on white (floor plans are drawn on white)
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = PILImage.new("RGB", image.size, "white")
+                background.paste(image, mask=image.split()[-1])
+                image = background
+            else:
+                image = image.convert("RGB")
+
+        if max(image.size) > max_dimension:
+            image.thumbnail((max_dimension, max_dimension), PILImage.LANCZOS)
+
+        save_kwargs = {"optimize": True}
+        if image_format in ("JPEG", "WEBP"):
+            save_kwargs["quality"] = quality
+
+        temp_path = f"{output_path}.tmp"
+        image.save(temp_path, format=image_format, **save_kwargs)
+        os.replace(temp_path, output_path)
+        return image.size
+
+
+def fits_profile(source_path: str, max_dimension: int) -> bool:
+    """Checks if an image can be uploaded as is: within the size limit and upright (no EXIF rotation)"""
+    with PILImage.open(source_path) as image:
+        return max(image.size) <= max_dimension and image.getexif().get(0x0112, 1) == 1
+
+
+class ImageDerivativeCache:
+    """Caches model-ready image derivatives and reports upload savings"""
+
+    def __init__(self, cache_dir: str = "image_cache/", enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled and PIL_AVAILABLE
+        self._hash_memo: Dict[Tuple[str, float, int], str] = {}
+        self.records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def _source_hash(self, source_path: str) -> str:
+        """Returns the content hash of a source file, memoized by mtime and size"""
+        stat = os.stat(source_path)
+        key = (os.path.abspath(source_path), stat.st_mtime, stat.st_size)
+        if key not in self._hash_memo:
+            self._hash_memo[key] = file_sha256(source_path)
+        return self._hash_memo[key]
+
+    def derivative_path(self, source_path: str, profile: str = "embedding") -> str:
+        """
+        Returns the path of the model-ready derivative, creating it if needed.
+
+        Falls back to the original path when caching is disabled, the source
+        is not a local file (e.g. gs:// URIs), preprocessing fails or the
+        derivative would be larger than a source that already fits the profile.
+
+        Args:
+            source_path: Original image path or URI
+            profile: Key of MODEL_IMAGE_PROFILES
+
+        Returns:
+            Path that should be uploaded to the API
+        """
+        if not self.enabled or not os.path.isfile(source_path):
+            return source_path
+
+        params = MODEL_IMAGE_PROFILES[profile]
+        params_key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:8]
+
+        try:
+            source_hash = self._source_hash(source_path)
+            extension = FORMAT_EXTENSIONS[params["format"]]
+            output_path = os.path.join(self.cache_dir, f"{source_hash[:20]}_{params_key}{extension}")
+
+            record = {
+                "source_path": source_path,
+                "profile": profile,
+                "derivative_path": output_path,
+                "source_bytes": os.path.getsize(source_path),
+                "cache_hit": os.path.exists(output_path),
+                "upload_seconds": [],
+            }
+
+            if not record["cache_hit"]:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                start = time.perf_counter()
+                normalize_image(source_path, output_path, params["max_dimension"],
+                                params["format"], params["quality"])
+                record["preprocess_seconds"] = time.perf_counter() - start
+
+            record["derivative_bytes"] = os.path.getsize(output_path)
+            # Re-encoding a small, already compact source (e.g. a flat PNG) can make it larger
+            if (record["derivative_bytes"] >= record["source_bytes"]
+                    and fits_profile(source_path, params["max_dimension"])):
+                record["derivative_path"] = output_path = source_path
+                record["derivative_bytes"] = record["source_bytes"]
+            previous = self.records.get((source_path, profile))
+            if previous:
+                record["upload_seconds"] = previous["upload_seconds"]
+            self.records[(source_path, profile)] = record
+            return output_path
+
+        except Exception as e:
+            print(f"  ⚠️  Image preprocessing failed for {os.path.basename(source_path)}: {e}")
+            return source_path
+
+    def record_upload(self, source_path: str, profile: str, seconds: float) -> None:
+        """Records the latency of an API call that uploaded the derivative"""
+        record = self.records.get((source_path, profile))
+        if record is not None:
+            record["upload_seconds"].append(seconds)
+
+    def get_report(self) -> List[Dict[str, Any]]:
+        """Returns bytes saved and upload latency per image and profile"""
+        report = []
+        for record in self.records.values():
+            uploads = record["upload_seconds"]
+            report.append({
+                "source_path": record["source_path"],
+                "profile": record["profile"],
+                "source_bytes": record["source_bytes"],
+                "derivative_bytes": record["derivative_bytes"],
+                "bytes_saved": record["source_bytes"] - record["derivative_bytes"],
+                "cache_hit": record["cache_hit"],
+                "uploads": len(uploads),
+                "avg_upload_seconds": (sum(uploads) / len(uploads)) if uploads else None,
+            })
+        return report
+
+    def display_report(self) -> None:
+        """Displays the preprocessing report"""
+        report = self.get_report()
+        if not report:
+            return
+
+        print("\n🗜️  IMAGE PREPROCESSING REPORT")
+        print("=" * 60)
+        for entry in report:
+            latency = entry["avg_upload_seconds"]
+            latency_text = f"{latency * 1000:.0f} ms" if latency is not None else "n/a"
+            print(f"  {os.path.basename(entry['source_path'])} [{entry['profile']}]: "
+                  f"{entry['source_bytes'] / 1024:.0f} KB → {entry['derivative_bytes'] / 1024:.0f} KB "
+                  f"(saved {entry['bytes_saved'] / 1024:.0f} KB), upload {latency_text}"
+                  f"{' (cached)' if entry['cache_hit'] else ''}")
+
+        total_saved = sum(entry["bytes_saved"] for entry in report)
+        print(f"  📊 Total saved: {total_saved / 1024:.0f} KB over {len(report)} uploads")
+        print("=" * 60)
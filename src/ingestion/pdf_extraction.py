@@ -0,0 +1,256 @@
+"""
+PDF Image Extraction Engine
+===========================
+
+This module extracts embedded images (and optionally full-page renders)
+from PDFs for the multimodal RAG system.
+
+- Pages are split into ranges processed by a process pool
+- Each image xref is extracted once, even when reused across pages
+- Identical images stored under different xrefs are written once (content hash)
+- PNGs are only rewritten when their content changes
+- PDFs whose hash and parameters are unchanged since the last run are
+  skipped entirely, based on a JSON manifest in the output folder
+"""
+
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# Try to import PyMuPDF, but don't fail if not available
+try:
+    import fitz
+    FITZ_AVAILABLE = True
+except ImportError:
+    FITZ_AVAILABLE = False
+    print("⚠️  PyMuPDF not available. Install with: pip install pymupdf")
+
+from .image_preprocessing import file_sha256
+
+MANIFEST_FILENAME = ".pdf_extraction_manifest.json"
+
+# Work item: (page_num, img_index, xref) for embedded images, xref=None for page renders
+WorkItem = Tuple[int, int, Optional[int]]
+
+
+def _split_ranges(items: List[Any], parts: int) -> List[List[Any]]:
+    """Splits a list into at most `parts` contiguous chunks"""
+    parts = max(1, min(parts, len(items)))
+    size, remainder = divmod(len(items), parts)
+    chunks, start = [], 0
+    for index in range(parts):
+        end = start + size + (1 if index < remainder else 0)
+        chunks.append(items[start:end])
+        start = end
+    return [chunk for chunk in chunks if chunk]
+
+
+def _extract_work_items(pdf_path: str, work_items: List[WorkItem], dpi: int) -> List[Dict[str, Any]]:
+    """
+    Extracts a chunk of images in a worker process.
+
+    Returns:
+        List of dicts with page_num, img_index, xref, sha256 and png bytes
+        (or error for items that failed)
+    """
+    results = []
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num, img_index, xref in work_items:
+            try:
+                if xref is None:
+                    pix = doc[page_num].get_pixmap(dpi=dpi)
+                else:
+                    pix = fitz.Pixmap(doc, xref)
+                    # Convert to RGB if necessary
+                    if pix.colorspace and pix.colorspace.n > 3:
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+                    elif pix.alpha and not pix.colorspace:
+                        pix = fitz.Pixmap(pix, 0)
+
+                png_bytes = pix.tobytes("png")
+                results.append({
+                    "page_num": page_num,
+                    "img_index": img_index,
+                    "xref": xref,
+                    "sha256": hashlib.sha256(png_bytes).hexdigest(),
+                    "png": png_bytes,
+                })
+                pix = None  # Free memory
+            except Exception as e:
+                results.append({"page_num": page_num, "img_index": img_index, "xref": xref, "error": str(e)})
+    finally:
+        doc.close()
+    return results
+
+
+class PDFImageExtractor:
+    """Parallel, incremental extractor of PDF images"""
+
+    def __init__(
+        self,
+        output_dir: str = "images/",
+        workers: Optional[int] = None,
+        render_pages: bool = False,
+        dpi: int = 150,
+        manifest_path: Optional[str] = None,
+    ):
+        self.output_dir = output_dir
+        self.workers = workers or max(1, min(4, os.cpu_count() or 1))
+        self.render_pages = render_pages
+        self.dpi = dpi
+        self.manifest_path = manifest_path or os.path.join(output_dir, MANIFEST_FILENAME)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Loads the extraction manifest (empty if missing or unreadable)"""
+        try:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️  Could not read extraction manifest: {e}")
+        return {}
+
+    def _save_manifest(self) -> None:
+        """Writes the manifest atomically"""
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def _params(self, prefix: str) -> Dict[str, Any]:
+        return {"prefix": prefix, "render_pages": self.render_pages, "dpi": self.dpi if self.render_pages else None}
+
+    def _plan_work(self, doc) -> List[WorkItem]:
+        """Lists the images to extract, keeping only the first use of each xref"""
+        work_items: List[WorkItem] = []
+        seen_xrefs = set()
+
+        for page_num in range(len(doc)):
+            images = doc[page_num].get_images()
+            print(f"📄 Page {page_num + 1}: {len(images)} images found")
+
+            for img_index, img in enumerate(images):
+                xref = img[0]
+                if xref in seen_xrefs:
+                    continue
+                seen_xrefs.add(xref)
+                work_items.append((page_num, img_index, xref))
+
+            if self.render_pages:
+                work_items.append((page_num, -1, None))
+
+        return work_items
+
+    def _output_name(self, prefix: str, page_num: int, img_index: int, xref: Optional[int]) -> str:
+        if xref is None:
+            return f"{prefix}_page_{page_num + 1}_render.png"
+        return f"{prefix}_page_{page_num + 1}_img_{img_index + 1}.png"
+
+    def extract(self, pdf_path: str, prefix: str = "map", force: bool = False) -> List[str]:
+        """
+        Extracts images from one PDF.
+
+        Args:
+            pdf_path: Path to the PDF file
+            prefix: Prefix for the file names
+            force: Ignore the manifest and extract again
+
+        Returns:
+            List of paths to extracted images
+        """
+        print(f"🔍 Processing PDF: {pdf_path}")
+
+        if not FITZ_AVAILABLE:
+            print("❌ PyMuPDF not available - extraction skipped")
+            return []
+
+        if not os.path.exists(pdf_path):
+            print(f"❌ PDF not found: {pdf_path}")
+            return []
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        manifest_key = os.path.abspath(pdf_path)
+        pdf_hash = file_sha256(pdf_path)
+        params = self._params(prefix)
+        previous = self.manifest.get(manifest_key, {})
+
+        if (not force and previous.get("sha256") == pdf_hash and previous.get("params") == params
+                and all(os.path.exists(path) for path in previous.get("outputs", {}))):
+            print(f"⏭️  Unchanged since last run, skipping ({len(previous['outputs'])} images)")
+            return list(previous["outputs"])
+
+        doc = fitz.open(pdf_path)
+        try:
+            print(f"📊 PDF has {len(doc)} pages")
+            work_items = self._plan_work(doc)
+        finally:
+            doc.close()
+
+        if not work_items:
+            print("\n🎉 Total of 0 images extracted!")
+            return []
+
+        # Process pool over page ranges (in-process for small jobs)
+        chunks = _split_ranges(work_items, self.workers)
+        if len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                futures = [executor.submit(_extract_work_items, pdf_path, chunk, self.dpi) for chunk in chunks]
+                results = [item for future in futures for item in future.result()]
+        else:
+            results = _extract_work_items(pdf_path, work_items, self.dpi)
+
+        previous_outputs = previous.get("outputs", {})
+        outputs: Dict[str, str] = {}
+        written_by_hash: Dict[str, str] = {}
+        written, unchanged, duplicates = 0, 0, 0
+
+        for item in results:
+            if "error" in item:
+                print(f"  ❌ Error extracting image {item['img_index']} on page {item['page_num'] + 1}: {item['error']}")
+                continue
+
+            if item["sha256"] in written_by_hash:
+                duplicates += 1
+                continue
+
+            img_path = os.path.join(self.output_dir, self._output_name(prefix, item["page_num"], item["img_index"], item["xref"]))
+            written_by_hash[item["sha256"]] = img_path
+            outputs[img_path] = item["sha256"]
+
+            if previous_outputs.get(img_path) == item["sha256"] and os.path.exists(img_path):
+                unchanged += 1
+                continue
+
+            with open(img_path, "wb") as f:
+                f.write(item["png"])
+            written += 1
+            print(f"  ✅ Extracted: {os.path.basename(img_path)}")
+
+        self.manifest[manifest_key] = {"sha256": pdf_hash, "params": params, "outputs": outputs}
+        self._save_manifest()
+
+        print(f"\n🎉 Total of {len(outputs)} images extracted! "
+              f"({written} written, {unchanged} unchanged, {duplicates} duplicates skipped)")
+        return list(outputs)
+
+    def extract_folder(self, pdf_folder: str, force: bool = False) -> Dict[str, List[str]]:
+        """
+        Extracts images from every PDF in a folder (not recursive).
+
+        The PDF file name (without extension) is used as prefix.
+
+        Returns:
+            Dict mapping PDF path to its extracted images
+        """
+        pdf_paths = sorted(glob.glob(os.path.join(pdf_folder, "*.pdf")) + glob.glob(os.path.join(pdf_folder, "*.PDF")))
+        return {
+            pdf_path: self.extract(pdf_path, os.path.splitext(os.path.basename(pdf_path))[0], force=force)
+            for pdf_path in pdf_paths
+        }
@@ -0,0 +1,148 @@
+"""
+Floor Plan Tiling
+=================
+
+This module splits large floor plans into overlapping tiles so that each
+region gets its own embedding and description. Tiles keep a reference to
+their parent image, which forms the parent-child index used at retrieval
+time to pass only the relevant region into the prompt.
+"""
+
+import hashlib
+import os
+from typing import Any, Dict, List, Tuple
+
+# Try to import Pillow, but don't fail if not available
+try:
+    from PIL import Image as PILImage
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    print("⚠️  Pillow not available. Install with: pip install pillow")
+
+# Default tiling parameters
+DEFAULT_TILE_SIZE = 768
+DEFAULT_TILE_OVERLAP = 0.25
+DEFAULT_MIN_DIMENSION = 1200
+
+
+def compute_tile_boxes(
+    width: int,
+    height: int,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    overlap: float = DEFAULT_TILE_OVERLAP,
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Computes overlapping tile boxes covering an image.
+
+    The last row and column are aligned to the image border, so every tile
+    has the full tile size (unless the image itself is smaller).
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        tile_size: Tile side in pixels
+        overlap: Fraction of the tile shared with its neighbour (0 <= overlap < 1)
+
+    Returns:
+        List of (left, top, right, bottom) boxes in row-major order
+    """
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap must be in the range [0, 1)")
+
+    stride = max(1, int(tile_size * (1 - overlap)))
+
+    def axis_starts(length: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        starts = list(range(0, length - tile_size, stride))
+        starts.append(length - tile_size)
+        return starts
+
+    boxes = []
+    for top in axis_starts(height):
+        for left in axis_starts(width):
+            boxes.append((left, top, min(left + tile_size, width), min(top + tile_size, height)))
+    return boxes
+
+
+def needs_tiling(width: int, height: int, min_dimension: int = DEFAULT_MIN_DIMENSION) -> bool:
+    """Checks if an image is large enough to be split into tiles"""
+    return max(width, height) >= min_dimension
+
+
+def generate_tiles(
+    image_path: str,
+    output_dir: str = "image_tiles/",
+    tile_size: int = DEFAULT_TILE_SIZE,
+    overlap: float = DEFAULT_TILE_OVERLAP,
+    min_dimension: int = DEFAULT_MIN_DIMENSION,
+) -> List[Dict[str, Any]]:
+    """
+    Splits an image into overlapping tiles saved as PNG files.
+
+    Tiles are written outside the watched images folder so they don't
+    trigger another embeddings update. Existing tiles are reused.
+
+    Args:
+        image_path: Path to the parent image
+        output_dir: Directory where tiles are saved
+        tile_size: Tile side in pixels
+        overlap: Fraction of overlap between neighbouring tiles
+        min_dimension: Images whose largest side is smaller are not tiled
+
+    Returns:
+        List of tile records with tile_id, tile_path, parent_img_path,
+        tile_box (left, top, right, bottom) and parent_size (width, height)
+    """
+    if not PIL_AVAILABLE:
+        print("❌ Pillow not available - tiling skipped")
+        return []
+
+    with PILImage.open(image_path) as image:
+        width, height = image.size
+        if not needs_tiling(width, height, min_dimension):
+            return []
+
+        os.makedirs(output_dir, exist_ok=True)
+        # The path hash keeps M1.png and M1.jpeg (or same-named plans in other folders) apart
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        path_hash = hashlib.sha1(os.path.abspath(image_path).encode()).hexdigest()[:8]
+        parent_mtime = os.path.getmtime(image_path)
+
+        tiles = []
+        for index, box in enumerate(compute_tile_boxes(width, height, tile_size, overlap), 1):
+            tile_id = f"{stem}_{path_hash}_tile_{index:02d}"
+            tile_path = os.path.join(output_dir, f"{tile_id}.png")
+
+            if not os.path.exists(tile_path) or os.path.getmtime(tile_path) < parent_mtime:
+                image.crop(box).save(tile_path)
+
+            tiles.append({
+                'tile_id': tile_id,
+                'tile_path': tile_path,
+                'parent_img_path': image_path,
+                'tile_box': box,
+                'parent_size': (width, height),
+            })
+
+    return tiles
+
+
+def describe_tile_position(tile_box: Tuple[int, int, int, int], parent_size: Tuple[int, int]) -> str:
+    """
+    Describes where a tile sits in its parent image (e.g. "upper-left").
+
+    Used to tell Gemini which part of the plan it is looking at.
+    """
+    left, top, right, bottom = tile_box
+    width, height = parent_size
+    center_x = (left + right) / 2 / width
+    center_y = (top + bottom) / 2 / height
+
+    vertical = "upper" if center_y < 1 / 3 else "lower" if center_y > 2 / 3 else "middle"
+    horizontal = "left" if center_x < 1 / 3 else "right" if center_x > 2 / 3 else "center"
+
+    if vertical == "middle" and horizontal == "center":
+        return "center"
+    return f"{vertical}-{horizontal}"
@@ -0,0 +1,52 @@
+"""
+Navigation Module
+=================
+
+This module contains the server-side routing components for the campus
+map: the weighted corridor graph, the precomputed route tables, the
+shortest-path routing engine, the accessibility routing profiles, the
+hierarchical multi-floor campus graph, runtime graph edits and closures,
+batch routing, k-shortest alternative routes, multi-stop routes,
+walk-time isochrones, nearest-amenity queries, the navigation bundle
+compiler, the versioned building config store, the fuzzy room name
+index, the route geometry service, the floor plan room geometry index,
+the SVG ↔ map coordinate transforms and the spatial index used to snap
+map positions to nodes and rooms.
+"""
+
+from .graph import NavigationGraph
+from .routing import RoutingEngine
+from .profiles import DEFAULT_PROFILE, ROUTING_PROFILES, detect_profile, normalize_profile, profile_weight
+from .route_tables import RouteTables, corridor_source_hash, load_or_build_route_tables
+from .campus import CampusGraph, load_building_configs, merge_building_configs
+from .dynamic import GraphEditor
+from .batch import route_batch
+from .alternatives import AlternativeRoutes, k_shortest_paths
+from .multistop import held_karp, plan_multi_stop, two_opt
+from .isochrones import IsochroneService, isochrone_bands
+from .amenities import AmenityIndex, detect_amenity, is_nearest_request
+from .bundle import decode_bundle, encode_bundle, load_bundle, write_bundle
+from .compiler import build_navigation_bundle, compile_navigation_bundle, load_node_spreadsheet
+from .config_store import BuildingConfigStore, ConfigSnapshot, ConfigVersionConflict
+from .room_search import RoomNameIndex
+from .geometry import RouteGeometryService, douglas_peucker, tolerance_for_zoom
+from .spatial import SpatialIndex
+from .floorplan import FloorPlanOverlay, load_building_outlines, load_svg_rooms, load_svg_shapes
+from .floorplan_index import build_floor_plan_index, index_floor_plan
+from .transform import PlanTransform, fit_affine, fit_homography
+from .snapping import LocationSnapper
+from .geo import haversine_m, linestring_length_m
+
+__all__ = ['NavigationGraph', 'RoutingEngine', 'DEFAULT_PROFILE', 'ROUTING_PROFILES', 'detect_profile',
+           'normalize_profile', 'profile_weight', 'RouteTables', 'corridor_source_hash',
+           'load_or_build_route_tables', 'CampusGraph', 'load_building_configs', 'merge_building_configs', 'GraphEditor', 'route_batch',
+           'AlternativeRoutes', 'k_shortest_paths', 'held_karp', 'plan_multi_stop', 'two_opt',
+           'IsochroneService', 'isochrone_bands',
+           'AmenityIndex', 'detect_amenity', 'is_nearest_request',
+           'decode_bundle', 'encode_bundle', 'load_bundle', 'write_bundle', 'build_navigation_bundle',
+           'compile_navigation_bundle', 'load_node_spreadsheet',
+           'BuildingConfigStore', 'ConfigSnapshot', 'ConfigVersionConflict', 'RoomNameIndex',
+           'RouteGeometryService', 'douglas_peucker', 'tolerance_for_zoom', 'SpatialIndex',
+           'FloorPlanOverlay', 'load_building_outlines', 'load_svg_rooms', 'load_svg_shapes',
+           'build_floor_plan_index', 'index_floor_plan', 'PlanTransform', 'fit_affine', 'fit_homography',
+           'LocationSnapper', 'haversine_m', 'linestring_length_m']
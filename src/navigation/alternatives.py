@@ -0,0 +1,145 @@
+"""
+Alternative Routes
+==================
+
+This module finds the k shortest loopless paths between two nodes of the
+campus graph (Yen's algorithm), for when the best route is not usable: a
+corridor blocked for an event, a crowded atrium, ...
+
+Each candidate is produced by a spur search that leaves the previous
+paths at one node, with the root nodes and the edges already taken from
+that root excluded. A diversity constraint drops candidates that share
+too much of their length with an accepted route, so the alternatives are
+real detours rather than the same route with one corner cut differently.
+
+Results are cached per (start, end, k, profile, max overlap) and dropped
+when the graph version changes.
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .cache import VersionedLRUCache
+from .campus import CampusGraph
+from .geometry import pair_key
+from .profiles import DEFAULT_PROFILE
+
+# Largest share of a route's length that may overlap an accepted route
+DEFAULT_MAX_OVERLAP = 0.7
+# Spur rounds per requested route before giving up on finding k diverse routes
+CANDIDATES_PER_ROUTE = 10
+DEFAULT_CACHE_SIZE = 256
+
+
+def overlap_ratio(campus: CampusGraph, path: Sequence[str], other: Sequence[str],
+                  profile: str = DEFAULT_PROFILE) -> float:
+    """Share of the path's weighted length that runs over edges of the other path"""
+    length = campus.path_length(path, profile)
+    if not length or length == float("inf"):
+        return 1.0
+    other_edges = {pair_key(a, b) for a, b in zip(other, other[1:])}
+    shared = [(a, b) for a, b in zip(path, path[1:]) if pair_key(a, b) in other_edges]
+    return sum(campus.path_length(edge, profile) for edge in shared) / length
+
+
+def _search_path(campus: CampusGraph, source: str, target: str, profile: str,
+                 excluded_nodes: Optional[Set[str]] = None,
+                 excluded_edges: Optional[Set[Tuple[str, str]]] = None) -> Optional[List[str]]:
+    distances, previous = campus.shortest_path_tree(source, profile, [target], excluded_nodes, excluded_edges)
+    if target not in distances:
+        return None
+    path = [target]
+    while path[-1] != source:
+        path.append(previous[path[-1]])
+    return path[::-1]
+
+
+def k_shortest_paths(
+    campus: CampusGraph,
+    source: str,
+    target: str,
+    k: int = 3,
+    profile: str = DEFAULT_PROFILE,
+    max_overlap: float = DEFAULT_MAX_OVERLAP,
+    max_candidates: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Up to k loopless paths in increasing length, each overlapping every
+    shorter accepted path by at most max_overlap of its length.
+
+    Args:
+        campus: The campus graph
+        source: Start node
+        target: Destination node
+        k: Number of routes wanted
+        profile: Routing profile (see ROUTING_PROFILES)
+        max_overlap: Diversity constraint, 1.0 disables it
+        max_candidates: Paths examined before giving up (default k * CANDIDATES_PER_ROUTE)
+
+    Returns:
+        [{path, distance_m, cost, overlap}], lowest profile-weighted cost
+        first; distance_m is the length in meters, overlap the largest share
+        with a cheaper route (0 for the first one)
+    """
+    if k < 1 or source not in campus or target not in campus:
+        return []
+    first = _search_path(campus, source, target, profile)
+    if first is None:
+        return []
+
+    accepted = [{"path": first, "cost": campus.path_length(first, profile), "overlap": 0.0}]
+    examined = [first]  # Every path taken out of the candidates, accepted or not, is spurred from
+    seen = {tuple(first)}
+    candidates: List[Tuple[float, int, Tuple[str, ...]]] = []
+    limit = max_candidates or k * CANDIDATES_PER_ROUTE
+
+    while len(accepted) < k and len(examined) < limit:
+        last = examined[-1]
+        for i in range(len(last) - 1):
+            root = last[:i + 1]
+            excluded_edges = {(path[i], path[i + 1]) for path in examined
+                              if len(path) > i + 1 and path[:i + 1] == root}
+            spur = _search_path(campus, last[i], target, profile, set(root[:-1]), excluded_edges)
+            if spur is None:
+                continue
+            candidate = tuple(root[:-1] + spur)
+            if candidate not in seen:
+                seen.add(candidate)
+                heapq.heappush(candidates, (campus.path_length(candidate, profile), len(candidate), candidate))
+
+        if not candidates:
+            break
+        cost, _, candidate = heapq.heappop(candidates)
+        path = list(candidate)
+        examined.append(path)
+        overlap = max(overlap_ratio(campus, path, route["path"], profile) for route in accepted)
+        if overlap <= max_overlap:
+            accepted.append({"path": path, "cost": cost, "overlap": overlap})
+
+    return [{"path": route["path"], "distance_m": round(campus.path_distance_m(route["path"]), 2),
+             "cost": round(route["cost"], 2), "overlap": round(route["overlap"], 3)} for route in accepted]
+
+
+class AlternativeRoutes:
+    """k-shortest-path queries over a campus graph, cached until the graph version changes"""
+
+    def __init__(self, campus: CampusGraph, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.campus = campus
+        self._cache = VersionedLRUCache(cache_size, campus.version)
+
+    def find(self, source: str, target: str, k: int = 3, profile: str = DEFAULT_PROFILE,
+             max_overlap: float = DEFAULT_MAX_OVERLAP) -> List[Dict[str, Any]]:
+        """Cached k_shortest_paths between two nodes"""
+        key = (source, target, k, profile, max_overlap)
+        version = self.campus.version
+        cached = self._cache.get(key, version)
+        if cached is not None:
+            return cached
+
+        routes = k_shortest_paths(self.campus, source, target, k, profile, max_overlap)
+        self._cache.put(key, routes, version)
+        return routes
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        return self._cache.info()
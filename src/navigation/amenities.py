@@ -0,0 +1,139 @@
+"""
+Nearest Amenities
+=================
+
+This module answers "nearest washroom", "closest exit" or "closest
+elevator" queries. Rooms are tagged with amenity categories from their
+IDs and descriptions (Bathroom-Men, "Exit 1 - South Entrance", ...), and
+for every category and routing profile a multi-source shortest-path
+field (a graph Voronoi partition) is precomputed over the campus graph:
+each node stores its distance to the nearest instance, the instance and
+the next node on the way there.
+
+A query is then a dictionary lookup, and the route is read by following
+the next nodes.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .campus import CampusGraph
+from .profiles import DEFAULT_PROFILE, ROUTING_PROFILES
+
+# Category → words of the room ID or description that tag it (any of), and words it also requires (all of)
+AMENITY_CATEGORIES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "bathroom": {"keywords": ("bathroom", "restroom", "washroom", "toilet", "lavatory"), "requires": ()},
+    "accessible_bathroom": {"keywords": ("bathroom", "restroom", "washroom", "toilet"), "requires": ("accessible",)},
+    "elevator": {"keywords": ("elevator", "lift"), "requires": ()},
+    "stairs": {"keywords": ("stairs", "stairwell", "staircase"), "requires": ()},
+    "exit": {"keywords": ("exit",), "requires": ()},
+    "entrance": {"keywords": ("entrance",), "requires": ()},
+}
+
+# Words of a query that name a category (English and Portuguese)
+QUERY_WORDS = {
+    "bathroom": "bathroom", "bathrooms": "bathroom", "restroom": "bathroom", "restrooms": "bathroom",
+    "washroom": "bathroom", "washrooms": "bathroom", "toilet": "bathroom", "toilets": "bathroom",
+    "wc": "bathroom", "banheiro": "bathroom",
+    "elevator": "elevator", "elevators": "elevator", "lift": "elevator", "elevador": "elevator",
+    "stairs": "stairs", "stairwell": "stairs", "staircase": "stairs", "escada": "stairs", "escadas": "stairs",
+    "exit": "exit", "exits": "exit", "saida": "exit", "saída": "exit",
+    "entrance": "entrance", "entrances": "entrance", "entrada": "entrance",
+}
+
+NEAREST_WORDS = ("nearest", "closest", "nearby", "near me", "close to me", "mais proximo", "mais próximo",
+                 "mais perto", "any")
+
+_WORD_PATTERN = re.compile(r"[a-zà-ú]+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_PATTERN.findall(text.lower().replace("-", " ").replace("_", " "))
+
+
+def room_categories(room_id: str, description: str = "") -> List[str]:
+    """Amenity categories of a room, from its ID and description"""
+    words = set(_words(f"{room_id} {description}"))
+    return [category for category, rule in AMENITY_CATEGORIES.items()
+            if words & set(rule["keywords"]) and set(rule["requires"]) <= words]
+
+
+def detect_amenity(text: str) -> Optional[str]:
+    """Category named in a text ('accessible washroom' → accessible_bathroom), or None"""
+    words = _words(text)
+    category = next((QUERY_WORDS[word] for word in words if word in QUERY_WORDS), None)
+    if category == "bathroom" and "accessible" in words:
+        return "accessible_bathroom"
+    return category
+
+
+def is_nearest_request(text: str) -> bool:
+    """Whether a message asks for the nearest instance of an amenity"""
+    words = f" {' '.join(_words(text))} "
+    return detect_amenity(text) is not None and any(f" {phrase} " in words for phrase in NEAREST_WORDS)
+
+
+class AmenityIndex:
+    """Precomputed nearest-amenity fields of a campus graph, per category and profile"""
+
+    def __init__(self, campus: CampusGraph, instances: Dict[str, Dict[str, List[str]]]):
+        """
+        Args:
+            campus: The campus graph
+            instances: Category → {node: [room IDs at that node]}
+        """
+        self.campus = campus
+        self.instances = instances
+        # fields[profile][category] = (distances, next node, nearest instance node)
+        self.fields: Dict[str, Dict[str, Tuple[Dict[str, float], Dict[str, str], Dict[str, str]]]] = {
+            profile: {category: campus.nearest_source_field(list(nodes), profile)
+                      for category, nodes in instances.items()}
+            for profile in ROUTING_PROFILES
+        }
+
+    @classmethod
+    def from_config(cls, campus: CampusGraph, navigation_config: Dict[str, Any]) -> "AmenityIndex":
+        """Tags the mapped rooms of a merged building config and precomputes the fields"""
+        descriptions = navigation_config.get("roomDescriptions", {})
+        instances: Dict[str, Dict[str, List[str]]] = {}
+        for room_id, node_id in sorted(navigation_config.get("roomToNode", {}).items()):
+            if node_id not in campus:
+                continue
+            description = descriptions.get(room_id)
+            for category in room_categories(room_id, description if isinstance(description, str) else ""):
+                instances.setdefault(category, {}).setdefault(node_id, []).append(room_id)
+        return cls(campus, instances)
+
+    def categories(self) -> Dict[str, List[str]]:
+        """Category → room IDs of its instances"""
+        return {category: sorted(room for rooms in nodes.values() for room in rooms)
+                for category, nodes in sorted(self.instances.items())}
+
+    def nearest(self, node_id: str, category: str, profile: str = DEFAULT_PROFILE) -> Optional[Dict[str, Any]]:
+        """
+        Nearest instance of a category from a node.
+
+        Returns:
+            {category, room, node, distance_m, cost, path}, or None if the
+            category has no reachable instance; the nearest instance is the
+            one with the lowest profile-weighted cost
+        """
+        field = self.fields.get(profile, {}).get(category)
+        if field is None:
+            return None
+        distances, next_node, nearest = field
+        if node_id not in distances:
+            return None
+
+        path = [node_id]
+        while path[-1] in next_node:
+            path.append(next_node[path[-1]])
+        target = nearest[node_id]
+        return {
+            "category": category,
+            "room": self.instances[category][target][0],
+            "node": target,
+            "distance_m": round(self.campus.path_distance_m(path), 2),
+            "cost": round(distances[node_id], 2),
+            "path": path,
+        }
@@ -0,0 +1,91 @@
+"""
+Batch Routing
+=============
+
+This module computes many routes at once (kiosk signage, precomputed
+directions, analytics). Requests are resolved to nodes, grouped by
+(profile, start node), and each group is answered by one single-source
+search over the campus graph instead of one search per route.
+
+Results are compact ({index, start, end, profile, path, distance_m, cost}
+or {index, start, end, error}) and are yielded group by group, so large
+batches can be streamed as they are computed.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .campus import CampusGraph
+from .profiles import DEFAULT_PROFILE, normalize_profile
+
+
+def parse_batch_item(item: Any, default_profile: str = DEFAULT_PROFILE) -> Tuple[str, str, str]:
+    """
+    Reads one batch entry: {start, end, profile?} or [start, end, profile?].
+
+    Raises:
+        ValueError: If start or end is missing or the profile is unknown
+    """
+    if isinstance(item, dict):
+        start, end, profile = item.get("start"), item.get("end"), item.get("profile")
+    elif isinstance(item, (list, tuple)) and 2 <= len(item) <= 3:
+        start, end, profile = item[0], item[1], item[2] if len(item) == 3 else None
+    else:
+        raise ValueError("Each route must be {start, end, profile} or [start, end, profile]")
+    if not start or not end:
+        raise ValueError("start and end required")
+    return str(start), str(end), normalize_profile(profile) if profile else default_profile
+
+
+def route_batch(
+    campus: CampusGraph,
+    items: Sequence[Any],
+    default_profile: str = DEFAULT_PROFILE,
+    resolve_name: Optional[Callable[[str], Optional[str]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Computes a batch of routes, one shortest-path search per (profile, start node).
+
+    Args:
+        campus: The campus graph
+        items: Route requests (see parse_batch_item)
+        default_profile: Profile of the requests that do not name one
+        resolve_name: Maps free-text room names to room IDs (None if unknown)
+
+    Yields:
+        One result per request, in group order; 'index' is the request's position
+    """
+    resolved: Dict[str, Optional[str]] = {}
+
+    def node_for(name: str) -> Optional[str]:
+        if name not in resolved:
+            node = campus.resolve(name)
+            if node is None and resolve_name is not None:
+                room = resolve_name(name)
+                node = campus.resolve(room) if room else None
+            resolved[name] = node
+        return resolved[name]
+
+    groups: Dict[Tuple[str, str], List[Tuple[int, str, str, str]]] = {}
+    for index, item in enumerate(items):
+        try:
+            start, end, profile = parse_batch_item(item, default_profile)
+        except ValueError as e:
+            yield {"index": index, "error": str(e)}
+            continue
+
+        start_node, end_node = node_for(start), node_for(end)
+        unknown = [name for name, node in ((start, start_node), (end, end_node)) if node is None]
+        if unknown:
+            yield {"index": index, "start": start, "end": end, "error": f"Unknown location: {', '.join(unknown)}"}
+            continue
+        groups.setdefault((profile, start_node), []).append((index, start, end, end_node))
+
+    for (profile, source), requests in groups.items():
+        paths = campus.shortest_paths(source, list({end_node for _, _, _, end_node in requests}), profile)
+        for index, start, end, end_node in requests:
+            path, cost = paths[end_node]
+            if path is None:
+                yield {"index": index, "start": start, "end": end, "profile": profile, "error": "No route found"}
+            else:
+                yield {"index": index, "start": start, "end": end, "profile": profile, "path": path,
+                       "distance_m": round(campus.path_distance_m(path), 2), "cost": round(cost, 2)}
@@ -0,0 +1,244 @@
+"""
+Navigation Bundle
+=================
+
+This module defines the compiled navigation bundle: one compact JSON
+document with everything the routing code and the map client need
+(nodes, edges, weights, corridor geometry, transfers and room mappings),
+produced by the bundle compiler (see compiler.py) and versioned by its
+content.
+
+Layout (columnar, indices instead of repeated node IDs):
+
+    nodes:      {ids, floors (index into 'floors'), x, y (grid units from
+                 origin, null when unpositioned), objects}
+    edges:      [[a, b, weight_cm, kind, geometry index or -1], ...]
+    kinds:      [{segmentType, accessibility, source}, ...]
+    geometry:   delta-encoded integer rings [x0, y0, dx1, dy1, ...]
+    transfers:  [[a, b, weight_cm, type, id], ...]
+    rooms:      {room_id: node index}, roomBuilding: {room_id: building}
+
+Coordinates use a 1e-7 degree grid (~1 cm) relative to 'origin'.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+BUNDLE_FORMAT = "navigation-bundle"
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_SCALE = 10 ** 7
+MANIFEST_FILE = "manifest.json"
+
+
+def _encode_line(coordinates: Sequence[Sequence[float]], origin: Sequence[float]) -> List[int]:
+    encoded, previous = [], (0, 0)
+    for lng, lat in (p[:2] for p in coordinates):
+        x, y = round((lng - origin[0]) * BUNDLE_SCALE), round((lat - origin[1]) * BUNDLE_SCALE)
+        encoded.extend((x - previous[0], y - previous[1]))
+        previous = (x, y)
+    return encoded
+
+
+def _decode_line(encoded: Sequence[int], origin: Sequence[float]) -> List[List[float]]:
+    coordinates, x, y = [], 0, 0
+    for i in range(0, len(encoded), 2):
+        x += encoded[i]
+        y += encoded[i + 1]
+        coordinates.append([origin[0] + x / BUNDLE_SCALE, origin[1] + y / BUNDLE_SCALE])
+    return coordinates
+
+
+def encode_bundle(
+    floors: Dict[str, Any],
+    transfers: Sequence[Dict[str, Any]],
+    room_to_node: Dict[str, str],
+    room_building: Optional[Dict[str, str]] = None,
+    node_objects: Optional[Dict[str, List[Dict[str, str]]]] = None,
+    report: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Encodes floor graphs into a bundle.
+
+    Args:
+        floors: Floor key → NavigationGraph
+        transfers: Transfer edges ({type, id, weight, nodes: (a, b)})
+        room_to_node: Room ID → node ID
+        room_building: Room ID → building code
+        node_objects: Node ID → objects the node represents ([{id, type}])
+        report: Validation report stored with the bundle
+
+    Returns:
+        The bundle, with 'version' set to a hash of its content
+    """
+    node_ids = sorted(node_id for graph in floors.values() for node_id in graph.nodes)
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    floor_keys = sorted(floors)
+    floor_of = {node_id: floor_key for floor_key, graph in floors.items() for node_id in graph.nodes}
+    positions = [floors[floor_of[node_id]].nodes[node_id] for node_id in node_ids]
+    positioned = [(node["lng"], node["lat"]) for node in positions if node["lng"] is not None]
+    origin = [min(p[0] for p in positioned), min(p[1] for p in positioned)] if positioned else [0.0, 0.0]
+
+    def grid(value, axis):
+        return None if value is None else round((value - origin[axis]) * BUNDLE_SCALE)
+
+    kinds: List[Dict[str, Any]] = []
+    kind_index: Dict[Tuple, int] = {}
+    edges, geometry = [], []
+    for floor_key in floor_keys:
+        graph = floors[floor_key]
+        seen = set()
+        for a in sorted(graph.adjacency):
+            for b, edge in sorted(graph.adjacency[a].items()):
+                if (b, a) in seen:
+                    continue
+                seen.add((a, b))
+                kind = {"segmentType": edge.get("segmentType") or "corridor",
+                        "accessibility": edge.get("accessibility"), "source": edge.get("source", "corridor")}
+                key = tuple(sorted(kind.items(), key=lambda item: item[0]))
+                if key not in kind_index:
+                    kind_index[key] = len(kinds)
+                    kinds.append(kind)
+                geometry_index = -1
+                if edge.get("coordinates"):
+                    geometry_index = len(geometry)
+                    geometry.append(_encode_line(edge["coordinates"], origin))
+                start, end = edge["start"], edge["end"]
+                edges.append([index[start], index[end], round(edge["weight"] * 100), kind_index[key], geometry_index])
+
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "formatVersion": BUNDLE_FORMAT_VERSION,
+        "scale": BUNDLE_SCALE,
+        "origin": origin,
+        "floors": floor_keys,
+        "nodes": {
+            "ids": node_ids,
+            "floors": [floor_keys.index(floor_of[node_id]) for node_id in node_ids],
+            "x": [grid(node["lng"], 0) for node in positions],
+            "y": [grid(node["lat"], 1) for node in positions],
+            "objects": {node_id: objects for node_id, objects in sorted((node_objects or {}).items())
+                        if node_id in index and objects},
+        },
+        "kinds": kinds,
+        "edges": edges,
+        "geometry": geometry,
+        "transfers": sorted(
+            [index[t["nodes"][0]], index[t["nodes"][1]], round(t["weight"] * 100), t["type"], t.get("id", "")]
+            for t in transfers if t["nodes"][0] in index and t["nodes"][1] in index
+        ),
+        "rooms": {room: index[node] for room, node in sorted(room_to_node.items()) if node in index},
+        "roomBuilding": dict(sorted((room_building or {}).items())),
+    }
+    content = json.dumps(bundle, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    bundle["version"] = hashlib.sha256(content).hexdigest()[:16]
+    bundle["report"] = report or {}
+    return bundle
+
+
+def decode_bundle(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decodes a bundle into plain structures.
+
+    Returns:
+        {nodes: {id: {floor, lng, lat}}, edges: [{start, end, weight,
+        coordinates, segmentType, accessibility, source, floor}],
+        transfers: [{type, id, weight, nodes}], roomToNode, roomBuilding}
+    """
+    if bundle.get("format") != BUNDLE_FORMAT or bundle.get("formatVersion") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported navigation bundle format: {bundle.get('format')} v{bundle.get('formatVersion')}")
+
+    origin, scale = bundle["origin"], bundle["scale"]
+    columns = bundle["nodes"]
+    ids = columns["ids"]
+    nodes = {}
+    for i, node_id in enumerate(ids):
+        x, y = columns["x"][i], columns["y"][i]
+        nodes[node_id] = {
+            "floor": bundle["floors"][columns["floors"][i]],
+            "lng": None if x is None else origin[0] + x / scale,
+            "lat": None if y is None else origin[1] + y / scale,
+        }
+
+    edges = []
+    for a, b, weight_cm, kind, geometry_index in bundle["edges"]:
+        edges.append({
+            "start": ids[a],
+            "end": ids[b],
+            "weight": weight_cm / 100,
+            "coordinates": _decode_line(bundle["geometry"][geometry_index], origin) if geometry_index >= 0 else None,
+            "floor": nodes[ids[a]]["floor"],
+            **bundle["kinds"][kind],
+        })
+
+    transfers = [{"type": transfer_type, "id": transfer_id, "weight": weight_cm / 100, "nodes": (ids[a], ids[b])}
+                 for a, b, weight_cm, transfer_type, transfer_id in bundle["transfers"]]
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "transfers": transfers,
+        "roomToNode": {room: ids[i] for room, i in bundle["rooms"].items()},
+        "roomBuilding": dict(bundle.get("roomBuilding", {})),
+    }
+
+
+def _write(path: str, data: bytes) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def bundle_file(version: str) -> str:
+    return f"navigation.{version}.json"
+
+
+def write_bundle(bundle: Dict[str, Any], directory: str) -> Dict[str, Any]:
+    """
+    Writes a bundle (plus a .gz copy) and its manifest, unless the manifest
+    already points at the same version.
+
+    Returns:
+        The manifest {version, file, bytes, gzipBytes, stats, errors, warnings}
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    filename = bundle_file(bundle["version"])
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == bundle["version"] and os.path.exists(os.path.join(directory, filename)):
+            return manifest
+    except (FileNotFoundError, ValueError):
+        pass
+
+    os.makedirs(directory, exist_ok=True)
+    payload = json.dumps(bundle, separators=(",", ":")).encode("utf-8")
+    compressed = gzip.compress(payload, compresslevel=9, mtime=0)
+    _write(os.path.join(directory, filename), payload)
+    _write(os.path.join(directory, f"{filename}.gz"), compressed)
+
+    report = bundle.get("report", {})
+    manifest = {
+        "version": bundle["version"],
+        "file": filename,
+        "bytes": len(payload),
+        "gzipBytes": len(compressed),
+        "stats": report.get("stats", {}),
+        "errors": len(report.get("errors", [])),
+        "warnings": len(report.get("warnings", [])),
+    }
+    _write(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+    return manifest
+
+
+def load_bundle(directory: str) -> Optional[Dict[str, Any]]:
+    """Loads the bundle the manifest of a directory points at (None if there is none)"""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        with open(os.path.join(directory, manifest["file"]), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
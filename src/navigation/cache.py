@@ -0,0 +1,74 @@
+"""
+Query Caches
+============
+
+This module provides the small thread-safe LRU cache shared by the
+navigation services (route geometries, alternative routes, isochrone
+trees). Entries can be tied to a graph version: a lookup with a new
+version drops every entry, and a result computed against an older version
+is not stored.
+
+Lookups and stores are separate so the value is computed outside the
+lock; concurrent misses on the same key may compute it twice.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class VersionedLRUCache:
+    """LRU cache whose entries belong to one graph version"""
+
+    def __init__(self, max_size: int, version: Any = None):
+        self.max_size = max_size
+        self.version = version
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: Any = None,
+            usable: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        Cached value of a key, or None on a miss.
+
+        Args:
+            key: Cache key
+            version: Graph version of the caller; a new version clears the cache
+            usable: Optional check a cached value must pass to count as a hit
+        """
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            value = self._entries.get(key)
+            if value is not None and (usable is None or usable(value)):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, version: Any = None) -> None:
+        """Stores a value computed against a graph version (dropped if the version is stale)"""
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        return {"size": len(self._entries), "max_size": self.max_size, "version": self.version,
+                "hits": self.hits, "misses": self.misses}
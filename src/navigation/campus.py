@@ -0,0 +1,669 @@
+"""
+Campus Routing Graph
+====================
+
+This module models the campus as a hierarchy: one corridor subgraph per
+building floor (e.g. M1, M2, H1) connected by typed transfer edges
+(stairs, elevators and building connections).
+
+Routing uses a floor-level overlay: the nodes with transfer edges
+("portals") form a small overlay graph whose intra-floor edges come from
+each floor's precomputed route tables. A query searches the overlay only,
+then expands each floor leg through the floor tables, so latency depends
+on the number of portals rather than on the size of the campus graph.
+
+Every routing profile (default, step-free, elevator-preferred) gets its
+own floor tables and overlay, built once, so switching profiles per
+request costs nothing.
+"""
+
+import glob
+import heapq
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .bundle import decode_bundle
+from .geometry import RouteGeometryService
+from .graph import NavigationGraph
+from .profiles import DEFAULT_PROFILE, ROUTING_PROFILES, profile_weight
+from .route_tables import RouteTables, load_or_build_route_tables
+from .routing import RoutingEngine
+
+TRANSFER_TYPES = ("stairs", "elevator", "building_connection")
+
+# Transfer costs in meters of equivalent walking
+STAIRS_COST_M_PER_FLOOR = 15.0
+ELEVATOR_BASE_COST_M = 30.0  # waiting for the car
+ELEVATOR_COST_M_PER_FLOOR = 5.0
+BUILDING_CONNECTION_COST_M = 10.0
+
+NODE_ID_PATTERN = re.compile(r"^([A-Za-z]+)(\d+)_")
+
+
+def parse_floor_key(floor_key: str) -> Tuple[str, int]:
+    """Splits a floor key such as 'M1' into ('M', 1)"""
+    match = re.match(r"^([A-Za-z]+)(\d+)$", floor_key)
+    if not match:
+        raise ValueError(f"Invalid floor key: {floor_key}")
+    return match.group(1).upper(), int(match.group(2))
+
+
+def floor_key_for_node(node_id: str) -> Optional[str]:
+    """Derives the floor key from a node ID such as 'M1_Int_1' (None if it has no prefix)"""
+    match = NODE_ID_PATTERN.match(node_id)
+    return f"{match.group(1).upper()}{int(match.group(2))}" if match else None
+
+
+def building_code(building_name: str) -> str:
+    """'Building M' → 'M'"""
+    return building_name.replace("Building", "").strip().upper()
+
+
+def load_building_configs(paths: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads building configurations (config/building_*_rooms.json).
+
+    Each file maps building names (e.g. "Building M") to their rooms,
+    aliases and transfers.
+
+    Returns:
+        Dict mapping building code to its config, with the source file
+        recorded under '_source'
+    """
+    configs = {}
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "r", encoding="utf-8") as f:
+                for building_name, config in json.load(f).items():
+                    configs[building_code(building_name)] = {**config, "_source": path, "_name": building_name}
+    return configs
+
+
+def merge_building_configs(configs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges the per-building configs into one lookup view.
+
+    Room IDs are expected to be unique across buildings; duplicates keep
+    the first building and print a warning.
+    """
+    merged: Dict[str, Any] = {"aliases": {}, "roomToNode": {}, "roomDescriptions": {},
+                              "navigationInstructions": {}, "roomCentersSVG": {}, "roomBuilding": {}}
+
+    for code, config in configs.items():
+        for room_id in config.get("roomToNode", {}):
+            if room_id in merged["roomBuilding"]:
+                print(f"⚠️ Room {room_id} defined in buildings {merged['roomBuilding'][room_id]} and {code}, keeping the first")
+                continue
+            merged["roomBuilding"][room_id] = code
+            merged["roomToNode"][room_id] = config["roomToNode"][room_id]
+
+        for key in ("aliases", "roomDescriptions", "navigationInstructions", "roomCentersSVG"):
+            for name, value in config.get(key, {}).items():
+                merged[key].setdefault(name, value)
+
+    return merged
+
+
+class CampusGraph:
+    """Hierarchical graph: per-floor subgraphs plus typed transfer edges"""
+
+    def __init__(self, floors: Dict[str, NavigationGraph], room_to_node: Optional[Dict[str, str]] = None,
+                 tables: Optional[Dict[str, Dict[str, RouteTables]]] = None):
+        self.floors = floors
+        self.room_to_node: Dict[str, str] = dict(room_to_node or {})
+        self.floor_of: Dict[str, str] = {
+            node_id: floor_key for floor_key, graph in floors.items() for node_id in graph.nodes
+        }
+        # Per-profile floor engines: engines[profile][floor_key]
+        self.engines = {
+            profile: {
+                floor_key: RoutingEngine(graph, (tables or {}).get(profile, {}).get(floor_key), profile)
+                for floor_key, graph in floors.items()
+            }
+            for profile in ROUTING_PROFILES
+        }
+        self.transfers: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.overlays: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.portals: Dict[str, List[str]] = {}
+        self.geometry = RouteGeometryService.from_graphs(floors.values())
+        self.bundle_version: Optional[str] = None
+        # Bumped whenever the graph is changed in place (caches keyed on the graph compare it)
+        self.revision = 0
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.floor_of
+
+    def __len__(self) -> int:
+        return len(self.floor_of)
+
+    @property
+    def edge_count(self) -> int:
+        transfer_edges = sum(len(edges) for edges in self.transfers.values()) // 2
+        return sum(graph.edge_count for graph in self.floors.values()) + transfer_edges
+
+    @property
+    def version(self) -> str:
+        """Version of the graph content: the bundle version plus the in-place revision"""
+        return f"{self.bundle_version or 'sources'}.{self.revision}"
+
+    def edge(self, a: str, b: str) -> Optional[Dict[str, Any]]:
+        """The corridor or transfer edge between two nodes, if any"""
+        floor_key = self.floor_of.get(a)
+        edge = self.floors[floor_key].edge(a, b) if floor_key is not None else None
+        return edge or self.transfers.get(a, {}).get(b)
+
+    def path_length(self, path: Sequence[str], profile: str = DEFAULT_PROFILE) -> float:
+        """Weighted length of a node path for a profile (inf if an edge is missing or not allowed)"""
+        total = 0.0
+        for a, b in zip(path, path[1:]):
+            edge = self.edge(a, b)
+            weight = profile_weight(profile, edge) if edge is not None else None
+            if weight is None:
+                return float("inf")
+            total += weight
+        return total
+
+    def path_distance_m(self, path: Sequence[str]) -> float:
+        """
+        Walking length of a node path in meters, whatever profile chose it:
+        the unweighted corridor lengths plus the transfer costs (the
+        default-profile weights).
+        """
+        return self.path_length(path, DEFAULT_PROFILE)
+
+    def node_location(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """Returns {'building', 'floor'} of a node (from its ID if it isn't traced yet)"""
+        floor_key = self.floor_of.get(node_id) or floor_key_for_node(node_id)
+        if floor_key is None:
+            return None
+        building, floor = parse_floor_key(floor_key)
+        return {"building": building, "floor": floor}
+
+    def resolve(self, location: str) -> Optional[str]:
+        """Maps a room ID or node ID to a graph node (None if unknown)"""
+        if location in self.room_to_node:
+            return self.room_to_node[location]
+        if location in self.floor_of:
+            return location
+        return None
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    def add_transfer(self, a: str, b: str, transfer_type: str, weight: float, transfer_id: str = "") -> None:
+        """Adds an undirected typed transfer edge between two floor nodes"""
+        if transfer_type not in TRANSFER_TYPES:
+            raise ValueError(f"Unknown transfer type '{transfer_type}'. Use one of {TRANSFER_TYPES}")
+        if a not in self.floor_of or b not in self.floor_of:
+            print(f"⚠️ Transfer {transfer_id or transfer_type} skipped: {a} or {b} is not on a mapped floor")
+            return
+
+        edge = {"type": transfer_type, "id": transfer_id, "weight": float(weight), "nodes": (a, b)}
+        self.transfers.setdefault(a, {})[b] = edge
+        self.transfers.setdefault(b, {})[a] = edge
+
+    def add_transfers_from_config(self, transfers: Sequence[Dict[str, Any]]) -> None:
+        """
+        Adds transfers described in a building config.
+
+        Each entry has an id, a type and `nodes`, a mapping of floor key to
+        node (e.g. {"M1": "M1_2", "M2": "M2_2"}). Stairs and elevators link
+        consecutive floors; building connections link every listed node.
+        Floors that are not mapped yet are ignored.
+        """
+        for transfer in transfers:
+            transfer_type = transfer.get("type")
+            transfer_id = transfer.get("id", "")
+            nodes = {key: node for key, node in transfer.get("nodes", {}).items() if node in self.floor_of}
+            if len(nodes) < 2:
+                continue
+
+            if transfer_type in ("stairs", "elevator"):
+                ordered = sorted(nodes.items(), key=lambda item: parse_floor_key(item[0])[1])
+                for (key_a, node_a), (key_b, node_b) in zip(ordered, ordered[1:]):
+                    floors = abs(parse_floor_key(key_b)[1] - parse_floor_key(key_a)[1])
+                    if "cost_m" in transfer:
+                        weight = transfer["cost_m"] * floors
+                    elif transfer_type == "stairs":
+                        weight = STAIRS_COST_M_PER_FLOOR * floors
+                    else:
+                        weight = ELEVATOR_BASE_COST_M + ELEVATOR_COST_M_PER_FLOOR * floors
+                    self.add_transfer(node_a, node_b, transfer_type, weight, transfer_id)
+            else:
+                node_list = list(nodes.values())
+                for i, node_a in enumerate(node_list):
+                    for node_b in node_list[i + 1:]:
+                        weight = transfer.get("cost_m", BUILDING_CONNECTION_COST_M)
+                        self.add_transfer(node_a, node_b, transfer_type, weight, transfer_id)
+
+    def build_overlay(self) -> None:
+        """Connects the portals of each floor with their shortest intra-floor distances, per profile"""
+        self.portals = {}
+        for node_id in self.transfers:
+            self.portals.setdefault(self.floor_of[node_id], []).append(node_id)
+
+        self.overlays = {}
+        for profile, engines in self.engines.items():
+            overlay = {node_id: {} for node_id in self.transfers}
+            for floor_key, portals in self.portals.items():
+                engine = engines[floor_key]
+                for i, a in enumerate(portals):
+                    for b in portals[i + 1:]:
+                        distance = self._floor_distance(engine, a, b)
+                        if distance < float("inf"):
+                            overlay[a][b] = distance
+                            overlay[b][a] = distance
+
+            for a, edges in self.transfers.items():
+                for b, edge in edges.items():
+                    weight = profile_weight(profile, edge)
+                    if weight is not None:
+                        overlay[a][b] = min(overlay[a].get(b, float("inf")), weight)
+
+            self.overlays[profile] = overlay
+
+    @classmethod
+    def from_sources(
+        cls,
+        corridor_paths: Sequence[str],
+        building_configs: Dict[str, Dict[str, Any]],
+        tables_dir: Optional[str] = None,
+        source_hash: str = ""
+    ) -> "CampusGraph":
+        """
+        Builds the campus graph from corridor GeoJSON files and building configs.
+
+        Corridor segments are split into floor subgraphs using the segment's
+        building/floor properties or the node ID prefix (M1_3 → floor M1).
+        Nodes without a prefix (e.g. H_entry) join the floor of the node
+        they connect to.
+
+        Args:
+            corridor_paths: Corridor segments GeoJSON files
+            building_configs: Output of load_building_configs
+            tables_dir: Where per-profile, per-floor route tables are stored (None: no tables)
+            source_hash: Hash of the corridor sources for the tables
+        """
+        features = []
+        for path in corridor_paths:
+            with open(path, "r", encoding="utf-8") as f:
+                features.extend(json.load(f).get("features", []))
+
+        # Assign nodes to floors
+        node_floor: Dict[str, str] = {}
+        pending = []
+        for feature in features:
+            properties = feature.get("properties", {})
+            endpoints = [properties.get("startNode"), properties.get("endNode")]
+            if properties.get("building") and properties.get("floor"):
+                explicit = f"{str(properties['building']).upper()}{int(properties['floor'])}"
+            else:
+                explicit = None
+            for node_id in endpoints:
+                if node_id and (explicit or floor_key_for_node(node_id)):
+                    node_floor.setdefault(node_id, explicit or floor_key_for_node(node_id))
+            pending.append((feature, endpoints))
+
+        for _, (a, b) in pending:
+            if a and b:
+                if a not in node_floor and b in node_floor:
+                    node_floor[a] = node_floor[b]
+                elif b not in node_floor and a in node_floor:
+                    node_floor[b] = node_floor[a]
+
+        # Split features per floor
+        floor_features: Dict[str, List[Dict[str, Any]]] = {}
+        for feature, (a, b) in pending:
+            floor_key = node_floor.get(a) or node_floor.get(b)
+            if floor_key is None:
+                print(f"⚠️ Corridor segment {feature.get('properties', {}).get('name')} has no floor, skipped")
+                continue
+            if a in node_floor and b in node_floor and node_floor[a] != node_floor[b]:
+                print(f"⚠️ Corridor segment {a}-{b} spans floors, use a transfer instead")
+                continue
+            floor_features.setdefault(floor_key, []).append(feature)
+
+        merged = merge_building_configs(building_configs)
+        floors = {
+            floor_key: NavigationGraph.from_corridor_geojson(
+                {"type": "FeatureCollection", "features": floor_feature_list}
+            )
+            for floor_key, floor_feature_list in floor_features.items()
+        }
+
+        tables: Dict[str, Dict[str, RouteTables]] = {}
+        if tables_dir:
+            for profile in ROUTING_PROFILES:
+                tables[profile] = {
+                    floor_key: load_or_build_route_tables(
+                        graph, source_hash, os.path.join(tables_dir, profile, floor_key), profile
+                    )
+                    for floor_key, graph in floors.items()
+                }
+
+        campus = cls(floors, merged["roomToNode"], tables)
+        for config in building_configs.values():
+            campus.add_transfers_from_config(config.get("transfers", []))
+        campus.build_overlay()
+        return campus
+
+    @classmethod
+    def from_bundle(cls, bundle: Dict[str, Any], tables_dir: Optional[str] = None) -> "CampusGraph":
+        """
+        Builds the campus graph from a compiled navigation bundle (see
+        bundle.py); route tables are keyed by the bundle version.
+
+        Args:
+            bundle: The navigation bundle
+            tables_dir: Where per-profile, per-floor route tables are stored (None: no tables)
+        """
+        decoded = decode_bundle(bundle)
+        floors: Dict[str, NavigationGraph] = {}
+        for node_id, node in decoded["nodes"].items():
+            floors.setdefault(node["floor"], NavigationGraph()).add_node(node_id, node["lng"], node["lat"])
+        for edge in decoded["edges"]:
+            floors[edge.pop("floor")].add_edge(edge.pop("start"), edge.pop("end"), edge.pop("weight"),
+                                               edge.pop("coordinates"), **edge)
+
+        tables: Dict[str, Dict[str, RouteTables]] = {}
+        if tables_dir:
+            for profile in ROUTING_PROFILES:
+                tables[profile] = {
+                    floor_key: load_or_build_route_tables(
+                        graph, bundle["version"], os.path.join(tables_dir, profile, floor_key), profile
+                    )
+                    for floor_key, graph in floors.items()
+                }
+
+        campus = cls(floors, decoded["roomToNode"], tables)
+        for transfer in decoded["transfers"]:
+            campus.add_transfer(*transfer["nodes"], transfer["type"], transfer["weight"], transfer["id"])
+        campus.build_overlay()
+        campus.bundle_version = bundle["version"]
+        return campus
+
+    # -------------------------------------------------------------------------
+    # Routing
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _floor_distance(engine: RoutingEngine, a: str, b: str) -> float:
+        if engine.tables is not None:
+            return engine.tables.distance(a, b)
+        return engine.shortest_path(a, b)[1]
+
+    def _distance_within_floor(self, a: str, b: str, profile: str = DEFAULT_PROFILE) -> float:
+        floor_key = self.floor_of.get(a)
+        if floor_key is None or floor_key != self.floor_of.get(b):
+            return float("inf")
+        return self._floor_distance(self.engines[profile][floor_key], a, b)
+
+    def shortest_path(self, source: str, target: str, profile: str = DEFAULT_PROFILE) -> Tuple[Optional[List[str]], float]:
+        """
+        Finds the shortest path between two nodes, possibly across floors.
+
+        Args:
+            source: Start node
+            target: Destination node
+            profile: Routing profile (see ROUTING_PROFILES)
+
+        Returns:
+            (node path, profile-weighted cost), or (None, inf) if unreachable;
+            see path_distance_m for the length in meters
+        """
+        if source not in self or target not in self:
+            return None, float("inf")
+
+        overlay = self.overlays.get(profile, {})
+        best_distance = self._distance_within_floor(source, target, profile)
+        best_waypoints = [source, target] if best_distance < float("inf") else None
+
+        # Multi-source search over the portal overlay
+        source_floor, target_floor = self.floor_of[source], self.floor_of[target]
+        distances: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        heap = []
+        for portal in self.portals.get(source_floor, []):
+            distance = self._distance_within_floor(source, portal, profile)
+            if distance < distances.get(portal, float("inf")):
+                distances[portal] = distance
+                previous[portal] = None
+                heapq.heappush(heap, (distance, portal))
+
+        target_portals = set(self.portals.get(target_floor, []))
+        visited = set()
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance >= best_distance:
+                break
+            if node in visited:
+                continue
+            visited.add(node)
+
+            if node in target_portals:
+                total = distance + self._distance_within_floor(node, target, profile)
+                if total < best_distance:
+                    best_distance = total
+                    waypoints = [node]
+                    while previous[waypoints[-1]] is not None:
+                        waypoints.append(previous[waypoints[-1]])
+                    best_waypoints = [source] + waypoints[::-1] + [target]
+
+            for neighbor, weight in overlay.get(node, {}).items():
+                candidate = distance + weight
+                if candidate < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = candidate
+                    previous[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+
+        if best_waypoints is None:
+            return None, float("inf")
+        return self._expand(best_waypoints, profile), best_distance
+
+    def _search(self, sources: Sequence[str], profile: str, targets: Optional[Sequence[str]] = None,
+                excluded_nodes: Optional[Set[str]] = None, excluded_edges: Optional[Set[Tuple[str, str]]] = None,
+                max_distance: float = float("inf")) -> Tuple[Dict[str, float], Dict[str, str], Dict[str, str]]:
+        """
+        Dijkstra from one or more sources over the floor graphs and the transfers.
+
+        Args:
+            excluded_nodes: Nodes the search may not enter
+            excluded_edges: Directed (a, b) node pairs the search may not traverse
+            max_distance: Stop before settling nodes farther than this
+
+        Returns:
+            (distances, previous, origin) of the settled nodes; origin is the
+            nearest source of each node
+        """
+        remaining = set(targets) if targets is not None else None
+        distances = {source: 0.0 for source in sources}
+        previous: Dict[str, str] = {}
+        origin = {source: source for source in sources}
+        settled: Dict[str, float] = {}
+        heap = [(0.0, source) for source in sources]
+        heapq.heapify(heap)
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > max_distance:
+                break
+            if node in settled:
+                continue
+            settled[node] = distance
+            if remaining is not None:
+                remaining.discard(node)
+                if not remaining:
+                    break
+
+            edges = list(self.floors[self.floor_of[node]].neighbors(node).items())
+            edges.extend(self.transfers.get(node, {}).items())
+            for neighbor, edge in edges:
+                if neighbor in settled or (excluded_nodes and neighbor in excluded_nodes):
+                    continue
+                if excluded_edges and (node, neighbor) in excluded_edges:
+                    continue
+                weight = profile_weight(profile, edge)
+                if weight is None:
+                    continue
+                candidate = distance + weight
+                if candidate < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = candidate
+                    previous[neighbor] = node
+                    origin[neighbor] = origin[node]
+                    heapq.heappush(heap, (candidate, neighbor))
+
+        return (settled, {node: previous[node] for node in settled if node in previous},
+                {node: origin[node] for node in settled})
+
+    def shortest_path_tree(self, source: str, profile: str = DEFAULT_PROFILE,
+                           targets: Optional[Sequence[str]] = None, excluded_nodes: Optional[Set[str]] = None,
+                           excluded_edges: Optional[Set[Tuple[str, str]]] = None,
+                           max_distance: float = float("inf")) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """
+        Single-source Dijkstra over the floor graphs and the transfers.
+
+        Args:
+            source: Start node
+            profile: Routing profile (see ROUTING_PROFILES)
+            targets: Stop once all of these are settled (None: explore everything reachable)
+            excluded_nodes: Nodes the search may not enter
+            excluded_edges: Directed (a, b) node pairs the search may not traverse
+            max_distance: Only settle the nodes within this distance (bounded search)
+
+        Returns:
+            (distances, previous) of the settled nodes
+        """
+        if source not in self:
+            return {}, {}
+        distances, previous, _ = self._search([source], profile, targets, excluded_nodes, excluded_edges,
+                                              max_distance)
+        return distances, previous
+
+    def nearest_source_field(self, sources: Sequence[str],
+                             profile: str = DEFAULT_PROFILE) -> Tuple[Dict[str, float], Dict[str, str], Dict[str, str]]:
+        """
+        Multi-source Dijkstra (graph Voronoi partition): for every reachable
+        node, its distance to the nearest source, the next node on the way
+        there and that source. Edge weights are symmetric, so following the
+        next nodes from any node walks its shortest path to the source.
+
+        Returns:
+            (distances, next node, nearest source)
+        """
+        return self._search([source for source in sources if source in self], profile)
+
+    def shortest_paths(self, source: str, targets: Sequence[str],
+                       profile: str = DEFAULT_PROFILE) -> Dict[str, Tuple[Optional[List[str]], float]]:
+        """
+        Shortest paths from one node to many with a single search.
+
+        Returns:
+            {target: (node path, profile-weighted cost)}, (None, inf) for unreachable targets
+        """
+        distances, previous = self.shortest_path_tree(source, profile, [t for t in targets if t in self])
+        results = {}
+        for target in targets:
+            if target not in distances:
+                results[target] = (None, float("inf"))
+                continue
+            path = [target]
+            while path[-1] != source:
+                path.append(previous[path[-1]])
+            results[target] = (path[::-1], distances[target])
+        return results
+
+    def _expand(self, waypoints: List[str], profile: str = DEFAULT_PROFILE) -> List[str]:
+        """Expands overlay waypoints into the full node path"""
+        path = [waypoints[0]]
+        for a, b in zip(waypoints, waypoints[1:]):
+            if a == b:
+                continue
+            if b in self.transfers.get(a, {}) and self.floor_of[a] != self.floor_of[b]:
+                path.append(b)
+                continue
+            leg, _ = self.engines[profile][self.floor_of[a]].shortest_path(a, b)
+            path.extend(leg[1:] if leg else [b])
+        return path
+
+    def route(self, start: str, end: str, profile: str = DEFAULT_PROFILE,
+              zoom: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Computes a route between two rooms or nodes anywhere on campus.
+
+        Args:
+            start: Start room ID or node ID
+            end: Destination room ID or node ID
+            profile: Routing profile (see ROUTING_PROFILES)
+            zoom: Map zoom level the geometry is simplified for (None: full detail)
+
+        Returns:
+            Dict with the node path, its length in meters (distance_m) and
+            profile-weighted cost, per-floor legs (each with its GeoJSON
+            LineString), the transfers taken and the full geometry, or None
+            if either location is unknown or no path exists
+        """
+        start_node = self.resolve(start)
+        end_node = self.resolve(end)
+        if start_node is None or end_node is None:
+            return None
+
+        path, cost = self.shortest_path(start_node, end_node, profile)
+        if path is None:
+            return None
+        distance = self.path_distance_m(path)
+
+        legs, transfers = [], []
+        current = [path[0]]
+        for a, b in zip(path, path[1:]):
+            if self.floor_of[a] != self.floor_of[b]:
+                legs.append(current)
+                edge = self.transfers[a][b]
+                transfers.append({"type": edge["type"], "id": edge["id"], "from": a, "to": b})
+                current = [b]
+            else:
+                current.append(b)
+        legs.append(current)
+
+        leg_results, coordinates, missing_segments = [], [], []
+        for leg in legs:
+            leg_geometry = self.geometry.geometry(leg, zoom)
+            coordinates.extend(leg_geometry["coordinates"])
+            missing_segments.extend(leg_geometry["missingSegments"])
+            leg_results.append({
+                **self.node_location(leg[0]),
+                "path": leg,
+                "geometry": {"type": "LineString", "coordinates": leg_geometry["coordinates"]},
+            })
+
+        start_location = self.node_location(start_node)
+        end_location = self.node_location(end_node)
+        return {
+            "start": start,
+            "end": end,
+            "startNode": start_node,
+            "endNode": end_node,
+            "profile": profile,
+            "building": start_location["building"],
+            "floor": start_location["floor"],
+            "endBuilding": end_location["building"],
+            "endFloor": end_location["floor"],
+            "path": path,
+            "distance_m": round(distance, 2),
+            "cost": round(cost, 2),
+            "legs": leg_results,
+            "transfers": transfers,
+            "geometry": {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": coordinates},
+                "properties": {
+                    "startNode": start_node,
+                    "endNode": end_node,
+                    "distance_m": round(distance, 2),
+                    "cost": round(cost, 2),
+                    "zoom": zoom,
+                    "missingSegments": missing_segments,
+                },
+            },
+        }
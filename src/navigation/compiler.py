@@ -0,0 +1,292 @@
+"""
+Navigation Bundle Compiler
+==========================
+
+This module compiles every navigation source into one validated bundle
+(see bundle.py):
+
+- corridor segments GeoJSON (traced edges with their geometry)
+- building configs (room mappings, transfers, floor plans)
+- node spreadsheets (LeafletJS/Node Excel Files/<floor>.xlsx: node,
+  node type, connections and the rooms/exits each node represents),
+  read with the standard library
+- floor plan SVGs, which position the nodes that have no traced segment
+
+Spreadsheet connections without a traced segment become straight edges
+between the node positions. The compiler reports errors (unknown nodes,
+rooms mapped to missing nodes, disconnected floors, unweighable edges)
+and warnings (one-way spreadsheet connections, room mapping mismatches,
+transfers to floors that are not mapped yet) in one pass.
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .bundle import encode_bundle, write_bundle
+from .campus import CampusGraph, merge_building_configs, parse_floor_key
+from .floorplan import FloorPlanOverlay, load_building_outlines, load_svg_points
+from .graph import NavigationGraph
+
+_XLSX_NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+            "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+            "rel": "http://schemas.openxmlformats.org/package/2006/relationships"}
+_CELL_REF = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def read_xlsx_rows(path: str) -> List[Dict[str, str]]:
+    """
+    Reads the first worksheet of an .xlsx file into dicts keyed by the
+    header row (values as stripped strings, empty cells omitted).
+    """
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        shared = []
+        if "xl/sharedStrings.xml" in names:
+            for item in ET.fromstring(archive.read("xl/sharedStrings.xml")).findall("m:si", _XLSX_NS):
+                shared.append("".join(t.text or "" for t in item.iter(f"{{{_XLSX_NS['m']}}}t")))
+
+        workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+        relations = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        first_sheet = workbook.find("m:sheets/m:sheet", _XLSX_NS)
+        relation_id = first_sheet.get(f"{{{_XLSX_NS['r']}}}id")
+        target = next(rel.get("Target") for rel in relations.findall("rel:Relationship", _XLSX_NS)
+                      if rel.get("Id") == relation_id)
+        sheet = ET.fromstring(archive.read("xl/" + target.lstrip("/").replace("xl/", "", 1)))
+
+    rows: List[Dict[int, str]] = []
+    for row in sheet.iterfind("m:sheetData/m:row", _XLSX_NS):
+        values = {}
+        for cell in row.findall("m:c", _XLSX_NS):
+            match = _CELL_REF.match(cell.get("r", ""))
+            if not match:
+                continue
+            kind = cell.get("t")
+            if kind == "inlineStr":
+                value = "".join(t.text or "" for t in cell.iter(f"{{{_XLSX_NS['m']}}}t"))
+            else:
+                raw = cell.find("m:v", _XLSX_NS)
+                if raw is None or raw.text is None:
+                    continue
+                value = shared[int(raw.text)] if kind == "s" else raw.text
+            if value.strip():
+                values[_column_index(match.group(1))] = value.strip()
+        rows.append(values)
+
+    if not rows:
+        return []
+    header = rows[0]
+    return [{header[i]: value for i, value in row.items() if i in header} for row in rows[1:] if row]
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def load_node_spreadsheet(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Reads a node spreadsheet (columns Node, Node_type, Node_connections,
+    Object, Object_type).
+
+    Returns:
+        {node_id: {types, connections, objects: [{id, type}]}}
+    """
+    nodes = {}
+    for row in read_xlsx_rows(path):
+        node_id = row.get("Node")
+        if not node_id:
+            continue
+        objects, object_types = _split(row.get("Object")), _split(row.get("Object_type"))
+        nodes[node_id] = {
+            "types": _split(row.get("Node_type")),
+            "connections": _split(row.get("Node_connections")),
+            "objects": [{"id": obj, "type": object_types[i] if i < len(object_types) else None}
+                        for i, obj in enumerate(objects)],
+        }
+    return nodes
+
+
+def floor_key_for_spreadsheet(path: str) -> str:
+    """Floor key of a node spreadsheet from its file name (M1.xlsx → M1)"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    building, floor = parse_floor_key(stem)
+    return f"{building}{floor}"
+
+
+def _floor_plan_positions(building_configs: Dict[str, Dict[str, Any]], campus_geojson_path: Optional[str],
+                          base_dir: str, report: Dict[str, List[str]]) -> Dict[str, Tuple[float, float]]:
+    """(lng, lat) of the node markers of every declared floor plan"""
+    plans = [(floor_key, plan, config) for config in building_configs.values()
+             for floor_key, plan in config.get("floorPlans", {}).items()]
+    if not plans or not campus_geojson_path:
+        return {}
+
+    outlines = load_building_outlines(campus_geojson_path)
+    positions = {}
+    for floor_key, plan, config in plans:
+        svg_path = os.path.join(base_dir, plan["svg"])
+        outline = outlines.get(plan.get("outline", config.get("_name")))
+        if outline is None or not os.path.exists(svg_path):
+            report["warnings"].append(f"Floor plan {floor_key}: SVG or building outline not found")
+            continue
+        overlay = FloorPlanOverlay.from_svg(svg_path, outline, plan.get("bearing", 0.0))
+        for node_id, (x, y) in load_svg_points(svg_path).items():
+            positions[node_id] = overlay.svg_to_lnglat(x, y)
+    return positions
+
+
+def compile_navigation_bundle(
+    corridor_paths: Sequence[str],
+    building_configs: Dict[str, Dict[str, Any]],
+    spreadsheet_paths: Sequence[str] = (),
+    campus_geojson_path: Optional[str] = None,
+    base_dir: str = "."
+) -> Dict[str, Any]:
+    """
+    Validates the navigation sources and compiles them into a bundle.
+
+    Args:
+        corridor_paths: Corridor segments GeoJSON files
+        building_configs: Output of load_building_configs
+        spreadsheet_paths: Node spreadsheets (<floor>.xlsx)
+        campus_geojson_path: Building outlines used to place the floor plan SVGs
+        base_dir: Directory the floor plan paths are relative to
+
+    Returns:
+        The bundle; its 'report' holds {errors, warnings, stats}
+    """
+    report: Dict[str, Any] = {"errors": [], "warnings": [], "stats": {}}
+    errors, warnings = report["errors"], report["warnings"]
+
+    traced = CampusGraph.from_sources(corridor_paths, building_configs)
+    floors = traced.floors
+    floor_of = dict(traced.floor_of)
+    positions = _floor_plan_positions(building_configs, campus_geojson_path, base_dir, report)
+
+    # Spreadsheet nodes and connections
+    sheets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for path in spreadsheet_paths:
+        try:
+            sheets[floor_key_for_spreadsheet(path)] = load_node_spreadsheet(path)
+        except (ValueError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            errors.append(f"Spreadsheet {os.path.basename(path)} could not be read: {e}")
+
+    node_objects: Dict[str, List[Dict[str, str]]] = {}
+    for floor_key, sheet in sheets.items():
+        for node_id in sheet:
+            floor_of.setdefault(node_id, floor_key)
+            graph = floors.setdefault(floor_of[node_id], NavigationGraph())
+            graph.add_node(node_id, *positions.get(node_id, (None, None)))
+            node_objects[node_id] = sheet[node_id]["objects"]
+
+    for floor_key, sheet in sheets.items():
+        for node_id, row in sheet.items():
+            graph = floors[floor_of[node_id]]
+            for neighbor in row["connections"]:
+                if neighbor not in floor_of:
+                    errors.append(f"{floor_key}: {node_id} connects to unknown node {neighbor}")
+                    continue
+                if node_id not in sheets.get(floor_of[neighbor], {}).get(neighbor, {}).get("connections", [node_id]):
+                    warnings.append(f"{floor_key}: {node_id} → {neighbor} is only listed in one direction")
+                if floor_of[neighbor] != floor_of[node_id]:
+                    errors.append(f"{floor_key}: {node_id}-{neighbor} spans floors, use a transfer instead")
+                    continue
+                if graph.edge(node_id, neighbor) is not None:
+                    continue
+                if graph.node_distance_m(node_id, neighbor) is None:
+                    errors.append(f"{floor_key}: edge {node_id}-{neighbor} has no traced segment and no node positions")
+                    continue
+                graph.add_edge(node_id, neighbor, segmentType="corridor", source="spreadsheet")
+
+    # Room mappings: the building configs are authoritative, spreadsheets fill gaps
+    merged = merge_building_configs(building_configs)
+    room_to_node = dict(merged["roomToNode"])
+    room_building = dict(merged["roomBuilding"])
+    for node_id, objects in node_objects.items():
+        for obj in objects:
+            mapped = room_to_node.get(obj["id"])
+            if mapped is None:
+                room_to_node[obj["id"]] = node_id
+                code = parse_floor_key(floor_of[node_id])[0]
+                room_building[obj["id"]] = code
+                warnings.append(f"{obj['id']} is only mapped in the spreadsheet (→ {node_id})")
+            elif mapped != node_id:
+                warnings.append(f"{obj['id']}: config maps it to {mapped}, spreadsheet to {node_id}")
+
+    all_nodes = {node_id for graph in floors.values() for node_id in graph.nodes}
+    for room, node_id in sorted(room_to_node.items()):
+        if node_id not in all_nodes:
+            errors.append(f"Room {room} is mapped to missing node {node_id}")
+
+    # Transfers between mapped floors (the others are reported, not fatal)
+    campus = CampusGraph(floors, room_to_node)
+    for config in building_configs.values():
+        for transfer in config.get("transfers", []):
+            nodes = transfer.get("nodes", {})
+            missing = [node for node in nodes.values() if node not in all_nodes]
+            missing += [floor_key for floor_key in transfer.get("goesTo", []) if floor_key not in nodes]
+            if missing:
+                warnings.append(f"Transfer {transfer.get('id', transfer.get('type'))}: "
+                                f"{', '.join(missing)} not mapped yet")
+        campus.add_transfers_from_config(config.get("transfers", []))
+    transfers = list({id(edge): edge for edges in campus.transfers.values() for edge in edges.values()}.values())
+
+    # Connectivity per floor
+    for floor_key, graph in sorted(floors.items()):
+        components = _components(graph)
+        for component in components[1:]:
+            errors.append(f"{floor_key}: nodes {', '.join(sorted(component))} are disconnected from the floor")
+        unpositioned = sorted(n for n, node in graph.nodes.items() if node["lng"] is None)
+        if unpositioned:
+            warnings.append(f"{floor_key}: nodes without a position: {', '.join(unpositioned)}")
+
+    edge_count = sum(graph.edge_count for graph in floors.values())
+    traced_count = sum(1 for graph in floors.values() for neighbors in graph.adjacency.values()
+                       for edge in neighbors.values() if edge.get("coordinates")) // 2
+    report["stats"] = {"floors": len(floors), "nodes": len(all_nodes), "edges": edge_count,
+                       "tracedEdges": traced_count, "transfers": len(transfers), "rooms": len(room_to_node)}
+    return encode_bundle(floors, transfers, room_to_node, room_building, node_objects, report)
+
+
+def _components(graph) -> List[set]:
+    """Connected components of a floor graph, largest first"""
+    remaining, components = set(graph.nodes), []
+    while remaining:
+        stack = [remaining.pop()]
+        component = set(stack)
+        while stack:
+            for neighbor in graph.neighbors(stack.pop()):
+                if neighbor not in component:
+                    component.add(neighbor)
+                    remaining.discard(neighbor)
+                    stack.append(neighbor)
+        components.append(component)
+    return sorted(components, key=len, reverse=True)
+
+
+def build_navigation_bundle(
+    corridor_paths: Sequence[str],
+    building_configs: Dict[str, Dict[str, Any]],
+    directory: str,
+    spreadsheet_paths: Sequence[str] = (),
+    campus_geojson_path: Optional[str] = None,
+    base_dir: str = "."
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Compiles the bundle and writes it to a directory when its version changed.
+
+    Returns:
+        (bundle, manifest)
+    """
+    bundle = compile_navigation_bundle(corridor_paths, building_configs, spreadsheet_paths,
+                                       campus_geojson_path, base_dir)
+    return bundle, write_bundle(bundle, directory)
@@ -0,0 +1,181 @@
+"""
+Building Configuration Store
+============================
+
+This module keeps the building configurations (config/building_*_rooms.json)
+as a sequence of immutable, versioned snapshots:
+
+- readers take the current snapshot (a single reference read) and never
+  block on writers; a snapshot is never mutated once published
+- writers are serialized, apply their change to a copy of the file
+  content (copy-on-write), write it to a temporary file, fsync it and
+  atomically rename it over the config, then publish a new snapshot with
+  the next version number
+- subscribers (route tables, snap indexes, caches) are notified with the
+  previous and the new snapshot after every change
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .campus import load_building_configs, merge_building_configs
+
+# Config keys the campus graph is built from (floorPlans feed the compiled navigation bundle);
+# the others only affect lookups, snapping and the map
+ROUTING_CONFIG_KEYS = frozenset({"roomToNode", "transfers", "floorPlans"})
+# Config keys the snap indexes are built from
+SNAP_CONFIG_KEYS = frozenset({"roomToNode", "roomCentersSVG", "floorPlans"})
+
+Subscriber = Callable[["ConfigSnapshot", "ConfigSnapshot"], None]
+
+
+class ConfigVersionConflict(Exception):
+    """Raised when a write expects a version that is no longer current"""
+
+
+class ConfigSnapshot:
+    """One immutable version of the building configs and their merged lookup view"""
+
+    __slots__ = ("version", "configs", "merged", "created_at")
+
+    def __init__(self, version: int, configs: Dict[str, Dict[str, Any]]):
+        self.version = version
+        self.configs = configs
+        self.merged = merge_building_configs(configs)
+        self.created_at = time.time()
+
+    def changed_keys(self, other: "ConfigSnapshot") -> set:
+        """Config keys that differ between two snapshots, across all buildings"""
+        changed = set()
+        for code in set(self.configs) | set(other.configs):
+            a, b = self.configs.get(code, {}), other.configs.get(code, {})
+            changed.update(key for key in set(a) | set(b) if a.get(key) != b.get(key))
+        return changed
+
+
+def _write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    """Writes JSON to a temporary file, syncs it and renames it over the target"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class BuildingConfigStore:
+    """Versioned, thread-safe store of the building configurations"""
+
+    def __init__(self, paths: Sequence[str], configs: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            paths: Glob patterns of the building config files
+            configs: Initial configs (default: loaded from the paths)
+        """
+        self.paths = list(paths)
+        self._write_lock = threading.RLock()
+        self._subscribers: List[Subscriber] = []
+        self._snapshot = ConfigSnapshot(1, load_building_configs(self.paths) if configs is None else configs)
+
+    def snapshot(self) -> ConfigSnapshot:
+        """The current snapshot (never blocks)"""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Calls callback(previous, snapshot) after every change; returns an unsubscribe function"""
+        with self._write_lock:
+            self._subscribers = self._subscribers + [callback]
+
+        def unsubscribe():
+            with self._write_lock:
+                self._subscribers = [s for s in self._subscribers if s is not callback]
+        return unsubscribe
+
+    def _publish(self, configs: Dict[str, Dict[str, Any]]) -> ConfigSnapshot:
+        """Publishes a new snapshot and notifies the subscribers (write lock held)"""
+        previous = self._snapshot
+        snapshot = ConfigSnapshot(previous.version + 1, configs)
+        self._snapshot = snapshot
+        for callback in self._subscribers:
+            try:
+                callback(previous, snapshot)
+            except Exception as e:
+                print(f"⚠️ Config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+        return snapshot
+
+    def _check_version(self, expected_version: Optional[int]) -> None:
+        if expected_version is not None and expected_version != self._snapshot.version:
+            raise ConfigVersionConflict(
+                f"Config version {expected_version} is stale (current: {self._snapshot.version})")
+
+    def reload(self, expected_version: Optional[int] = None) -> ConfigSnapshot:
+        """Re-reads the config files (e.g. after editing them by hand) and publishes them"""
+        with self._write_lock:
+            self._check_version(expected_version)
+            return self._publish(load_building_configs(self.paths))
+
+    def update(self, changes: Dict[str, Callable[[Dict[str, Any]], None]],
+               expected_version: Optional[int] = None) -> ConfigSnapshot:
+        """
+        Applies changes to building configs and persists them atomically.
+
+        Args:
+            changes: Building code → function mutating a copy of that building's config
+            expected_version: Fail with ConfigVersionConflict unless this is the current version
+
+        Returns:
+            The published snapshot
+        """
+        with self._write_lock:
+            self._check_version(expected_version)
+            current = self._snapshot.configs
+            unknown = [code for code in changes if code not in current]
+            if unknown:
+                raise KeyError(f"Unknown building: {', '.join(unknown)}")
+
+            # Group by file, so buildings sharing a file are written once
+            files: Dict[str, List[str]] = {}
+            for code in changes:
+                files.setdefault(current[code]["_source"], []).append(code)
+
+            configs = dict(current)
+            for path, codes in files.items():
+                with open(path, "r", encoding="utf-8") as f:
+                    content = json.load(f)
+                for code in codes:
+                    name = current[code]["_name"]
+                    section = copy.deepcopy(content.get(name, {}))
+                    changes[code](section)
+                    content[name] = section
+                    configs[code] = {**section, "_source": path, "_name": name}
+                _write_json_atomic(path, content)
+
+            return self._publish(configs)
+
+    def update_room_centers(self, centers: Dict[str, Dict[str, float]],
+                            expected_version: Optional[int] = None) -> ConfigSnapshot:
+        """Sets SVG room centers ({room_id: {x, y}}); unknown rooms go to the first building"""
+        def apply(updates):
+            return lambda section: section.setdefault("roomCentersSVG", {}).update(updates)
+
+        with self._write_lock:
+            snapshot = self._snapshot
+            room_buildings = snapshot.merged.get("roomBuilding", {})
+            default_building = next(iter(snapshot.configs), None)
+            if default_building is None:
+                raise KeyError("No building configuration loaded")
+
+            by_building: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for room_id, coords in centers.items():
+                code = room_buildings.get(room_id, default_building)
+                by_building.setdefault(code, {})[room_id] = {"x": coords["x"], "y": coords["y"]}
+
+            return self.update({code: apply(updates) for code, updates in by_building.items()}, expected_version)
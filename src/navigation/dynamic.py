@@ -0,0 +1,277 @@
+"""
+Dynamic Graph Edits
+===================
+
+This module changes the campus graph at runtime without a full reload:
+
+- corridor edges can be added, removed or reweighted (the corridor tools
+  post their edits here instead of waiting for the files to be reloaded)
+- any corridor or transfer edge can be closed until a given time, for
+  construction or an event; closed edges are skipped by every profile
+  and reopen by themselves when the closure expires
+
+After each change only the affected columns of the floor's route tables
+are recomputed (see RouteTables.repair_edge), the portal overlay is
+rebuilt from those tables and the graph revision is bumped, so the caches
+keyed on the graph version drop their stale entries. A new node joins the
+floor of the node it is connected to, and that floor's tables are
+rebuilt.
+
+Edits live in memory: permanent changes still belong in the corridor
+files, which rebuild the graph when they change. Active closures are
+carried over to the rebuilt graph.
+"""
+
+import itertools
+import math
+import numbers
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from .campus import CampusGraph
+from .geometry import pair_key
+from .profiles import ROUTING_PROFILES, profile_weight
+from .route_tables import RouteTables
+
+_closure_ids = itertools.count(1)
+
+
+class GraphEditor:
+    """Applies edge edits and temporary closures to a campus graph, repairing its route tables"""
+
+    def __init__(self, campus: CampusGraph, closures: Sequence[Dict[str, Any]] = ()):
+        """
+        Args:
+            campus: The campus graph, changed in place
+            closures: Closures to carry over (from active_closures() of the previous graph's editor);
+                those whose edge no longer exists are dropped
+        """
+        self.campus = campus
+        self.closures: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._next_expiry = float("inf")
+        for closure in closures:
+            if closure["until"] > time.time() and campus.edge(closure["start"], closure["end"]) is not None:
+                self.close(closure["start"], closure["end"], closure["until"], closure.get("reason", ""),
+                           closure["id"])
+
+    # -------------------------------------------------------------------------
+    # Repair
+    # -------------------------------------------------------------------------
+
+    def _weights(self, a: str, b: str) -> Dict[str, Optional[float]]:
+        edge = self.campus.edge(a, b)
+        return {profile: profile_weight(profile, edge) if edge is not None else None for profile in ROUTING_PROFILES}
+
+    def _is_transfer(self, a: str, b: str) -> bool:
+        return b in self.campus.transfers.get(a, {})
+
+    def _repair(self, a: str, b: str, before: Dict[str, Optional[float]], started: float) -> Dict[str, Any]:
+        """Repairs the route tables and the overlay after edge a-b changed"""
+        recomputed = 0
+        if not self._is_transfer(a, b):
+            floor_key = self.campus.floor_of[a]
+            after = self._weights(a, b)
+            for profile, engines in self.campus.engines.items():
+                tables = engines[floor_key].tables
+                if tables is not None and before[profile] != after[profile]:
+                    recomputed += tables.repair_edge(self.campus.floors[floor_key], a, b,
+                                                     before[profile], after[profile])
+        self.campus.build_overlay()
+        self.campus.revision += 1
+        return {"version": self.campus.version, "columnsRecomputed": recomputed,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    @staticmethod
+    def _check_weight(weight: float) -> None:
+        if not math.isfinite(weight) or weight < 0:
+            raise ValueError("weight must be a finite, non-negative number")
+
+    @staticmethod
+    def _check_coordinates(coordinates: Sequence[Sequence[float]]) -> None:
+        valid = isinstance(coordinates, (list, tuple)) and len(coordinates) >= 2 and all(
+            isinstance(point, (list, tuple)) and len(point) >= 2 and all(
+                isinstance(value, numbers.Real) and not isinstance(value, bool) and math.isfinite(value)
+                for value in point[:2])
+            for point in coordinates)
+        if not valid:
+            raise ValueError("coordinates must be a list of at least two [lng, lat] pairs")
+
+    def _existing_edge(self, a: str, b: str) -> Dict[str, Any]:
+        edge = self.campus.edge(a, b)
+        if edge is None:
+            raise ValueError(f"No edge between {a} and {b}")
+        return edge
+
+    # -------------------------------------------------------------------------
+    # Edits
+    # -------------------------------------------------------------------------
+
+    def add_edge(self, a: str, b: str, weight: Optional[float] = None,
+                 coordinates: Optional[Sequence[Sequence[float]]] = None, **properties) -> Dict[str, Any]:
+        """
+        Adds (or replaces) a corridor edge. At most one of the nodes may be
+        new; it joins the floor of the other one.
+
+        Raises:
+            ValueError: If neither node is in the graph, they are on different floors, or the
+                weight or coordinates are invalid
+        """
+        if weight is not None:
+            self._check_weight(weight)
+        if coordinates is not None:
+            self._check_coordinates(coordinates)
+        started = time.perf_counter()
+        with self._lock:
+            floors = {self.campus.floor_of[node] for node in (a, b) if node in self.campus}
+            if not floors:
+                raise ValueError(f"Neither {a} nor {b} is in the graph")
+            if len(floors) > 1:
+                raise ValueError(f"{a} and {b} are on different floors, use a transfer")
+            floor_key = floors.pop()
+            graph = self.campus.floors[floor_key]
+            new_nodes = [node for node in (a, b) if node not in self.campus]
+            if weight is None and not coordinates and graph.node_distance_m(a, b) is None:
+                raise ValueError(f"Edge {a}-{b} needs a weight or coordinates")
+            before = self._weights(a, b) if not new_nodes else {}
+            existing = self.campus.edge(a, b)
+            if existing is not None and existing.get("closed"):
+                properties.setdefault("closed", True)  # A replaced edge stays under its closures
+
+            graph.add_edge(a, b, weight, coordinates, **properties)
+            if coordinates:
+                self.campus.geometry.add_segment(a, b, coordinates)
+            else:
+                self.campus.geometry.clear_cache()
+
+            if not new_nodes:
+                return self._repair(a, b, before, started)
+
+            # The tables are indexed by node: a new node means new tables for this floor
+            for node in new_nodes:
+                self.campus.floor_of[node] = floor_key
+                if graph.nodes[node]["lng"] is not None:
+                    self.campus.geometry.add_node(node, graph.nodes[node]["lng"], graph.nodes[node]["lat"])
+            for profile, engines in self.campus.engines.items():
+                tables = engines[floor_key].tables
+                if tables is not None:
+                    engines[floor_key].tables = RouteTables.build(graph, tables.source_hash, profile)
+            self.campus.build_overlay()
+            self.campus.revision += 1
+            return {"version": self.campus.version, "columnsRecomputed": len(graph) * len(ROUTING_PROFILES),
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    def remove_edge(self, a: str, b: str) -> Dict[str, Any]:
+        """
+        Removes a corridor or transfer edge.
+
+        Raises:
+            ValueError: If there is no such edge
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._existing_edge(a, b)
+            before = self._weights(a, b)
+            transfer = self._is_transfer(a, b)
+            if transfer:
+                self.campus.transfers[a].pop(b)
+                self.campus.transfers[b].pop(a)
+                for node in (a, b):
+                    if not self.campus.transfers[node]:
+                        del self.campus.transfers[node]
+                self.campus.build_overlay()
+                self.campus.revision += 1
+                return {"version": self.campus.version, "columnsRecomputed": 0,
+                        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+            self.campus.floors[self.campus.floor_of[a]].remove_edge(a, b)
+            self.campus.geometry.segments.pop(pair_key(a, b), None)
+            self.campus.geometry.clear_cache()
+            return self._repair(a, b, before, started)
+
+    def set_weight(self, a: str, b: str, weight: float) -> Dict[str, Any]:
+        """
+        Changes the weight (meters of equivalent walking) of a corridor or transfer edge.
+
+        Raises:
+            ValueError: If there is no such edge or the weight is negative or not finite
+        """
+        self._check_weight(weight)
+        started = time.perf_counter()
+        with self._lock:
+            edge = self._existing_edge(a, b)
+            before = self._weights(a, b)
+            edge["weight"] = float(weight)
+            return self._repair(a, b, before, started)
+
+    # -------------------------------------------------------------------------
+    # Closures
+    # -------------------------------------------------------------------------
+
+    def close(self, a: str, b: str, until: float, reason: str = "",
+              closure_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Closes an edge until a time (epoch seconds).
+
+        Returns:
+            The closure {id, start, end, until, reason, type} with the repair stats
+
+        Raises:
+            ValueError: If there is no such edge or the closure is already over (or never ends)
+        """
+        if not math.isfinite(until):
+            raise ValueError("until must be a finite time")
+        if until <= time.time():
+            raise ValueError("until must be in the future")
+        started = time.perf_counter()
+        with self._lock:
+            edge = self._existing_edge(a, b)
+            before = self._weights(a, b)
+            closure = {
+                "id": closure_id or f"closure-{next(_closure_ids)}",
+                "start": a,
+                "end": b,
+                "until": float(until),
+                "reason": reason,
+                "type": edge.get("type") or edge.get("segmentType") or "corridor",
+            }
+            self.closures[closure["id"]] = closure
+            self._next_expiry = min(self._next_expiry, closure["until"])
+            edge["closed"] = True
+            return {**closure, **self._repair(a, b, before, started)}
+
+    def reopen(self, closure_id: str) -> Dict[str, Any]:
+        """
+        Ends a closure (the edge stays closed while another closure covers it).
+
+        Raises:
+            KeyError: If the closure is unknown
+        """
+        started = time.perf_counter()
+        with self._lock:
+            closure = self.closures.pop(closure_id)
+            a, b = closure["start"], closure["end"]
+            self._next_expiry = min((c["until"] for c in self.closures.values()), default=float("inf"))
+            edge = self.campus.edge(a, b)
+            still_closed = any(pair_key(c["start"], c["end"]) == pair_key(a, b) for c in self.closures.values())
+            if edge is None or still_closed:
+                return {**closure, "version": self.campus.version, "columnsRecomputed": 0,
+                        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+            before = self._weights(a, b)
+            edge.pop("closed", None)
+            return {**closure, **self._repair(a, b, before, started)}
+
+    def expire_closures(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Reopens the closures whose time is up; returns them"""
+        now = time.time() if now is None else now
+        if now < self._next_expiry:
+            return []
+        with self._lock:
+            expired = [closure_id for closure_id, closure in self.closures.items() if closure["until"] <= now]
+            return [self.reopen(closure_id) for closure_id in expired]
+
+    def active_closures(self) -> List[Dict[str, Any]]:
+        """Current closures, soonest to end first"""
+        with self._lock:
+            return sorted((dict(closure) for closure in self.closures.values()), key=lambda c: (c["until"], c["id"]))
@@ -0,0 +1,320 @@
+"""
+Floor Plan Geometry
+===================
+
+This module reads the Inkscape floor plan SVGs (LeafletJS/Floorplans) on
+the server and places them on the map the same way the Leaflet client
+does: the SVG viewBox is stretched over the bounding box of the building
+outline from campus.geojson, rotated by the floor plan bearing, and
+points are interpolated bilinearly across the rotated corners.
+
+Floor plans are declared per building config:
+
+    "floorPlans": {
+        "M1": {"svg": "LeafletJS/Floorplans/Building M/M1_official.svg",
+               "outline": "Building M", "bearing": 21.3}
+    }
+"""
+
+import json
+import math
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# 2D affine matrix (a, b, c, d, e, f) as in the SVG transform attribute
+Matrix = Tuple[float, float, float, float, float, float]
+
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate)\s*\(([^)]*)\)")
+_PATH_TOKEN = re.compile(rf"([MmLlHhVvCcSsQqTtAaZz])|({_NUMBER})")
+
+# Number of parameters of each path command
+_PATH_ARITY = {"m": 2, "l": 2, "h": 1, "v": 1, "c": 6, "s": 4, "q": 4, "t": 2, "a": 7, "z": 0}
+
+
+def _multiply(m1: Matrix, m2: Matrix) -> Matrix:
+    """Composes two affine matrices (m1 applied after m2)"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + c1 * b2,
+        b1 * a2 + d1 * b2,
+        a1 * c2 + c1 * d2,
+        b1 * c2 + d1 * d2,
+        a1 * e2 + c1 * f2 + e1,
+        b1 * e2 + d1 * f2 + f1,
+    )
+
+
+def apply_matrix(matrix: Matrix, x: float, y: float) -> Tuple[float, float]:
+    """Applies an affine matrix to a point"""
+    a, b, c, d, e, f = matrix
+    return a * x + c * y + e, b * x + d * y + f
+
+
+def parse_transform(transform: Optional[str]) -> Matrix:
+    """Parses an SVG transform attribute into a single affine matrix"""
+    matrix = IDENTITY
+    for name, args in _TRANSFORM.findall(transform or ""):
+        values = [float(v) for v in re.findall(_NUMBER, args)]
+        if name == "matrix" and len(values) == 6:
+            step = tuple(values)
+        elif name == "translate":
+            step = (1.0, 0.0, 0.0, 1.0, values[0], values[1] if len(values) > 1 else 0.0)
+        elif name == "scale":
+            sx = values[0]
+            step = (sx, 0.0, 0.0, values[1] if len(values) > 1 else sx, 0.0, 0.0)
+        elif name == "rotate":
+            angle = math.radians(values[0])
+            cos, sin = math.cos(angle), math.sin(angle)
+            step = (cos, sin, -sin, cos, 0.0, 0.0)
+            if len(values) == 3:
+                cx, cy = values[1], values[2]
+                step = _multiply((1.0, 0.0, 0.0, 1.0, cx, cy), _multiply(step, (1.0, 0.0, 0.0, 1.0, -cx, -cy)))
+        else:
+            continue
+        matrix = _multiply(matrix, step)
+    return matrix
+
+
+def parse_path(d: str) -> List[List[Tuple[float, float]]]:
+    """
+    Parses SVG path data into rings of vertices.
+
+    Curves and arcs are reduced to their end points, which is enough for
+    the mostly straight-walled rooms of the floor plans.
+    """
+    rings: List[List[Tuple[float, float]]] = []
+    ring: List[Tuple[float, float]] = []
+    x = y = start_x = start_y = 0.0
+    command = None
+    numbers: List[float] = []
+
+    def flush():
+        nonlocal x, y, start_x, start_y, ring, command
+        if command is None:
+            return
+        lower = command.lower()
+        arity = _PATH_ARITY[lower]
+        relative = command.islower()
+        if lower == "z":
+            if ring:
+                rings.append(ring)
+            ring = []
+            x, y = start_x, start_y
+            return
+        for i in range(0, len(numbers) - arity + 1, arity):
+            args = numbers[i:i + arity]
+            if lower == "h":
+                x = x + args[0] if relative else args[0]
+            elif lower == "v":
+                y = y + args[0] if relative else args[0]
+            else:
+                end_x, end_y = args[-2], args[-1]
+                x, y = (x + end_x, y + end_y) if relative else (end_x, end_y)
+            if lower == "m" and i == 0:
+                if ring:
+                    rings.append(ring)
+                ring = [(x, y)]
+                start_x, start_y = x, y
+            else:
+                ring.append((x, y))
+
+    for token_command, token_number in _PATH_TOKEN.findall(d or ""):
+        if token_command:
+            flush()
+            command, numbers = token_command, []
+        else:
+            numbers.append(float(token_number))
+    flush()
+    if ring:
+        rings.append(ring)
+    return rings
+
+
+def _element_rings(element: ET.Element) -> List[List[Tuple[float, float]]]:
+    tag = element.tag.split("}")[-1]
+    if tag == "rect":
+        x, y = float(element.get("x", 0)), float(element.get("y", 0))
+        width, height = float(element.get("width", 0)), float(element.get("height", 0))
+        return [[(x, y), (x + width, y), (x + width, y + height), (x, y + height)]]
+    if tag in ("polygon", "polyline"):
+        values = [float(v) for v in re.findall(_NUMBER, element.get("points", ""))]
+        return [list(zip(values[0::2], values[1::2]))]
+    if tag == "path":
+        return parse_path(element.get("d", ""))
+    return []
+
+
+def load_svg_shapes(svg_path: str, select: Callable[[str], bool]) -> Tuple[Dict[str, List[Tuple[float, float]]], Tuple[float, float, float, float]]:
+    """
+    Extracts the outer ring of every SVG shape whose ID is selected.
+
+    Args:
+        svg_path: Path to the SVG
+        select: Returns True for the element IDs to extract
+
+    Returns:
+        ({element_id: outer ring in viewBox coordinates}, viewBox (x, y, width, height))
+    """
+    root = ET.parse(svg_path).getroot()
+    shapes: Dict[str, List[Tuple[float, float]]] = {}
+
+    def walk(element: ET.Element, matrix: Matrix):
+        matrix = _multiply(matrix, parse_transform(element.get("transform")))
+        element_id = element.get("id") or ""
+        if element_id and select(element_id):
+            rings = _element_rings(element)
+            if rings:
+                outer = max(rings, key=lambda ring: abs(polygon_area(ring)))
+                shapes[element_id] = [apply_matrix(matrix, px, py) for px, py in outer]
+        for child in element:
+            walk(child, matrix)
+
+    walk(root, IDENTITY)
+    return shapes, svg_viewbox(root)
+
+
+def load_svg_rooms(svg_path: str, prefix: str = "Room_") -> Tuple[Dict[str, List[Tuple[float, float]]], Tuple[float, float, float, float]]:
+    """
+    Extracts the room polygons of a floor plan SVG.
+
+    Args:
+        svg_path: Path to the SVG
+        prefix: ID prefix of the room elements
+
+    Returns:
+        ({room_id: outer ring in viewBox coordinates}, viewBox (x, y, width, height))
+    """
+    return load_svg_shapes(svg_path, lambda element_id: element_id.startswith(prefix))
+
+
+def load_svg_points(svg_path: str, pattern: str = r"^[A-Za-z]+\d*_") -> Dict[str, Tuple[float, float]]:
+    """
+    Extracts the centers of the circle/ellipse markers of a floor plan SVG
+    whose ID matches a pattern (by default the corridor nodes: M1_3,
+    M1_Int_1, H_entry, ...), in viewBox coordinates.
+    """
+    root = ET.parse(svg_path).getroot()
+    expression = re.compile(pattern)
+    points: Dict[str, Tuple[float, float]] = {}
+
+    def walk(element: ET.Element, matrix: Matrix):
+        matrix = _multiply(matrix, parse_transform(element.get("transform")))
+        element_id = element.get("id") or ""
+        if element.tag.split("}")[-1] in ("circle", "ellipse") and expression.match(element_id):
+            points[element_id] = apply_matrix(matrix, float(element.get("cx", 0)), float(element.get("cy", 0)))
+        for child in element:
+            walk(child, matrix)
+
+    walk(root, IDENTITY)
+    return points
+
+
+def svg_viewbox(root: ET.Element) -> Tuple[float, float, float, float]:
+    """viewBox of an SVG root element (falls back to width/height)"""
+    values = [float(v) for v in re.findall(_NUMBER, root.get("viewBox", ""))]
+    if len(values) == 4:
+        return tuple(values)
+    width = float(re.findall(_NUMBER, root.get("width", "0"))[0])
+    height = float(re.findall(_NUMBER, root.get("height", "0"))[0])
+    return 0.0, 0.0, width, height
+
+
+def polygon_area(ring: Sequence[Sequence[float]]) -> float:
+    """Signed area of a ring (shoelace formula)"""
+    return 0.5 * sum(
+        a[0] * b[1] - b[0] * a[1]
+        for a, b in zip(ring, list(ring[1:]) + [ring[0]])
+    )
+
+
+def polygon_centroid(ring: Sequence[Sequence[float]]) -> Tuple[float, float]:
+    """Area centroid of a ring (vertex mean for degenerate rings)"""
+    area = polygon_area(ring)
+    if abs(area) < 1e-12:
+        return (sum(p[0] for p in ring) / len(ring), sum(p[1] for p in ring) / len(ring))
+    cx = cy = 0.0
+    for a, b in zip(ring, list(ring[1:]) + [ring[0]]):
+        cross = a[0] * b[1] - b[0] * a[1]
+        cx += (a[0] + b[0]) * cross
+        cy += (a[1] + b[1]) * cross
+    return cx / (6 * area), cy / (6 * area)
+
+
+class FloorPlanOverlay:
+    """Placement of a floor plan SVG on the map"""
+
+    def __init__(self, corners: Sequence[Sequence[float]], viewbox: Tuple[float, float, float, float]):
+        """
+        Args:
+            corners: (lng, lat) of the top-left, top-right, bottom-right and
+                bottom-left corners of the SVG on the map
+            viewbox: SVG viewBox (x, y, width, height)
+        """
+        self.corners = [tuple(corner[:2]) for corner in corners]
+        self.viewbox = tuple(viewbox)
+
+    @classmethod
+    def from_outline(cls, outline: Dict[str, Any], viewbox: Tuple[float, float, float, float],
+                     bearing: float = 0.0) -> "FloorPlanOverlay":
+        """
+        Places the SVG over the bounding box of a building outline rotated
+        by the bearing, like loadBuildingM/rotatePoint in the client.
+        """
+        points = list(_geometry_points(outline))
+        west, east = min(p[0] for p in points), max(p[0] for p in points)
+        south, north = min(p[1] for p in points), max(p[1] for p in points)
+        center = ((west + east) / 2, (south + north) / 2)
+
+        angle = math.radians(bearing)
+        cos, sin = math.cos(angle), math.sin(angle)
+        corners = []
+        for lng, lat in ((west, north), (east, north), (east, south), (west, south)):
+            dx, dy = lng - center[0], lat - center[1]
+            corners.append((center[0] + dx * cos + dy * sin, center[1] + dy * cos - dx * sin))
+        return cls(corners, viewbox)
+
+    @classmethod
+    def from_svg(cls, svg_path: str, outline: Dict[str, Any], bearing: float = 0.0) -> "FloorPlanOverlay":
+        """Places a floor plan SVG file over a building outline"""
+        return cls.from_outline(outline, svg_viewbox(ET.parse(svg_path).getroot()), bearing)
+
+    def svg_to_lnglat(self, x: float, y: float) -> Tuple[float, float]:
+        """Converts a viewBox point to (lng, lat)"""
+        vx, vy, width, height = self.viewbox
+        u, v = (x - vx) / width, (y - vy) / height
+        top_left, top_right, bottom_right, bottom_left = self.corners
+
+        top = [top_left[i] + u * (top_right[i] - top_left[i]) for i in (0, 1)]
+        bottom = [bottom_left[i] + u * (bottom_right[i] - bottom_left[i]) for i in (0, 1)]
+        return top[0] + v * (bottom[0] - top[0]), top[1] + v * (bottom[1] - top[1])
+
+
+def _geometry_points(geometry: Dict[str, Any]):
+    coordinates = geometry.get("coordinates", [])
+    depth = {"Point": 0, "LineString": 1, "MultiPoint": 1, "Polygon": 2,
+             "MultiLineString": 2, "MultiPolygon": 3}.get(geometry.get("type"), 2)
+
+    def flatten(value, level):
+        if level == 0:
+            yield value
+        else:
+            for item in value:
+                yield from flatten(item, level - 1)
+
+    yield from flatten(coordinates, depth)
+
+
+def load_building_outlines(campus_geojson_path: str) -> Dict[str, Dict[str, Any]]:
+    """Building outline geometries from campus.geojson, keyed by name"""
+    with open(campus_geojson_path, "r", encoding="utf-8") as f:
+        campus = json.load(f)
+    return {
+        feature["properties"]["name"]: feature["geometry"]
+        for feature in campus.get("features", [])
+        if feature.get("properties", {}).get("name") and feature.get("geometry")
+    }
@@ -0,0 +1,145 @@
+"""
+Floor Plan Index
+================
+
+This module preprocesses the floor plan SVGs declared in the building
+configs into a compact room geometry index, so the map client does not
+have to search the SVG DOM (getElementById/getBBox) for room centers and
+node positions:
+
+- room shapes (rooms, doors, exits, stairs, elevators: every element
+  whose ID is a mapped room or starts with Room_/Door_) with their
+  bounding box, outer ring and area centroid
+- room centers: the roomCentersSVG override when there is one, else the
+  bounding-box center (what the client used to compute)
+- corridor node marker positions
+- the fitted SVG → map transform (see transform.py), used to convert
+  all the points of a floor in one call
+
+Points are given in SVG viewBox coordinates (rounded to 0.01) and as
+[lat, lng] on the map. The index is versioned by a hash of its content.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .floorplan import (FloorPlanOverlay, load_building_outlines, load_svg_points, load_svg_shapes,
+                        polygon_centroid)
+from .transform import PlanTransform
+
+INDEX_FORMAT = "floor-plan-index"
+INDEX_FORMAT_VERSION = 1
+ROOM_ID_PREFIXES = ("Room_", "Door_")
+SVG_PRECISION = 2
+LATLNG_PRECISION = 7
+
+
+def _point(x: float, y: float) -> List[float]:
+    return [round(x, SVG_PRECISION), round(y, SVG_PRECISION)]
+
+
+def _latlngs(transform: PlanTransform, points: List[List[float]]) -> List[List[float]]:
+    if not points:
+        return []
+    return [[round(lat, LATLNG_PRECISION), round(lng, LATLNG_PRECISION)]
+            for lng, lat in transform.to_lnglat(points).tolist()]
+
+
+def index_floor_plan(svg_path: str, overlay: FloorPlanOverlay, room_ids: Sequence[str] = (),
+                     overrides: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Any]:
+    """
+    Indexes one floor plan SVG.
+
+    Args:
+        svg_path: Path to the SVG
+        overlay: Placement of the SVG on the map
+        room_ids: IDs of the mapped rooms, extracted whatever their prefix
+        overrides: roomCentersSVG manual centers ({room_id: {x, y}})
+
+    Returns:
+        {viewBox, corners, transform, rooms: {id: {center, manual, latlng, bbox?, centroid?, polygon?}},
+        nodes: {id: {svg, latlng}}}
+    """
+    known = set(room_ids)
+    shapes, viewbox = load_svg_shapes(
+        svg_path, lambda element_id: element_id in known or element_id.startswith(ROOM_ID_PREFIXES))
+
+    rooms: Dict[str, Dict[str, Any]] = {}
+    for room_id, ring in sorted(shapes.items()):
+        xs, ys = [p[0] for p in ring], [p[1] for p in ring]
+        bbox = [min(xs), min(ys), max(xs), max(ys)]
+        rooms[room_id] = {
+            "center": _point((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2),
+            "manual": False,
+            "bbox": [round(v, SVG_PRECISION) for v in bbox],
+            "centroid": _point(*polygon_centroid(ring)),
+            "polygon": [_point(x, y) for x, y in ring],
+        }
+
+    for room_id, center in sorted((overrides or {}).items()):
+        if room_id.startswith("_") or not isinstance(center, dict) or center.get("x") is None:
+            continue
+        rooms.setdefault(room_id, {})
+        rooms[room_id].update(center=_point(float(center["x"]), float(center["y"])), manual=True)
+
+    transform = PlanTransform.from_overlay(overlay)
+    for room, latlng in zip(rooms.values(), _latlngs(transform, [room["center"] for room in rooms.values()])):
+        room["latlng"] = latlng
+
+    points = sorted(load_svg_points(svg_path).items())
+    nodes = {node_id: {"svg": _point(x, y), "latlng": latlng}
+             for (node_id, (x, y)), latlng in zip(points, _latlngs(transform, [p for _, p in points]))}
+
+    return {
+        "viewBox": list(viewbox),
+        "corners": [[round(lat, LATLNG_PRECISION), round(lng, LATLNG_PRECISION)] for lng, lat in overlay.corners],
+        "transform": transform.to_dict(),
+        "rooms": rooms,
+        "nodes": nodes,
+    }
+
+
+def build_floor_plan_index(building_configs: Dict[str, Dict[str, Any]], campus_geojson_path: str,
+                           base_dir: str = ".") -> Dict[str, Any]:
+    """
+    Indexes every floor plan declared in the building configs.
+
+    Returns:
+        {format, formatVersion, version, floors: {floor_key: {svg, bearing, ...index_floor_plan}}}
+    """
+    floors: Dict[str, Dict[str, Any]] = {}
+    outlines = None
+    for code, config in sorted(building_configs.items()):
+        for floor_key, plan in sorted(config.get("floorPlans", {}).items()):
+            if outlines is None:
+                outlines = load_building_outlines(campus_geojson_path)
+            outline = outlines.get(plan.get("outline", config.get("_name")))
+            svg_path = os.path.join(base_dir, plan["svg"])
+            if outline is None or not os.path.exists(svg_path):
+                print(f"⚠️ Floor plan {floor_key} not indexed: outline or SVG not found")
+                continue
+
+            overlay = FloorPlanOverlay.from_svg(svg_path, outline, plan.get("bearing", 0.0))
+            room_ids = [room for room in config.get("roomToNode", {}) if not room.startswith("_")]
+            floors[floor_key] = {
+                "svg": plan["svg"],
+                "bearing": plan.get("bearing", 0.0),
+                **index_floor_plan(svg_path, overlay, room_ids, config.get("roomCentersSVG")),
+            }
+
+    index = {"format": INDEX_FORMAT, "formatVersion": INDEX_FORMAT_VERSION, "floors": floors}
+    content = json.dumps(index, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    index["version"] = hashlib.sha256(content).hexdigest()[:16]
+    return index
+
+
+def floor_plan_signature(building_configs: Dict[str, Dict[str, Any]], base_dir: str = ".") -> Tuple:
+    """Modification times of the declared floor plan SVGs (for cache invalidation)"""
+    signature = []
+    for config in building_configs.values():
+        for plan in config.get("floorPlans", {}).values():
+            path = os.path.join(base_dir, plan["svg"])
+            signature.append((path, os.path.getmtime(path) if os.path.exists(path) else None))
+    return tuple(sorted(signature, key=lambda item: item[0]))
@@ -0,0 +1,58 @@
+"""
+Geodesic Helpers
+================
+
+This module contains the distance functions used to weight the navigation
+graph. Coordinates follow the GeoJSON order: (longitude, latitude).
+"""
+
+import math
+from typing import List, Sequence
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def haversine_m(lng1: float, lat1: float, lng2: float, lat2: float) -> float:
+    """Great-circle distance in meters between two (lng, lat) points"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def linestring_length_m(coordinates: Sequence[Sequence[float]]) -> float:
+    """Geodesic length in meters of a GeoJSON LineString coordinate list"""
+    return sum(
+        haversine_m(a[0], a[1], b[0], b[1])
+        for a, b in zip(coordinates, coordinates[1:])
+    )
+
+
+def line_substring(coordinates: Sequence[Sequence[float]], start: float, end: float) -> List[List[float]]:
+    """
+    Part of a LineString between two fractions (0-1) of its geodesic
+    length, interpolated linearly inside the cut segments.
+    """
+    lengths = [haversine_m(a[0], a[1], b[0], b[1]) for a, b in zip(coordinates, coordinates[1:])]
+    total = sum(lengths)
+    if total == 0:
+        return [list(coordinates[0][:2]), list(coordinates[-1][:2])] if coordinates else []
+
+    def point_at(distance: float) -> List[float]:
+        for (a, b), length in zip(zip(coordinates, coordinates[1:]), lengths):
+            if distance <= length and length > 0:
+                t = distance / length
+                return [a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t]
+            distance -= length
+        return list(coordinates[-1][:2])
+
+    start_m, end_m = max(0.0, start) * total, min(1.0, end) * total
+    result = [point_at(start_m)]
+    walked = 0.0
+    for point, length in zip(coordinates[1:], lengths):
+        walked += length
+        if start_m < walked < end_m:
+            result.append(list(point[:2]))
+    result.append(point_at(end_m))
+    return result
@@ -0,0 +1,196 @@
+"""
+Route Geometry
+==============
+
+This module assembles the map geometry of a node path on the server:
+
+- corridor segments are looked up by their unordered node pair in O(1)
+  (instead of scanning every segment per pair of nodes)
+- segments are oriented along the path and stitched without duplicate
+  junction points; untraced pairs fall back to a straight line
+- the polyline is simplified with Douglas–Peucker using a tolerance of a
+  fraction of a pixel at the requested Leaflet zoom level, and rounded to
+  a fixed precision, so the returned GeoJSON stays small
+- assembled geometries are cached per (path, zoom)
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .cache import VersionedLRUCache
+from .geo import EARTH_RADIUS_M
+
+# Meters per pixel at zoom 0 on the equator (256 px Web Mercator tiles)
+METERS_PER_PIXEL_Z0 = 2 * math.pi * EARTH_RADIUS_M / 256
+SIMPLIFY_TOLERANCE_PX = 0.5
+COORDINATE_PRECISION = 7  # ~1 cm
+MIN_MAP_ZOOM, MAX_MAP_ZOOM = 0, 24  # Tile zoom range a geometry can be simplified for
+DEFAULT_CACHE_SIZE = 512
+
+
+def pair_key(a: str, b: str) -> Tuple[str, str]:
+    """Order-independent key of a node pair"""
+    return (a, b) if a <= b else (b, a)
+
+
+def tolerance_for_zoom(zoom: float, latitude: float, pixels: float = SIMPLIFY_TOLERANCE_PX) -> float:
+    """Simplification tolerance in meters for a Leaflet zoom level"""
+    return pixels * METERS_PER_PIXEL_Z0 * math.cos(math.radians(latitude)) / (2 ** zoom)
+
+
+def douglas_peucker(coordinates: Sequence[Sequence[float]], tolerance_m: float) -> List[List[float]]:
+    """
+    Simplifies a (lng, lat) polyline, keeping every point farther than the
+    tolerance from the simplified line. Iterative, so long routes cannot
+    hit the recursion limit.
+    """
+    count = len(coordinates)
+    if count < 3 or tolerance_m <= 0:
+        return [list(point) for point in coordinates]
+
+    # Local equirectangular projection around the first point
+    lat0 = math.radians(coordinates[0][1])
+    scale_x = math.radians(1) * EARTH_RADIUS_M * math.cos(lat0)
+    scale_y = math.radians(1) * EARTH_RADIUS_M
+    points = [((p[0] - coordinates[0][0]) * scale_x, (p[1] - coordinates[0][1]) * scale_y) for p in coordinates]
+
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        (ax, ay), (bx, by) = points[first], points[last]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+
+        farthest, farthest_distance = None, tolerance_m
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if length_sq == 0:
+                distance = math.hypot(px - ax, py - ay)
+            else:
+                t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+                distance = math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+            if distance > farthest_distance:
+                farthest, farthest_distance = i, distance
+
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    return [list(coordinates[i]) for i in range(count) if keep[i]]
+
+
+class RouteGeometryService:
+    """Assembles, simplifies and caches route geometries"""
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE, precision: int = COORDINATE_PRECISION):
+        self.segments: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.node_positions: Dict[str, Tuple[float, float]] = {}
+        self.precision = precision
+        self._cache = VersionedLRUCache(cache_size)
+
+    @property
+    def cache_size(self) -> int:
+        return self._cache.max_size
+
+    @cache_size.setter
+    def cache_size(self, size: int) -> None:
+        self._cache.max_size = size
+
+    def add_segment(self, start: str, end: str, coordinates: Sequence[Sequence[float]]) -> None:
+        """Indexes a traced segment, stored in its start → end orientation"""
+        self.segments[pair_key(start, end)] = {"start": start, "coordinates": [list(p[:2]) for p in coordinates]}
+        self.clear_cache()
+
+    def add_node(self, node_id: str, lng: float, lat: float) -> None:
+        """Records a node position (used for the straight-line fallback)"""
+        self.node_positions[node_id] = (lng, lat)
+
+    @classmethod
+    def from_graphs(cls, graphs: Iterable[Any], **kwargs) -> "RouteGeometryService":
+        """
+        Builds the service from navigation graphs (e.g. the floors of a
+        CampusGraph): every edge with traced coordinates becomes a segment.
+        """
+        service = cls(**kwargs)
+        for graph in graphs:
+            for node_id, node in graph.nodes.items():
+                if node["lng"] is not None:
+                    service.add_node(node_id, node["lng"], node["lat"])
+            for neighbors in graph.adjacency.values():
+                for edge in neighbors.values():
+                    if edge.get("coordinates"):
+                        service.add_segment(edge["start"], edge["end"], edge["coordinates"])
+        return service
+
+    def segment_coordinates(self, a: str, b: str) -> Optional[List[List[float]]]:
+        """Traced coordinates of the pair oriented from a to b (None if untraced)"""
+        segment = self.segments.get(pair_key(a, b))
+        if segment is None:
+            return None
+        coordinates = segment["coordinates"]
+        return coordinates if segment["start"] == a else coordinates[::-1]
+
+    def assemble(self, path: Sequence[str]) -> Dict[str, Any]:
+        """
+        Stitches the segments of a node path.
+
+        Returns:
+            {coordinates, segmentsFound, segmentsMissing, missingSegments, quality}
+        """
+        coordinates: List[List[float]] = []
+        found, missing = 0, []
+
+        for a, b in zip(path, path[1:]):
+            segment = self.segment_coordinates(a, b)
+            if segment is not None:
+                found += 1
+            else:
+                missing.append(f"{a}→{b}")
+                segment = [list(self.node_positions[n]) for n in (a, b) if n in self.node_positions]
+            if coordinates and segment and coordinates[-1] == segment[0]:
+                segment = segment[1:]
+            coordinates.extend(segment)
+
+        if not coordinates and path and path[0] in self.node_positions:
+            coordinates = [list(self.node_positions[path[0]])]
+
+        pairs = found + len(missing)
+        return {
+            "coordinates": coordinates,
+            "segmentsFound": found,
+            "segmentsMissing": len(missing),
+            "missingSegments": missing,
+            "quality": round(found / pairs, 3) if pairs else 1.0,
+        }
+
+    def geometry(self, path: Sequence[str], zoom: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Assembled geometry of a path, simplified for a zoom level (None:
+        full detail) and rounded to the service precision. Cached.
+        """
+        key = (tuple(path), zoom)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self.assemble(path)
+        coordinates = result["coordinates"]
+        if zoom is not None and coordinates:
+            coordinates = douglas_peucker(coordinates, tolerance_for_zoom(zoom, coordinates[0][1]))
+        result["coordinates"] = [[round(p[0], self.precision), round(p[1], self.precision)] for p in coordinates]
+
+        self._cache.put(key, result)
+        return result
+
+    def clear_cache(self) -> None:
+        """Drops every cached geometry"""
+        self._cache.clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        """Cache statistics"""
+        info = self._cache.info()
+        del info["version"]
+        return info
@@ -0,0 +1,177 @@
+"""
+Navigation Graph
+================
+
+This module builds the weighted corridor graph used for server-side
+routing. Nodes are the corridor nodes of the floor plans (e.g. M1_3,
+M1_Int_1) and edges are the traced corridor segments, weighted by their
+geodesic length. Rooms are attached to the graph through roomToNode.
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .geo import haversine_m, linestring_length_m
+
+
+class NavigationGraph:
+    """Undirected weighted graph of corridor nodes"""
+
+    def __init__(self, room_to_node: Optional[Dict[str, str]] = None):
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.adjacency: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.room_to_node: Dict[str, str] = dict(room_to_node or {})
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.nodes
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(neighbors) for neighbors in self.adjacency.values()) // 2
+
+    def add_node(self, node_id: str, lng: Optional[float] = None, lat: Optional[float] = None, **attributes) -> None:
+        """Adds a node (or fills in the position and attributes of an existing one)"""
+        node = self.nodes.setdefault(node_id, {"id": node_id, "lng": None, "lat": None})
+        if lng is not None and lat is not None:
+            node["lng"], node["lat"] = lng, lat
+        node.update(attributes)
+        self.adjacency.setdefault(node_id, {})
+
+    def add_edge(
+        self,
+        start: str,
+        end: str,
+        weight: Optional[float] = None,
+        coordinates: Optional[Sequence[Sequence[float]]] = None,
+        **properties
+    ) -> Dict[str, Any]:
+        """
+        Adds an undirected edge.
+
+        Args:
+            start: First node
+            end: Second node
+            weight: Length in meters (default: geodesic length of the coordinates,
+                or the distance between the node positions)
+            coordinates: LineString coordinates ordered from start to end
+            **properties: Extra edge properties (segmentType, name, ...)
+
+        Returns:
+            The edge dict, shared by both directions
+
+        Raises:
+            ValueError: If the weight is negative or not finite, or the edge has no way to be measured
+        """
+        if weight is not None and (not math.isfinite(weight) or weight < 0):
+            raise ValueError(f"Edge {start}-{end} weight must be a finite, non-negative number")
+        coordinates = [list(point[:2]) for point in coordinates] if coordinates else None
+        self.add_node(start, *(coordinates[0] if coordinates else (None, None)))
+        self.add_node(end, *(coordinates[-1] if coordinates else (None, None)))
+
+        if weight is None:
+            if coordinates and len(coordinates) > 1:
+                weight = linestring_length_m(coordinates)
+            else:
+                weight = self.node_distance_m(start, end)
+                if weight is None:
+                    raise ValueError(f"Edge {start}-{end} has no geometry and its nodes have no position")
+
+        edge = {"start": start, "end": end, "weight": float(weight), "coordinates": coordinates, **properties}
+        self.adjacency[start][end] = edge
+        self.adjacency[end][start] = edge
+        return edge
+
+    def remove_edge(self, a: str, b: str) -> Optional[Dict[str, Any]]:
+        """Removes the edge between two nodes (both directions); returns it, or None if there was none"""
+        edge = self.adjacency.get(a, {}).pop(b, None)
+        self.adjacency.get(b, {}).pop(a, None)
+        return edge
+
+    def node_distance_m(self, a: str, b: str) -> Optional[float]:
+        """Straight-line distance between two positioned nodes"""
+        node_a, node_b = self.nodes.get(a), self.nodes.get(b)
+        if not node_a or not node_b or node_a["lng"] is None or node_b["lng"] is None:
+            return None
+        return haversine_m(node_a["lng"], node_a["lat"], node_b["lng"], node_b["lat"])
+
+    def neighbors(self, node_id: str) -> Dict[str, Dict[str, Any]]:
+        """Returns {neighbor: edge} for a node"""
+        return self.adjacency.get(node_id, {})
+
+    def edge(self, a: str, b: str) -> Optional[Dict[str, Any]]:
+        """Returns the edge between two nodes, if any"""
+        return self.adjacency.get(a, {}).get(b)
+
+    def edge_coordinates(self, a: str, b: str) -> List[List[float]]:
+        """
+        Returns the coordinates of the edge a-b oriented from a to b.
+
+        Falls back to the straight line between the node positions when
+        the edge has no traced geometry.
+        """
+        edge = self.edge(a, b)
+        if edge and edge["coordinates"]:
+            return edge["coordinates"] if edge["start"] == a else edge["coordinates"][::-1]
+
+        coordinates = []
+        for node_id in (a, b):
+            node = self.nodes.get(node_id)
+            if node and node["lng"] is not None:
+                coordinates.append([node["lng"], node["lat"]])
+        return coordinates
+
+    def resolve(self, location: str) -> Optional[str]:
+        """Maps a room ID or node ID to a graph node"""
+        if location in self.room_to_node:
+            return self.room_to_node[location]
+        if location in self.nodes:
+            return location
+        return None
+
+    @classmethod
+    def from_corridor_geojson(
+        cls,
+        source: Union[str, Dict[str, Any]],
+        room_to_node: Optional[Dict[str, str]] = None
+    ) -> "NavigationGraph":
+        """
+        Builds the graph from a corridor segments FeatureCollection.
+
+        Each LineString feature with startNode/endNode properties becomes an
+        edge weighted by its geodesic length.
+
+        Args:
+            source: Path to the GeoJSON file or the parsed FeatureCollection
+            room_to_node: Room ID → node ID mapping from the building config
+
+        Returns:
+            The navigation graph
+        """
+        if isinstance(source, str):
+            with open(source, "r", encoding="utf-8") as f:
+                source = json.load(f)
+
+        graph = cls(room_to_node)
+        for feature in source.get("features", []):
+            properties = feature.get("properties", {})
+            geometry = feature.get("geometry") or {}
+            start, end = properties.get("startNode"), properties.get("endNode")
+
+            if not start or not end or geometry.get("type") != "LineString":
+                print(f"⚠️  Skipping corridor feature without nodes or LineString: {properties.get('name')}")
+                continue
+
+            graph.add_edge(
+                start,
+                end,
+                coordinates=geometry.get("coordinates"),
+                name=properties.get("name"),
+                segmentType=properties.get("segmentType", "corridor"),
+                accessibility=properties.get("accessibility"),
+            )
+
+        return graph
@@ -0,0 +1,199 @@
+"""
+Walk-Time Isochrones
+====================
+
+This module answers "everything within a 2-minute walk of room 1003": a
+bounded single-source search over the campus graph (corridors and
+transfers) gives the walking distance to every node up to the largest
+time threshold, and each corridor segment is cut where that budget runs
+out, from either end. The reachable segment portions are grouped into
+GeoJSON bands (0-1 min, 1-2 min, ...), one MultiLineString per band and
+floor.
+
+The profile decides which edges may be used and which route is taken to
+each node; times are the walking length of that route in meters (not
+its profile-weighted cost) divided by the walking speed. Shortest-path
+trees are cached per (origin, profile) with the distance they were
+searched to, and dropped when the graph version changes.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .cache import VersionedLRUCache
+from .campus import CampusGraph, parse_floor_key
+from .geo import line_substring
+from .profiles import DEFAULT_PROFILE, ROUTING_PROFILES, profile_weight
+
+WALKING_SPEED_M_PER_S = 1.2
+DEFAULT_THRESHOLDS_S = (60, 120, 300)
+COORDINATE_PRECISION = 7
+DEFAULT_CACHE_SIZE = 128
+
+Interval = Tuple[float, float]
+
+
+def reachable_fractions(distance_a: float, distance_b: float, weight: float, budget: float) -> List[Interval]:
+    """
+    Fractions (0 at a, 1 at b) of an edge reachable within the budget,
+    walking in from either end.
+    """
+    if weight <= 0:
+        return [(0.0, 1.0)] if min(distance_a, distance_b) <= budget else []
+    intervals = []
+    from_a, from_b = (budget - distance_a) / weight, (budget - distance_b) / weight
+    if from_a > 0:
+        intervals.append((0.0, min(1.0, from_a)))
+    if from_b > 0:
+        intervals.append((max(0.0, 1.0 - from_b), 1.0))
+    if len(intervals) == 2 and intervals[0][1] >= intervals[1][0]:
+        return [(0.0, 1.0)]
+    return intervals
+
+
+def subtract_intervals(intervals: Sequence[Interval], removed: Sequence[Interval]) -> List[Interval]:
+    """Parts of the intervals not covered by the removed ones"""
+    result = []
+    for interval in intervals:
+        pieces = [interval]
+        for removed_start, removed_end in removed:
+            remaining = []
+            for start, end in pieces:
+                if removed_end <= start or removed_start >= end:
+                    remaining.append((start, end))
+                    continue
+                if start < removed_start:
+                    remaining.append((start, removed_start))
+                if removed_end < end:
+                    remaining.append((removed_end, end))
+            pieces = remaining
+        result.extend(piece for piece in pieces if piece[1] - piece[0] > 1e-9)
+    return result
+
+
+def isochrone_bands(campus: CampusGraph, distances: Dict[str, float], thresholds_s: Sequence[float],
+                    profile: str = DEFAULT_PROFILE,
+                    speed_m_per_s: float = WALKING_SPEED_M_PER_S) -> List[Dict[str, Any]]:
+    """
+    Reachable corridor portions per time band.
+
+    Args:
+        campus: The campus graph
+        distances: Walking distance in meters of the nodes from the origin (at least up to the largest threshold)
+        thresholds_s: Band limits in seconds
+        profile: Routing profile the distances were computed with
+        speed_m_per_s: Walking speed
+
+    Returns:
+        GeoJSON features, one MultiLineString per band and floor, with
+        {band, minSeconds, maxSeconds, building, floor} properties
+    """
+    thresholds = sorted(set(float(t) for t in thresholds_s))
+    budgets = [threshold * speed_m_per_s for threshold in thresholds]
+    bands: List[Dict[str, List[List[List[float]]]]] = [{} for _ in budgets]
+
+    for floor_key, graph in sorted(campus.floors.items()):
+        for a, neighbors in graph.adjacency.items():
+            for b, edge in neighbors.items():
+                if a >= b:
+                    continue
+                distance_a, distance_b = distances.get(a, float("inf")), distances.get(b, float("inf"))
+                if not budgets or min(distance_a, distance_b) >= budgets[-1]:
+                    continue
+                if profile_weight(profile, edge) is None:
+                    continue
+                weight = profile_weight(DEFAULT_PROFILE, edge)  # meters, not the profile's cost
+                coordinates = graph.edge_coordinates(a, b)
+                if len(coordinates) < 2:
+                    continue
+
+                covered: List[Interval] = []
+                for band, budget in enumerate(budgets):
+                    reachable = reachable_fractions(distance_a, distance_b, weight, budget)
+                    for start, end in subtract_intervals(reachable, covered):
+                        line = line_substring(coordinates, start, end)
+                        bands[band].setdefault(floor_key, []).append(
+                            [[round(p[0], COORDINATE_PRECISION), round(p[1], COORDINATE_PRECISION)] for p in line])
+                    covered = reachable
+
+    features = []
+    for band, lines_by_floor in enumerate(bands):
+        for floor_key, lines in sorted(lines_by_floor.items()):
+            building, floor = parse_floor_key(floor_key)
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "MultiLineString", "coordinates": lines},
+                "properties": {
+                    "band": band,
+                    "minSeconds": thresholds[band - 1] if band else 0,
+                    "maxSeconds": thresholds[band],
+                    "building": building,
+                    "floor": floor,
+                },
+            })
+    return features
+
+
+class IsochroneService:
+    """Walk-time isochrones over a campus graph, with cached shortest-path trees"""
+
+    def __init__(self, campus: CampusGraph, speed_m_per_s: float = WALKING_SPEED_M_PER_S,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.campus = campus
+        self.speed_m_per_s = speed_m_per_s
+        # (origin, profile) → (distance searched to, node distances)
+        self._trees = VersionedLRUCache(cache_size, campus.version)
+
+    def distances(self, origin: str, profile: str = DEFAULT_PROFILE,
+                  max_distance: float = float("inf")) -> Dict[str, float]:
+        """
+        Walking distance in meters, along the profile's routes, of the nodes
+        within max_distance of the origin (cached tree, bounded search)
+        """
+        key = (origin, profile)
+        version = self.campus.version
+        cached = self._trees.get(key, version, usable=lambda tree: tree[0] >= max_distance)
+        if cached is not None:
+            return cached[1]
+
+        # A route within max_distance meters costs at most max_distance times the largest multiplier
+        stretch = max([1.0, *ROUTING_PROFILES[profile]["multipliers"].values()])
+        costs, previous = self.campus.shortest_path_tree(origin, profile, max_distance=max_distance * stretch)
+        distances: Dict[str, float] = {}
+        for node in costs:  # Settling order: each node comes after the node it is reached from
+            parent = previous.get(node)
+            distances[node] = 0.0 if parent is None else (
+                distances[parent] + self.campus.path_distance_m([parent, node]))
+
+        self._trees.put(key, (max_distance, distances), version)
+        return distances
+
+    def isochrone(self, origin: str, thresholds_s: Sequence[float] = DEFAULT_THRESHOLDS_S,
+                  profile: str = DEFAULT_PROFILE) -> Optional[Dict[str, Any]]:
+        """
+        Isochrone bands around an origin node.
+
+        Returns:
+            GeoJSON FeatureCollection with the bands (see isochrone_bands) and
+            'rooms': [{room, node, seconds}] reachable within the largest
+            threshold, nearest first; None if the origin is not in the graph
+        """
+        if origin not in self.campus or not thresholds_s:
+            return None
+        max_distance = max(thresholds_s) * self.speed_m_per_s
+        distances = self.distances(origin, profile, max_distance)
+
+        rooms = sorted(
+            ({"room": room, "node": node, "seconds": round(distances[node] / self.speed_m_per_s, 1)}
+             for room, node in self.campus.room_to_node.items()
+             if node in distances and distances[node] <= max_distance),
+            key=lambda item: (item["seconds"], item["room"])
+        )
+        return {
+            "type": "FeatureCollection",
+            "features": isochrone_bands(self.campus, distances, thresholds_s, profile, self.speed_m_per_s),
+            "rooms": rooms,
+        }
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        return self._trees.info()
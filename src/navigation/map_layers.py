@@ -0,0 +1,249 @@
+"""
+Campus Map Layers
+=================
+
+This module builds compact, zoom-aware versions of the campus GeoJSON
+(LeafletJS/campus.geojson) for the map:
+
+- one layer per zoom band, simplified with Douglas–Peucker at half a
+  pixel of the band's simplification zoom (the detail band is not
+  simplified)
+- coordinates quantized to a per-band integer grid finer than the
+  tolerance and delta-encoded per ring (x0, y0, dx1, dy1, ...)
+- every layer written as JSON plus a pre-compressed .gz copy, under a
+  version derived from the source content
+
+The manifest lists the bands with their files and sizes, plus the exact
+bounds of every named feature (so the floor plan can be placed without
+downloading the detail band); the client picks the band of its zoom and
+decodes it with decodeCampusLayer.
+"""
+
+import gzip
+import hashlib
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from .geo import EARTH_RADIUS_M
+from .geometry import douglas_peucker, tolerance_for_zoom
+
+LAYER_FORMAT = "campus-layer"
+LAYER_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# (name, min zoom, max zoom, zoom the band is simplified for or None)
+ZOOM_BANDS: List[Tuple[str, int, int, Optional[int]]] = [
+    ("overview", 0, 16, 15),
+    ("campus", 17, 18, 17),
+    ("detail", 19, 22, None),
+]
+
+# Unsimplified bands are quantized for this tolerance (1e-7 degree grid, ~1 cm)
+DETAIL_TOLERANCE_M = 0.05
+
+_METERS_PER_DEGREE = math.radians(1) * EARTH_RADIUS_M
+
+
+def band_for_zoom(zoom: float) -> str:
+    """Name of the zoom band covering a zoom level"""
+    for name, min_zoom, max_zoom, _ in ZOOM_BANDS:
+        if zoom <= max_zoom:
+            return name
+    return ZOOM_BANDS[-1][0]
+
+
+def _ring_points(geometry: Dict[str, Any]) -> List[List[List[float]]]:
+    """Rings/lines of a geometry as lists of points, with their nesting recorded by encode"""
+    kind, coordinates = geometry["type"], geometry["coordinates"]
+    if kind == "Point":
+        return [[coordinates]]
+    if kind in ("LineString", "MultiPoint"):
+        return [coordinates]
+    if kind in ("Polygon", "MultiLineString"):
+        return list(coordinates)
+    if kind == "MultiPolygon":
+        return [ring for polygon in coordinates for ring in polygon]
+    raise ValueError(f"Unsupported geometry type: {kind}")
+
+
+def simplify_geometry(geometry: Dict[str, Any], tolerance_m: float) -> Dict[str, Any]:
+    """Simplifies the lines and rings of a geometry (rings keep at least 4 points; 0 keeps all)"""
+    def simplify(points, closed):
+        simplified = douglas_peucker(points, tolerance_m)
+        if closed and len(simplified) < 4:
+            return [list(p) for p in points]
+        return simplified
+
+    kind, coordinates = geometry["type"], geometry["coordinates"]
+    if kind in ("Point", "MultiPoint"):
+        return {"type": kind, "coordinates": coordinates}
+    if kind == "LineString":
+        return {"type": kind, "coordinates": simplify(coordinates, False)}
+    if kind == "MultiLineString":
+        return {"type": kind, "coordinates": [simplify(line, False) for line in coordinates]}
+    if kind == "Polygon":
+        return {"type": kind, "coordinates": [simplify(ring, True) for ring in coordinates]}
+    if kind == "MultiPolygon":
+        return {"type": kind, "coordinates": [[simplify(ring, True) for ring in polygon] for polygon in coordinates]}
+    raise ValueError(f"Unsupported geometry type: {kind}")
+
+
+def quantization_scale(tolerance_m: float) -> int:
+    """Grid units per degree: a power of ten with cells under a quarter of the tolerance"""
+    return 10 ** max(5, math.ceil(math.log10(_METERS_PER_DEGREE / (tolerance_m / 4))))
+
+
+def encode_layer(collection: Dict[str, Any], tolerance_m: float, band: Tuple[str, int, int, Optional[int]],
+                 simplify: bool = True) -> Dict[str, Any]:
+    """
+    Simplifies (unless simplify is False), quantizes to a grid finer than
+    the tolerance and delta-encodes a FeatureCollection.
+
+    Every ring or line becomes a flat integer list [x0, y0, dx1, dy1, ...]
+    relative to the layer origin; 'parts' records how rings group into
+    polygons for MultiPolygon features.
+    """
+    scale = quantization_scale(tolerance_m)
+    points = [p for feature in collection["features"] for ring in _ring_points(feature["geometry"]) for p in ring]
+    origin = [min(p[0] for p in points), min(p[1] for p in points)] if points else [0.0, 0.0]
+
+    features = []
+    for feature in collection["features"]:
+        geometry = simplify_geometry(feature["geometry"], tolerance_m if simplify else 0)
+        rings = []
+        for ring in _ring_points(geometry):
+            encoded, previous = [], (0, 0)
+            for lng, lat in (p[:2] for p in ring):
+                x = round((lng - origin[0]) * scale)
+                y = round((lat - origin[1]) * scale)
+                encoded.extend((x - previous[0], y - previous[1]))
+                previous = (x, y)
+            rings.append(encoded)
+
+        encoded_feature = {"type": geometry["type"], "rings": rings, "properties": feature.get("properties", {})}
+        if geometry["type"] == "MultiPolygon":
+            encoded_feature["parts"] = [len(polygon) for polygon in geometry["coordinates"]]
+        features.append(encoded_feature)
+
+    return {
+        "format": LAYER_FORMAT,
+        "version": LAYER_FORMAT_VERSION,
+        "band": {"name": band[0], "minZoom": band[1], "maxZoom": band[2]},
+        "scale": scale,
+        "origin": origin,
+        "features": features,
+    }
+
+
+def decode_layer(layer: Dict[str, Any]) -> Dict[str, Any]:
+    """Decodes a layer back into a GeoJSON FeatureCollection (mirrors decodeCampusLayer)"""
+    scale, (origin_x, origin_y) = layer["scale"], layer["origin"]
+    features = []
+    for feature in layer["features"]:
+        rings = []
+        for encoded in feature["rings"]:
+            x = y = 0
+            ring = []
+            for i in range(0, len(encoded), 2):
+                x += encoded[i]
+                y += encoded[i + 1]
+                ring.append([origin_x + x / scale, origin_y + y / scale])
+            rings.append(ring)
+
+        kind = feature["type"]
+        if kind == "Point":
+            coordinates = rings[0][0]
+        elif kind in ("LineString", "MultiPoint"):
+            coordinates = rings[0]
+        elif kind == "MultiPolygon":
+            coordinates, start = [], 0
+            for count in feature["parts"]:
+                coordinates.append(rings[start:start + count])
+                start += count
+        else:
+            coordinates = rings
+        features.append({"type": "Feature", "geometry": {"type": kind, "coordinates": coordinates},
+                         "properties": feature["properties"]})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def feature_bounds(collection: Dict[str, Any]) -> Dict[str, List[float]]:
+    """Unsimplified [west, south, east, north] bounds of every named feature"""
+    bounds = {}
+    for feature in collection["features"]:
+        name = (feature.get("properties") or {}).get("name")
+        points = [p for ring in _ring_points(feature["geometry"]) for p in ring]
+        if name and points:
+            bounds[name] = [min(p[0] for p in points), min(p[1] for p in points),
+                            max(p[0] for p in points), max(p[1] for p in points)]
+    return bounds
+
+
+def _write(path: str, data: bytes) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def build_map_layers(source_path: str, directory: str) -> Dict[str, Any]:
+    """
+    Builds every zoom band of a campus GeoJSON and writes the files and
+    manifest (manifest last, so readers never see a partial build).
+
+    Returns:
+        The manifest
+    """
+    with open(source_path, "rb") as f:
+        raw = f.read()
+    collection = json.loads(raw)
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    latitude = next((p[1] for feature in collection["features"] for ring in _ring_points(feature["geometry"])
+                     for p in ring), 0.0)
+
+    os.makedirs(directory, exist_ok=True)
+    bands = []
+    for band in ZOOM_BANDS:
+        name, min_zoom, max_zoom, simplify_zoom = band
+        tolerance = tolerance_for_zoom(simplify_zoom, latitude) if simplify_zoom is not None else DETAIL_TOLERANCE_M
+        layer = encode_layer(collection, tolerance, band, simplify=simplify_zoom is not None)
+        payload = json.dumps(layer, separators=(",", ":")).encode("utf-8")
+        filename = f"campus.{name}.{version}.json"
+        _write(os.path.join(directory, filename), payload)
+        compressed = gzip.compress(payload, compresslevel=9, mtime=0)
+        _write(os.path.join(directory, f"{filename}.gz"), compressed)
+        bands.append({"name": name, "minZoom": min_zoom, "maxZoom": max_zoom, "file": filename,
+                      "tolerance_m": round(tolerance, 3) if simplify_zoom is not None else 0,
+                      "bytes": len(payload), "gzipBytes": len(compressed)})
+
+    manifest = {"version": version, "source": os.path.basename(source_path), "sourceBytes": len(raw), "bands": bands,
+                "featureBounds": feature_bounds(collection)}
+    _write(os.path.join(directory, MANIFEST_FILE), json.dumps(manifest, indent=2).encode("utf-8"))
+    return manifest
+
+
+def load_or_build_map_layers(source_path: str, directory: str) -> Dict[str, Any]:
+    """Loads the manifest if it matches the source, otherwise rebuilds the layers"""
+    with open(source_path, "rb") as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:16]
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == version and "featureBounds" in manifest and all(
+                os.path.exists(os.path.join(directory, band["file"])) for band in manifest["bands"]):
+            return manifest
+        print("🔄 Campus GeoJSON changed, rebuilding map layers...")
+    except FileNotFoundError:
+        print("🔄 Building map layers...")
+
+    manifest = build_map_layers(source_path, directory)
+    print(f"✅ Map layers built: {manifest['sourceBytes']} bytes → " + ", ".join(
+        f"{band['name']} {band['gzipBytes']} gz" for band in manifest["bands"]))
+    return manifest
+
+
+def band_file(manifest: Dict[str, Any], name: str) -> Optional[str]:
+    """File of a band in a manifest"""
+    return next((band["file"] for band in manifest["bands"] if band["name"] == name), None)
@@ -0,0 +1,104 @@
+"""
+Routing Profiles
+================
+
+This module defines the accessibility profiles used by the routing
+engine. A profile filters and reweights edges by type:
+
+- default: shortest walking route
+- step-free: no stairs (segments or transfers), for wheelchairs and strollers
+- elevator-preferred: stairs are allowed but strongly penalized
+
+Edge types come from the corridor segment `segmentType` and
+`accessibility` properties and from the transfer types of the campus
+graph (stairs, elevator, building_connection). Temporarily closed edges
+(see dynamic.py) are excluded by every profile.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+DEFAULT_PROFILE = "default"
+
+ROUTING_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "description": "Shortest walking route",
+        "excluded_types": set(),
+        "multipliers": {},
+    },
+    "step-free": {
+        "description": "Avoids stairs; uses elevators and ramps",
+        "excluded_types": {"stairs", "steps", "escalator"},
+        "multipliers": {},
+    },
+    "elevator-preferred": {
+        "description": "Prefers elevators, takes stairs only when much shorter",
+        "excluded_types": set(),
+        "multipliers": {"stairs": 4.0, "steps": 4.0, "escalator": 2.0, "elevator": 0.5},
+    },
+}
+
+# Accessibility values of corridor segments that are not step-free
+_NOT_STEP_FREE = {"stairs", "steps", "none", "no", "false"}
+
+# Chat phrasing that asks for a route without stairs, or by elevator (whole words only, so
+# "take me to the elevator" or "uplift" do not change the route)
+_STEP_FREE_PATTERN = re.compile(
+    r"\b(?:wheelchairs?|step[- ]free|(?:no|without|avoid(?:ing)?)\s+(?:the\s+)?stairs|accessible\s+route"
+    r"|mobility|strollers?|crutches)\b"
+)
+_ELEVATOR_PATTERN = re.compile(
+    r"\b(?:(?:use|using|via|by|take|taking|ride|riding|prefer|preferring)\s+(?:the\s+|an\s+|a\s+)?"
+    r"(?:elevators?|lifts?)|(?:elevators?|lifts?)\s+only)\b"
+)
+
+
+def normalize_profile(profile: Optional[str]) -> str:
+    """
+    Normalizes a profile name ('Step_Free', 'step free' → 'step-free').
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if not profile:
+        return DEFAULT_PROFILE
+    name = str(profile).strip().lower().replace("_", "-").replace(" ", "-")
+    if name not in ROUTING_PROFILES:
+        raise ValueError(f"Unknown routing profile '{profile}'. Use one of {list(ROUTING_PROFILES)}")
+    return name
+
+
+def edge_type(edge: Dict[str, Any]) -> str:
+    """Type of a corridor edge or transfer edge"""
+    return str(edge.get("type") or edge.get("segmentType") or "corridor").lower()
+
+
+def profile_weight(profile: str, edge: Dict[str, Any]) -> Optional[float]:
+    """
+    Weight of an edge under a profile.
+
+    Returns:
+        The weight in meters, or None if the profile excludes the edge
+    """
+    if edge.get("closed"):
+        return None
+    settings = ROUTING_PROFILES[profile]
+    kind = edge_type(edge)
+
+    if kind in settings["excluded_types"]:
+        return None
+    accessibility = edge.get("accessibility")
+    if profile == "step-free" and accessibility is not None and str(accessibility).lower() in _NOT_STEP_FREE:
+        return None
+
+    return edge["weight"] * settings["multipliers"].get(kind, 1.0)
+
+
+def detect_profile(message: str) -> Optional[str]:
+    """Detects an accessibility need in a chat message (asking for a route, not for the elevator itself)"""
+    text = message.lower()
+    if _STEP_FREE_PATTERN.search(text):
+        return "step-free"
+    if _ELEVATOR_PATTERN.search(text):
+        return "elevator-preferred"
+    return None
@@ -0,0 +1,243 @@
+"""
+Room Name Search
+================
+
+This module resolves free-text room names ("room 1oo3", "mens washroom",
+"M1003") to room IDs with a precomputed fuzzy index over the aliases, the
+room IDs and the room descriptions of the building configs:
+
+- names are normalized (case, punctuation, synonyms such as washroom →
+  bathroom, digit look-alikes in room numbers, building prefixes and
+  filler words like "room")
+- query tokens are corrected against the index vocabulary with a
+  SymSpell-style delete index and a bounded edit-distance check (room
+  numbers must match exactly)
+- names sharing corrected tokens or character trigrams with the query are
+  scored, and the best score per room gives ranked candidates
+
+resolve() only returns a room when the best candidate clears a confidence
+threshold and a margin over the next room.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_MARGIN = 0.05
+MAX_EDIT_DISTANCE = 2
+MIN_TRIGRAM_SCORE = 0.35
+
+# Words that do not identify a room
+STOP_WORDS = {"room", "rm", "the", "a", "an", "to", "of", "in", "at", "sala", "building", "bldg", "floor"}
+
+# Normalized to the first form of each group
+SYNONYMS = {
+    "washroom": "bathroom", "restroom": "bathroom", "toilet": "bathroom", "toilets": "bathroom",
+    "washrooms": "bathroom", "restrooms": "bathroom", "bathrooms": "bathroom", "lavatory": "bathroom",
+    "wc": "bathroom", "banheiro": "bathroom",
+    "lift": "elevator", "elevador": "elevator",
+    "stairwell": "stairs", "stair": "stairs", "staircase": "stairs", "escada": "stairs",
+    "man": "men", "mens": "men", "male": "men", "gents": "men",
+    "woman": "women", "womens": "women", "female": "women", "ladies": "women",
+}
+
+# Letters commonly typed for digits inside room numbers
+DIGIT_LOOKALIKES = {"o": "0", "l": "1", "i": "1"}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_LETTER_DIGIT_PATTERN = re.compile(r"[a-z]+|[0-9]+")
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), stopping early: returns max_distance + 1 once the
+    distance is known to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+
+    previous_previous: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+
+def max_distance_for(token: str) -> int:
+    """Edit distance allowed for a token: none for numbers and short words"""
+    if token.isdigit() or len(token) < 4:
+        return 0
+    return 1 if len(token) < 7 else MAX_EDIT_DISTANCE
+
+
+def deletes(token: str, max_distance: int) -> Set[str]:
+    """Every string obtained by deleting up to max_distance characters"""
+    results = {token}
+    frontier = {token}
+    for _ in range(max_distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))} - results
+        results |= frontier
+    return results
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class RoomNameIndex:
+    """Fuzzy index of room names → room IDs"""
+
+    def __init__(self, building_codes: Iterable[str] = ()):
+        self.building_codes = {code.lower() for code in building_codes}
+        # (normalized text, tokens, room ID, source)
+        self.names: List[Tuple[str, Tuple[str, ...], str, str]] = []
+        self.exact: Dict[str, int] = {}
+        self.token_postings: Dict[str, Set[int]] = {}
+        self.trigram_postings: Dict[str, Set[int]] = {}
+        self.delete_index: Dict[str, Set[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Normalization
+    # ------------------------------------------------------------------
+    def tokenize(self, text: str) -> List[str]:
+        """Normalized tokens of a name, without filler words or building prefixes"""
+        tokens = []
+        for raw in _TOKEN_PATTERN.findall(text.lower().replace("'", "")):
+            if any(c.isdigit() for c in raw) and all(c.isdigit() or c in DIGIT_LOOKALIKES for c in raw):
+                raw = "".join(DIGIT_LOOKALIKES.get(c, c) for c in raw)
+            tokens.extend(_LETTER_DIGIT_PATTERN.findall(raw))
+
+        tokens = [SYNONYMS.get(token, token) for token in tokens]
+        meaningful = [t for t in tokens if t not in STOP_WORDS and t not in self.building_codes]
+        return meaningful or tokens
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+    def add(self, name: str, room_id: str, source: str = "alias") -> None:
+        """Indexes one name of a room"""
+        tokens = tuple(self.tokenize(name))
+        if not tokens:
+            return
+        text = " ".join(tokens)
+        index = len(self.names)
+        self.names.append((text, tokens, room_id, source))
+        self.exact.setdefault(text, index)
+
+        for token in set(tokens):
+            if token not in self.token_postings:
+                for deleted in deletes(token, max_distance_for(token)):
+                    self.delete_index.setdefault(deleted, set()).add(token)
+            self.token_postings.setdefault(token, set()).add(index)
+        for trigram in trigrams(text):
+            self.trigram_postings.setdefault(trigram, set()).add(index)
+
+    @classmethod
+    def from_config(cls, navigation_config: Dict[str, Any]) -> "RoomNameIndex":
+        """Builds the index from a merged building config (aliases, room IDs, descriptions)"""
+        index = cls(set(navigation_config.get("roomBuilding", {}).values()))
+        room_ids = list(navigation_config.get("roomToNode", {}))
+        for room_id in room_ids:
+            index.add(room_id, room_id, "id")
+        for alias, room_id in navigation_config.get("aliases", {}).items():
+            if not alias.startswith("_"):
+                index.add(alias, room_id, "alias")
+        for room_id, description in navigation_config.get("roomDescriptions", {}).items():
+            if not room_id.startswith("_") and isinstance(description, str):
+                index.add(description, room_id, "description")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def correct(self, token: str) -> Dict[str, float]:
+        """Vocabulary tokens within the allowed edit distance of a token → similarity"""
+        max_distance = max_distance_for(token)
+        candidates: Set[str] = set()
+        for deleted in deletes(token, max_distance):
+            candidates |= self.delete_index.get(deleted, set())
+
+        matches = {}
+        for candidate in candidates:
+            allowed = min(max_distance, max_distance_for(candidate))
+            distance = edit_distance(token, candidate, allowed)
+            if distance <= allowed:
+                matches[candidate] = 1.0 - distance / max(len(token), len(candidate))
+        return matches
+
+    def _token_score(self, corrections: List[Dict[str, float]], tokens: Tuple[str, ...]) -> float:
+        """Harmonic mean of query-token and name-token coverage"""
+        precision = sum(max((c.get(t, 0.0) for t in tokens), default=0.0) for c in corrections) / len(corrections)
+        recall = sum(max((c.get(t, 0.0) for c in corrections), default=0.0) for t in tokens) / len(tokens)
+        return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Ranked candidate rooms for a query.
+
+        Returns:
+            [{room, score, name, source}] best first, one entry per room
+        """
+        tokens = self.tokenize(query)
+        if not tokens:
+            return []
+        text = " ".join(tokens)
+
+        scores: Dict[int, float] = {}
+        exact = self.exact.get(text)
+        if exact is not None:
+            scores[exact] = 1.0
+
+        corrections = [self.correct(token) for token in tokens]
+        candidates: Set[int] = set()
+        for matches in corrections:
+            for token in matches:
+                candidates |= self.token_postings.get(token, set())
+        for index in candidates:
+            scores[index] = max(scores.get(index, 0.0), self._token_score(corrections, self.names[index][1]))
+
+        # Character trigrams catch what tokenization misses (e.g. "mensbathroom")
+        query_trigrams = trigrams(text)
+        shared: Dict[int, int] = {}
+        for trigram in query_trigrams:
+            for index in self.trigram_postings.get(trigram, ()):
+                shared[index] = shared.get(index, 0) + 1
+        for index, count in shared.items():
+            dice = 2 * count / (len(query_trigrams) + len(trigrams(self.names[index][0])))
+            if dice >= MIN_TRIGRAM_SCORE:
+                scores[index] = max(scores.get(index, 0.0), dice)
+
+        best: Dict[str, Tuple[float, int]] = {}
+        for index, score in scores.items():
+            room_id = self.names[index][2]
+            if room_id not in best or score > best[room_id][0]:
+                best[room_id] = (score, index)
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+        return [{"room": room_id, "score": round(score, 3), "name": self.names[index][0],
+                 "source": self.names[index][3]} for room_id, (score, index) in ranked]
+
+    def resolve(self, query: str, threshold: float = DEFAULT_THRESHOLD,
+                margin: float = DEFAULT_MARGIN) -> Optional[str]:
+        """Best room if it is confident enough and clearly ahead of the next room (else None)"""
+        candidates = self.search(query, limit=2)
+        if not candidates or candidates[0]["score"] < threshold:
+            return None
+        if len(candidates) > 1 and candidates[0]["score"] < 1.0 and candidates[0]["score"] - candidates[1]["score"] < margin:
+            return None
+        return candidates[0]["room"]
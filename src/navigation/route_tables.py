@@ -0,0 +1,253 @@
+"""
+Precomputed Route Tables
+========================
+
+This module precomputes all-pairs shortest-path distances and a next-hop
+matrix for the navigation graph, stored as compact NumPy arrays:
+
+- distances: float32 (n, n), inf where unreachable
+- next_hop: int16 (n, n), index of the next node from row toward column,
+  -1 where unreachable
+
+Tables are saved next to the building configuration and memory-mapped at
+startup, so a route is a walk of O(path length) table lookups. They are
+keyed by the hash of the corridor sources and rebuilt when it changes.
+
+When one edge changes at runtime (see dynamic.py), only the columns whose
+shortest-path tree uses the edge, or would be improved by it, are
+recomputed, on copies of the arrays that then replace the old ones.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .graph import NavigationGraph
+from .profiles import DEFAULT_PROFILE, profile_weight
+
+DISTANCES_FILE = "route_distances.npy"
+NEXT_HOP_FILE = "route_next_hop.npy"
+METADATA_FILE = "route_tables.json"
+TABLES_FORMAT_VERSION = 1
+# Slack when comparing float32 table distances (meters)
+DISTANCE_TOLERANCE = 1e-3
+
+
+def corridor_source_hash(paths: Sequence[str]) -> str:
+    """Hashes the files the graph is built from"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _dijkstra_tree(graph: NavigationGraph, index: Dict[str, int], root: str,
+                   profile: str = DEFAULT_PROFILE) -> Tuple[np.ndarray, np.ndarray]:
+    """Distances to root and parent (toward root) of every node"""
+    count = len(index)
+    distances = np.full(count, np.inf, dtype=np.float64)
+    parents = np.full(count, -1, dtype=np.int64)
+    distances[index[root]] = 0.0
+    heap = [(0.0, root)]
+
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if distance > distances[index[node]]:
+            continue
+        for neighbor, edge in graph.neighbors(node).items():
+            weight = profile_weight(profile, edge)
+            if weight is None:
+                continue
+            candidate = distance + weight
+            if candidate < distances[index[neighbor]]:
+                distances[index[neighbor]] = candidate
+                parents[index[neighbor]] = index[node]
+                heapq.heappush(heap, (candidate, neighbor))
+
+    return distances, parents
+
+
+class RouteTables:
+    """All-pairs distance and next-hop tables"""
+
+    def __init__(self, node_ids: List[str], distances: np.ndarray, next_hop: np.ndarray, source_hash: str = "",
+                 profile: str = DEFAULT_PROFILE):
+        self.node_ids = list(node_ids)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.distances = distances
+        self.next_hop = next_hop
+        self.source_hash = source_hash
+        self.profile = profile
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.index
+
+    @classmethod
+    def build(cls, graph: NavigationGraph, source_hash: str = "", profile: str = DEFAULT_PROFILE) -> "RouteTables":
+        """
+        Computes the tables with one Dijkstra run per node.
+
+        The graph is undirected, so the tree rooted at a target gives, for
+        every node, its next hop toward that target. Edge weights and
+        filters come from the routing profile.
+        """
+        node_ids = sorted(graph.nodes)
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        count = len(node_ids)
+        if count >= np.iinfo(np.int16).max:
+            raise ValueError(f"Graph too large for int16 next-hop table ({count} nodes)")
+
+        distances = np.full((count, count), np.inf, dtype=np.float32)
+        next_hop = np.full((count, count), -1, dtype=np.int16)
+
+        for target in node_ids:
+            column = index[target]
+            tree_distances, parents = _dijkstra_tree(graph, index, target, profile)
+            distances[:, column] = tree_distances
+            next_hop[:, column] = parents
+            next_hop[column, column] = column
+
+        return cls(node_ids, distances, next_hop, source_hash, profile)
+
+    def affected_targets(self, a: str, b: str, old_weight: Optional[float],
+                         new_weight: Optional[float]) -> np.ndarray:
+        """
+        Columns (targets) whose shortest-path tree can change when the
+        weight of edge a-b goes from old_weight to new_weight (None: the
+        edge is absent or excluded by the profile): the trees that use the
+        edge, when it gets longer or goes away, and the trees it shortens.
+        """
+        i, j = self.index[a], self.index[b]
+        affected = np.zeros(len(self), dtype=bool)
+        if old_weight is not None and (new_weight is None or new_weight > old_weight):
+            affected |= (self.next_hop[i] == j) | (self.next_hop[j] == i)
+        if new_weight is not None and (old_weight is None or new_weight < old_weight):
+            from_a = self.distances[i].astype(np.float64)
+            from_b = self.distances[j].astype(np.float64)
+            affected |= (from_a > from_b + new_weight + DISTANCE_TOLERANCE)
+            affected |= (from_b > from_a + new_weight + DISTANCE_TOLERANCE)
+        return np.flatnonzero(affected)
+
+    def repair_edge(self, graph: NavigationGraph, a: str, b: str, old_weight: Optional[float],
+                    new_weight: Optional[float]) -> int:
+        """
+        Updates the tables after edge a-b changed in the graph (weights
+        under this profile, None when absent or excluded), recomputing only
+        the affected columns.
+
+        Returns:
+            Number of columns recomputed
+        """
+        columns = self.affected_targets(a, b, old_weight, new_weight)
+        if len(columns) == 0:
+            return 0
+
+        # Copies: the loaded arrays are read-only memory maps, and readers keep a consistent view
+        distances, next_hop = np.array(self.distances), np.array(self.next_hop)
+        for column in columns:
+            tree_distances, parents = _dijkstra_tree(graph, self.index, self.node_ids[column], self.profile)
+            distances[:, column] = tree_distances
+            next_hop[:, column] = parents
+            next_hop[column, column] = column
+        self.distances, self.next_hop = distances, next_hop
+        return len(columns)
+
+    def distance(self, source: str, target: str) -> float:
+        """Shortest distance in meters (inf if unreachable or unknown)"""
+        if source not in self.index or target not in self.index:
+            return float("inf")
+        return float(self.distances[self.index[source], self.index[target]])
+
+    def path(self, source: str, target: str) -> Optional[List[str]]:
+        """Walks the next-hop table from source to target"""
+        if source not in self.index or target not in self.index:
+            return None
+
+        current, goal = self.index[source], self.index[target]
+        if self.next_hop[current, goal] < 0:
+            return None
+
+        path = [current]
+        while current != goal:
+            current = int(self.next_hop[current, goal])
+            path.append(current)
+        return [self.node_ids[i] for i in path]
+
+    def save(self, directory: str) -> None:
+        """Writes the tables (arrays first, metadata last, each atomically)"""
+        os.makedirs(directory, exist_ok=True)
+        for filename, array in ((DISTANCES_FILE, self.distances), (NEXT_HOP_FILE, self.next_hop)):
+            temp_path = os.path.join(directory, f"{filename}.tmp")
+            with open(temp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(temp_path, os.path.join(directory, filename))
+
+        metadata = {
+            "format_version": TABLES_FORMAT_VERSION,
+            "source_hash": self.source_hash,
+            "profile": self.profile,
+            "node_ids": self.node_ids,
+        }
+        temp_path = os.path.join(directory, f"{METADATA_FILE}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(temp_path, os.path.join(directory, METADATA_FILE))
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "RouteTables":
+        """Loads saved tables, memory-mapping the arrays"""
+        with open(os.path.join(directory, METADATA_FILE), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        if metadata.get("format_version") != TABLES_FORMAT_VERSION:
+            raise ValueError("Route tables were written by a different format version")
+
+        mmap_mode = "r" if mmap else None
+        distances = np.load(os.path.join(directory, DISTANCES_FILE), mmap_mode=mmap_mode)
+        next_hop = np.load(os.path.join(directory, NEXT_HOP_FILE), mmap_mode=mmap_mode)
+        return cls(metadata["node_ids"], distances, next_hop, metadata.get("source_hash", ""),
+                   metadata.get("profile", DEFAULT_PROFILE))
+
+
+def load_or_build_route_tables(graph: NavigationGraph, source_hash: str, directory: str,
+                               profile: str = DEFAULT_PROFILE) -> RouteTables:
+    """
+    Loads the saved tables if they match the corridor sources, otherwise
+    rebuilds and saves them.
+
+    Args:
+        graph: Navigation graph built from the sources
+        source_hash: Hash of the sources (see corridor_source_hash)
+        directory: Where the tables are stored
+        profile: Routing profile the tables are computed for
+
+    Returns:
+        The route tables
+    """
+    try:
+        tables = RouteTables.load(directory)
+        if (tables.source_hash == source_hash and tables.profile == profile
+                and set(tables.node_ids) == set(graph.nodes)):
+            print(f"✅ Route tables loaded ({len(tables)} nodes)")
+            return tables
+        print("🔄 Corridor sources changed, rebuilding route tables...")
+    except FileNotFoundError:
+        print("🔄 Building route tables...")
+    except Exception as e:
+        print(f"⚠️  Could not load route tables ({e}), rebuilding...")
+
+    tables = RouteTables.build(graph, source_hash, profile)
+    try:
+        tables.save(directory)
+    except Exception as e:
+        print(f"⚠️  Could not save route tables: {e}")
+    print(f"✅ Route tables built ({len(tables)} nodes)")
+    return tables
@@ -0,0 +1,128 @@
+"""
+Routing Engine
+==============
+
+This module computes shortest routes over the NavigationGraph and
+assembles the route geometry as a GeoJSON LineString, so clients don't
+need to download and parse the graph. Paths come from the precomputed
+route tables when available, with Dijkstra (binary heap) as fallback.
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
+
+from .graph import NavigationGraph
+from .profiles import DEFAULT_PROFILE, profile_weight
+from .route_tables import RouteTables
+
+
+class RoutingEngine:
+    """Shortest-path routing over a navigation graph for one routing profile"""
+
+    def __init__(self, graph: NavigationGraph, tables: Optional[RouteTables] = None, profile: str = DEFAULT_PROFILE):
+        self.graph = graph
+        self.tables = tables
+        self.profile = profile
+
+    def shortest_path(self, source: str, target: str) -> Tuple[Optional[List[str]], float]:
+        """
+        Finds the shortest path between two nodes.
+
+        Returns:
+            (node path, distance in meters), or (None, inf) if unreachable
+        """
+        if source not in self.graph or target not in self.graph:
+            return None, float("inf")
+
+        if self.tables is not None and source in self.tables and target in self.tables:
+            path = self.tables.path(source, target)
+            if path is None:
+                return None, float("inf")
+            return path, self.tables.distance(source, target)
+
+        distances = {source: 0.0}
+        previous: Dict[str, str] = {}
+        heap = [(0.0, source)]
+        visited = set()
+
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in visited:
+                continue
+            visited.add(node)
+
+            if node == target:
+                path = [node]
+                while path[-1] != source:
+                    path.append(previous[path[-1]])
+                return path[::-1], distance
+
+            for neighbor, edge in self.graph.neighbors(node).items():
+                weight = profile_weight(self.profile, edge)
+                if weight is None:
+                    continue
+                candidate = distance + weight
+                if candidate < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = candidate
+                    previous[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+
+        return None, float("inf")
+
+    def assemble_geometry(self, path: List[str]) -> List[List[float]]:
+        """Stitches the edge geometries of a path into one coordinate list"""
+        coordinates: List[List[float]] = []
+        for a, b in zip(path, path[1:]):
+            segment = self.graph.edge_coordinates(a, b)
+            if coordinates and segment and coordinates[-1] == segment[0]:
+                segment = segment[1:]
+            coordinates.extend(segment)
+
+        if not coordinates and path:
+            node = self.graph.nodes.get(path[0])
+            if node and node["lng"] is not None:
+                coordinates = [[node["lng"], node["lat"]]]
+        return coordinates
+
+    def route(self, start: str, end: str) -> Optional[Dict[str, Any]]:
+        """
+        Computes a route between two rooms or nodes.
+
+        Args:
+            start: Start room ID or node ID
+            end: Destination room ID or node ID
+
+        Returns:
+            Dict with the node path, its length in meters (distance_m) and
+            profile-weighted cost, and GeoJSON LineString Feature, or None if
+            either location is unknown or no path exists
+        """
+        start_node = self.graph.resolve(start)
+        end_node = self.graph.resolve(end)
+        if start_node is None or end_node is None:
+            return None
+
+        path, cost = self.shortest_path(start_node, end_node)
+        if path is None:
+            return None
+        distance = sum(profile_weight(DEFAULT_PROFILE, self.graph.edge(a, b)) for a, b in zip(path, path[1:]))
+
+        return {
+            "start": start,
+            "end": end,
+            "startNode": start_node,
+            "endNode": end_node,
+            "path": path,
+            "distance_m": round(distance, 2),
+            "cost": round(cost, 2),
+            "geometry": {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": self.assemble_geometry(path)},
+                "properties": {
+                    "startNode": start_node,
+                    "endNode": end_node,
+                    "distance_m": round(distance, 2),
+                    "cost": round(cost, 2),
+                },
+            },
+        }
@@ -0,0 +1,169 @@
+"""
+Location Snapping
+=================
+
+This module snaps map coordinates to the nearest corridor node and room
+of a floor. It keeps one spatial index per floor with:
+
+- the positioned nodes of the campus graph
+- the room outlines of the floor plan SVGs (see floorplan.py), reported
+  at their roomCentersSVG override or polygon centroid
+- roomCentersSVG centers of rooms that have no outline in the SVG
+
+Map clicks, and later GPS or QR-code positions, use it to find where the
+user is and which room they selected.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from .campus import CampusGraph, floor_key_for_node, parse_floor_key
+from .floorplan import FloorPlanOverlay, load_building_outlines, load_svg_rooms, polygon_centroid
+from .spatial import DEFAULT_CELL_SIZE_M, SpatialIndex
+
+
+class LocationSnapper:
+    """Per-floor nearest node and room lookup"""
+
+    def __init__(self, cell_size_m: float = DEFAULT_CELL_SIZE_M):
+        self.cell_size_m = cell_size_m
+        self.indexes: Dict[str, SpatialIndex] = {}
+
+    def index_for(self, floor_key: str) -> SpatialIndex:
+        """Returns (creating it if needed) the index of a floor"""
+        if floor_key not in self.indexes:
+            self.indexes[floor_key] = SpatialIndex(self.cell_size_m)
+        return self.indexes[floor_key]
+
+    def add_graph_nodes(self, campus_graph: CampusGraph) -> None:
+        """Indexes every positioned node of the campus graph"""
+        for floor_key, graph in campus_graph.floors.items():
+            building, floor = parse_floor_key(floor_key)
+            for node_id, node in graph.nodes.items():
+                if node["lng"] is not None:
+                    self.index_for(floor_key).insert_point(node_id, node["lng"], node["lat"], "node",
+                                                           building=building, floor=floor)
+
+    def add_floor_plan(self, floor_key: str, svg_path: str, overlay: FloorPlanOverlay,
+                       room_centers: Optional[Dict[str, Dict[str, float]]] = None,
+                       room_to_node: Optional[Dict[str, str]] = None) -> int:
+        """
+        Indexes the room outlines of a floor plan SVG.
+
+        Args:
+            floor_key: Floor of the plan (e.g. 'M1')
+            svg_path: Floor plan SVG
+            overlay: Placement of the SVG on the map
+            room_centers: roomCentersSVG overrides ({room: {x, y}})
+            room_to_node: Room → node mapping
+
+        Returns:
+            Number of rooms indexed
+        """
+        room_centers = room_centers or {}
+        room_to_node = room_to_node or {}
+        building, floor = parse_floor_key(floor_key)
+        rooms, _ = load_svg_rooms(svg_path)
+        index = self.index_for(floor_key)
+
+        for room_id, ring in rooms.items():
+            override = room_centers.get(room_id) or {}
+            center_svg = ((override["x"], override["y"]) if "x" in override and "y" in override
+                          else polygon_centroid(ring))
+            index.insert_polygon(
+                room_id,
+                [overlay.svg_to_lnglat(x, y) for x, y in ring],
+                "room",
+                center=overlay.svg_to_lnglat(*center_svg),
+                node=room_to_node.get(room_id),
+                building=building,
+                floor=floor,
+            )
+
+        # Manual centers of rooms the SVG has no outline for
+        for room_id, center in room_centers.items():
+            if room_id.startswith("_") or room_id in rooms or "x" not in center or "y" not in center:
+                continue
+            node_floor = floor_key_for_node(room_to_node.get(room_id, ""))
+            if node_floor not in (None, floor_key):
+                continue
+            lng, lat = overlay.svg_to_lnglat(center["x"], center["y"])
+            index.insert_point(room_id, lng, lat, "room", node=room_to_node.get(room_id),
+                               building=building, floor=floor)
+
+        return len(rooms)
+
+    @classmethod
+    def from_sources(cls, campus_graph: Optional[CampusGraph], building_configs: Dict[str, Dict[str, Any]],
+                     campus_geojson_path: str, base_dir: str = ".",
+                     cell_size_m: float = DEFAULT_CELL_SIZE_M) -> "LocationSnapper":
+        """
+        Builds the snapper from the campus graph and the floorPlans of the
+        building configs.
+
+        Args:
+            campus_graph: Campus graph whose nodes are indexed (None: rooms only)
+            building_configs: Configs from load_building_configs
+            campus_geojson_path: campus.geojson with the building outlines
+            base_dir: Directory the floor plan paths are relative to
+            cell_size_m: Grid cell size in meters
+
+        Returns:
+            The location snapper
+        """
+        snapper = cls(cell_size_m)
+        if campus_graph is not None:
+            snapper.add_graph_nodes(campus_graph)
+
+        outlines = None
+        for code, config in building_configs.items():
+            for floor_key, plan in config.get("floorPlans", {}).items():
+                if outlines is None:
+                    outlines = load_building_outlines(campus_geojson_path)
+                outline = outlines.get(plan.get("outline", config.get("_name")))
+                svg_path = os.path.join(base_dir, plan["svg"])
+                if outline is None or not os.path.exists(svg_path):
+                    print(f"⚠️  Floor plan {floor_key} skipped: outline or SVG not found")
+                    continue
+
+                overlay = FloorPlanOverlay.from_svg(svg_path, outline, plan.get("bearing", 0.0))
+                snapper.add_floor_plan(floor_key, svg_path, overlay, config.get("roomCentersSVG"),
+                                       config.get("roomToNode"))
+
+        return snapper
+
+    def snap(self, lng: float, lat: float, floor_key: Optional[str] = None,
+             max_distance_m: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Snaps a map position to the nearest node and room.
+
+        Args:
+            lng: Longitude
+            lat: Latitude
+            floor_key: Floor shown on the map (default: the floor with the
+                closest node, lowest floor first on ties)
+            max_distance_m: Ignore nodes and rooms farther than this
+
+        Returns:
+            {floor, node, room} where node and room are the nearest items
+            (with distance_m and inside) or None; None if the floor is unknown
+        """
+        if floor_key is None:
+            candidates = []
+            for key in sorted(self.indexes):
+                node = self.indexes[key].nearest(lng, lat, ["node", "room"], max_distance_m)
+                if node is not None:
+                    candidates.append((node["distance_m"], key))
+            if not candidates:
+                return None
+            floor_key = min(candidates)[1]
+
+        index = self.indexes.get(floor_key)
+        if index is None:
+            return None
+
+        return {
+            "floor": floor_key,
+            "node": index.nearest(lng, lat, ["node"], max_distance_m),
+            "room": index.nearest(lng, lat, ["room"], max_distance_m),
+        }
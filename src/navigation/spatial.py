@@ -0,0 +1,216 @@
+"""
+Spatial Index
+=============
+
+This module provides a uniform-grid spatial index over map points and
+polygons (corridor nodes, room centers and room outlines). Coordinates
+are projected to local meters (equirectangular around the first inserted
+point, exact enough at campus scale) and bucketed into square cells.
+
+A nearest-item query scans rings of cells around the query point and
+stops as soon as the next ring cannot hold anything closer, so a lookup
+touches a handful of cells regardless of how many items are indexed.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .geo import EARTH_RADIUS_M
+
+DEFAULT_CELL_SIZE_M = 10.0
+
+
+def point_in_polygon(x: float, y: float, ring: Sequence[Sequence[float]]) -> bool:
+    """Ray-casting point-in-polygon test"""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def point_segment_distance(x: float, y: float, a: Sequence[float], b: Sequence[float]) -> float:
+    """Distance from a point to the segment a-b"""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((x - a[0]) * dx + (y - a[1]) * dy) / length_sq))
+    return math.hypot(x - (a[0] + t * dx), y - (a[1] + t * dy))
+
+
+class SpatialIndex:
+    """Uniform-grid index of points and polygons in (lng, lat)"""
+
+    def __init__(self, cell_size_m: float = DEFAULT_CELL_SIZE_M):
+        self.cell_size_m = cell_size_m
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._origin: Optional[Tuple[float, float]] = None
+        self._meters_per_degree_lng = 0.0
+        self._meters_per_degree_lat = math.radians(1) * EARTH_RADIUS_M
+        self._bounds: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.items
+
+    def project(self, lng: float, lat: float) -> Tuple[float, float]:
+        """Projects (lng, lat) to local meters"""
+        if self._origin is None:
+            self._origin = (lng, lat)
+            self._meters_per_degree_lng = self._meters_per_degree_lat * math.cos(math.radians(lat))
+        return ((lng - self._origin[0]) * self._meters_per_degree_lng,
+                (lat - self._origin[1]) * self._meters_per_degree_lat)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size_m)), int(math.floor(y / self.cell_size_m))
+
+    def _add_to_cells(self, item_id: str, min_cell: Tuple[int, int], max_cell: Tuple[int, int]) -> None:
+        for cx in range(min_cell[0], max_cell[0] + 1):
+            for cy in range(min_cell[1], max_cell[1] + 1):
+                self.cells.setdefault((cx, cy), set()).add(item_id)
+
+        if self._bounds is None:
+            self._bounds = [min_cell[0], min_cell[1], max_cell[0], max_cell[1]]
+        else:
+            self._bounds = [min(self._bounds[0], min_cell[0]), min(self._bounds[1], min_cell[1]),
+                            max(self._bounds[2], max_cell[0]), max(self._bounds[3], max_cell[1])]
+
+    def insert_point(self, item_id: str, lng: float, lat: float, kind: str, **data) -> None:
+        """Indexes a point item (e.g. a corridor node or room center)"""
+        x, y = self.project(lng, lat)
+        self.remove(item_id)
+        self.items[item_id] = {"id": item_id, "kind": kind, "lng": lng, "lat": lat, "_xy": (x, y), **data}
+        cell = self._cell(x, y)
+        self._add_to_cells(item_id, cell, cell)
+
+    def insert_polygon(self, item_id: str, ring: Sequence[Sequence[float]], kind: str,
+                       center: Optional[Sequence[float]] = None, **data) -> None:
+        """
+        Indexes a polygon item (e.g. a room outline) in every cell its
+        bounding box overlaps.
+
+        Args:
+            item_id: Item ID
+            ring: Outer ring as (lng, lat) points
+            kind: Item kind used to filter queries
+            center: (lng, lat) reported for the item (default: vertex mean)
+            **data: Extra properties returned with query results
+        """
+        projected = [self.project(p[0], p[1]) for p in ring]
+        if center is None:
+            center = (sum(p[0] for p in ring) / len(ring), sum(p[1] for p in ring) / len(ring))
+        self.remove(item_id)
+        self.items[item_id] = {"id": item_id, "kind": kind, "lng": center[0], "lat": center[1],
+                               "_ring": projected, **data}
+        min_cell = self._cell(min(p[0] for p in projected), min(p[1] for p in projected))
+        max_cell = self._cell(max(p[0] for p in projected), max(p[1] for p in projected))
+        self._add_to_cells(item_id, min_cell, max_cell)
+
+    def remove(self, item_id: str) -> None:
+        """Removes an item (no-op if absent)"""
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return
+        for cell, members in list(self.cells.items()):
+            members.discard(item_id)
+            if not members:
+                del self.cells[cell]
+
+    def _item_distance(self, item: Dict[str, Any], x: float, y: float) -> Tuple[float, bool]:
+        ring = item.get("_ring")
+        if ring is None:
+            px, py = item["_xy"]
+            return math.hypot(x - px, y - py), False
+        if point_in_polygon(x, y, ring):
+            return 0.0, True
+        return min(point_segment_distance(x, y, a, b) for a, b in zip(ring, ring[1:] + ring[:1])), False
+
+    @staticmethod
+    def _result(item: Dict[str, Any], distance: float, inside: bool) -> Dict[str, Any]:
+        result = {key: value for key, value in item.items() if not key.startswith("_")}
+        result["distance_m"] = round(distance, 2)
+        result["inside"] = inside
+        return result
+
+    def _matches(self, item: Dict[str, Any], kinds: Optional[Iterable[str]]) -> bool:
+        return kinds is None or item["kind"] in kinds
+
+    def nearest(self, lng: float, lat: float, kinds: Optional[Iterable[str]] = None,
+                max_distance_m: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Finds the item closest to a point.
+
+        Polygons containing the point are at distance 0 (with inside=True).
+
+        Args:
+            lng: Query longitude
+            lat: Query latitude
+            kinds: Only consider these item kinds (default: all)
+            max_distance_m: Ignore items farther than this
+
+        Returns:
+            The item properties plus distance_m and inside, or None
+        """
+        if not self.items:
+            return None
+        kinds = set(kinds) if kinds is not None else None
+        x, y = self.project(lng, lat)
+        cx, cy = self._cell(x, y)
+        limit = max_distance_m if max_distance_m is not None else float("inf")
+
+        # Rings beyond the occupied cells hold nothing
+        min_x, min_y, max_x, max_y = self._bounds
+        max_ring = max(abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y))
+
+        best, best_distance, best_inside = None, float("inf"), False
+        seen: Set[str] = set()
+        for ring in range(max_ring + 1):
+            # Every cell of this ring is at least (ring - 1) cells away
+            if (ring - 1) * self.cell_size_m > min(best_distance, limit):
+                break
+            for cell in self._ring_cells(cx, cy, ring):
+                for item_id in self.cells.get(cell, ()):
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                    item = self.items[item_id]
+                    if not self._matches(item, kinds):
+                        continue
+                    distance, inside = self._item_distance(item, x, y)
+                    if distance < best_distance:
+                        best, best_distance, best_inside = item, distance, inside
+
+        if best is None or best_distance > limit:
+            return None
+        return self._result(best, best_distance, best_inside)
+
+    def containing(self, lng: float, lat: float, kinds: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Polygons that contain a point"""
+        if not self.items:
+            return []
+        kinds = set(kinds) if kinds is not None else None
+        x, y = self.project(lng, lat)
+        results = []
+        for item_id in self.cells.get(self._cell(x, y), ()):
+            item = self.items[item_id]
+            if "_ring" in item and self._matches(item, kinds) and point_in_polygon(x, y, item["_ring"]):
+                results.append(self._result(item, 0.0, True))
+        return results
+
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int):
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
@@ -0,0 +1,111 @@
+"""
+Floor Plan Transforms
+=====================
+
+This module converts points between floor plan SVG coordinates and map
+coordinates with a projective matrix fitted once per floor plan, instead
+of interpolating between the rotated corners for every point:
+
+- the matrix is fitted to the corner correspondences of a
+  FloorPlanOverlay (or to any set of calibration points): an affine
+  least-squares fit when it is exact (a rotated rectangle always is),
+  a homography otherwise
+- whole arrays of points are converted with NumPy in one call, both ways
+  (the inverse matrix is stored with the forward one)
+
+Map coordinates are (lng, lat) like GeoJSON.
+"""
+
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from .floorplan import FloorPlanOverlay
+
+# Largest residual (degrees, ~1 mm) for which the affine fit is kept
+AFFINE_TOLERANCE = 1e-8
+
+
+def _apply(matrix: np.ndarray, points: Any) -> np.ndarray:
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    homogeneous = np.hstack([points, np.ones((len(points), 1))]) @ matrix.T
+    return homogeneous[:, :2] / homogeneous[:, 2:3]
+
+
+def fit_affine(source: Any, target: Any) -> np.ndarray:
+    """Least-squares affine matrix (3x3) mapping source points to target points"""
+    source, target = np.asarray(source, dtype=float), np.asarray(target, dtype=float)
+    design = np.hstack([source, np.ones((len(source), 1))])
+    solution, *_ = np.linalg.lstsq(design, target, rcond=None)
+    return np.vstack([solution.T, [0.0, 0.0, 1.0]])
+
+
+def fit_homography(source: Any, target: Any) -> np.ndarray:
+    """Homography (3x3, DLT) mapping source points to target points (at least 4)"""
+    source, target = np.asarray(source, dtype=float), np.asarray(target, dtype=float)
+    # Normalize both point sets for a well-conditioned system
+    def normalizer(points):
+        center = points.mean(axis=0)
+        scale = np.sqrt(2) / max(np.sqrt(((points - center) ** 2).sum(axis=1)).mean(), 1e-12)
+        return np.array([[scale, 0, -scale * center[0]], [0, scale, -scale * center[1]], [0, 0, 1]])
+
+    source_norm, target_norm = normalizer(source), normalizer(target)
+    s, t = _apply(source_norm, source), _apply(target_norm, target)
+    rows = []
+    for (x, y), (u, v) in zip(s, t):
+        rows.append([-x, -y, -1, 0, 0, 0, u * x, u * y, u])
+        rows.append([0, 0, 0, -x, -y, -1, v * x, v * y, v])
+    _, _, vt = np.linalg.svd(np.asarray(rows))
+    matrix = np.linalg.inv(target_norm) @ vt[-1].reshape(3, 3) @ source_norm
+    return matrix / matrix[2, 2]
+
+
+class PlanTransform:
+    """SVG viewBox ↔ (lng, lat) transform of one floor plan"""
+
+    def __init__(self, matrix: Any, kind: str = "affine"):
+        """
+        Args:
+            matrix: 3x3 matrix mapping homogeneous SVG points to (lng, lat)
+            kind: 'affine' or 'homography'
+        """
+        self.matrix = np.asarray(matrix, dtype=float)
+        self.inverse = np.linalg.inv(self.matrix)
+        self.kind = kind
+
+    @classmethod
+    def fit(cls, svg_points: Any, lnglat_points: Any) -> "PlanTransform":
+        """Fits the transform to point correspondences (affine when exact, else homography)"""
+        affine = fit_affine(svg_points, lnglat_points)
+        residual = np.abs(_apply(affine, svg_points) - np.asarray(lnglat_points, dtype=float)).max()
+        if residual <= AFFINE_TOLERANCE or len(svg_points) < 4:
+            return cls(affine, "affine")
+        return cls(fit_homography(svg_points, lnglat_points), "homography")
+
+    @classmethod
+    def from_overlay(cls, overlay: FloorPlanOverlay) -> "PlanTransform":
+        """Fits the transform to the corners of a floor plan overlay"""
+        x, y, width, height = overlay.viewbox
+        svg_corners = [(x, y), (x + width, y), (x + width, y + height), (x, y + height)]
+        return cls.fit(svg_corners, overlay.corners)
+
+    @classmethod
+    def from_corners(cls, viewbox: Sequence[float], corners_latlng: Sequence[Sequence[float]]) -> "PlanTransform":
+        """Fits the transform to a viewBox and its [lat, lng] corners (TL, TR, BR, BL), as in the floor plan index"""
+        return cls.from_overlay(FloorPlanOverlay([(lng, lat) for lat, lng in corners_latlng], tuple(viewbox)))
+
+    def to_lnglat(self, points: Any) -> np.ndarray:
+        """(N, 2) SVG points → (N, 2) (lng, lat)"""
+        return _apply(self.matrix, points)
+
+    def to_svg(self, points: Any) -> np.ndarray:
+        """(N, 2) (lng, lat) → (N, 2) SVG points"""
+        return _apply(self.inverse, points)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable parameters ({kind, matrix, inverse} as nested lists)"""
+        return {"kind": self.kind, "matrix": self.matrix.tolist(), "inverse": self.inverse.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlanTransform":
+        return cls(data["matrix"], data.get("kind", "affine"))
@@ -0,0 +1,13 @@
+"""
+Retrieval Module
+================
+
+This module contains the search components used to find relevant
+images for the multimodal RAG system.
+"""
+
+from .lexical_index import BM25Index, reciprocal_rank_fusion, hybrid_search, tokenize, extract_room_numbers
+from .regions import select_regions
+from .ann_index import IVFIndex
+
+__all__ = ['BM25Index', 'reciprocal_rank_fusion', 'hybrid_search', 'tokenize', 'extract_room_numbers', 'select_regions', 'IVFIndex']
@@ -0,0 +1,103 @@
+"""
+Approximate Nearest Neighbor Index
+==================================
+
+This module provides an inverted-file (IVF) index over embeddings: vectors
+are clustered with spherical k-means and a query only scans the lists of
+its `nprobe` closest centroids. Candidates are scored with the exact dot
+product, so the search API and scores match EmbeddingStore.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class IVFIndex:
+    """Inverted-file index with exact scoring inside the probed lists"""
+
+    def __init__(self, nlist: Optional[int] = None, nprobe: int = 4, iterations: int = 10, seed: int = 0):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.seed = seed
+        self.ids: List[Any] = []
+        self.vectors: Optional[np.ndarray] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.order: Optional[np.ndarray] = None  # vector indices grouped by list
+        self.offsets: Optional[np.ndarray] = None  # list i is order[offsets[i]:offsets[i + 1]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def build(self, ids: Sequence[Any], vectors: Iterable[Sequence[float]]) -> "IVFIndex":
+        """
+        Clusters the vectors and builds the inverted lists.
+
+        Args:
+            ids: Identifiers returned by search
+            vectors: Embeddings, one per id
+
+        Returns:
+            The index itself, to allow chaining
+        """
+        matrix = np.ascontiguousarray(np.asarray([np.asarray(v, dtype=np.float32) for v in vectors], dtype=np.float32))
+        if len(ids) != len(matrix):
+            raise ValueError("ids and vectors must have the same length")
+
+        self.ids = list(ids)
+        self.vectors = matrix
+        if not self.ids:
+            return self
+
+        nlist = min(self.nlist or max(1, int(np.sqrt(len(matrix)))), len(matrix))
+        rng = np.random.default_rng(self.seed)
+        normalized = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        centroids = normalized[rng.choice(len(matrix), nlist, replace=False)]
+
+        for _ in range(self.iterations):
+            assignment = np.argmax(normalized @ centroids.T, axis=1)
+            for list_id in range(nlist):
+                members = normalized[assignment == list_id]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                else:
+                    # Re-seed empty lists with a random vector
+                    centroid = normalized[rng.integers(len(matrix))]
+                centroids[list_id] = centroid / max(np.linalg.norm(centroid), 1e-12)
+
+        assignment = np.argmax(normalized @ centroids.T, axis=1)
+        self.centroids = centroids.astype(np.float32)
+        self.order = np.argsort(assignment, kind="stable")
+        self.offsets = np.searchsorted(assignment[self.order], np.arange(nlist + 1))
+        return self
+
+    def search(self, query: Sequence[float], top_n: int = 5) -> List[Tuple[Any, float]]:
+        """
+        Finds the vectors with the highest dot product among the probed lists.
+
+        Args:
+            query: Query embedding
+            top_n: Number of results
+
+        Returns:
+            List of (id, score) pairs ordered by descending score
+        """
+        if not self.ids:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = min(self.nprobe, len(self.centroids))
+        probed = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        candidates = np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in probed])
+
+        scores = self.vectors[candidates] @ query
+        best = np.argsort(-scores, kind="stable")[:top_n]
+        return [(self.ids[candidates[i]], float(scores[i])) for i in best]
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """Returns the memory used by the index structures"""
+        if self.vectors is None or self.centroids is None:
+            return {"index": 0}
+        index_bytes = self.vectors.nbytes + self.centroids.nbytes + self.order.nbytes + self.offsets.nbytes
+        return {"index": index_bytes}
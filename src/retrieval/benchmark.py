@@ -0,0 +1,313 @@
+"""
+Retrieval Benchmark Suite
+=========================
+
+This module benchmarks the image retrieval index offline, using fixture
+embeddings and a labeled query→image set instead of live models:
+
+- recall@k and MRR against the labeled relevant images
+- p50/p95/p99 search latency
+- memory allocated by each index configuration
+
+Configurations cover the search engines used by AdvancedImageManager:
+brute force (float32), quantized stores, the IVF ANN index and the hybrid
+BM25 + vector search. Results are compared against a JSON baseline with
+regression thresholds.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ann_index import IVFIndex
+from .embedding_store import EmbeddingStore
+from .lexical_index import BM25Index, hybrid_search
+
+CORPUS_FILE = "corpus.json"
+QUERIES_FILE = "queries.json"
+EMBEDDINGS_FILE = "embeddings.npz"
+
+DEFAULT_THRESHOLDS = {
+    "recall_max_drop": 0.02,
+    "mrr_max_drop": 0.02,
+    "latency_p95_max_ratio": 2.0,
+    "memory_max_ratio": 1.10,
+}
+
+# Fixture vocabulary (mirrors the campus floor plans)
+_BUILDINGS = ["A", "B", "E", "G", "H", "J", "K", "L", "M", "S"]
+_REGIONS = ["upper-left", "upper", "upper-right", "left", "center", "right", "lower-left", "lower", "lower-right"]
+_FEATURES = ["stairs", "elevator", "washroom", "entrance", "computer lab", "cafeteria", "library", "study area"]
+_PARAPHRASES = ["spot", "zone", "part of campus", "place", "section"]
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+class RetrievalFixture:
+    """Corpus descriptions, labeled queries and their embeddings"""
+
+    def __init__(self, corpus: List[Dict[str, Any]], queries: List[Dict[str, Any]],
+                 corpus_vectors: np.ndarray, query_vectors: np.ndarray):
+        self.corpus = corpus
+        self.queries = queries
+        self.corpus_vectors = corpus_vectors.astype(np.float32)
+        self.query_vectors = query_vectors.astype(np.float32)
+
+    @property
+    def ids(self) -> List[str]:
+        return [record["img_path"] for record in self.corpus]
+
+    @classmethod
+    def load(cls, fixture_dir: str) -> "RetrievalFixture":
+        """Loads a fixture written by generate_fixture"""
+        with open(os.path.join(fixture_dir, CORPUS_FILE), "r", encoding="utf-8") as f:
+            corpus = json.load(f)
+        with open(os.path.join(fixture_dir, QUERIES_FILE), "r", encoding="utf-8") as f:
+            queries = json.load(f)
+        with np.load(os.path.join(fixture_dir, EMBEDDINGS_FILE)) as arrays:
+            return cls(corpus, queries, arrays["corpus"], arrays["queries"])
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def generate_fixture(fixture_dir: str, dimension: int = 256, seed: int = 0) -> RetrievalFixture:
+    """
+    Writes a deterministic fixture of floor-plan region records and queries.
+
+    Record embeddings share building, floor and region components, so
+    neighbouring regions are close in vector space. Queries come in three
+    kinds: exact room numbers (weak embedding signal), descriptive queries
+    (lexical and vector signal) and paraphrases (vector signal only).
+
+    Args:
+        fixture_dir: Output directory
+        dimension: Embedding size
+        seed: Random seed
+
+    Returns:
+        The generated fixture
+    """
+    rng = np.random.default_rng(seed)
+    building_vectors = _unit(rng.normal(size=(len(_BUILDINGS), dimension)))
+    floor_vectors = _unit(rng.normal(size=(3, dimension)))
+    region_vectors = _unit(rng.normal(size=(len(_REGIONS), dimension)))
+
+    corpus, corpus_vectors = [], []
+    for b_index, building in enumerate(_BUILDINGS):
+        for floor in range(1, 4):
+            for r_index, region in enumerate(_REGIONS):
+                rooms = [str(floor * 1000 + b_index * 90 + r_index * 10 + j) for j in range(3)]
+                features = [str(f) for f in rng.choice(_FEATURES, 2, replace=False)]
+                corpus.append({
+                    "img_path": f"image_tiles/{building}{floor}_{region}.png",
+                    "building": building,
+                    "floor": floor,
+                    "region": region,
+                    "rooms": rooms,
+                    "features": features,
+                    "description": (f"Building {building} floor {floor} plan, {region} region. "
+                                    f"Rooms {', '.join(rooms)}. Shows the {features[0]} and the {features[1]}."),
+                })
+                vector = (building_vectors[b_index] + 0.6 * floor_vectors[floor - 1]
+                          + 0.5 * region_vectors[r_index] + 0.25 * _unit(rng.normal(size=dimension)))
+                corpus_vectors.append(_unit(vector))
+
+    corpus_vectors = np.asarray(corpus_vectors, dtype=np.float32)
+    queries, query_vectors = [], []
+    for kind, noise in (("room_number", 5.0), ("descriptive", 2.5), ("paraphrase", 2.0)):
+        for doc_index in rng.choice(len(corpus), 40, replace=False):
+            record = corpus[doc_index]
+            if kind == "room_number":
+                text = f"Where is room {rng.choice(record['rooms'])}?"
+            elif kind == "descriptive":
+                text = f"How do I get to the {record['features'][0]} in building {record['building']}?"
+            else:
+                text = f"the {rng.choice(_PARAPHRASES)} you described near level {record['floor']} over there"
+            queries.append({"query": text, "kind": kind, "relevant": [record["img_path"]]})
+            query_vectors.append(_unit(corpus_vectors[doc_index] + noise * _unit(rng.normal(size=dimension))))
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    with open(os.path.join(fixture_dir, CORPUS_FILE), "w", encoding="utf-8") as f:
+        json.dump(corpus, f, indent=1)
+    with open(os.path.join(fixture_dir, QUERIES_FILE), "w", encoding="utf-8") as f:
+        json.dump(queries, f, indent=1)
+    np.savez_compressed(os.path.join(fixture_dir, EMBEDDINGS_FILE),
+                        corpus=corpus_vectors.astype(np.float16),
+                        queries=np.asarray(query_vectors).astype(np.float16))
+
+    return RetrievalFixture.load(fixture_dir)
+
+
+# =============================================================================
+# INDEX CONFIGURATIONS
+# =============================================================================
+
+SearchFunction = Callable[[str, np.ndarray, int], List[Any]]
+
+
+def _vector_search(index) -> SearchFunction:
+    return lambda text, vector, top_n: [i for i, _ in index.search(vector, top_n)]
+
+
+def _hybrid_search(lexical: BM25Index, store: EmbeddingStore) -> SearchFunction:
+    """The ranking of AdvancedImageManager.find_relevant_images (lexical_index.hybrid_search)"""
+    def search(text: str, vector: np.ndarray, top_n: int) -> List[Any]:
+        _, hits = hybrid_search(text, lexical, lambda pool: store.search(vector, top_n=pool), top_n)
+        return [i for i, _ in hits]
+    return search
+
+
+def build_configurations(fixture: RetrievalFixture) -> Dict[str, Callable[[], SearchFunction]]:
+    """Returns a builder per index configuration (built lazily to measure memory)"""
+    ids, vectors = fixture.ids, fixture.corpus_vectors
+    documents = [(record["img_path"], record["description"]) for record in fixture.corpus]
+
+    return {
+        "brute_force": lambda: _vector_search(EmbeddingStore(mode="float32").build(ids, vectors)),
+        "quantized_float16": lambda: _vector_search(EmbeddingStore(mode="float16").build(ids, vectors)),
+        "quantized_int8": lambda: _vector_search(EmbeddingStore(mode="int8").build(ids, vectors)),
+        "ann_ivf": lambda: _vector_search(IVFIndex(nprobe=4).build(ids, vectors)),
+        "hybrid": lambda: _hybrid_search(BM25Index().build(documents), EmbeddingStore(mode="int8").build(ids, vectors)),
+    }
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+def recall_at_k(ranked: Sequence[Any], relevant: Sequence[Any], k: int) -> float:
+    """Fraction of the relevant items found in the top k"""
+    if not relevant:
+        return 0.0
+    return len(set(ranked[:k]) & set(relevant)) / len(relevant)
+
+
+def reciprocal_rank(ranked: Sequence[Any], relevant: Sequence[Any]) -> float:
+    """1 / rank of the first relevant item (0 if none is found)"""
+    relevant = set(relevant)
+    for rank, item in enumerate(ranked, 1):
+        if item in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def _measure_memory(builder: Callable[[], SearchFunction]) -> Tuple[SearchFunction, int]:
+    """Builds a configuration and returns the bytes it keeps allocated"""
+    builder()  # warm up lazy imports and caches so they aren't attributed to the index
+    tracemalloc.start()
+    try:
+        search = builder()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return search, allocated
+
+
+def run_benchmark(fixture: RetrievalFixture, k: int = 5,
+                  configurations: Optional[Sequence[str]] = None, warmup: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs every labeled query against each index configuration.
+
+    Args:
+        fixture: Loaded fixture
+        k: Cut-off for recall@k (and the number of results requested)
+        configurations: Subset of configuration names (default: all)
+        warmup: Queries run before timing starts
+
+    Returns:
+        Dict mapping configuration name to its metrics
+    """
+    builders = build_configurations(fixture)
+    results = {}
+
+    for name in configurations or builders:
+        search, memory = _measure_memory(builders[name])
+
+        for query, vector in list(zip(fixture.queries, fixture.query_vectors))[:warmup]:
+            search(query["query"], vector, k)
+
+        recalls, reciprocal_ranks, latencies = [], [], []
+        for query, vector in zip(fixture.queries, fixture.query_vectors):
+            start = time.perf_counter()
+            ranked = search(query["query"], vector, k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(recall_at_k(ranked, query["relevant"], k))
+            reciprocal_ranks.append(reciprocal_rank(ranked, query["relevant"]))
+
+        results[name] = {
+            f"recall@{k}": round(float(np.mean(recalls)), 4),
+            "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)), 4),
+            "latency_p95_ms": round(float(np.percentile(latencies, 95)), 4),
+            "latency_p99_ms": round(float(np.percentile(latencies, 99)), 4),
+            "memory_bytes": int(memory),
+        }
+
+    return results
+
+
+# =============================================================================
+# BASELINE
+# =============================================================================
+
+def write_baseline(path: str, results: Dict[str, Dict[str, Any]], k: int,
+                   thresholds: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Writes the results as the new baseline"""
+    baseline = {"k": k, "thresholds": thresholds or dict(DEFAULT_THRESHOLDS), "configurations": results}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+    return baseline
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """Loads a baseline written by write_baseline"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                        check_latency: bool = True) -> List[str]:
+    """
+    Checks the results against the baseline thresholds.
+
+    Args:
+        results: Output of run_benchmark
+        baseline: Loaded baseline
+        check_latency: Whether to check latency (machine dependent)
+
+    Returns:
+        List of regression messages (empty if everything passes)
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+    recall_key = f"recall@{baseline['k']}"
+    regressions = []
+
+    for name, expected in baseline["configurations"].items():
+        actual = results.get(name)
+        if actual is None:
+            regressions.append(f"{name}: configuration missing from results")
+            continue
+
+        for metric, max_drop in ((recall_key, thresholds["recall_max_drop"]), ("mrr", thresholds["mrr_max_drop"])):
+            if actual[metric] < expected[metric] - max_drop:
+                regressions.append(f"{name}: {metric} dropped from {expected[metric]:.4f} to {actual[metric]:.4f}")
+
+        if expected["memory_bytes"] and actual["memory_bytes"] > expected["memory_bytes"] * thresholds["memory_max_ratio"]:
+            regressions.append(f"{name}: memory grew from {expected['memory_bytes']} to {actual['memory_bytes']} bytes")
+
+        if check_latency and expected["latency_p95_ms"] and \
+                actual["latency_p95_ms"] > expected["latency_p95_ms"] * thresholds["latency_p95_max_ratio"]:
+            regressions.append(f"{name}: p95 latency grew from {expected['latency_p95_ms']:.3f} "
+                               f"to {actual['latency_p95_ms']:.3f} ms")
+
+    return regressions
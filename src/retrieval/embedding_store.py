@@ -0,0 +1,256 @@
+"""
+Quantized Embedding Store
+=========================
+
+This module keeps image and description embeddings in a contiguous NumPy
+matrix instead of per-row Python lists, with optional reduced-precision
+modes:
+
+- float32: plain matrix, exact search
+- float16: half-precision matrix
+- int8: symmetric per-vector quantization (one float32 scale per vector)
+
+Candidate search runs on the reduced-precision matrix and the best
+candidates are rescored against the float32 vectors, so the final scores
+match the exact dot product used by get_cosine_score. In the reduced
+modes only the search matrix stays in RAM: the float32 vectors are
+written to a temporary file and memory-mapped, so rescoring only pages in
+the few candidate rows it reads.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STORE_MODES = ("float32", "float16", "int8")
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantizes each row to int8 with its own scale.
+
+    Args:
+        vectors: (n, d) float matrix
+
+    Returns:
+        (int8 codes, float32 scales) such that codes * scales ≈ vectors
+    """
+    max_abs = np.abs(vectors).max(axis=1)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+class EmbeddingStore:
+    """In-memory embedding matrix with quantized candidate search and exact rescoring"""
+
+    def __init__(self, mode: str = "int8", oversample: int = 4, rescore_dir: Optional[str] = None):
+        """
+        Args:
+            mode: Storage mode (float32, float16, int8)
+            oversample: Candidates rescored per requested result
+            rescore_dir: Directory of the memory-mapped float32 vectors (default: the system temp dir)
+        """
+        if mode not in STORE_MODES:
+            raise ValueError(f"Unknown store mode '{mode}'. Use one of {STORE_MODES}")
+
+        self.mode = mode
+        self.oversample = oversample
+        self.rescore_dir = rescore_dir
+        self.ids: List[Any] = []
+        self.vectors: Optional[np.ndarray] = None  # float32, used for rescoring (memory-mapped in reduced modes)
+        self.codes: Optional[np.ndarray] = None  # float16 or int8 search matrix
+        self.scales: Optional[np.ndarray] = None  # int8 mode only
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dimension(self) -> int:
+        return 0 if self.vectors is None else self.vectors.shape[1]
+
+    def build(self, ids: Sequence[Any], vectors: Iterable[Sequence[float]]) -> "EmbeddingStore":
+        """
+        Builds the store from ids and embeddings.
+
+        Args:
+            ids: Identifiers returned by search (e.g. image paths)
+            vectors: Embeddings, one per id
+
+        Returns:
+            The store itself, to allow chaining
+        """
+        matrix = np.asarray([np.asarray(v, dtype=np.float32) for v in vectors], dtype=np.float32)
+        if len(ids) != len(matrix):
+            raise ValueError("ids and vectors must have the same length")
+
+        self.ids = list(ids)
+        matrix = np.ascontiguousarray(matrix)
+
+        if self.mode == "float32":
+            self.vectors = self.codes = matrix
+            return self
+
+        if self.mode == "float16":
+            self.codes = matrix.astype(np.float16)
+        else:
+            self.codes, self.scales = quantize_int8(matrix)
+        self.vectors = self._spill(matrix)
+        return self
+
+    def _spill(self, matrix: np.ndarray) -> np.ndarray:
+        """Moves the float32 vectors to an unnamed temporary file and memory-maps them"""
+        if matrix.size == 0:
+            return matrix
+        if self.rescore_dir:
+            os.makedirs(self.rescore_dir, exist_ok=True)
+        # The file is deleted on close; the mapping keeps it alive for as long as the store uses it
+        with tempfile.TemporaryFile(dir=self.rescore_dir) as f:
+            vectors = np.memmap(f, dtype=np.float32, mode="w+", shape=matrix.shape)
+        vectors[:] = matrix
+        vectors.flush()
+        return vectors
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        dataframe,
+        column_name: str,
+        id_column: str = "img_path",
+        mode: str = "int8",
+        rescore_dir: Optional[str] = None,
+    ) -> "EmbeddingStore":
+        """
+        Builds a store from a metadata DataFrame, skipping rows without embedding.
+
+        Args:
+            dataframe: DataFrame produced by processar_imagens_da_pasta
+            column_name: Column with the embeddings
+            id_column: Column used as result id
+            mode: Storage mode (float32, float16, int8)
+            rescore_dir: Directory of the memory-mapped float32 vectors
+        """
+        ids, vectors = [], []
+        for _, row in dataframe.iterrows():
+            embedding = row.get(column_name)
+            if embedding is None or (isinstance(embedding, float) and np.isnan(embedding)):
+                continue
+            ids.append(row.get(id_column))
+            vectors.append(embedding)
+        return cls(mode=mode, rescore_dir=rescore_dir).build(ids, vectors)
+
+    def _approximate_scores(self, query: np.ndarray) -> np.ndarray:
+        """Scores every vector against the query using the reduced-precision matrix"""
+        if self.mode == "int8":
+            return (self.codes @ query) * self.scales
+        if self.mode == "float16":
+            return (self.codes @ query.astype(np.float16)).astype(np.float32)
+        return self.codes @ query
+
+    def search(self, query: Sequence[float], top_n: int = 5, rescore: bool = True) -> List[Tuple[Any, float]]:
+        """
+        Finds the vectors with the highest dot product with the query.
+
+        Args:
+            query: Query embedding
+            top_n: Number of results
+            rescore: Whether to rescore the candidates in full precision
+
+        Returns:
+            List of (id, score) pairs ordered by descending score
+        """
+        if not self.ids:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        top_n = min(top_n, len(self.ids))
+        scores = self._approximate_scores(query)
+
+        if rescore and self.mode != "float32":
+            pool = min(len(self.ids), top_n * self.oversample)
+            candidates = np.argpartition(-scores, pool - 1)[:pool]
+            candidate_scores = self.vectors[candidates] @ query
+        else:
+            candidates = np.arange(len(self.ids))
+            candidate_scores = scores
+
+        best = np.argsort(-candidate_scores, kind="stable")[:top_n]
+        return [(self.ids[candidates[i]], float(candidate_scores[i])) for i in best]
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """Returns the RAM used by the search matrix and the bytes of the rescoring vectors kept on disk"""
+        index_bytes = 0 if self.codes is None else self.codes.nbytes
+        if self.scales is not None:
+            index_bytes += self.scales.nbytes
+        mapped = isinstance(self.vectors, np.memmap)
+        full_bytes = 0 if self.vectors is None else self.vectors.nbytes
+        # float32 mode searches the full-precision matrix itself; the reduced modes map it from disk
+        return {"index": index_bytes, "on_disk": full_bytes if mapped else 0}
+
+
+def python_list_bytes(count: int, dimension: int) -> int:
+    """Approximate memory of embeddings stored as lists of Python floats (the DataFrame format)"""
+    sample = [0.1] * dimension
+    return count * (sys.getsizeof(sample) + dimension * sys.getsizeof(0.1))
+
+
+def benchmark_embedding_store(
+    dimensions: Sequence[int] = (512, 768),
+    num_vectors: int = 5000,
+    num_queries: int = 200,
+    top_k: int = 10,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Compares memory, latency and recall@k of every store mode.
+
+    Uses synthetic unit-norm embeddings with cluster structure and noisy
+    queries; recall is measured against exact float32 search.
+
+    Args:
+        dimensions: Embedding sizes to test (512-d multimodal, 768-d text)
+        num_vectors: Number of stored vectors
+        num_queries: Number of queries
+        top_k: k used for recall@k
+        seed: Random seed
+
+    Returns:
+        List of result dicts (one per dimension, mode and rescoring setting)
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+
+    for dimension in dimensions:
+        centers = rng.normal(size=(max(1, num_vectors // 50), dimension))
+        vectors = centers[rng.integers(0, len(centers), num_vectors)] + 0.5 * rng.normal(size=(num_vectors, dimension))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = vectors[rng.integers(0, num_vectors, num_queries)] + 0.3 * rng.normal(size=(num_queries, dimension)) / np.sqrt(dimension)
+
+        ids = list(range(num_vectors))
+        exact = EmbeddingStore(mode="float32").build(ids, vectors)
+        truth = [set(i for i, _ in exact.search(q, top_k)) for q in queries]
+
+        for mode in STORE_MODES:
+            store = EmbeddingStore(mode=mode).build(ids, vectors)
+            for rescore in ((False,) if mode == "float32" else (False, True)):
+                start = time.perf_counter()
+                found = [set(i for i, _ in store.search(q, top_k, rescore=rescore)) for q in queries]
+                elapsed = time.perf_counter() - start
+
+                memory = store.memory_bytes()
+                results.append({
+                    "dimension": dimension,
+                    "mode": mode,
+                    "rescore": rescore,
+                    "index_bytes": memory["index"],
+                    "on_disk_bytes": memory["on_disk"],
+                    "python_list_bytes": python_list_bytes(num_vectors, dimension),
+                    "avg_latency_ms": elapsed / num_queries * 1000,
+                    f"recall@{top_k}": float(np.mean([len(f & t) / top_k for f, t in zip(found, truth)])),
+                })
+
+    return results
@@ -0,0 +1,206 @@
+"""
+Lexical Retrieval (BM25)
+========================
+
+This module implements a small BM25 inverted index over the image
+descriptions produced by the multimodal RAG pipeline, plus Reciprocal
+Rank Fusion (RRF) to combine lexical and vector rankings.
+
+Floor-plan descriptions are full of exact tokens such as room numbers
+("1003", "1063-C") that dense embeddings match poorly, so the lexical
+side is used both as a precision boost and as an embedding-free fast path.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Tokens keep internal hyphens so "1063-C" survives as one term
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+# Room numbers such as "1003", "2037" or "1063-c"
+ROOM_NUMBER_PATTERN = re.compile(r"^\d{3,4}(?:-[a-z0-9]+)?$")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "at", "be", "by", "can", "do", "for", "from",
+    "get", "go", "how", "i", "in", "is", "it", "me", "my", "of", "on", "or",
+    "the", "there", "this", "to", "where", "with", "you",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase search terms.
+
+    Hyphenated tokens are emitted whole and also split into their parts,
+    so "1063-C" matches queries for both "1063-c" and "1063".
+    """
+    if not text:
+        return []
+
+    tokens = []
+    for token in TOKEN_PATTERN.findall(str(text).lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        if "-" in token:
+            tokens.extend(part for part in token.split("-") if part and part not in STOPWORDS)
+    return tokens
+
+
+def extract_room_numbers(text: str) -> List[str]:
+    """Returns the room-number-like tokens of a query (e.g. "1003", "1063-c")"""
+    return [token for token in TOKEN_PATTERN.findall(str(text).lower())
+            if ROOM_NUMBER_PATTERN.match(token)]
+
+
+class BM25Index:
+    """Okapi BM25 inverted index over a collection of short documents"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids: List[Any] = []
+        self.doc_lengths: List[int] = []
+        self.avg_doc_length = 0.0
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.idf: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def build(self, documents: Iterable[Tuple[Any, str]]) -> "BM25Index":
+        """
+        Builds the index from (doc_id, text) pairs.
+
+        Args:
+            documents: Iterable of (doc_id, text) pairs
+
+        Returns:
+            The index itself, to allow chaining
+        """
+        postings = defaultdict(list)
+        self.doc_ids = []
+        self.doc_lengths = []
+
+        for position, (doc_id, text) in enumerate(documents):
+            terms = tokenize(text)
+            self.doc_ids.append(doc_id)
+            self.doc_lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                postings[term].append((position, frequency))
+
+        total_docs = len(self.doc_ids)
+        self.avg_doc_length = (sum(self.doc_lengths) / total_docs) if total_docs else 0.0
+        self.postings = dict(postings)
+        self.idf = {
+            term: math.log(1 + (total_docs - len(entries) + 0.5) / (len(entries) + 0.5))
+            for term, entries in self.postings.items()
+        }
+        return self
+
+    def search(self, query: str, top_n: int = 10) -> List[Tuple[Any, float]]:
+        """
+        Scores documents against the query.
+
+        Args:
+            query: Free-text query
+            top_n: Maximum number of results
+
+        Returns:
+            List of (doc_id, score) pairs ordered by descending score
+        """
+        if not self.doc_ids:
+            return []
+
+        scores = defaultdict(float)
+        avg_length = self.avg_doc_length or 1.0
+
+        for term in set(tokenize(query)):
+            entries = self.postings.get(term)
+            if not entries:
+                continue
+            idf = self.idf[term]
+            for position, frequency in entries:
+                length_norm = 1 - self.b + self.b * self.doc_lengths[position] / avg_length
+                scores[position] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+        return [(self.doc_ids[position], score) for position, score in ranked]
+
+    def contains_term(self, term: str) -> bool:
+        """Checks if any document contains the given term"""
+        return term.lower() in self.postings
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Any]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Tuple[Any, float]]:
+    """
+    Fuses several ranked lists with Reciprocal Rank Fusion.
+
+    Args:
+        rankings: Ranked lists of document ids (best first)
+        k: RRF smoothing constant (60 in the original paper)
+        weights: Optional per-ranking weights (default 1.0 each)
+
+    Returns:
+        List of (doc_id, fused_score) pairs ordered by descending score
+    """
+    weights = list(weights) if weights is not None else [1.0] * len(rankings)
+    fused = defaultdict(float)
+    first_seen = {}
+
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, 1):
+            fused[doc_id] += weight / (k + rank)
+            first_seen.setdefault(doc_id, len(first_seen))
+
+    return sorted(fused.items(), key=lambda item: (-item[1], first_seen[item[0]]))
+
+
+def hybrid_search(
+    query: str,
+    lexical_index: Optional[BM25Index],
+    vector_search: Callable[[int], List[Tuple[Any, float]]],
+    top_n: int = 3,
+) -> Tuple[str, List[Tuple[Any, Dict[str, float]]]]:
+    """
+    Ranks documents with BM25 and a vector search fused by Reciprocal Rank
+    Fusion. Queries whose room numbers all appear in the lexical index are
+    ranked lexically, without calling the vector search (no embedding call).
+
+    Args:
+        query: Free-text query
+        lexical_index: BM25 index over the documents (None for vector search only)
+        vector_search: Called with the candidate pool size, returns (doc_id, score) pairs best first
+        top_n: Maximum number of results
+
+    Returns:
+        (retrieval, hits) where retrieval is 'lexical', 'vector' or 'hybrid' and hits
+        are (doc_id, scores) pairs; scores holds bm25_score, rrf_score and relevance_score
+        as they apply (empty for plain vector hits)
+    """
+    candidate_pool = max(top_n * 4, 10)
+    lexical_hits = lexical_index.search(query, top_n=candidate_pool) if lexical_index is not None else []
+
+    # Exact room-number queries: lexical ranking only
+    room_numbers = extract_room_numbers(query)
+    if lexical_hits and room_numbers and all(lexical_index.contains_term(n) for n in room_numbers):
+        best_score = lexical_hits[0][1]
+        return "lexical", [(doc_id, {"bm25_score": score, "relevance_score": score / best_score})
+                           for doc_id, score in lexical_hits[:top_n]]
+
+    vector_hits = vector_search(candidate_pool)
+    if not lexical_hits:
+        return "vector", [(doc_id, {}) for doc_id, _ in vector_hits[:top_n]]
+
+    bm25_by_id = dict(lexical_hits)
+    fused = reciprocal_rank_fusion([[doc_id for doc_id, _ in lexical_hits], [doc_id for doc_id, _ in vector_hits]])
+    best_fused = fused[0][1] if fused else 1.0
+    return "hybrid", [(doc_id, {"bm25_score": bm25_by_id.get(doc_id, 0.0), "rrf_score": rrf_score,
+                                "relevance_score": rrf_score / best_fused})
+                      for doc_id, rrf_score in fused[:top_n]]
@@ -0,0 +1,57 @@
+"""
+Region Selection
+================
+
+This module collapses image search results onto the parent-child index
+built by floor plan tiling: for each parent image only one entry is kept,
+preferring its best-ranked tile so that the prompt receives the
+description of the relevant region instead of the whole floor.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+def _is_missing(value: Any) -> bool:
+    """Checks for None/NaN values coming from DataFrame rows"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def parent_key(result: Dict[str, Any]) -> str:
+    """Returns the parent image path of a result (the image itself for whole images)"""
+    parent = result.get('parent_img_path')
+    return result.get('img_path') if _is_missing(parent) else parent
+
+
+def is_tile(result: Dict[str, Any]) -> bool:
+    """Checks if a search result is a tile of a larger plan"""
+    return result.get('record_type') == 'tile'
+
+
+def select_regions(results: List[Dict[str, Any]], top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Keeps the most relevant region per parent image.
+
+    Results must be ordered best first. Parents are ranked by their first
+    appearance; for each parent its best-ranked tile wins over the whole
+    image when both are present.
+
+    Args:
+        results: Ranked search results
+        top_n: Maximum number of regions returned (default: all)
+
+    Returns:
+        List of at most one result per parent image, best first
+    """
+    order = []
+    best = {}
+
+    for result in results:
+        key = parent_key(result)
+        if key not in best:
+            order.append(key)
+            best[key] = result
+        elif is_tile(result) and not is_tile(best[key]):
+            best[key] = result
+
+    selected = [best[key] for key in order]
+    return selected[:top_n] if top_n is not None else selected
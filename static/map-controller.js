@@ -13,6 +13,8 @@ let currentCorners = null;
 let currentOverlay = null;
 let currentGraphData = null;
 let manualRoomCenters = {}; // Manual room center coordinates from config
+let roomCentersVersion = null; // Config version the centers were loaded from (sent back on save)
+let floorPlanIndex = null; // Room geometry and node positions precomputed from the floor plan SVGs
 
 // Navigation state
 const navigationState = {
@@ -140,6 +142,7 @@ async function loadManualRoomCenters() {
         const data = await response.json();
         
         manualRoomCenters = data;
+        roomCentersVersion = response.headers.get('X-Config-Version');
         
         // Count how many rooms have manual overrides
         const manualCount = Object.values(data).filter(center => 
@@ -156,6 +159,117 @@ async function loadManualRoomCenters() {
     }
 }
 
+/**
+ * Load the room geometry index precomputed from the floor plan SVGs on the server
+ * (room bounding boxes and centers, node positions), so the SVG DOM is not searched
+ */
+async function loadFloorPlanIndex() {
+    try {
+        const response = await fetch('/api/navigation/floorplans');
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        floorPlanIndex = await response.json();
+        console.log(`📐 Floor plan index ${floorPlanIndex.version} loaded: ${Object.keys(floorPlanIndex.floors).join(', ')}`);
+        return true;
+    } catch (error) {
+        console.warn('⚠️ Floor plan index unavailable, reading geometry from the SVG:', error);
+        floorPlanIndex = null;
+        return false;
+    }
+}
+
+/**
+ * Entry of a room ('rooms') or node ('nodes') in the floor plan index, or null
+ */
+function floorPlanEntry(kind, id) {
+    if (!floorPlanIndex) return null;
+    for (const plan of Object.values(floorPlanIndex.floors)) {
+        if (plan[kind] && plan[kind][id]) return plan[kind][id];
+    }
+    return null;
+}
+
+/**
+ * Headers for saving room centers: the loaded config version makes the server
+ * reject the save (409) if the config was changed by someone else in the meantime
+ */
+function roomCentersSaveHeaders() {
+    const headers = { 'Content-Type': 'application/json' };
+    if (roomCentersVersion) {
+        headers['X-Config-Version'] = roomCentersVersion;
+    }
+    return headers;
+}
+
+/**
+ * Versioned URL of a static asset (content-hashed, cached forever by the browser)
+ * The page lists them in window.ASSET_URLS; unlisted assets use their plain, revalidated URL
+ */
+function assetUrl(path) {
+    return (window.ASSET_URLS && window.ASSET_URLS[path]) || '/' + encodeURI(path);
+}
+
+/**
+ * Decode a compact campus layer (see src/navigation/map_layers.py) into GeoJSON
+ * Rings are delta-encoded integer lists [x0, y0, dx1, dy1, ...] on a grid of 1/scale degrees
+ */
+function decodeCampusLayer(layer) {
+    const [originX, originY] = layer.origin;
+    const features = layer.features.map(feature => {
+        const rings = feature.rings.map(encoded => {
+            const ring = [];
+            let x = 0, y = 0;
+            for (let i = 0; i < encoded.length; i += 2) {
+                x += encoded[i];
+                y += encoded[i + 1];
+                ring.push([originX + x / layer.scale, originY + y / layer.scale]);
+            }
+            return ring;
+        });
+
+        let coordinates = rings;
+        if (feature.type === 'Point') {
+            coordinates = rings[0][0];
+        } else if (feature.type === 'LineString' || feature.type === 'MultiPoint') {
+            coordinates = rings[0];
+        } else if (feature.type === 'MultiPolygon') {
+            coordinates = [];
+            let start = 0;
+            feature.parts.forEach(count => {
+                coordinates.push(rings.slice(start, start + count));
+                start += count;
+            });
+        }
+        return { type: 'Feature', geometry: { type: feature.type, coordinates }, properties: feature.properties };
+    });
+    return { type: 'FeatureCollection', features };
+}
+
+/**
+ * Load the campus GeoJSON from the versioned map layers
+ * Uses the band of the current zoom unless a band name is given
+ * The result carries the manifest's exact featureBounds (by feature name)
+ * Falls back to the raw campus.geojson if the layers are not available
+ */
+async function loadCampusGeoJSON(bandName = null) {
+    try {
+        const manifest = await fetch('/api/map/campus').then(r => {
+            if (!r.ok) throw new Error(`HTTP ${r.status}`);
+            return r.json();
+        });
+        const zoom = map ? map.getZoom() : manifest.bands[manifest.bands.length - 1].minZoom;
+        const band = manifest.bands.find(b => bandName ? b.name === bandName : zoom <= b.maxZoom)
+            || manifest.bands[manifest.bands.length - 1];
+        const layer = await fetch(band.url).then(r => r.json());
+        console.log(`🗺️ Campus layer '${band.name}' loaded (${band.gzipBytes} bytes gzipped)`);
+        const collection = decodeCampusLayer(layer);
+        collection.featureBounds = manifest.featureBounds || {};
+        return collection;
+    } catch (error) {
+        console.warn('⚠️ Map layers unavailable, loading raw campus.geojson:', error);
+        return fetch(assetUrl('LeafletJS/campus.geojson')).then(response => response.json());
+    }
+}
+
 /**
  * Load Building M Floor 1
  */
@@ -165,12 +279,14 @@ async function loadBuildingM() {
         return;
     }
 
-    // Load manual room centers first
-    await loadManualRoomCenters();
+    // Load manual room centers, the floor plan index and the compiled navigation graph first
+    await Promise.all([loadManualRoomCenters(), loadFloorPlanIndex()]);
+    const navigationBundle = await loadNavigationBundle();
 
     // Get building center and load GeoJSON for building bounds
-    fetch('/LeafletJS/campus.geojson?ts=' + new Date().getTime())
-        .then(response => response.json())
+    // (band of the current zoom; the exact bounds come from the manifest, so the
+    // floor plan lands on the building without downloading the detail band)
+    loadCampusGeoJSON()
         .then(data => {
             // Find Building M in GeoJSON
             const buildingMFeature = data.features.find(f => f.properties.name === 'Building M');
@@ -180,9 +296,11 @@ async function loadBuildingM() {
                 return;
             }
 
-            // Get building bounds
-            const layer = L.geoJSON(buildingMFeature);
-            const bounds = layer.getBounds();
+            // Get building bounds (raw geometry when the layers are unavailable)
+            const exactBounds = data.featureBounds && data.featureBounds['Building M'];
+            const bounds = exactBounds
+                ? L.latLngBounds([exactBounds[1], exactBounds[0]], [exactBounds[3], exactBounds[2]])
+                : L.geoJSON(buildingMFeature).getBounds();
             const center = bounds.getCenter();
 
             // Calculate corners for SVG overlay
@@ -193,11 +311,15 @@ async function loadBuildingM() {
                 L.latLng(bounds.getSouth(), bounds.getWest())   // bottom-left
             ];
 
+            // Rotated corners precomputed on the server, else rotated here
+            const indexedPlan = floorPlanIndex && floorPlanIndex.floors['M1'];
             const mapBearing = 21.3;
-            currentCorners = corners.map(corner => rotatePoint(corner, center, mapBearing));
+            currentCorners = indexedPlan
+                ? indexedPlan.corners.map(([lat, lng]) => L.latLng(lat, lng))
+                : corners.map(corner => rotatePoint(corner, center, mapBearing));
 
             // Load SVG floor plan
-            const svgPath = '/LeafletJS/Floorplans/Building%20M/M1_official.svg?ts=' + new Date().getTime();
+            const svgPath = assetUrl('LeafletJS/Floorplans/Building M/M1_official.svg');
 
             fetch(svgPath)
                 .then(r => r.text())
@@ -215,8 +337,9 @@ async function loadBuildingM() {
                     const floorData = floorPlans['Building M']['floors']['floor1'];
                     const navigationGraph = floorData['navigationGraph'];
 
-                    if (navigationGraph) {
-                        currentGraphData = buildNavigationGraph(currentSvgMap, navigationGraph, currentCorners);
+                    if (navigationBundle || navigationGraph) {
+                        currentGraphData = (navigationBundle && graphFromBundle(navigationBundle, 'M1', navigationGraph))
+                            || buildNavigationGraph(currentSvgMap, navigationGraph, currentCorners);
 
                         // Add roomToNode mapping from floor data
                         if (floorData['roomToNode']) {
@@ -398,9 +521,23 @@ function getRoomCenterFromSVG(roomId, svgMap, corners) {
     if (manualRoomCenters[roomId] && manualRoomCenters[roomId].x !== undefined && manualRoomCenters[roomId].y !== undefined) {
         const manual = manualRoomCenters[roomId];
         console.log(`📌 Using MANUAL center for ${roomId}: (${manual.x}, ${manual.y})`);
+        // The server sends the map coordinates along with the SVG ones
+        if (manual.lat !== undefined && manual.lng !== undefined) {
+            return L.latLng(manual.lat, manual.lng);
+        }
         return svgCoordsToLatLng(manual.x, manual.y, svgMap, corners);
     }
 
+    // Precomputed center (already converted to map coordinates) from the floor plan index
+    const indexed = floorPlanEntry('rooms', roomId);
+    if (indexed && indexed.latlng && !indexed.manual) {
+        return L.latLng(indexed.latlng[0], indexed.latlng[1]);
+    }
+    if (indexed && indexed.bbox) {
+        const [minX, minY, maxX, maxY] = indexed.bbox;
+        return svgCoordsToLatLng((minX + maxX) / 2, (minY + maxY) / 2, svgMap, corners);
+    }
+
     // Find the room element in SVG for automatic calculation
     const roomElement = svgMap.getElementById(roomId);
     
@@ -438,10 +575,13 @@ function buildNavigationGraph(svgMap, graphDefinition, corners) {
     console.log('🔨 Building navigation graph...');
 
     Object.entries(graphDefinition).forEach(([nodeId, nodeData]) => {
-        const nodeElement = svgMap.getElementById(nodeId);
+        const indexed = floorPlanEntry('nodes', nodeId);
+        const nodeElement = indexed ? null : svgMap.getElementById(nodeId);
 
-        if (nodeElement) {
-            nodePositions[nodeId] = nodeToLatLng(nodeElement, svgMap, corners);
+        if (indexed || nodeElement) {
+            nodePositions[nodeId] = indexed
+                ? L.latLng(indexed.latlng[0], indexed.latlng[1])
+                : nodeToLatLng(nodeElement, svgMap, corners);
             nodeMetadata[nodeId] = {
                 connections: nodeData.connections || [],
                 represents: nodeData.represents || null
@@ -470,6 +610,67 @@ function buildNavigationGraph(svgMap, graphDefinition, corners) {
     return { graph, nodePositions, nodeMetadata };
 }
 
+/**
+ * Load the compiled navigation bundle (see src/navigation/bundle.py)
+ * Returns null when the server has none, so the graph is built from the SVG instead
+ */
+async function loadNavigationBundle() {
+    try {
+        const manifest = await fetch('/api/navigation/bundle').then(r => {
+            if (!r.ok) throw new Error(`HTTP ${r.status}`);
+            return r.json();
+        });
+        const bundle = await fetch(manifest.url).then(r => r.json());
+        console.log(`🧭 Navigation bundle ${manifest.version} loaded (${manifest.gzipBytes} bytes gzipped)`);
+        return bundle;
+    } catch (error) {
+        console.warn('⚠️ Navigation bundle unavailable, building the graph from the floor plan:', error);
+        return null;
+    }
+}
+
+/**
+ * Build the navigation graph of one floor from the navigation bundle
+ * Same shape as buildNavigationGraph; node metadata comes from the floor's
+ * navigationGraph definition when it has one, else from the bundle objects
+ */
+function graphFromBundle(bundle, floorKey, graphDefinition = null) {
+    const floorIndex = bundle.floors.indexOf(floorKey);
+    if (floorIndex < 0) return null;
+
+    const [originX, originY] = bundle.origin;
+    const ids = bundle.nodes.ids;
+    const graph = {};
+    const nodePositions = {};
+    const nodeMetadata = {};
+
+    ids.forEach((nodeId, i) => {
+        if (bundle.nodes.floors[i] !== floorIndex || bundle.nodes.x[i] === null) return;
+        nodePositions[nodeId] = L.latLng(originY + bundle.nodes.y[i] / bundle.scale,
+                                         originX + bundle.nodes.x[i] / bundle.scale);
+        const objects = bundle.nodes.objects[nodeId] || [];
+        nodeMetadata[nodeId] = {
+            connections: [],
+            represents: (graphDefinition && graphDefinition[nodeId] && graphDefinition[nodeId].represents)
+                || (objects.length ? objects : null)
+        };
+        graph[nodeId] = [];
+    });
+
+    bundle.edges.forEach(([a, b, weightCm]) => {
+        const start = ids[a], end = ids[b];
+        if (!graph[start] || !graph[end]) return;
+        const distance = weightCm / 100;
+        graph[start].push({ node: end, distance });
+        graph[end].push({ node: start, distance });
+        nodeMetadata[start].connections.push(end);
+        nodeMetadata[end].connections.push(start);
+    });
+
+    console.log(`✅ Navigation graph for ${floorKey} built from bundle ${bundle.version}`);
+    return { graph, nodePositions, nodeMetadata };
+}
+
 /**
  * Dijkstra's shortest path algorithm
  */
@@ -966,6 +1167,117 @@ function handleRoomClick(roomId, graphData, svgMap) {
     }
 }
 
+/**
+ * Use the nearest amenity (washroom, exit, elevator, stairs, entrance) as destination
+ * Works once a start room is selected; the server precomputes the nearest instance per node
+ */
+async function navigateToNearest(category, profile = null) {
+    if (navigationState.mode !== 'selecting_end' || !navigationState.startRoom) {
+        updateModeIndicator('Select a starting location first');
+        return;
+    }
+
+    const params = new URLSearchParams({ from: navigationState.startRoom, category });
+    if (profile) params.set('profile', profile);
+    try {
+        const response = await fetch(`/api/navigation/nearest?${params}`);
+        const nearest = await response.json();
+        if (!response.ok) throw new Error(nearest.error || `HTTP ${response.status}`);
+
+        console.log(`🚻 Nearest ${nearest.category}: ${nearest.room} (${nearest.distance_m} m)`);
+        handleRoomClick(nearest.room, currentGraphData, currentSvgMap);
+    } catch (error) {
+        console.error(`❌ Nearest ${category} not found:`, error);
+        updateModeIndicator(`No ${category} found nearby`);
+    }
+}
+
+/**
+ * Plan and draw one route from a start through several stops, visited in the
+ * shortest order computed on the server (e.g. office, then cafeteria, then 1018)
+ */
+async function navigateMultiStop(start, stops, end = null, profile = null) {
+    try {
+        const response = await fetch('/api/navigation/multi-stop', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ start, stops, end, profile, zoom: map.getZoom() })
+        });
+        const plan = await response.json();
+        if (!response.ok) throw new Error(plan.error || `HTTP ${response.status}`);
+
+        console.log(`🧭 Multi-stop route (${plan.method}): ${[plan.start, ...plan.order].join(' → ')}` +
+                    `${plan.end ? ' → ' + plan.end : ''} (${plan.distance_m} m)`);
+
+        clearRoutePolylines();
+        clearRoute();
+
+        const latlngs = plan.geometry.coordinates.map(coord => L.latLng(coord[1], coord[0]));
+        const polyline = L.polyline(latlngs, { color: '#2196F3', weight: 5, opacity: 0.9 }).addTo(map);
+        window.routePolylines.push(polyline);
+
+        // Start and final markers, numbered circles for the stops in between
+        const visits = plan.legs.map(leg => leg.to);
+        const lastCoords = getCoordinatesForRoom(visits[visits.length - 1], currentGraphData, currentSvgMap);
+        const startCoords = getCoordinatesForRoom(plan.start, currentGraphData, currentSvgMap);
+        if (startCoords) {
+            navigationMarkers.start = L.marker(startCoords, { icon: markerIcons.start })
+                .addTo(map).bindPopup(`Start: ${plan.start}`);
+        }
+        if (lastCoords) {
+            navigationMarkers.end = L.marker(lastCoords, { icon: markerIcons.end })
+                .addTo(map).bindPopup(`Destination: ${visits[visits.length - 1]}`);
+        }
+        visits.slice(0, -1).forEach((room, i) => {
+            const coords = getCoordinatesForRoom(room, currentGraphData, currentSvgMap);
+            if (!coords) return;
+            const marker = L.circleMarker(coords, { radius: 8, color: '#FF9800', fillOpacity: 0.9 })
+                .addTo(map).bindTooltip(`${i + 1}. ${room}`, { permanent: true });
+            window.routePolylines.push(marker);
+        });
+
+        if (latlngs.length > 0) map.fitBounds(polyline.getBounds(), { padding: [50, 50] });
+        return plan;
+    } catch (error) {
+        console.error('❌ Multi-stop route failed:', error);
+        updateModeIndicator('Could not plan a route through these stops');
+        return null;
+    }
+}
+
+/**
+ * Show the corridors within walking time bands of a room (e.g. 1, 2 and 5 minutes),
+ * computed on the server; nearer bands are drawn darker
+ */
+async function showIsochrone(room, thresholds = [60, 120, 300], profile = null) {
+    const params = new URLSearchParams({ from: room, thresholds: thresholds.join(',') });
+    if (profile) params.set('profile', profile);
+    try {
+        const response = await fetch(`/api/navigation/isochrone?${params}`);
+        const result = await response.json();
+        if (!response.ok) throw new Error(result.error || `HTTP ${response.status}`);
+
+        clearRoutePolylines();
+        const colors = ['#1B5E20', '#43A047', '#A5D6A7', '#E8F5E9'];
+        const layer = L.geoJSON(result.isochrone, {
+            style: feature => ({
+                color: colors[Math.min(feature.properties.band, colors.length - 1)],
+                weight: 6,
+                opacity: 0.9
+            }),
+            onEachFeature: (feature, featureLayer) => featureLayer.bindTooltip(
+                `${feature.properties.minSeconds / 60}–${feature.properties.maxSeconds / 60} min walk`)
+        }).addTo(map);
+        window.routePolylines.push(layer);
+
+        console.log(`⏱️ ${result.isochrone.rooms.length} rooms within ${Math.max(...result.thresholds) / 60} min of ${result.from}`);
+        return result;
+    } catch (error) {
+        console.error(`❌ Isochrone of ${room} failed:`, error);
+        return null;
+    }
+}
+
 /**
  * Get room node ID from room name
  */
@@ -1570,9 +1882,7 @@ const coordinateEditor = {
             // Send to server
             const response = await fetch('/api/navigation/room-centers/update', {
                 method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
+                headers: roomCentersSaveHeaders(),
                 body: JSON.stringify(dataToSave)
             });
 
@@ -1986,9 +2296,7 @@ const calibrationMode = {
             // Save to server - NO LLM CALL, just coordinate update
             const response = await fetch('/api/navigation/room-centers/update', {
                 method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
+                headers: roomCentersSaveHeaders(),
                 body: JSON.stringify(dataToSave)
             });
 
@@ -3144,7 +3452,7 @@ const routeSegmentsLoader = {
             }
 
             // Fetch the latest route segments file
-            const response = await fetch('/map/route_segments_2025-11-17.geojson?ts=' + new Date().getTime());
+            const response = await fetch(assetUrl('map/route_segments_2025-11-17.geojson'));
             
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
@@ -3444,7 +3752,7 @@ document.addEventListener('DOMContentLoaded', () => {
  */
 async function loadCorridorSegments() {
     try {
-        const response = await fetch('/map/corridor_segments_building_m.geojson?ts=' + new Date().getTime());
+        const response = await fetch(assetUrl('map/corridor_segments_building_m.geojson'));
         
         if (!response.ok) {
             // File might not exist yet - that's okay
@@ -3478,6 +3786,9 @@ async function loadCorridorSegments() {
 window.showRouteBuildingM = showRouteBuildingM;
 window.clearRoute = clearRoute;
 window.startMapNavigation = startMapNavigation;
+window.navigateToNearest = navigateToNearest;
+window.navigateMultiStop = navigateMultiStop;
+window.showIsochrone = showIsochrone;
 window.reloadCoordinates = reloadCoordinates;
 window.coordinateEditor = coordinateEditor;
 window.calibrationMode = calibrationMode;
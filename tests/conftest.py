@@ -6,6 +6,7 @@ This file contains pytest configuration and shared fixtures
 for all tests in the Capstone Project AIM test suite.
 """
 
+import json
 import os
 import sys
 import pytest
@@ -94,6 +95,39 @@ def set_mock_env(mock_env_vars):
             os.environ[key] = original_value
 
 
+@pytest.fixture(scope="function")
+def campus_sources(tmp_path):
+    """
+    Fixture that writes small navigation sources to tmp_path and returns a builder.
+
+    build(floors, config, segments, step) writes corridors.geojson with one
+    straight corridor per floor ({"X1": 4} is X1_0 ... X1_3 at latitude 1,
+    `step` degrees apart) plus the extra (start, end, coordinates[, segmentType])
+    segments, and building_x_rooms.json when a config is given. It returns
+    (corridors path, configs loaded with load_building_configs).
+    """
+    from navigation import load_building_configs
+
+    def build(floors=None, config=None, segments=(), step=0.0001):
+        def feature(start, end, coordinates, segment_type="corridor"):
+            return {"type": "Feature",
+                    "geometry": {"type": "LineString", "coordinates": [list(point) for point in coordinates]},
+                    "properties": {"startNode": start, "endNode": end, "segmentType": segment_type}}
+
+        features = [feature(f"{floor}_{i}", f"{floor}_{i + 1}",
+                            [[i * step, int(floor[1:])], [(i + 1) * step, int(floor[1:])]])
+                    for floor, count in (floors or {}).items() for i in range(count - 1)]
+        features += [feature(*segment) for segment in segments]
+        corridors = tmp_path / "corridors.geojson"
+        corridors.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+        if config is None:
+            return str(corridors), {}
+        (tmp_path / "building_x_rooms.json").write_text(json.dumps(config))
+        return str(corridors), load_building_configs([str(tmp_path / "building_*_rooms.json")])
+
+    return build
+
+
 # Pytest configuration
 def pytest_configure(config):
     """Configure pytest with custom markers."""
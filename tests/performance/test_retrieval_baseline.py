@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Retrieval Baseline Regression Test
+==================================
+
+Runs the offline retrieval benchmark on the fixture embeddings and checks
+recall@k, MRR and memory against tests/performance/retrieval_baseline.json.
+Latency is machine dependent and is checked by scripts/benchmark_retrieval.py.
+"""
+
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from retrieval.benchmark import RetrievalFixture, run_benchmark, load_baseline, compare_to_baseline
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'retrieval')
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'retrieval_baseline.json')
+
+
+def test_retrieval_has_no_regressions():
+    """Quality and memory stay within the baseline thresholds"""
+    baseline = load_baseline(BASELINE_PATH)
+    results = run_benchmark(RetrievalFixture.load(FIXTURE_DIR), k=baseline["k"])
+
+    assert compare_to_baseline(results, baseline, check_latency=False) == []
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Alternative Routes Tests
+========================
+
+Tests the k shortest loopless paths (Yen's algorithm): ordering and
+looplessness, agreement with brute-force enumeration, the diversity
+constraint, and the cache invalidated by the graph version.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import AlternativeRoutes, CampusGraph, NavigationGraph, k_shortest_paths
+from navigation.alternatives import overlap_ratio
+
+STEP = 0.0001
+
+
+@pytest.fixture
+def campus():
+    """3x3 grid of corridor nodes X1_<row><col> on one floor, plus a long bypass 00 → 22"""
+    graph = NavigationGraph()
+    for row in range(3):
+        for col in range(3):
+            if col < 2:
+                graph.add_edge(f"X1_{row}{col}", f"X1_{row}{col + 1}", coordinates=[
+                    [col * STEP, row * STEP], [(col + 1) * STEP, row * STEP]])
+            if row < 2:
+                graph.add_edge(f"X1_{row}{col}", f"X1_{row + 1}{col}", coordinates=[
+                    [col * STEP, row * STEP], [col * STEP, (row + 1) * STEP]])
+    graph.add_edge("X1_00", "X1_22", weight=200.0)
+    return CampusGraph({"X1": graph})
+
+
+def _all_simple_paths(campus, source, target):
+    paths, stack = [], [[source]]
+    while stack:
+        path = stack.pop()
+        if path[-1] == target:
+            paths.append(path)
+            continue
+        for neighbor in campus.floors["X1"].neighbors(path[-1]):
+            if neighbor not in path:
+                stack.append(path + [neighbor])
+    return paths
+
+
+def test_k_shortest_paths_match_enumeration(campus):
+    """Test Yen's paths are the k shortest simple paths, loopless and in order"""
+    routes = k_shortest_paths(campus, "X1_00", "X1_22", k=8, max_overlap=1.0)
+    lengths = sorted(campus.path_length(path) for path in _all_simple_paths(campus, "X1_00", "X1_22"))
+
+    assert len(routes) == 8
+    assert [route["distance_m"] for route in routes] == pytest.approx(lengths[:8], abs=0.01)
+    assert routes[0]["path"] == campus.shortest_path("X1_00", "X1_22")[0]
+    assert len({tuple(route["path"]) for route in routes}) == 8
+    for route in routes:
+        assert len(set(route["path"])) == len(route["path"])
+        assert route["path"][0] == "X1_00" and route["path"][-1] == "X1_22"
+
+
+def test_diversity_constraint(campus):
+    """Test every alternative overlaps the shorter routes by at most max_overlap"""
+    routes = k_shortest_paths(campus, "X1_00", "X1_22", k=3, max_overlap=0.4)
+
+    assert len(routes) == 3
+    for i, route in enumerate(routes):
+        for shorter in routes[:i]:
+            assert overlap_ratio(campus, route["path"], shorter["path"]) <= 0.4
+
+    # Edge-disjoint routes only: the two grid borders, then the bypass
+    disjoint = k_shortest_paths(campus, "X1_00", "X1_22", k=3, max_overlap=0.0)
+    assert [set(route["path"]) & {"X1_01", "X1_10"} for route in disjoint[:2]] in (
+        [{"X1_10"}, {"X1_01"}], [{"X1_01"}, {"X1_10"}])
+    assert disjoint[2]["path"] == ["X1_00", "X1_22"]
+    assert k_shortest_paths(campus, "X1_00", "X1_00", k=3) == [{"path": ["X1_00"], "distance_m": 0.0, "cost": 0.0,
+                                                                 "overlap": 0.0}]
+    assert k_shortest_paths(campus, "X1_00", "missing") == []
+
+
+def test_cache_follows_graph_version(campus):
+    """Test results are cached and dropped when the graph revision changes"""
+    service = AlternativeRoutes(campus)
+    first = service.find("X1_00", "X1_22", 3)
+    assert service.find("X1_00", "X1_22", 3) is first
+    assert service.cache_info()["hits"] == 1
+
+    campus.revision += 1
+    assert service.find("X1_00", "X1_22", 3) is not first
+    assert service.cache_info()["size"] == 1
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Nearest Amenity Tests
+=====================
+
+Tests amenity tagging, query detection and the precomputed
+nearest-amenity fields (distances and routes per profile).
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import AmenityIndex, CampusGraph, detect_amenity, is_nearest_request, merge_building_configs
+from navigation.amenities import room_categories
+
+
+@pytest.fixture
+def campus(campus_sources):
+    """Floor X1 (X1_0 ... X1_6) and X2 (X2_0 ... X2_2), linked by stairs at X1_6 and an elevator at X1_0"""
+    corridors, configs = campus_sources({"X1": 7, "X2": 3}, {"Building X": {
+        "roomToNode": {"Bathroom-Men": "X1_1", "Bathroom-Accessible": "X1_5", "Outside-Exit_1": "X1_6",
+                       "Room_201": "X2_2", "Room_101": "X1_3"},
+        "roomDescriptions": {"Bathroom-Accessible": "Accessible Restroom", "Room_201": "Washroom 2"},
+        "transfers": [
+            {"id": "Stairs_A", "type": "stairs", "nodes": {"X1": "X1_6", "X2": "X2_2"}},
+            {"id": "Elevator-X", "type": "elevator", "nodes": {"X1": "X1_0", "X2": "X2_0"}},
+        ],
+    }})
+    graph = CampusGraph.from_sources([corridors], configs)
+    return AmenityIndex.from_config(graph, merge_building_configs(configs))
+
+
+def test_rooms_are_tagged_and_queries_detected():
+    assert room_categories("Bathroom-Men") == ["bathroom"]
+    assert room_categories("Bathroom-Accessible", "Accessible Restroom") == ["bathroom", "accessible_bathroom"]
+    assert room_categories("Outside-Exit_2", "Exit 2 - East Entrance") == ["exit", "entrance"]
+    assert room_categories("Room_1003", "Room 1003 - Computer Lab") == []
+
+    assert detect_amenity("where's the closest washroom?") == "bathroom"
+    assert detect_amenity("accessible toilet") == "accessible_bathroom"
+    assert is_nearest_request("nearest exit from 1003")
+    assert not is_nearest_request("how do I get to the exit from 1003")
+    assert not is_nearest_request("nearest room 1004")
+    assert not is_nearest_request("How many exits does building M have?")
+    assert not is_nearest_request("company lift")
+    assert is_nearest_request("Is there any washroom near me?")
+    assert is_nearest_request("elevador mais próximo")
+
+
+def test_nearest_matches_shortest_path(campus):
+    graph = campus.campus
+    assert set(campus.instances["bathroom"]) == {"X1_1", "X1_5", "X2_2"}
+
+    for node in graph.floor_of:
+        for profile in ("default", "step-free"):
+            result = campus.nearest(node, "bathroom", profile)
+            best = min(graph.shortest_path(node, target, profile)[1] for target in campus.instances["bathroom"])
+            assert result["distance_m"] == pytest.approx(best, abs=0.01)
+            assert result["path"][0] == node and result["path"][-1] == result["node"]
+
+
+def test_nearest_depends_on_profile(campus):
+    # From the end of floor 2 the stairs lead to the exit; step-free goes around through the elevator
+    default = campus.nearest("X2_2", "exit")
+    step_free = campus.nearest("X2_2", "exit", "step-free")
+    assert default["room"] == step_free["room"] == "Outside-Exit_1"
+    assert default["path"] == ["X2_2", "X1_6"]
+    assert "X1_0" in step_free["path"] and step_free["distance_m"] > default["distance_m"]
+
+    assert campus.nearest("X1_2", "elevator") is None  # no elevator room is mapped
+    assert campus.nearest("X1_4", "accessible_bathroom")["room"] == "Bathroom-Accessible"
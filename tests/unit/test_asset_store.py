@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Asset Store Tests
+=================
+
+Tests the content-hashed static asset manifest: incremental rebuilds,
+precompressed variants, Accept-Encoding negotiation and versioned URLs.
+"""
+
+import sys
+import os
+import gzip
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from assets import AssetStore, choose_encoding, file_hash, parse_accept_encoding
+
+SCRIPT = ("function route() { return 'corridor'; }\n" * 100).encode("utf-8")
+
+
+def _store(tmp_path):
+    root = tmp_path / "static"
+    (root / "Floorplans" / "Building M").mkdir(parents=True)
+    (root / "script.js").write_bytes(SCRIPT)
+    (root / "tiny.css").write_text("body{}")
+    (root / "logo.png").write_bytes(os.urandom(4096))
+    (root / "Floorplans" / "Building M" / "M1.svg").write_text("<svg>" + "<path d='M 0,0 h 10'/>" * 200 + "</svg>")
+    return AssetStore({"static": str(root)}, str(tmp_path / "cache"))
+
+
+def test_build_hashes_and_precompresses_text_assets(tmp_path):
+    """Text assets over the size threshold get a gzip variant; binaries and tiny files do not"""
+    store = _store(tmp_path)
+    stats = store.build()
+
+    assert stats["files"] == 4 and stats["changed"] == 4 and stats["compressed"] == 2
+    entry = store.entry("static", "script.js")
+    assert entry["hash"] == file_hash(entry["path"]) and len(entry["hash"]) == 16
+    assert "gzip" in entry["encodings"] and entry["encodings"]["gzip"] < len(SCRIPT)
+    assert store.entry("static", "logo.png")["encodings"] == {}
+    assert store.entry("static", "tiny.css")["encodings"] == {}
+
+    path, encoding = store.variant(entry, "gzip, deflate")
+    assert encoding == "gzip" and gzip.decompress(open(path, "rb").read()) == SCRIPT
+    assert store.variant(entry, "identity") == (entry["path"], None)
+    assert store.etag(entry, "gzip") == f"{entry['hash']}-gzip" != store.etag(entry, None)
+
+
+def test_rebuild_is_incremental_and_tracks_changes(tmp_path):
+    """Unchanged files are reused from the saved manifest; edits get a new hash"""
+    store = _store(tmp_path)
+    store.build()
+    before = store.entry("static", "script.js")["hash"]
+
+    reloaded = AssetStore(store.roots, store.cache_dir)
+    assert reloaded.build()["changed"] == 0
+
+    (tmp_path / "static" / "script.js").write_bytes(SCRIPT + b"// edited\n")
+    after = reloaded.entry("static", "script.js")
+    assert after["hash"] != before
+    assert reloaded.build()["changed"] == 0
+
+
+def test_versioned_urls_and_path_safety(tmp_path):
+    """URLs embed the content hash and are quoted; unknown or escaping paths are rejected"""
+    store = _store(tmp_path)
+    store.build()
+
+    digest = store.entry("static", "Floorplans/Building M/M1.svg")["hash"]
+    assert store.url("static/Floorplans/Building M/M1.svg") == f"/assets/{digest}/static/Floorplans/Building%20M/M1.svg"
+    assert store.url("static/missing.js") == "/static/missing.js"
+    assert store.entry("static", "../cache/manifest.json") is None
+    assert store.entry("other", "script.js") is None
+
+
+def test_accept_encoding_negotiation():
+    """Brotli is preferred over gzip; q=0 and missing codings are honored"""
+    assert parse_accept_encoding("gzip;q=0.5, br") == {"gzip": 0.5, "br": 1.0}
+    assert choose_encoding(["gzip", "br"], "gzip, deflate, br") == "br"
+    assert choose_encoding(["gzip"], "gzip, deflate, br") == "gzip"
+    assert choose_encoding(["gzip", "br"], "br;q=0, gzip") == "gzip"
+    assert choose_encoding(["gzip"], "*") == "gzip"
+    assert choose_encoding(["gzip"], "") is None
+    assert choose_encoding(["gzip"], "*, gzip;q=0") is None
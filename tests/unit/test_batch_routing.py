@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Batch Routing Tests
+===================
+
+Tests batch route computation: single-source searches shared by the
+routes of a group, agreement with the point-to-point search, and
+per-route errors.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import CampusGraph, route_batch
+
+
+@pytest.fixture
+def campus(campus_sources):
+    """Two floors of building X (4-node corridors) linked by stairs and an elevator"""
+    corridors, configs = campus_sources({"X1": 4, "X2": 4}, {"Building X": {
+        "roomToNode": {"Room_101": "X1_0", "Room_203": "X2_3"},
+        "transfers": [
+            {"id": "Stairs_A", "type": "stairs", "nodes": {"X1": "X1_3", "X2": "X2_3"}},
+            {"id": "Elevator-X", "type": "elevator", "nodes": {"X1": "X1_0", "X2": "X2_0"}},
+        ],
+    }})
+    return CampusGraph.from_sources([corridors], configs)
+
+
+def test_batch_matches_point_to_point_routes(campus):
+    nodes = sorted(campus.floor_of)
+    items = [[a, b, profile] for profile in ("default", "step-free") for a in nodes for b in nodes]
+    results = list(route_batch(campus, items))
+
+    assert sorted(r["index"] for r in results) == list(range(len(items)))
+    for result in results:
+        start, end, profile = items[result["index"]]
+        _, distance = campus.shortest_path(start, end, profile)
+        assert result["distance_m"] == pytest.approx(distance, abs=0.01)
+        assert result["path"][0] == start and result["path"][-1] == end
+
+
+def test_routes_are_grouped_by_source_and_profile(campus, monkeypatch):
+    calls = []
+    original = campus.shortest_paths
+    monkeypatch.setattr(campus, "shortest_paths",
+                        lambda source, targets, profile: calls.append((source, profile)) or original(source, targets, profile))
+
+    items = [{"start": "Room_101", "end": end} for end in ("X1_2", "X2_1", "Room_203")]
+    items += [{"start": "Room_101", "end": "X2_2", "profile": "step-free"}, ["X2_3", "X1_1"]]
+    results = list(route_batch(campus, items))
+
+    assert sorted(calls) == [("X1_0", "default"), ("X1_0", "step-free"), ("X2_3", "default")]
+    step_free = next(r for r in results if r["index"] == 3)
+    assert "X2_0" in step_free["path"]  # elevator, not the stairs
+
+
+def test_batch_reports_errors_per_route(campus):
+    items = [{"start": "Room_101"}, ["Room_101", "Room_999"], ["Room_101", "X1_1", "jetpack"],
+             ["Room_101", "Room_203"], ["bathroom", "Room_101"]]
+    results = {r["index"]: r for r in route_batch(campus, items, resolve_name=lambda name: None)}
+
+    assert results[0]["error"] == "start and end required"
+    assert results[1]["error"] == "Unknown location: Room_999"
+    assert "Unknown routing profile" in results[2]["error"]
+    assert results[3]["path"][-1] == "X2_3"
+    assert "error" in results[4]
+
+    resolved = list(route_batch(campus, [["bathroom", "X1_1"]], resolve_name=lambda name: "Room_101"))
+    assert resolved[0]["path"] == ["X1_0", "X1_1"]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Campus Graph Tests
+==================
+
+Tests the hierarchical campus graph: per-floor subgraphs, typed transfer
+edges (stairs, elevators, building connections) and the floor-level
+overlay search.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import CampusGraph, merge_building_configs
+from navigation.campus import STAIRS_COST_M_PER_FLOOR
+
+STEP = 0.0001  # ~11 m of longitude at the equator
+
+
+def _write_campus(campus_sources, tmp_path):
+    """Two floors of building X (a corridor of 4 nodes each) and building Y floor 1"""
+    corridors, configs = campus_sources({"X1": 4, "X2": 4}, {"Building X": {
+        "roomToNode": {"Room_101": "X1_0", "Room_201": "X2_3"},
+        "aliases": {"101": "Room_101"},
+        "transfers": [
+            {"id": "Stairs_A", "type": "stairs", "nodes": {"X1": "X1_3", "X2": "X2_3"}},
+            {"id": "Elevator-X", "type": "elevator", "nodes": {"X1": "X1_0", "X2": "X2_0", "X3": "X3_0"}},
+            {"id": "Bridge", "type": "building_connection", "nodes": {"X1": "X1_3", "Y1": "Y1_0"}},
+        ],
+    }}, segments=[("Y1_0", "Y1_1", [[1.0, 1.0], [1.0 + STEP, 1.0]])])
+    return CampusGraph.from_sources([corridors], configs, str(tmp_path / "tables"), "v1")
+
+
+def test_floors_are_split_by_node_prefix(campus_sources, tmp_path):
+    """Each building floor becomes its own subgraph"""
+    campus = _write_campus(campus_sources, tmp_path)
+
+    assert sorted(campus.floors) == ["X1", "X2", "Y1"]
+    assert campus.node_location("X2_1") == {"building": "X", "floor": 2}
+    assert campus.node_location("Z3_9") == {"building": "Z", "floor": 3}  # not traced yet
+    # The elevator's X3 stop is not mapped, so only X1-X2 is linked
+    assert sorted(campus.transfers["X1_0"]) == ["X2_0"]
+
+
+def test_cross_floor_route_uses_cheapest_transfer(campus_sources, tmp_path):
+    """The route to the far end of floor 2 takes the stairs at that end"""
+    campus = _write_campus(campus_sources, tmp_path)
+    route = campus.route("Room_101", "Room_201")
+
+    assert route["path"] == ["X1_0", "X1_1", "X1_2", "X1_3", "X2_3"]
+    assert route["transfers"] == [{"type": "stairs", "id": "Stairs_A", "from": "X1_3", "to": "X2_3"}]
+    assert [(leg["building"], leg["floor"]) for leg in route["legs"]] == [("X", 1), ("X", 2)]
+    assert route["distance_m"] == pytest.approx(3 * 11.12 + STAIRS_COST_M_PER_FLOOR, abs=0.1)
+    assert (route["endBuilding"], route["endFloor"]) == ("X", 2)
+
+
+def test_cross_building_route_and_same_floor_route(campus_sources, tmp_path):
+    """Building connections link floors of different buildings"""
+    campus = _write_campus(campus_sources, tmp_path)
+
+    across = campus.route("X2_0", "Y1_1")
+    assert across["path"][-2:] == ["Y1_0", "Y1_1"]
+    # Walking floor 2 and taking the stairs beats the elevator wait
+    assert [t["id"] for t in across["transfers"]] == ["Stairs_A", "Bridge"]
+
+    same_floor = campus.route("X1_1", "X1_2")
+    assert same_floor["path"] == ["X1_1", "X1_2"] and same_floor["transfers"] == []
+    assert campus.route("X1_0", "Nowhere") is None
+
+
+def test_merge_building_configs_records_room_building():
+    """Merged view keeps the building of every room"""
+    merged = merge_building_configs({
+        "M": {"roomToNode": {"Room_1003": "M1_6"}, "aliases": {"1003": "Room_1003"}},
+        "H": {"roomToNode": {"Room_H101": "H1_2", "Room_1003": "H1_9"}},
+    })
+
+    assert merged["roomBuilding"] == {"Room_1003": "M", "Room_H101": "H"}
+    assert merged["roomToNode"]["Room_1003"] == "M1_6"
+    assert merged["aliases"] == {"1003": "Room_1003"}
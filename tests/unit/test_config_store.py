@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Building Config Store Tests
+===========================
+
+Tests the versioned building config store: copy-on-write snapshots,
+atomic persistence, optimistic version checks, subscribers and
+concurrent writers.
+"""
+
+import sys
+import os
+import json
+import threading
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import BuildingConfigStore, ConfigVersionConflict
+
+
+def _write_configs(tmp_path):
+    (tmp_path / "building_m_rooms.json").write_text(json.dumps({"Building M": {
+        "roomToNode": {"Room_M1001": "M1_1"},
+        "roomCentersSVG": {"_comment": "manual overrides", "Room_M1001": {"x": 1, "y": 2}},
+        "transfers": [],
+    }}, indent=2))
+    (tmp_path / "building_h_rooms.json").write_text(json.dumps({"Building H": {
+        "roomToNode": {"Room_H101": "H1_1"},
+    }}, indent=2))
+    return [str(tmp_path / "building_*_rooms.json")]
+
+
+def test_updates_publish_new_snapshots_and_persist(tmp_path):
+    """Writers never mutate a published snapshot; the file holds the new data"""
+    store = BuildingConfigStore(_write_configs(tmp_path))
+    before = store.snapshot()
+
+    after = store.update_room_centers({"Room_M1001": {"x": 10, "y": 20}, "Room_H101": {"x": 3, "y": 4},
+                                       "Room_New": {"x": 5, "y": 6}})
+
+    assert (before.version, after.version, store.version) == (1, 2, 2)
+    assert before.merged["roomCentersSVG"]["Room_M1001"] == {"x": 1, "y": 2}
+    assert after.merged["roomCentersSVG"]["Room_M1001"] == {"x": 10, "y": 20}
+    # Unknown rooms go to the first building (files load in sorted order: H, then M)
+    assert after.configs["H"]["roomCentersSVG"] == {"Room_H101": {"x": 3, "y": 4}, "Room_New": {"x": 5, "y": 6}}
+
+    saved = json.loads((tmp_path / "building_m_rooms.json").read_text())["Building M"]
+    assert saved["roomCentersSVG"] == {"_comment": "manual overrides", "Room_M1001": {"x": 10, "y": 20}}
+    assert "_source" not in saved
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_expected_version_conflicts_and_reload(tmp_path):
+    """Stale writers are rejected; reload picks up hand edits"""
+    store = BuildingConfigStore(_write_configs(tmp_path))
+    store.update_room_centers({"Room_M1001": {"x": 10, "y": 20}}, expected_version=1)
+
+    with pytest.raises(ConfigVersionConflict):
+        store.update_room_centers({"Room_M1001": {"x": 0, "y": 0}}, expected_version=1)
+    assert store.snapshot().merged["roomCentersSVG"]["Room_M1001"] == {"x": 10, "y": 20}
+
+    path = tmp_path / "building_h_rooms.json"
+    path.write_text(json.dumps({"Building H": {"roomToNode": {"Room_H101": "H1_2"}}}))
+    snapshot = store.reload()
+    assert snapshot.version == 3 and snapshot.merged["roomToNode"]["Room_H101"] == "H1_2"
+
+    with pytest.raises(KeyError):
+        store.update({"X": lambda section: None})
+
+
+def test_subscribers_receive_previous_and_new_snapshot(tmp_path):
+    """Subscribers see which keys changed; a failing subscriber does not block the others"""
+    store = BuildingConfigStore(_write_configs(tmp_path))
+    seen = []
+
+    def failing(previous, snapshot):
+        raise RuntimeError("boom")
+
+    store.subscribe(failing)
+    unsubscribe = store.subscribe(lambda previous, snapshot: seen.append(
+        (previous.version, snapshot.version, previous.changed_keys(snapshot))))
+
+    store.update_room_centers({"Room_M1001": {"x": 10, "y": 20}})
+    store.update({"H": lambda section: section["roomToNode"].update({"Room_H102": "H1_3"})})
+    unsubscribe()
+    store.reload()
+
+    assert seen == [(1, 2, {"roomCentersSVG"}), (2, 3, {"roomToNode"})]
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    """Serialized writers each get their own version and all rooms are saved"""
+    store = BuildingConfigStore(_write_configs(tmp_path))
+    threads = [threading.Thread(target=store.update_room_centers, args=({f"Room_N{i}": {"x": i, "y": i}},))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.version == 21
+    saved = json.loads((tmp_path / "building_h_rooms.json").read_text())["Building H"]["roomCentersSVG"]
+    assert all(saved[f"Room_N{i}"] == {"x": i, "y": i} for i in range(20))
+    assert BuildingConfigStore(store.paths).snapshot().configs["H"]["roomCentersSVG"] == saved
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Dynamic Graph Edit Tests
+========================
+
+Tests runtime graph edits and closures: repaired route tables match a full
+rebuild after every kind of change, only the affected columns are
+recomputed, closures expire, and cached queries follow the graph version.
+"""
+
+import sys
+import os
+import random
+import time
+
+import numpy as np
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import (AlternativeRoutes, CampusGraph, GraphEditor, NavigationGraph, RouteTables,
+                        ROUTING_PROFILES)
+
+STEP = 0.0001
+
+
+def _grid_campus(size=4):
+    """size x size grid of corridor nodes X1_<row><col> with route tables for every profile"""
+    graph = NavigationGraph()
+    for row in range(size):
+        for col in range(size):
+            if col < size - 1:
+                graph.add_edge(f"X1_{row}{col}", f"X1_{row}{col + 1}",
+                               coordinates=[[col * STEP, row * STEP], [(col + 1) * STEP, row * STEP]])
+            if row < size - 1:
+                graph.add_edge(f"X1_{row}{col}", f"X1_{row + 1}{col}",
+                               coordinates=[[col * STEP, row * STEP], [col * STEP, (row + 1) * STEP]],
+                               segmentType="stairs" if col == 0 else "corridor")
+    tables = {profile: {"X1": RouteTables.build(graph, profile=profile)} for profile in ROUTING_PROFILES}
+    return CampusGraph({"X1": graph}, {"Room_A": "X1_00"}, tables)
+
+
+def _assert_tables_match_rebuild(campus):
+    graph = campus.floors["X1"]
+    for profile, engines in campus.engines.items():
+        tables = engines["X1"].tables
+        rebuilt = RouteTables.build(graph, profile=profile)
+        assert tables.node_ids == rebuilt.node_ids
+        np.testing.assert_allclose(tables.distances, rebuilt.distances, rtol=1e-5)
+        for source in tables.node_ids:
+            for target in tables.node_ids:
+                path = tables.path(source, target)
+                if path is None:
+                    assert rebuilt.distance(source, target) == float("inf")
+                else:
+                    assert campus.path_length(path, profile) == pytest.approx(rebuilt.distance(source, target),
+                                                                              rel=1e-5)
+
+
+def test_random_edits_match_full_rebuild():
+    """Test the incrementally repaired tables equal rebuilt ones after random edits"""
+    campus = _grid_campus()
+    editor = GraphEditor(campus)
+    rng = random.Random(5)
+    nodes = sorted(campus.floor_of)
+
+    for _ in range(25):
+        edges = [(a, b) for a in nodes for b in campus.floors["X1"].neighbors(a) if a < b]
+        action = rng.choice(["reweight", "remove", "add", "close"])
+        a, b = rng.choice(edges)
+        if action == "reweight":
+            editor.set_weight(a, b, rng.uniform(1, 40))
+        elif action == "remove":
+            editor.remove_edge(a, b)
+        elif action == "add":
+            a, b = rng.sample(nodes, 2)
+            editor.add_edge(a, b, weight=rng.uniform(1, 40))
+        else:
+            editor.close(a, b, time.time() + 60)
+        _assert_tables_match_rebuild(campus)
+
+    for closure in editor.active_closures():
+        editor.reopen(closure["id"])
+    assert not any(edge.get("closed") for neighbors in campus.floors["X1"].adjacency.values()
+                   for edge in neighbors.values())
+    _assert_tables_match_rebuild(campus)
+
+
+def test_only_affected_columns_are_recomputed():
+    """Test an edge no tree uses recomputes nothing and a new node rebuilds the floor"""
+    campus = _grid_campus()
+    editor = GraphEditor(campus)
+
+    # Once the detour is shorter no tree uses the edge: making it longer again recomputes nothing
+    result = editor.set_weight("X1_32", "X1_33", 50.0)
+    assert 0 < result["columnsRecomputed"] <= 16 * len(ROUTING_PROFILES)
+    assert result["version"] == campus.version and campus.revision == 1
+    assert editor.set_weight("X1_32", "X1_33", 60.0)["columnsRecomputed"] == 0
+    assert editor.set_weight("X1_32", "X1_33", 1.0)["columnsRecomputed"] > 0
+    _assert_tables_match_rebuild(campus)
+
+    result = editor.add_edge("X1_33", "X1_new", coordinates=[[3 * STEP, 3 * STEP], [4 * STEP, 3 * STEP]])
+    assert "X1_new" in campus.engines["default"]["X1"].tables
+    assert campus.shortest_path("X1_00", "X1_new")[0][-2:] == ["X1_33", "X1_new"]
+    _assert_tables_match_rebuild(campus)
+
+    with pytest.raises(ValueError):
+        editor.set_weight("X1_00", "X1_33", 1.0)
+    with pytest.raises(ValueError):
+        editor.add_edge("Y1_1", "Y1_2", weight=1.0)
+
+
+def test_invalid_weights_coordinates_and_times_change_nothing():
+    """Test negative or non-finite weights, malformed coordinates and endless closures are rejected"""
+    campus = _grid_campus(3)
+    editor = GraphEditor(campus)
+    bad_edits = [
+        lambda: editor.add_edge("X1_00", "X1_22", weight=-100.0),
+        lambda: editor.add_edge("X1_00", "X1_22", weight=float("nan")),
+        lambda: editor.add_edge("X1_00", "X1_new", coordinates="ab"),
+        lambda: editor.add_edge("X1_00", "X1_new", coordinates=[[1]]),
+        lambda: editor.add_edge("X1_00", "X1_new", coordinates=[[0, 0], ["a", 1]]),
+        lambda: editor.set_weight("X1_00", "X1_01", float("nan")),
+        lambda: editor.set_weight("X1_00", "X1_01", float("inf")),
+        lambda: editor.close("X1_00", "X1_01", float("nan")),
+        lambda: campus.floors["X1"].add_edge("X1_00", "X1_22", weight=-1.0),
+    ]
+    for edit in bad_edits:
+        with pytest.raises(ValueError):
+            edit()
+
+    assert campus.revision == 0 and "X1_new" not in campus
+    assert campus.edge("X1_00", "X1_22") is None and editor.active_closures() == []
+    _assert_tables_match_rebuild(campus)
+
+
+def test_closures_expire_and_invalidate_caches():
+    """Test a closure reroutes, expires on time, and drops cached alternative routes"""
+    campus = _grid_campus(3)
+    editor = GraphEditor(campus)
+    alternatives = AlternativeRoutes(campus)
+    before = alternatives.find("X1_00", "X1_02", 1)[0]
+    assert before["path"] == ["X1_00", "X1_01", "X1_02"]
+
+    closure = editor.close("X1_00", "X1_01", time.time() + 3600, "Event setup")
+    assert campus.shortest_path("X1_00", "X1_02")[0] == ["X1_00", "X1_10", "X1_11", "X1_12", "X1_02"]
+    assert alternatives.find("X1_00", "X1_02", 1)[0]["path"][1] == "X1_10"
+    assert campus.shortest_path("X1_00", "X1_01", "step-free")[0] is None  # stairs and the closure
+
+    # Closures survive a rebuilt graph, and reopen when they expire
+    rebuilt = _grid_campus(3)
+    carried = GraphEditor(rebuilt, editor.active_closures())
+    assert [c["id"] for c in carried.active_closures()] == [closure["id"]]
+    assert carried.expire_closures(closure["until"] + 1)[0]["id"] == closure["id"]
+    assert rebuilt.shortest_path("X1_00", "X1_02")[0] == ["X1_00", "X1_01", "X1_02"]
+    assert editor.expire_closures() == []
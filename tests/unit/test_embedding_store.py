@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Embedding Store Tests
+=====================
+
+Tests the float16/int8 quantized embedding store and its full-precision
+rescoring.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from retrieval.embedding_store import EmbeddingStore, quantize_int8, benchmark_embedding_store
+
+
+def _vectors(count=300, dimension=64, seed=1):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dimension))
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_int8_quantization_roundtrip():
+    """Per-vector scales keep the reconstruction error small"""
+    vectors = _vectors()
+    codes, scales = quantize_int8(vectors)
+    assert codes.dtype == np.int8
+    assert np.abs(codes * scales[:, None] - vectors).max() < 0.01
+
+
+@pytest.mark.parametrize("mode", ["float16", "int8"])
+def test_rescored_search_matches_exact(mode):
+    """Rescored results equal exact float32 search"""
+    vectors = _vectors()
+    ids = [f"img_{i}" for i in range(len(vectors))]
+    exact = EmbeddingStore(mode="float32").build(ids, vectors)
+    store = EmbeddingStore(mode=mode).build(ids, vectors)
+
+    for query in vectors[:20]:
+        expected = exact.search(query, top_n=5)
+        found = store.search(query, top_n=5)
+        assert [i for i, _ in found] == [i for i, _ in expected]
+        assert found[0][1] == pytest.approx(expected[0][1], abs=1e-5)
+
+
+def test_quantized_modes_use_less_memory():
+    """int8 < float16 < float32 for the search matrix"""
+    vectors = _vectors()
+    ids = list(range(len(vectors)))
+    memory = {mode: EmbeddingStore(mode=mode).build(ids, vectors).memory_bytes()["index"]
+              for mode in ("float32", "float16", "int8")}
+    assert memory["int8"] < memory["float16"] < memory["float32"]
+
+    # The rescoring vectors of the reduced modes live on disk, not in RAM
+    store = EmbeddingStore(mode="int8").build(ids, vectors)
+    assert isinstance(store.vectors, np.memmap)
+    assert store.memory_bytes() == {"index": memory["int8"], "on_disk": vectors.size * 4}
+
+
+def test_invalid_mode_and_empty_store():
+    """Unknown modes are rejected and empty stores return nothing"""
+    with pytest.raises(ValueError):
+        EmbeddingStore(mode="int4")
+    assert EmbeddingStore().search([0.1, 0.2]) == []
+
+
+def test_benchmark_reports_recall():
+    """The benchmark reports recall@k per mode and dimension"""
+    rows = benchmark_embedding_store(dimensions=(32,), num_vectors=200, num_queries=10, top_k=5)
+    assert {row["mode"] for row in rows} == {"float32", "float16", "int8"}
+    assert all(row["recall@5"] >= 0.8 for row in rows if row["rescore"])
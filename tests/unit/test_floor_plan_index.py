@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Floor Plan Index Tests
+======================
+
+Tests the server-side floor plan preprocessing: room shapes selected by
+prefix or room mapping, manual center overrides, node positions and the
+content version.
+"""
+
+import sys
+import os
+import json
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import build_floor_plan_index
+
+SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 100 100">
+  <g transform="translate(10,0)">
+    <path id="Room_A" d="m 0,0 h 40 v 40 h -40 z" />
+  </g>
+  <rect id="Elevator-X" x="50" y="50" width="20" height="40" />
+  <rect id="Furniture_1" x="80" y="0" width="10" height="10" />
+  <ellipse id="X1_1" cx="5" cy="5" rx="1" ry="1" />
+</svg>"""
+
+OUTLINE = {"type": "FeatureCollection", "features": [
+    {"type": "Feature", "properties": {"name": "Building X"},
+     "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}}]}
+
+
+def _build(tmp_path, overrides=None):
+    (tmp_path / "plan.svg").write_text(SVG)
+    (tmp_path / "campus.geojson").write_text(json.dumps(OUTLINE))
+    configs = {"X": {"_name": "Building X", "roomToNode": {"Elevator-X": "X1_1"},
+                     "roomCentersSVG": overrides or {}, "floorPlans": {"X1": {"svg": "plan.svg"}}}}
+    return build_floor_plan_index(configs, str(tmp_path / "campus.geojson"), str(tmp_path))
+
+
+def test_rooms_nodes_and_centers(tmp_path):
+    plan = _build(tmp_path)["floors"]["X1"]
+
+    assert sorted(plan["rooms"]) == ["Elevator-X", "Room_A"]  # Furniture_1 is neither mapped nor Room_/Door_
+    room = plan["rooms"]["Room_A"]
+    assert room["bbox"] == [10, 0, 50, 40]  # parent transform applied
+    assert room["center"] == [30, 20] and room["centroid"] == pytest.approx([30, 20])
+    assert room["manual"] is False
+    # viewBox (0, 0) is the north-west corner of the outline
+    assert room["latlng"] == pytest.approx([1 - 0.2, 0.3])
+    assert plan["nodes"]["X1_1"] == {"svg": [5, 5], "latlng": pytest.approx([0.95, 0.05])}
+
+
+def test_manual_overrides_and_version(tmp_path):
+    index = _build(tmp_path)
+    overridden = _build(tmp_path, {"Room_A": {"x": 20, "y": 30}, "Room_Z": {"x": 1, "y": 2}, "_comment": "x"})
+
+    room = overridden["floors"]["X1"]["rooms"]["Room_A"]
+    assert room["center"] == [20, 30] and room["manual"] is True
+    assert room["bbox"] == [10, 0, 50, 40]
+    assert overridden["floors"]["X1"]["rooms"]["Room_Z"]["center"] == [1, 2]  # not in the SVG
+    assert "_comment" not in overridden["floors"]["X1"]["rooms"]
+
+    assert overridden["version"] != index["version"]
+    assert _build(tmp_path)["version"] == index["version"]
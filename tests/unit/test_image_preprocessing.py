@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Image Preprocessing Tests
+=========================
+
+Tests the normalization of images before multimodal API calls and the
+derivative cache keyed by source hash and parameters.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from ingestion.image_preprocessing import ImageDerivativeCache, MODEL_IMAGE_PROFILES, PIL_AVAILABLE
+
+pytestmark = pytest.mark.skipif(not PIL_AVAILABLE, reason="Pillow not installed")
+
+
+def _make_plan(path, size=(3000, 2000)):
+    from PIL import Image
+    Image.new("RGBA", size, (255, 255, 255, 0)).save(path)
+
+
+def test_derivative_is_downsized_and_cached(tmp_path):
+    """Large scans are downsized once and reused on later calls"""
+    from PIL import Image
+
+    source = tmp_path / "keyplan.png"
+    _make_plan(source)
+    cache = ImageDerivativeCache(str(tmp_path / "cache"))
+
+    derivative = cache.derivative_path(str(source), "embedding")
+    with Image.open(derivative) as image:
+        assert max(image.size) == MODEL_IMAGE_PROFILES["embedding"]["max_dimension"]
+        assert image.mode == "RGB"
+
+    mtime = os.path.getmtime(derivative)
+    assert cache.derivative_path(str(source), "embedding") == derivative
+    assert os.path.getmtime(derivative) == mtime
+
+
+def test_profiles_use_separate_derivatives(tmp_path):
+    """Each profile gets its own cached file"""
+    source = tmp_path / "keyplan.png"
+    _make_plan(source)
+    cache = ImageDerivativeCache(str(tmp_path / "cache"))
+
+    assert cache.derivative_path(str(source), "embedding") != cache.derivative_path(str(source), "description")
+
+
+def test_report_tracks_bytes_and_latency(tmp_path):
+    """The report lists bytes saved and upload latency per image"""
+    source = tmp_path / "keyplan.png"
+    _make_plan(source)
+    cache = ImageDerivativeCache(str(tmp_path / "cache"))
+
+    cache.derivative_path(str(source), "embedding")
+    cache.record_upload(str(source), "embedding", 0.25)
+
+    entry = cache.get_report()[0]
+    assert entry["bytes_saved"] == entry["source_bytes"] - entry["derivative_bytes"]
+    assert entry["uploads"] == 1
+    assert entry["avg_upload_seconds"] == pytest.approx(0.25)
+
+
+def test_small_sources_are_kept_when_smaller(tmp_path):
+    """A compact source that already fits is uploaded as is, never reported as a loss"""
+    source = tmp_path / "icon.png"
+    _make_plan(source, (200, 100))
+    cache = ImageDerivativeCache(str(tmp_path / "cache"))
+
+    assert cache.derivative_path(str(source), "embedding") == str(source)
+    assert cache.get_report()[0]["bytes_saved"] == 0
+
+
+def test_non_local_uris_are_passed_through(tmp_path):
+    """Remote URIs and disabled caches return the original path"""
+    cache = ImageDerivativeCache(str(tmp_path / "cache"))
+    assert cache.derivative_path("gs://bucket/plan.png") == "gs://bucket/plan.png"
+
+    disabled = ImageDerivativeCache(str(tmp_path / "cache"), enabled=False)
+    source = tmp_path / "keyplan.png"
+    _make_plan(source, (100, 100))
+    assert disabled.derivative_path(str(source)) == str(source)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Isochrone Tests
+===============
+
+Tests the walk-time isochrones: segments cut where the time budget runs
+out, nested bands that do not overlap, reachable rooms, and the cached
+bounded shortest-path trees.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import CampusGraph, IsochroneService, NavigationGraph, linestring_length_m
+from navigation.isochrones import reachable_fractions, subtract_intervals
+
+
+@pytest.fixture
+def campus():
+    """Straight corridor X1_0 … X1_5, 60 m per segment, walked at 1 m/s in the tests"""
+    graph = NavigationGraph()
+    for i in range(5):
+        graph.add_edge(f"X1_{i}", f"X1_{i + 1}", weight=60.0,
+                       coordinates=[[i * 0.001, 0.0], [(i + 1) * 0.001, 0.0]])
+    return CampusGraph({"X1": graph}, {"Room_A": "X1_1", "Room_B": "X1_4"})
+
+
+def test_reachable_fractions():
+    """Test an edge is cut from either end and merged when both ends meet"""
+    assert reachable_fractions(0, 100, 100, 30) == [(0.0, 0.3)]
+    assert reachable_fractions(float("inf"), 10, 100, 30) == [(pytest.approx(0.8), 1.0)]
+    assert reachable_fractions(20, 25, 100, 30) == [(0.0, 0.1), (pytest.approx(0.95), 1.0)]
+    assert reachable_fractions(20, 40, 100, 90) == [(0.0, 1.0)]
+    assert subtract_intervals([(0.0, 1.0)], [(0.0, 0.3), (0.8, 1.0)]) == [(0.3, 0.8)]
+
+
+def test_bands_cover_the_walkable_length(campus):
+    """Test each band covers exactly the corridor length walkable in its time range"""
+    service = IsochroneService(campus, speed_m_per_s=1.0)
+    result = service.isochrone("X1_0", [90, 150])
+
+    bands = {feature["properties"]["band"]: feature for feature in result["features"]}
+    lengths = {band: sum(linestring_length_m(line) for line in feature["geometry"]["coordinates"])
+               for band, feature in bands.items()}
+    meters_per_unit = linestring_length_m([[0, 0], [0.001, 0]]) / 60  # geometry vs weight scale
+    assert lengths[0] == pytest.approx(90 * meters_per_unit, rel=1e-6)
+    assert lengths[1] == pytest.approx(60 * meters_per_unit, rel=1e-6)
+    assert bands[1]["properties"] == {"band": 1, "minSeconds": 90.0, "maxSeconds": 150.0,
+                                      "building": "X", "floor": 1}
+    assert result["rooms"] == [{"room": "Room_A", "node": "X1_1", "seconds": 60.0}]
+
+
+def test_trees_are_bounded_and_cached(campus):
+    """Test the search stops at the largest threshold and trees are reused until the graph changes"""
+    service = IsochroneService(campus, speed_m_per_s=1.0)
+    assert set(service.distances("X1_0", max_distance=130)) == {"X1_0", "X1_1", "X1_2"}
+
+    service.isochrone("X1_0", [60, 120])
+    assert service.cache_info()["hits"] == 1
+
+    # A larger threshold needs a deeper search, a graph change drops the trees
+    assert len(service.isochrone("X1_0", [300])["rooms"]) == 2
+    assert service.cache_info()["misses"] == 2
+    campus.revision += 1
+    service.isochrone("X1_0", [60])
+    assert service.cache_info()["misses"] == 3
+
+
+def test_times_are_walking_meters_not_profile_cost(campus):
+    """Test a penalized stairs segment slows no one down, it only changes the route choice"""
+    campus.floors["X1"].edge("X1_1", "X1_2")["segmentType"] = "stairs"  # ×4 under elevator-preferred
+    service = IsochroneService(campus, speed_m_per_s=1.0)
+
+    default = service.isochrone("X1_0", [300])
+    preferred = service.isochrone("X1_0", [300], "elevator-preferred")
+    assert preferred["rooms"] == default["rooms"] == [{"room": "Room_A", "node": "X1_1", "seconds": 60.0},
+                                                      {"room": "Room_B", "node": "X1_4", "seconds": 240.0}]
+    assert service.distances("X1_0", "elevator-preferred", 300)["X1_5"] == 300.0
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Lexical Retrieval Tests
+=======================
+
+Tests the BM25 index, Reciprocal Rank Fusion and the hybrid ranking
+used by the image search.
+"""
+
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from retrieval.lexical_index import (BM25Index, extract_room_numbers, hybrid_search, reciprocal_rank_fusion,
+                                     tokenize)
+
+
+DESCRIPTIONS = [
+    ("images/M1.png", "Floor plan of Building M. Room 1003 computer lab is next to the elevator. Corridor 1063-C."),
+    ("images/M2.png", "Second floor plan with rooms 2001 and 2037 along the main corridor."),
+    ("images/A1.png", "Building A first floor: cafeteria, stairs and main entrance."),
+]
+
+
+def test_tokenize_keeps_hyphenated_room_numbers():
+    """Hyphenated tokens are kept whole and split into parts"""
+    tokens = tokenize("Corridor 1063-C near the stairs")
+    assert "1063-c" in tokens
+    assert "1063" in tokens
+    assert "the" not in tokens
+
+
+def test_extract_room_numbers():
+    """Only room-number-like tokens are extracted"""
+    assert extract_room_numbers("How do I get from room 1003 to 1063-C?") == ["1003", "1063-c"]
+    assert extract_room_numbers("where is the cafeteria") == []
+
+
+def test_bm25_ranks_exact_room_number_first():
+    """An exact room number ranks the describing image first"""
+    index = BM25Index().build(DESCRIPTIONS)
+    results = index.search("room 2037", top_n=3)
+    assert results[0][0] == "images/M2.png"
+    assert index.contains_term("1063-c")
+    assert not index.contains_term("9999")
+
+
+def test_bm25_empty_index_and_unknown_terms():
+    """Empty indexes and unknown terms return no results"""
+    assert BM25Index().search("1003") == []
+    index = BM25Index().build(DESCRIPTIONS)
+    assert index.search("zzzz") == []
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    """Documents ranked well by both lists come first"""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a", "d"]])
+    ids = [doc_id for doc_id, _ in fused]
+    assert ids == ["a", "b", "c", "d"]
+
+
+def test_hybrid_search_skips_vectors_for_known_room_numbers():
+    """Known room numbers are ranked lexically; other queries fuse both rankings"""
+    index = BM25Index().build(DESCRIPTIONS)
+    calls = []
+
+    def vector_search(pool):
+        calls.append(pool)
+        return [("images/A1.png", 0.9), ("images/M2.png", 0.5)]
+
+    retrieval, hits = hybrid_search("Where is room 1003?", index, vector_search, top_n=2)
+    assert retrieval == "lexical" and calls == []
+    assert hits[0][0] == "images/M1.png" and hits[0][1]["relevance_score"] == 1.0
+
+    retrieval, hits = hybrid_search("cafeteria stairs", index, vector_search, top_n=2)
+    assert retrieval == "hybrid" and calls == [10]
+    assert hits[0][0] == "images/A1.png" and hits[0][1]["rrf_score"] > hits[1][1]["rrf_score"]
+
+    retrieval, hits = hybrid_search("somewhere", None, vector_search, top_n=1)
+    assert (retrieval, hits) == ("vector", [("images/A1.png", {})])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Map Layers Tests
+================
+
+Tests the zoom-banded campus map layers: simplification per band,
+quantized delta encoding round trips and the versioned build.
+"""
+
+import sys
+import os
+import gzip
+import json
+import math
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation.map_layers import (ZOOM_BANDS, band_for_zoom, build_map_layers, decode_layer, encode_layer,
+                                   feature_bounds, load_or_build_map_layers)
+
+
+def _circle(lng, lat, radius_deg, points=64):
+    ring = [[lng + radius_deg * math.cos(2 * math.pi * i / points), lat + radius_deg * math.sin(2 * math.pi * i / points)]
+            for i in range(points)]
+    return ring + [ring[0]]
+
+
+def _points(geometry):
+    polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+    return [point for polygon in polygons for ring in polygon for point in ring]
+
+
+def _campus():
+    return {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"name": "Building M"},
+         "geometry": {"type": "Polygon", "coordinates": [_circle(-81.1985, 43.0140, 0.0003)]}},
+        {"type": "Feature", "properties": {"name": "Tiny"},
+         "geometry": {"type": "Polygon", "coordinates": [[[-81.19, 43.01], [-81.19, 43.0100001],
+                                                         [-81.1899999, 43.0100001], [-81.19, 43.01]]]}},
+        {"type": "Feature", "properties": {"name": "Parts"},
+         "geometry": {"type": "MultiPolygon", "coordinates": [[_circle(-81.2, 43.0, 0.0001, 8)],
+                                                              [_circle(-81.21, 43.0, 0.0001, 8)]]}},
+    ]}
+
+
+def test_unsimplified_band_round_trips_within_a_centimeter():
+    """Delta-encoded integers decode back to the source coordinates"""
+    campus = _campus()
+    decoded = decode_layer(encode_layer(campus, 0.05, ZOOM_BANDS[-1], simplify=False))
+
+    assert [f["properties"]["name"] for f in decoded["features"]] == ["Building M", "Tiny", "Parts"]
+    for original, result in zip(campus["features"], decoded["features"]):
+        assert result["geometry"]["type"] == original["geometry"]["type"]
+        for a, b in zip(_points(original["geometry"]), _points(result["geometry"])):
+            assert a == pytest.approx(b, abs=1e-7)
+    assert len(decoded["features"][2]["geometry"]["coordinates"]) == 2
+
+
+def test_lower_zoom_bands_have_fewer_points_and_valid_rings():
+    """Coarser bands drop vertices but never collapse a ring"""
+    layer = encode_layer(_campus(), 2.0, ZOOM_BANDS[0])
+    detail = encode_layer(_campus(), 0.05, ZOOM_BANDS[-1], simplify=False)
+
+    assert len(layer["features"][0]["rings"][0]) < len(detail["features"][0]["rings"][0])
+    decoded = decode_layer(layer)
+    assert all(len(ring) >= 4 for feature in decoded["features"][:2] for ring in feature["geometry"]["coordinates"])
+    assert layer["scale"] < detail["scale"]
+
+
+def test_build_writes_versioned_compressed_bands(tmp_path):
+    """Layers are versioned by source content and rebuilt when it changes"""
+    source = tmp_path / "campus.geojson"
+    source.write_text(json.dumps(_campus()))
+    output = tmp_path / "layers"
+
+    manifest = build_map_layers(str(source), str(output))
+    assert [band["name"] for band in manifest["bands"]] == [band[0] for band in ZOOM_BANDS]
+    for band in manifest["bands"]:
+        assert manifest["version"] in band["file"]
+        raw = (output / band["file"]).read_bytes()
+        assert gzip.decompress((output / f"{band['file']}.gz").read_bytes()) == raw
+        assert band["gzipBytes"] < band["bytes"]
+
+    assert load_or_build_map_layers(str(source), str(output)) == manifest
+    source.write_text(json.dumps({"type": "FeatureCollection", "features": _campus()["features"][:1]}))
+    assert load_or_build_map_layers(str(source), str(output))["version"] != manifest["version"]
+
+
+def test_feature_bounds_come_from_the_unsimplified_source(tmp_path):
+    """The manifest carries exact building bounds, so placing a floor plan needs no detail band"""
+    campus = _campus()
+    bounds = feature_bounds(campus)
+    points = _points(campus["features"][0]["geometry"])
+    assert bounds["Building M"] == [min(p[0] for p in points), min(p[1] for p in points),
+                                    max(p[0] for p in points), max(p[1] for p in points)]
+    assert sorted(bounds) == ["Building M", "Parts", "Tiny"]
+
+    source = tmp_path / "campus.geojson"
+    source.write_text(json.dumps(campus))
+    manifest = build_map_layers(str(source), str(tmp_path / "layers"))
+    assert manifest["featureBounds"] == json.loads(json.dumps(bounds))
+
+
+def test_band_for_zoom():
+    """Zoom levels map onto the configured bands"""
+    assert band_for_zoom(12) == "overview"
+    assert band_for_zoom(17.5) == "campus"
+    assert band_for_zoom(19) == "detail"
+    assert band_for_zoom(25) == "detail"
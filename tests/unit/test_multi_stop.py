@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Multi-Stop Route Tests
+======================
+
+Tests the visiting order solvers (Held–Karp against brute force, 2-opt)
+and the stitched multi-stop route over a campus graph.
+"""
+
+import sys
+import os
+import itertools
+import random
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import CampusGraph, NavigationGraph, held_karp, plan_multi_stop, two_opt
+from navigation import multistop
+from navigation.multistop import nearest_neighbor_tour
+
+STEP = 0.0001
+
+
+def _matrix(rng, count):
+    points = [(rng.random(), rng.random()) for _ in range(count)]
+    return [[((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5 for b in points] for a in points]
+
+
+def _cost(matrix, tour):
+    return sum(matrix[a][b] for a, b in zip(tour, tour[1:]))
+
+
+def test_held_karp_matches_brute_force():
+    """Test the exact solver finds the optimal open tour, with and without a fixed end"""
+    rng = random.Random(7)
+    for count in range(1, 8):
+        for _ in range(10):
+            matrix = _matrix(rng, count)
+            for end in ([None, count - 1] if count > 1 else [None]):
+                stops = [i for i in range(1, count) if i != end]
+                best = min(_cost(matrix, [0, *order] + ([end] if end is not None else []))
+                           for order in itertools.permutations(stops))
+                tour, cost = held_karp(matrix, end)
+                assert cost == pytest.approx(best)
+                assert _cost(matrix, tour) == pytest.approx(cost)
+                assert tour[0] == 0 and sorted(tour) == list(range(count))
+                assert end is None or tour[-1] == end
+
+
+def test_two_opt_improves_greedy_tour():
+    """Test 2-opt keeps the endpoints, visits every stop and never lengthens the tour"""
+    rng = random.Random(3)
+    for _ in range(20):
+        matrix = _matrix(rng, 15)
+        for end in (None, 14):
+            greedy = nearest_neighbor_tour(matrix, end)
+            improved = two_opt(matrix, greedy, end is not None)
+            assert improved[0] == 0 and sorted(improved) == list(range(15))
+            assert end is None or improved[-1] == end
+            assert _cost(matrix, improved) <= _cost(matrix, greedy) + 1e-9
+
+
+def test_plan_multi_stop_stitches_legs(monkeypatch):
+    """Test the route visits the stops along the corridor in order and is one continuous path"""
+    graph = NavigationGraph()
+    for i in range(9):
+        graph.add_edge(f"X1_{i}", f"X1_{i + 1}", coordinates=[[i * STEP, 0], [(i + 1) * STEP, 0]])
+    campus = CampusGraph({"X1": graph})
+
+    plan = plan_multi_stop(campus, "X1_0", ["X1_7", "X1_2", "X1_5"])
+    assert plan["order"] == [1, 2, 0]
+    assert plan["method"] == "held-karp"
+    assert plan["path"] == [f"X1_{i}" for i in range(8)]
+    assert plan["distance_m"] == pytest.approx(sum(leg["distance_m"] for leg in plan["legs"]), abs=0.05)
+    assert [leg["to"] for leg in plan["legs"]] == ["X1_2", "X1_5", "X1_7"]
+
+    # A fixed destination is visited last; large stop counts use the heuristic
+    plan = plan_multi_stop(campus, "X1_5", ["X1_9", "X1_7"], end="X1_0")
+    assert [leg["to"] for leg in plan["legs"]] == ["X1_7", "X1_9", "X1_0"]
+    monkeypatch.setattr(multistop, "HELD_KARP_MAX_STOPS", 1)
+    assert plan_multi_stop(campus, "X1_5", ["X1_9", "X1_7"], end="X1_0")["path"] == plan["path"]
+
+    with pytest.raises(ValueError):
+        plan_multi_stop(campus, "X1_0", ["missing"])
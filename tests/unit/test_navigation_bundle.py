@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Navigation Bundle Tests
+=======================
+
+Tests the navigation bundle compiler: the node spreadsheet reader,
+validation errors, the bundle round trip and routing on a campus graph
+built from a bundle.
+"""
+
+import sys
+import os
+import zipfile
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation.bundle import decode_bundle, load_bundle, write_bundle
+from navigation.campus import CampusGraph
+from navigation.compiler import compile_navigation_bundle, load_node_spreadsheet
+
+HEADER = ["Node", "Node_type", "Node_connections", "Object", "Object_type"]
+
+
+def _write_xlsx(path, rows):
+    """Minimal workbook with one sheet of shared-string cells"""
+    strings, cells = [], []
+    for r, row in enumerate([HEADER] + rows, start=1):
+        row_cells = []
+        for c, value in enumerate(row):
+            if value:
+                strings.append(value)
+                row_cells.append(f'<c r="{chr(65 + c)}{r}" t="s"><v>{len(strings) - 1}</v></c>')
+        cells.append(f'<row r="{r}">{"".join(row_cells)}</row>')
+
+    main = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", f'<workbook xmlns="{main}" xmlns:r="http://schemas.openxmlformats.org/'
+                         'officeDocument/2006/relationships"><sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/>'
+                         '</sheets></workbook>')
+        archive.writestr("xl/_rels/workbook.xml.rels", '<Relationships xmlns="http://schemas.openxmlformats.org/'
+                         'package/2006/relationships"><Relationship Id="rId1" Target="worksheets/sheet1.xml"/>'
+                         '</Relationships>')
+        archive.writestr("xl/sharedStrings.xml", f'<sst xmlns="{main}">'
+                         + "".join(f"<si><t>{s}</t></si>" for s in strings) + "</sst>")
+        archive.writestr("xl/worksheets/sheet1.xml", f'<worksheet xmlns="{main}"><sheetData>{"".join(cells)}'
+                         '</sheetData></worksheet>')
+
+
+CONFIGS = {"M": {"_name": "Building M", "roomToNode": {"Room_1001": "M1_1", "Room_1003": "M1_3"}}}
+
+
+@pytest.fixture
+def sources(campus_sources, tmp_path):
+    # Traced M1_1 - M1_2 - M1_3 (M1_3 → M1_1 is only in the spreadsheet)
+    corridors, _ = campus_sources(segments=[
+        ("M1_1", "M1_2", [[-81.2000, 43.0100], [-81.1990, 43.0100]]),
+        ("M1_2", "M1_3", [[-81.1990, 43.0100], [-81.1990, 43.0110]]),
+    ])
+    spreadsheet = tmp_path / "M1.xlsx"
+    _write_xlsx(spreadsheet, [
+        ["M1_1", "room", "M1_2, M1_3", "Room_1001", "room"],
+        ["M1_2", "turn", "M1_1, M1_3", "", ""],
+        ["M1_3", "room", "M1_2, M1_1", "Room_1003, Exit_1", "room, exit"],
+    ])
+    return corridors, str(spreadsheet)
+
+
+def test_spreadsheet_reader(sources):
+    nodes = load_node_spreadsheet(sources[1])
+    assert set(nodes) == {"M1_1", "M1_2", "M1_3"}
+    assert nodes["M1_1"]["connections"] == ["M1_2", "M1_3"]
+    assert nodes["M1_3"]["objects"] == [{"id": "Room_1003", "type": "room"}, {"id": "Exit_1", "type": "exit"}]
+    assert nodes["M1_2"]["objects"] == []
+
+
+def test_compile_adds_untraced_edges_and_spreadsheet_rooms(sources):
+    bundle = compile_navigation_bundle([sources[0]], CONFIGS, [sources[1]])
+    report = bundle["report"]
+    assert report["errors"] == []
+    assert report["stats"]["edges"] == 3 and report["stats"]["tracedEdges"] == 2
+
+    decoded = decode_bundle(bundle)
+    shortcut = next(e for e in decoded["edges"] if {e["start"], e["end"]} == {"M1_1", "M1_3"})
+    assert shortcut["source"] == "spreadsheet" and shortcut["coordinates"] is None
+    assert decoded["roomToNode"]["Exit_1"] == "M1_3"
+    assert any("Exit_1" in warning for warning in report["warnings"])
+
+    # Same sources, same version
+    assert compile_navigation_bundle([sources[0]], CONFIGS, [sources[1]])["version"] == bundle["version"]
+
+
+def test_compile_reports_errors(sources, tmp_path):
+    spreadsheet = tmp_path / "M1.xlsx"
+    _write_xlsx(spreadsheet, [
+        ["M1_1", "room", "M1_2, M1_9", "", ""],
+        ["M1_2", "turn", "M1_3", "", ""],
+        ["M1_3", "room", "M1_2", "", ""],
+        ["M1_7", "room", "", "", ""],
+    ])
+    configs = {"M": {"_name": "Building M", "roomToNode": {"Room_1001": "M1_8"}}}
+    report = compile_navigation_bundle([sources[0]], configs, [str(spreadsheet)])["report"]
+
+    assert any("unknown node M1_9" in error for error in report["errors"])
+    assert any("Room_1001" in error and "M1_8" in error for error in report["errors"])
+    assert any("M1_7" in error and "disconnected" in error for error in report["errors"])
+    assert "M1: M1_1 → M1_2 is only listed in one direction" in report["warnings"]
+
+
+def test_bundle_round_trip_and_routing(sources, tmp_path):
+    bundle = compile_navigation_bundle([sources[0]], CONFIGS, [sources[1]])
+    manifest = write_bundle(bundle, str(tmp_path / "bundle"))
+    assert manifest["version"] == bundle["version"]
+    assert os.path.exists(tmp_path / "bundle" / f"{manifest['file']}.gz")
+    assert write_bundle(bundle, str(tmp_path / "bundle")) == manifest
+
+    loaded = load_bundle(str(tmp_path / "bundle"))
+    campus = CampusGraph.from_bundle(loaded)
+    assert campus.bundle_version == bundle["version"]
+
+    path, distance = campus.shortest_path(campus.resolve("Room_1001"), campus.resolve("Room_1003"))
+    assert path == ["M1_1", "M1_3"]
+    traced = CampusGraph.from_sources([sources[0]], CONFIGS)
+    _, traced_distance = traced.shortest_path("M1_1", "M1_3")
+    assert distance < traced_distance
+
+    # Traced geometry survives the grid quantization (~1 cm)
+    original = traced.floors["M1"].edge("M1_1", "M1_2")["coordinates"]
+    decoded = campus.floors["M1"].edge("M1_1", "M1_2")["coordinates"]
+    assert all(abs(a - b) < 1e-6 for p, q in zip(original, decoded) for a, b in zip(p, q))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+PDF Extraction Tests
+====================
+
+Tests the parallel PDF image extraction: xref and content deduplication,
+page rendering and the manifest that skips unchanged PDFs.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from ingestion.pdf_extraction import PDFImageExtractor, FITZ_AVAILABLE, _split_ranges
+
+pytestmark = pytest.mark.skipif(not FITZ_AVAILABLE, reason="PyMuPDF not installed")
+
+
+def _png_bytes(color):
+    import fitz
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 40, 30), False)
+    pix.set_rect(pix.irect, color)
+    return pix.tobytes("png")
+
+
+def _make_pdf(path, pages=4):
+    """Each page shows a shared logo (same xref) plus its own plan; the last two plans are identical"""
+    import fitz
+    doc = fitz.open()
+    logo_xref = 0
+    plans = [_png_bytes((255, 0, 0)), _png_bytes((0, 255, 0)), _png_bytes((0, 0, 255)), _png_bytes((0, 0, 255))]
+    for page_num in range(pages):
+        page = doc.new_page()
+        if logo_xref:
+            page.insert_image(fitz.Rect(0, 0, 40, 30), xref=logo_xref)
+        else:
+            logo_xref = page.insert_image(fitz.Rect(0, 0, 40, 30), stream=_png_bytes((10, 10, 10)))
+        page.insert_image(fitz.Rect(100, 100, 300, 250), stream=plans[page_num])
+    doc.save(str(path))
+    doc.close()
+
+
+def test_split_ranges_covers_all_items():
+    """Work is split into contiguous, non-empty chunks"""
+    chunks = _split_ranges(list(range(10)), 4)
+    assert [len(c) for c in chunks] == [3, 3, 2, 2]
+    assert sum(chunks, []) == list(range(10))
+    assert _split_ranges([1], 8) == [[1]]
+
+
+def test_extraction_dedupes_xrefs_and_content(tmp_path):
+    """The shared logo and the duplicated plan are written once"""
+    pdf_path = tmp_path / "map.pdf"
+    _make_pdf(pdf_path)
+
+    outputs = PDFImageExtractor(str(tmp_path / "images"), workers=2).extract(str(pdf_path), "map")
+
+    # logo + 3 distinct plans
+    assert len(outputs) == 4
+    assert all(os.path.exists(p) for p in outputs)
+    assert os.path.basename(outputs[0]) == "map_page_1_img_1.png"
+
+
+def test_unchanged_pdf_is_skipped(tmp_path):
+    """A second run reuses the manifest without rewriting files"""
+    pdf_path = tmp_path / "map.pdf"
+    _make_pdf(pdf_path)
+    output_dir = str(tmp_path / "images")
+
+    first = PDFImageExtractor(output_dir, workers=1).extract(str(pdf_path), "map")
+    mtimes = {p: os.path.getmtime(p) for p in first}
+
+    second = PDFImageExtractor(output_dir, workers=1).extract(str(pdf_path), "map")
+    assert second == first
+    assert {p: os.path.getmtime(p) for p in second} == mtimes
+
+
+def test_render_pages_and_folder_scan(tmp_path):
+    """Page renders are added and the folder scan uses the PDF name as prefix"""
+    pdf_dir = tmp_path / "map"
+    pdf_dir.mkdir()
+    _make_pdf(pdf_dir / "keyplan.pdf", pages=2)
+
+    extractor = PDFImageExtractor(str(tmp_path / "images"), workers=1, render_pages=True, dpi=36)
+    results = extractor.extract_folder(str(pdf_dir))
+
+    outputs = results[str(pdf_dir / "keyplan.pdf")]
+    renders = [p for p in outputs if p.endswith("_render.png")]
+    assert len(renders) == 2
+    assert all(os.path.basename(p).startswith("keyplan_page_") for p in outputs)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Floor Plan Transform Tests
+==========================
+
+Tests the fitted SVG ↔ map transforms: the affine fit reproduces the
+corner interpolation of a rotated floor plan overlay, arrays of points
+round-trip, and a non-parallelogram calibration falls back to a
+homography.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import FloorPlanOverlay, PlanTransform
+
+OUTLINE = {"type": "Polygon", "coordinates": [[[-79.70, 43.65], [-79.69, 43.65], [-79.69, 43.66],
+                                               [-79.70, 43.66], [-79.70, 43.65]]]}
+
+
+def test_affine_fit_matches_overlay():
+    """Test the fitted matrix converts like the bilinear corner interpolation"""
+    overlay = FloorPlanOverlay.from_outline(OUTLINE, (0, 0, 1200, 800), bearing=21.3)
+    transform = PlanTransform.from_overlay(overlay)
+    assert transform.kind == "affine"
+
+    points = np.random.default_rng(0).uniform((0, 0), (1200, 800), size=(200, 2))
+    expected = np.array([overlay.svg_to_lnglat(x, y) for x, y in points])
+    assert np.abs(transform.to_lnglat(points) - expected).max() < 1e-9
+
+
+def test_round_trip_and_serialization():
+    """Test map → SVG inverts SVG → map and the parameters survive to_dict/from_dict"""
+    overlay = FloorPlanOverlay.from_outline(OUTLINE, (10, 20, 500, 300), bearing=-12)
+    transform = PlanTransform.from_dict(PlanTransform.from_overlay(overlay).to_dict())
+
+    points = [[10, 20], [510, 320], [250.5, 170.25]]
+    assert np.abs(transform.to_svg(transform.to_lnglat(points)) - np.array(points)).max() < 1e-6
+    assert transform.to_lnglat([10, 20]).shape == (1, 2)
+
+
+def test_homography_for_perspective_calibration():
+    """Test four calibration points that are not a parallelogram are fitted exactly"""
+    svg = [(0, 0), (100, 0), (100, 100), (0, 100)]
+    lnglat = [(0.0, 1.0), (1.0, 1.0), (0.8, 0.0), (0.2, 0.0)]
+    transform = PlanTransform.fit(svg, lnglat)
+
+    assert transform.kind == "homography"
+    assert np.abs(transform.to_lnglat(svg) - np.array(lnglat)).max() < 1e-9
+    assert np.abs(transform.to_svg(lnglat) - np.array(svg)).max() < 1e-6
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Query Cache Tests
+=================
+
+Tests the versioned LRU cache shared by the navigation services: LRU
+eviction, clearing on a new graph version, and results of a stale
+version not being stored.
+"""
+
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation.cache import VersionedLRUCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test a hit refreshes an entry and the oldest one is evicted"""
+    cache = VersionedLRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.info() == {"size": 2, "max_size": 2, "version": None, "hits": 3, "misses": 1}
+
+
+def test_entries_follow_the_graph_version():
+    """Test a new version clears the cache and stale results are dropped"""
+    cache = VersionedLRUCache(4, version="v1")
+    cache.put("route", [1, 2], "v1")
+    assert cache.get("route", "v1") == [1, 2]
+
+    assert cache.get("route", "v2") is None and len(cache) == 0
+    cache.put("route", [1, 3], "v1")  # computed before the graph changed
+    assert len(cache) == 0
+    cache.put("route", [1, 4], "v2")
+    assert cache.get("route", "v2", usable=lambda value: len(value) > 2) is None
+    assert cache.get("route", "v2") == [1, 4]
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Retrieval Benchmark Tests
+=========================
+
+Tests the ranking metrics, the IVF ANN index and the baseline regression
+checks of the offline retrieval benchmark.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from retrieval.ann_index import IVFIndex
+from retrieval.embedding_store import EmbeddingStore
+from retrieval.benchmark import recall_at_k, reciprocal_rank, compare_to_baseline
+
+
+def test_ranking_metrics():
+    """recall@k and reciprocal rank follow their definitions"""
+    ranked = ["a", "b", "c", "d"]
+    assert recall_at_k(ranked, ["c"], 2) == 0.0
+    assert recall_at_k(ranked, ["c", "a"], 3) == 1.0
+    assert reciprocal_rank(ranked, ["c"]) == 1 / 3
+    assert reciprocal_rank(ranked, ["z"]) == 0.0
+
+
+def test_ivf_index_matches_exact_search_when_probing_all_lists():
+    """Probing every list is an exhaustive search with exact scores"""
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(300, 32)).astype(np.float32)
+    ids = [f"img_{i}" for i in range(300)]
+    query = rng.normal(size=32)
+
+    index = IVFIndex(nlist=8, nprobe=8).build(ids, vectors)
+    exact = EmbeddingStore(mode="float32").build(ids, vectors)
+
+    assert index.search(query, 5) == exact.search(query, 5)
+    assert len(IVFIndex(nlist=8, nprobe=1).build(ids, vectors).search(query, 5)) == 5
+
+
+def test_compare_to_baseline_flags_regressions():
+    """Quality drops and memory growth beyond the thresholds are reported"""
+    metrics = {"recall@5": 0.9, "mrr": 0.8, "latency_p50_ms": 0.1, "latency_p95_ms": 0.2,
+               "latency_p99_ms": 0.3, "memory_bytes": 1000}
+    baseline = {"k": 5, "thresholds": {}, "configurations": {"brute_force": metrics}}
+
+    assert compare_to_baseline({"brute_force": dict(metrics)}, baseline) == []
+
+    worse = dict(metrics, mrr=0.7, memory_bytes=2000, latency_p95_ms=1.0)
+    regressions = compare_to_baseline({"brute_force": worse}, baseline)
+    assert len(regressions) == 3
+    assert len(compare_to_baseline({"brute_force": worse}, baseline, check_latency=False)) == 2
+    assert compare_to_baseline({}, baseline) == ["brute_force: configuration missing from results"]
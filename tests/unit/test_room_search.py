@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Room Search Tests
+=================
+
+Tests the fuzzy room name index behind resolve_room_name: normalization,
+SymSpell-style token correction, ranking and the auto-resolution
+threshold.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import RoomNameIndex
+from navigation.room_search import deletes, edit_distance
+
+CONFIG = {
+    "roomBuilding": {"Room_1003": "M", "Room_1004": "M", "Room_1030": "M", "Room_1041": "M",
+                     "Bathroom-Men": "M", "Bathroom-Women": "M", "Elevator-M": "M"},
+    "roomToNode": {"Room_1003": "M1_1", "Room_1004": "M1_2", "Room_1030": "M1_3", "Room_1041": "M1_4",
+                   "Bathroom-Men": "M1_5", "Bathroom-Women": "M1_6", "Elevator-M": "M1_7"},
+    "aliases": {"room 1003": "Room_1003", "men's bathroom": "Bathroom-Men", "bathroom women": "Bathroom-Women",
+                "elevator": "Elevator-M"},
+    "roomDescriptions": {"_comment": "friendly names", "Room_1003": "Room 1003 - Computer Lab",
+                         "Room_1030": "Room 1030 - Lab", "Room_1041": "Room 1041 - Lab"},
+}
+
+
+@pytest.fixture
+def index():
+    return RoomNameIndex.from_config(CONFIG)
+
+
+def test_edit_distance_is_bounded():
+    """Transpositions count once and the search stops past the bound"""
+    assert edit_distance("elevator", "elevator", 2) == 0
+    assert edit_distance("elevator", "elevaotr", 2) == 1
+    assert edit_distance("washroom", "bathroom", 2) == 2
+    assert edit_distance("computer", "cmptr", 2) == 3
+    assert deletes("abc", 1) == {"abc", "bc", "ac", "ab"}
+
+
+@pytest.mark.parametrize("query, room", [
+    ("room 1oo3", "Room_1003"),
+    ("M1003", "Room_1003"),
+    ("Room_1003", "Room_1003"),
+    ("mens washroom", "Bathroom-Men"),
+    ("womens restroom", "Bathroom-Women"),
+    ("elevaotr", "Elevator-M"),
+    ("computer lab", "Room_1003"),
+])
+def test_misspelled_names_resolve(index, query, room):
+    """Typos, digit look-alikes, building prefixes and synonyms resolve to the room"""
+    assert index.resolve(query) == room
+
+
+def test_ambiguous_or_unknown_names_do_not_resolve(index):
+    """Room numbers must match exactly and ties stay unresolved"""
+    assert index.resolve("1005") is None
+    assert index.resolve("lab") is None
+    assert index.resolve("cafeteria") is None
+    assert index.search("") == []
+
+
+def test_search_ranks_one_candidate_per_room(index):
+    """Candidates are unique per room, best first, with the matched name"""
+    candidates = index.search("lab", limit=5)
+    rooms = [c["room"] for c in candidates]
+
+    assert len(rooms) == len(set(rooms))
+    assert set(rooms[:2]) == {"Room_1030", "Room_1041"}
+    assert candidates[0]["score"] == candidates[1]["score"] > candidates[2]["score"]
+    assert candidates[0]["source"] == "description"
+    assert index.search("room 1003", limit=1) == [{"room": "Room_1003", "score": 1.0, "name": "1003", "source": "id"}]
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Route Geometry Tests
+====================
+
+Tests the server-side route geometry assembly: the unordered node-pair
+segment index, orientation and stitching, the straight-line fallback,
+zoom-tuned Douglas–Peucker simplification and the geometry cache.
+"""
+
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import NavigationGraph, RouteGeometryService, douglas_peucker, tolerance_for_zoom
+
+STEP = 0.0001  # ~8 m of longitude at 43°N
+
+
+def _service():
+    graph = NavigationGraph()
+    # A-B traced with a small wiggle, stored B → A to exercise orientation
+    graph.add_edge("B", "A", coordinates=[[-81.2 + STEP, 43.0], [-81.2 + STEP / 2, 43.0 + STEP / 1000], [-81.2, 43.0]])
+    graph.add_edge("B", "C", coordinates=[[-81.2 + STEP, 43.0], [-81.2 + STEP, 43.0 + STEP]])
+    graph.add_node("D", -81.2 + 2 * STEP, 43.0 + STEP)
+    return RouteGeometryService.from_graphs([graph])
+
+
+def test_segments_are_oriented_and_stitched():
+    """Pairs are found in either direction and junction points are not duplicated"""
+    service = _service()
+    result = service.assemble(["A", "B", "C"])
+
+    assert result["coordinates"][0] == [-81.2, 43.0]
+    assert result["coordinates"][-1] == [-81.2 + STEP, 43.0 + STEP]
+    assert len(result["coordinates"]) == 4
+    assert (result["segmentsFound"], result["segmentsMissing"], result["quality"]) == (2, 0, 1.0)
+    assert service.segment_coordinates("A", "B") == service.segment_coordinates("B", "A")[::-1]
+
+
+def test_untraced_pairs_fall_back_to_straight_lines():
+    """A pair without a segment is drawn between the node positions and reported"""
+    result = _service().assemble(["B", "C", "D"])
+
+    assert result["coordinates"][-2:] == [[-81.2 + STEP, 43.0 + STEP], [-81.2 + 2 * STEP, 43.0 + STEP]]
+    assert result["missingSegments"] == ["C→D"]
+    assert result["quality"] == 0.5
+
+
+def test_douglas_peucker_tolerance_follows_zoom():
+    """Low zooms drop small wiggles, high zooms keep them"""
+    line = [[-81.2 + i * STEP / 10, 43.0 + (STEP / 50 if i % 2 else 0)] for i in range(11)]  # ~0.2 m zigzag
+
+    assert tolerance_for_zoom(15, 43.0) > 0.2 > tolerance_for_zoom(21, 43.0)
+    assert douglas_peucker(line, tolerance_for_zoom(15, 43.0)) == [line[0], line[-1]]
+    assert len(douglas_peucker(line, tolerance_for_zoom(21, 43.0))) == 11
+    assert douglas_peucker(line[:2], 100) == line[:2]
+
+
+def test_geometry_is_simplified_rounded_and_cached():
+    """Geometries are cached per (path, zoom)"""
+    service = _service()
+
+    detailed = service.geometry(["A", "B", "C"])
+    simplified = service.geometry(["A", "B", "C"], zoom=16)
+    assert len(detailed["coordinates"]) == 4 and len(simplified["coordinates"]) == 3
+    assert all(len(str(value).split(".")[-1]) <= 7 for point in detailed["coordinates"] for value in point)
+
+    assert service.geometry(["A", "B", "C"], zoom=16) is simplified
+    assert service.cache_info()["hits"] == 1 and service.cache_info()["misses"] == 2
+
+    service.cache_size = 1
+    service.geometry(["B", "C"])
+    assert service.cache_info()["size"] == 1
+    service.clear_cache()
+    assert service.cache_info()["size"] == 0
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Route Tables Tests
+==================
+
+Tests the precomputed all-pairs distance and next-hop tables, their
+memory-mapped persistence and the rebuild when the corridor sources change.
+"""
+
+import sys
+import os
+import json
+
+import numpy as np
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import NavigationGraph, RoutingEngine, RouteTables, corridor_source_hash, load_or_build_route_tables
+
+
+def _graph():
+    """Chain A-B-C-D plus a long A-D shortcut and an isolated node Z"""
+    graph = NavigationGraph()
+    for node_id, lng in (("A", 0.0), ("B", 0.0001), ("C", 0.0002), ("D", 0.0003)):
+        graph.add_node(node_id, lng, 0.0)
+    graph.add_edge("A", "B")
+    graph.add_edge("B", "C")
+    graph.add_edge("C", "D")
+    graph.add_edge("A", "D", weight=1000.0)
+    graph.add_node("Z", 1.0, 1.0)
+    return graph
+
+
+def test_tables_match_dijkstra():
+    """Table walks give the same paths and distances as Dijkstra"""
+    graph = _graph()
+    tables = RouteTables.build(graph)
+    dijkstra = RoutingEngine(graph)
+
+    assert tables.next_hop.dtype == np.int16 and tables.distances.dtype == np.float32
+    for source in "ABCD":
+        for target in "ABCD":
+            path, distance = dijkstra.shortest_path(source, target)
+            assert tables.path(source, target) == path
+            assert np.isclose(tables.distance(source, target), distance, rtol=1e-5)
+
+    assert tables.path("A", "Z") is None
+    assert tables.distance("A", "Z") == float("inf")
+
+
+def test_tables_are_memory_mapped_and_rebuilt_on_change(tmp_path):
+    """Saved tables are reused for the same sources and rebuilt otherwise"""
+    corridors = tmp_path / "corridors.geojson"
+    corridors.write_text(json.dumps({"type": "FeatureCollection", "features": []}))
+    source_hash = corridor_source_hash([str(corridors)])
+    directory = str(tmp_path / "route_tables")
+
+    load_or_build_route_tables(_graph(), source_hash, directory)
+    loaded = load_or_build_route_tables(_graph(), source_hash, directory)
+    assert isinstance(loaded.distances, np.memmap)
+    assert loaded.path("A", "D") == ["A", "B", "C", "D"]
+
+    graph = _graph()
+    graph.add_edge("A", "D", weight=1.0)
+    corridors.write_text(json.dumps({"type": "FeatureCollection", "features": [], "edited": True}))
+    rebuilt = load_or_build_route_tables(graph, corridor_source_hash([str(corridors)]), directory)
+    assert rebuilt.path("A", "D") == ["A", "D"]
+    assert RouteTables.load(directory).source_hash == rebuilt.source_hash
+
+
+def test_routing_engine_uses_tables():
+    """The engine answers from the tables when they cover both nodes"""
+    graph = _graph()
+    engine = RoutingEngine(graph, RouteTables.build(graph))
+    route = engine.route("A", "C")
+
+    assert route["path"] == ["A", "B", "C"]
+    assert route["geometry"]["geometry"]["coordinates"] == [[0.0, 0.0], [0.0001, 0.0], [0.0002, 0.0]]
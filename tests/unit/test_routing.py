@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Routing Engine Tests
+====================
+
+Tests the corridor graph built from the GeoJSON segments and the
+shortest-path routing with assembled LineString geometry.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import NavigationGraph, RoutingEngine, haversine_m
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+CORRIDORS_PATH = os.path.join(PROJECT_ROOT, 'map', 'corridor_segments_building_m.geojson')
+
+
+@pytest.fixture
+def square_graph(campus_sources):
+    """A-B-C is shorter than the A-D-C detour"""
+    corridors, _ = campus_sources(segments=[
+        ("A", "B", [(0.0, 0.0), (0.0001, 0.0)]),
+        ("C", "B", [(0.0002, 0.0), (0.0001, 0.0)]),  # traced in reverse
+        ("A", "D", [(0.0, 0.0), (0.0, 0.0003)]),
+        ("D", "C", [(0.0, 0.0003), (0.0002, 0.0)]),
+    ])
+    return NavigationGraph.from_corridor_geojson(corridors, {"Room_1": "A", "Room_2": "C"})
+
+
+def test_haversine_matches_known_distance():
+    """0.001° of latitude is about 111 m"""
+    assert haversine_m(0, 0, 0, 0.001) == pytest.approx(111.2, abs=0.1)
+
+
+def test_route_picks_shortest_path_and_orients_geometry(square_graph):
+    """Reversed segments are flipped so the LineString is continuous"""
+    route = RoutingEngine(square_graph).route("Room_1", "Room_2")
+
+    assert route["path"] == ["A", "B", "C"]
+    assert route["distance_m"] == pytest.approx(haversine_m(0, 0, 0.0002, 0), abs=0.01)
+    assert route["geometry"]["geometry"]["coordinates"] == [[0.0, 0.0], [0.0001, 0.0], [0.0002, 0.0]]
+
+
+def test_unknown_or_unreachable_locations_return_none(square_graph):
+    """Unknown rooms and disconnected nodes have no route"""
+    graph = square_graph
+    graph.add_node("Z", 1.0, 1.0)
+    engine = RoutingEngine(graph)
+
+    assert engine.route("Room_1", "Room_404") is None
+    assert engine.route("A", "Z") is None
+    assert engine.route("A", "A")["distance_m"] == 0
+
+
+def test_building_m_corridors_are_routable():
+    """The traced Building M segments connect Room 1006 to Room 1003"""
+    graph = NavigationGraph.from_corridor_geojson(CORRIDORS_PATH, {"Room_1006": "M1_3", "Room_1003": "M1_6"})
+    route = RoutingEngine(graph).route("Room_1006", "Room_1003")
+
+    assert route["path"] == ["M1_3", "M1_Int_1", "M1_4", "M1_5", "M1_6"]
+    assert route["distance_m"] > 0
+    assert len(route["geometry"]["geometry"]["coordinates"]) >= len(route["path"])
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Routing Profile Tests
+=====================
+
+Tests the accessibility routing profiles: profile name handling, edge
+filtering and reweighting, and profile-aware campus routes.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import (CampusGraph, NavigationGraph, RoutingEngine, RouteTables, detect_profile, normalize_profile,
+                        profile_weight)
+
+STEP = 0.0001  # ~11 m of longitude at the equator
+
+
+def _write_campus(campus_sources, tmp_path):
+    """Two floors of building X with stairs at one end and an elevator at the other"""
+    corridors, configs = campus_sources({"X1": 4, "X2": 4}, {"Building X": {
+        "roomToNode": {"Room_101": "X1_1", "Room_201": "X2_3"},
+        "transfers": [
+            {"id": "Stairs_A", "type": "stairs", "nodes": {"X1": "X1_3", "X2": "X2_3"}},
+            {"id": "Elevator-X", "type": "elevator", "nodes": {"X1": "X1_0", "X2": "X2_0"}},
+        ],
+    }})
+    return CampusGraph.from_sources([corridors], configs, str(tmp_path / "tables"), "v1")
+
+
+def test_profile_names_and_detection():
+    """Names are normalized, unknown profiles rejected and chat hints detected"""
+    assert normalize_profile(None) == "default"
+    assert normalize_profile("Step_Free") == "step-free"
+    assert normalize_profile("elevator preferred") == "elevator-preferred"
+    with pytest.raises(ValueError):
+        normalize_profile("teleport")
+
+    assert detect_profile("How do I get to 1003 in a wheelchair?") == "step-free"
+    assert detect_profile("Route to the library using the lift") == "elevator-preferred"
+    assert detect_profile("How do I get to the library?") is None
+    assert detect_profile("Can I go up by elevator?") == "elevator-preferred"
+    assert detect_profile("I need a route with no stairs") == "step-free"
+    assert detect_profile("Take me to the elevator") is None
+    assert detect_profile("Where is the uplift lounge?") is None
+
+
+def test_profile_weight_filters_and_reweights_edges():
+    """Step-free drops stairs; elevator-preferred penalizes them"""
+    stairs = {"type": "stairs", "weight": 15.0}
+    elevator = {"type": "elevator", "weight": 40.0}
+    steps_segment = {"segmentType": "corridor", "accessibility": "stairs", "weight": 5.0}
+
+    assert profile_weight("default", stairs) == 15.0
+    assert profile_weight("step-free", stairs) is None
+    assert profile_weight("step-free", steps_segment) is None
+    assert profile_weight("step-free", elevator) == 40.0
+    assert profile_weight("elevator-preferred", stairs) == 60.0
+    assert profile_weight("elevator-preferred", elevator) == 20.0
+
+
+def test_step_free_engine_avoids_stepped_segment():
+    """A segment marked with steps is skipped by Dijkstra and by the tables"""
+    graph = NavigationGraph()
+    graph.add_edge("A", "B", coordinates=[[0, 0], [STEP, 0]], accessibility="steps")
+    graph.add_edge("A", "C", coordinates=[[0, 0], [0, STEP]])
+    graph.add_edge("C", "D", coordinates=[[0, STEP], [STEP, STEP]])
+    graph.add_edge("D", "B", coordinates=[[STEP, STEP], [STEP, 0]])
+
+    assert RoutingEngine(graph).shortest_path("A", "B")[0] == ["A", "B"]
+    assert RoutingEngine(graph, profile="step-free").shortest_path("A", "B")[0] == ["A", "C", "D", "B"]
+
+    tables = RouteTables.build(graph, profile="step-free")
+    assert RoutingEngine(graph, tables, "step-free").shortest_path("A", "B")[0] == ["A", "C", "D", "B"]
+
+
+def test_campus_route_depends_on_profile(campus_sources, tmp_path):
+    """Default takes the nearby stairs, step-free and elevator-preferred the elevator"""
+    campus = _write_campus(campus_sources, tmp_path)
+
+    default = campus.route("Room_101", "Room_201")
+    assert [t["id"] for t in default["transfers"]] == ["Stairs_A"]
+    assert default["profile"] == "default"
+
+    for profile in ("step-free", "elevator-preferred"):
+        route = campus.route("Room_101", "Room_201", profile)
+        assert [t["id"] for t in route["transfers"]] == ["Elevator-X"]
+        assert route["path"][0] == "X1_1" and route["path"][-1] == "X2_3"
+        assert route["profile"] == profile
+        assert route["distance_m"] > default["distance_m"]
+
+    # Meters do not depend on the profile; the weighted cost is reported separately
+    preferred = campus.route("Room_101", "Room_201", "elevator-preferred")
+    step_free = campus.route("Room_101", "Room_201", "step-free")
+    assert preferred["distance_m"] == step_free["distance_m"] == pytest.approx(campus.path_distance_m(preferred["path"]),
+                                                                              abs=0.01)
+    assert preferred["cost"] < preferred["distance_m"]  # elevator weighted ×0.5
+    assert default["cost"] == default["distance_m"]
+
+    assert os.path.isdir(tmp_path / "tables" / "step-free" / "X1")
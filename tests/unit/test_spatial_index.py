@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Spatial Index Tests
+===================
+
+Tests the uniform-grid spatial index, the floor plan SVG parsing and the
+per-floor location snapper behind /api/navigation/snap.
+"""
+
+import sys
+import os
+import json
+import random
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from navigation import FloorPlanOverlay, LocationSnapper, SpatialIndex, haversine_m, load_svg_rooms
+from navigation.floorplan import parse_path
+
+STEP = 0.0001  # ~8 m of longitude at 43°N
+
+SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 100 100">
+  <g transform="translate(10,0)">
+    <path id="Room_A" d="m 0,0 h 40 v 40 h -40 z" />
+  </g>
+  <rect id="Room_B" x="50" y="50" width="40" height="40" />
+  <ellipse id="M1_1" cx="5" cy="5" rx="1" ry="1" />
+</svg>"""
+
+
+def test_nearest_matches_brute_force():
+    """Grid search returns the same nearest point as a linear scan"""
+    rng = random.Random(7)
+    index = SpatialIndex(cell_size_m=5.0)
+    points = {}
+    for i in range(300):
+        lng, lat = -81.2 + rng.random() * 0.002, 43.0 + rng.random() * 0.002
+        points[f"n{i}"] = (lng, lat)
+        index.insert_point(f"n{i}", lng, lat, "node")
+
+    for _ in range(50):
+        lng, lat = -81.2 + rng.random() * 0.002, 43.0 + rng.random() * 0.002
+        expected = min(points, key=lambda p: haversine_m(lng, lat, *points[p]))
+        result = index.nearest(lng, lat)
+        assert result["id"] == expected
+        assert result["distance_m"] == pytest.approx(haversine_m(lng, lat, *points[expected]), rel=0.01, abs=0.01)
+
+    assert index.nearest(-81.1, 43.0, max_distance_m=10) is None
+    assert index.nearest(-81.2, 43.0, kinds=["room"]) is None
+
+
+def test_polygons_contain_points_and_report_their_center():
+    """A point inside a polygon snaps to it at distance 0"""
+    index = SpatialIndex()
+    ring = [(0.0, 0.0), (4 * STEP, 0.0), (4 * STEP, 4 * STEP), (0.0, 4 * STEP)]
+    index.insert_polygon("Room_1", [(-81.2 + x, 43.0 + y) for x, y in ring], "room", center=(-81.2, 43.0), node="M1_1")
+    index.insert_point("M1_1", -81.2 - STEP, 43.0, "node")
+
+    inside = index.nearest(-81.2 + STEP, 43.0 + STEP, kinds=["room"])
+    assert inside["inside"] is True and inside["distance_m"] == 0
+    assert (inside["lng"], inside["lat"], inside["node"]) == (-81.2, 43.0, "M1_1")
+    assert [room["id"] for room in index.containing(-81.2 + STEP, 43.0 + STEP)] == ["Room_1"]
+
+    outside = index.nearest(-81.2 + 5 * STEP, 43.0 + STEP, kinds=["room"])
+    assert outside["inside"] is False and outside["distance_m"] == pytest.approx(8.1, abs=0.2)
+
+
+def test_svg_room_outlines_and_overlay(tmp_path):
+    """Room elements are parsed with their transforms and placed on the map"""
+    assert parse_path("M 0,0 L 10,0 l 0,10 H 0 Z") == [[(0, 0), (10, 0), (10, 10), (0, 10)]]
+
+    svg_path = tmp_path / "plan.svg"
+    svg_path.write_text(SVG)
+    rooms, viewbox = load_svg_rooms(str(svg_path))
+
+    assert viewbox == (0, 0, 100, 100)
+    assert sorted(rooms) == ["Room_A", "Room_B"]
+    assert rooms["Room_A"][0] == (10, 0) and rooms["Room_A"][2] == (50, 40)
+
+    outline = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}
+    overlay = FloorPlanOverlay.from_svg(str(svg_path), outline)
+    assert overlay.svg_to_lnglat(0, 0) == pytest.approx((0, 1))
+    assert overlay.svg_to_lnglat(100, 100) == pytest.approx((1, 0))
+
+    rotated = FloorPlanOverlay.from_outline(outline, viewbox, bearing=90)
+    assert rotated.svg_to_lnglat(0, 0) == pytest.approx((1, 1))
+
+
+def test_location_snapper_from_building_config(tmp_path):
+    """Snaps to the room under the position and falls back across floors"""
+    svg_path = tmp_path / "plan.svg"
+    svg_path.write_text(SVG)
+    campus = tmp_path / "campus.geojson"
+    campus.write_text(json.dumps({"type": "FeatureCollection", "features": [{
+        "type": "Feature", "properties": {"name": "Building X"},
+        "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [0.001, 0], [0.001, 0.001], [0, 0.001], [0, 0]]]},
+    }]}))
+    configs = {"X": {
+        "_name": "Building X",
+        "roomToNode": {"Room_A": "X1_1", "Room_C": "X1_2"},
+        "roomCentersSVG": {"_comment": "overrides", "Room_B": {"x": 60, "y": 60}, "Room_C": {"x": 5, "y": 95}},
+        "floorPlans": {"X1": {"svg": "plan.svg"}},
+    }}
+
+    snapper = LocationSnapper.from_sources(None, configs, str(campus), base_dir=str(tmp_path))
+    assert sorted(snapper.indexes["X1"].items) == ["Room_A", "Room_B", "Room_C"]
+
+    # Center of Room_A (SVG 30,20) → lng 0.0003, lat 0.0008
+    result = snapper.snap(0.0003, 0.0008)
+    assert result["floor"] == "X1" and result["node"] is None
+    assert result["room"]["id"] == "Room_A" and result["room"]["inside"] and result["room"]["node"] == "X1_1"
+
+    room_b = snapper.snap(0.0007, 0.0003, "X1")["room"]
+    assert room_b["id"] == "Room_B"
+    assert (room_b["lng"], room_b["lat"]) == pytest.approx((0.0006, 0.0004))
+
+    assert snapper.snap(0.00005, 0.00005, "X1")["room"]["id"] == "Room_C"
+    assert snapper.snap(0.0003, 0.0008, "X2") is None
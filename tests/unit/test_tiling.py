@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Floor Plan Tiling Tests
+=======================
+
+Tests the tile layout used for region-level retrieval and the selection
+of the most relevant region per parent image.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from ingestion.tiling import compute_tile_boxes, describe_tile_position, generate_tiles, PIL_AVAILABLE
+from retrieval.regions import select_regions
+
+
+def test_tile_boxes_cover_image_with_overlap():
+    """Tiles cover the whole image and neighbours overlap"""
+    boxes = compute_tile_boxes(1275, 1650, tile_size=768, overlap=0.25)
+
+    assert all(right - left == 768 and bottom - top == 768 for left, top, right, bottom in boxes)
+    assert max(box[2] for box in boxes) == 1275
+    assert max(box[3] for box in boxes) == 1650
+    assert boxes[1][0] < boxes[0][2]  # horizontal overlap
+
+
+def test_small_image_is_single_tile():
+    """Images smaller than the tile produce one tile"""
+    assert compute_tile_boxes(500, 400, tile_size=768) == [(0, 0, 500, 400)]
+
+
+def test_invalid_overlap():
+    """Overlap must be a fraction below 1"""
+    with pytest.raises(ValueError):
+        compute_tile_boxes(1000, 1000, overlap=1.0)
+
+
+def test_describe_tile_position():
+    """Tile positions are named relative to the parent"""
+    assert describe_tile_position((0, 0, 100, 100), (900, 900)) == "upper-left"
+    assert describe_tile_position((400, 400, 500, 500), (900, 900)) == "center"
+    assert describe_tile_position((800, 0, 900, 100), (900, 900)) == "upper-right"
+
+
+@pytest.mark.skipif(not PIL_AVAILABLE, reason="Pillow not installed")
+def test_generate_tiles_records_parent(tmp_path):
+    """Generated tiles point back to their parent image"""
+    from PIL import Image
+
+    parent = tmp_path / "plan.png"
+    Image.new("RGB", (1300, 900), "white").save(parent)
+
+    tiles = generate_tiles(str(parent), str(tmp_path / "tiles"), tile_size=768, overlap=0.25)
+
+    assert len(tiles) == 4
+    assert all(tile['parent_img_path'] == str(parent) for tile in tiles)
+    assert all(os.path.exists(tile['tile_path']) for tile in tiles)
+
+    # A plan with the same name but another format gets its own tiles
+    Image.new("RGB", (1300, 900), "black").save(tmp_path / "plan.jpeg")
+    other = generate_tiles(str(tmp_path / "plan.jpeg"), str(tmp_path / "tiles"), tile_size=768, overlap=0.25)
+    assert not {tile['tile_path'] for tile in tiles} & {tile['tile_path'] for tile in other}
+
+
+def test_select_regions_prefers_tiles():
+    """The best tile replaces its parent and parents stay in rank order"""
+    results = [
+        {'img_path': 'images/M1.png', 'record_type': 'image', 'parent_img_path': None},
+        {'img_path': 'images/M2.png', 'record_type': 'image', 'parent_img_path': None},
+        {'img_path': 'tiles/M1_tile_03.png', 'record_type': 'tile', 'parent_img_path': 'images/M1.png'},
+        {'img_path': 'tiles/M1_tile_01.png', 'record_type': 'tile', 'parent_img_path': 'images/M1.png'},
+    ]
+
+    regions = select_regions(results, top_n=2)
+
+    assert [region['img_path'] for region in regions] == ['tiles/M1_tile_03.png', 'images/M2.png']